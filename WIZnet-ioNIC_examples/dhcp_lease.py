@@ -0,0 +1,408 @@
+"""
+Fast-boot DHCP client with lease persistence, written with asyncio.
+
+The lease (address, netmask, gateway, DNS server, DHCP server and lease times)
+is saved to the filesystem when it is obtained.  At the next boot, for example
+after a watchdog reset, the client first asks the server to confirm the saved
+address with a single REQUEST (the INIT-REBOOT state of RFC 2131), which takes
+one round trip instead of the full DISCOVER/OFFER/REQUEST/ACK exchange.  Only
+if that gets no answer or is refused does the client fall back to discovery.
+
+Bring-up doesn't block: DHCPClient.run() is a task which brings the interface
+up, then renews and rebinds the lease in the background, and DHCPClient.bound
+is an asyncio.Event which is set whenever there is a valid lease.
+
+Run on the W55RP20 through Thonny, or on the unix port against a local DHCP
+stand-in (see dhcp_test_server.py):
+
+    micropython dhcp_lease.py 127.0.0.1:6767 6868
+"""
+
+import asyncio
+import json
+import os
+import socket
+import struct
+import time
+
+DHCP_SERVER_PORT = 67
+DHCP_CLIENT_PORT = 68
+LEASE_FILE = "dhcp_lease.json"
+
+# Message types (option 53)
+DISCOVER = 1
+OFFER = 2
+REQUEST = 3
+DECLINE = 4
+ACK = 5
+NAK = 6
+RELEASE = 7
+
+# Options
+OPT_NETMASK = 1
+OPT_ROUTER = 3
+OPT_DNS = 6
+OPT_HOSTNAME = 12
+OPT_REQUESTED_IP = 50
+OPT_LEASE_TIME = 51
+OPT_MSG_TYPE = 53
+OPT_SERVER_ID = 54
+OPT_PARAM_REQUEST = 55
+OPT_RENEWAL_TIME = 58
+OPT_REBINDING_TIME = 59
+OPT_CLIENT_ID = 61
+OPT_END = 255
+
+MAGIC_COOKIE = b"\x63\x82\x53\x63"
+PARAM_REQUEST = bytes(
+    (OPT_NETMASK, OPT_ROUTER, OPT_DNS, OPT_LEASE_TIME, OPT_RENEWAL_TIME, OPT_REBINDING_TIME)
+)
+
+
+def _ip_str(b):
+    return "{}.{}.{}.{}".format(*b)
+
+
+def _ip_bytes(s):
+    return bytes(int(x) for x in s.split("."))
+
+
+class DHCPClient:
+    def __init__(
+        self,
+        mac,
+        apply=None,
+        hostname=None,
+        lease_file=LEASE_FILE,
+        server_addr=("255.255.255.255", DHCP_SERVER_PORT),
+        client_port=DHCP_CLIENT_PORT,
+    ):
+        self.mac = bytes(mac)
+        self.apply = apply  # Called with (ip, netmask, gateway, dns) when bound
+        self.hostname = hostname
+        self.lease_file = lease_file
+        self.server_addr = server_addr
+        self.client_port = client_port
+        self.lease = None  # The current lease, a dict as saved in lease_file
+        self.bound = asyncio.Event()
+        self._ep = None
+        self._server = socket.getaddrinfo(*server_addr)[0][-1]
+        self._xid = 0
+        self._pkt = bytearray(300)
+        self._resp = bytearray(576)
+
+    ############################################################################
+    # Lease persistence
+
+    def _load(self):
+        try:
+            with open(self.lease_file) as f:
+                lease = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(lease, dict) or "ip" not in lease or "server" not in lease:
+            return None
+        # The clock may have been reset by the reboot, so the lease can only be
+        # known to have expired if the time hasn't gone backwards.  Otherwise
+        # the server decides whether it is still valid.
+        now = time.time()
+        if lease["obtained"] <= now and now >= lease["obtained"] + lease["lease"]:
+            return None
+        return lease
+
+    def _save(self):
+        tmp = self.lease_file + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self.lease, f)
+            os.rename(tmp, self.lease_file)
+        except OSError:
+            pass
+
+    def _forget(self):
+        self.lease = None
+        self.bound.clear()
+        try:
+            os.remove(self.lease_file)
+        except OSError:
+            pass
+
+    ############################################################################
+    # Messages
+
+    def _build(self, msg_type, ciaddr=None, requested_ip=None, server_id=None):
+        p = self._pkt
+        for i in range(len(p)):
+            p[i] = 0
+        p[0] = 1  # BOOTREQUEST
+        p[1] = 1  # Ethernet
+        p[2] = 6  # Hardware address length
+        struct.pack_into("!I", p, 4, self._xid)
+        if ciaddr is None:
+            # The client can't receive unicast replies without an address
+            p[10] = 0x80
+        else:
+            p[12:16] = _ip_bytes(ciaddr)
+        p[28:34] = self.mac
+        p[236:240] = MAGIC_COOKIE
+        i = 240
+
+        def opt(code, data):
+            nonlocal i
+            p[i] = code
+            p[i + 1] = len(data)
+            p[i + 2 : i + 2 + len(data)] = data
+            i += 2 + len(data)
+
+        opt(OPT_MSG_TYPE, bytes((msg_type,)))
+        opt(OPT_CLIENT_ID, b"\x01" + self.mac)
+        if requested_ip is not None:
+            opt(OPT_REQUESTED_IP, _ip_bytes(requested_ip))
+        if server_id is not None:
+            opt(OPT_SERVER_ID, _ip_bytes(server_id))
+        if self.hostname:
+            opt(OPT_HOSTNAME, self.hostname.encode()[:32])
+        opt(OPT_PARAM_REQUEST, PARAM_REQUEST)
+        p[i] = OPT_END
+        return p
+
+    # Parse a reply to the current transaction, returning a dict of the
+    # message type, offered address and options, or None if it isn't one.
+    def _parse(self, n):
+        p = self._resp
+        if (
+            n < 240
+            or p[0] != 2  # BOOTREPLY
+            or struct.unpack_from("!I", p, 4)[0] != self._xid
+            or p[28:34] != self.mac
+            or p[236:240] != MAGIC_COOKIE
+        ):
+            return None
+        msg = {"yiaddr": _ip_str(p[16:20])}
+        # The lengths come off the wire, so a reply with an option that runs
+        # past the end of it, or is the wrong length, is skipped as malformed.
+        i = 240
+        while i < n and p[i] != OPT_END:
+            code = p[i]
+            if code == 0:
+                i += 1
+                continue
+            if i + 2 > n or i + 2 + p[i + 1] > n:
+                return None
+            size = p[i + 1]
+            data = p[i + 2 : i + 2 + size]
+            if code == OPT_MSG_TYPE:
+                if size != 1:
+                    return None
+                msg["type"] = data[0]
+            elif code in (OPT_NETMASK, OPT_ROUTER, OPT_DNS, OPT_SERVER_ID):
+                # Router and DNS are lists of addresses, of which the first is used
+                if size < 4 or size % 4:
+                    return None
+                msg[code] = _ip_str(data[:4])
+            elif code in (OPT_LEASE_TIME, OPT_RENEWAL_TIME, OPT_REBINDING_TIME):
+                if size != 4:
+                    return None
+                msg[code] = struct.unpack("!I", data)[0]
+            i += 2 + size
+        return msg if "type" in msg else None
+
+    # Send a message and wait for a reply of one of the given types, resending
+    # with a doubling timeout.  Returns the parsed reply or None.
+    async def _transact(self, pkt, dest, types, timeout_ms, tries):
+        ep = self._ep
+        for _ in range(tries):
+            await ep.sendto(pkt, dest)
+            deadline = time.ticks_add(time.ticks_ms(), timeout_ms)
+            while True:
+                remaining = time.ticks_diff(deadline, time.ticks_ms())
+                if remaining <= 0:
+                    break
+                try:
+                    n, _ = await asyncio.wait_for_ms(ep.recvfrom_into(self._resp), remaining)
+                except asyncio.TimeoutError:
+                    break
+                msg = self._parse(n)
+                if msg is not None and msg["type"] in types:
+                    return msg
+            timeout_ms *= 2
+        return None
+
+    def _new_xid(self):
+        self._xid = struct.unpack("I", os.urandom(4))[0]
+
+    ############################################################################
+    # States
+
+    def _bind(self, msg, server):
+        lease_time = msg.get(OPT_LEASE_TIME, 3600)
+        self.lease = {
+            "ip": msg["yiaddr"],
+            "netmask": msg.get(OPT_NETMASK, "255.255.255.0"),
+            "gateway": msg.get(OPT_ROUTER, "0.0.0.0"),
+            "dns": msg.get(OPT_DNS, "0.0.0.0"),
+            "server": msg.get(OPT_SERVER_ID, server),
+            "lease": lease_time,
+            "t1": msg.get(OPT_RENEWAL_TIME, lease_time // 2),
+            "t2": msg.get(OPT_REBINDING_TIME, lease_time * 7 // 8),
+            "obtained": time.time(),
+        }
+        self._bound_ticks = time.ticks_ms()
+        self._save()
+        if self.apply:
+            lease = self.lease
+            self.apply(lease["ip"], lease["netmask"], lease["gateway"], lease["dns"])
+        self.bound.set()
+
+    # INIT-REBOOT: ask for the saved address to be confirmed.  Returns True if
+    # it was, and False if it was refused or there was no answer.
+    async def _reboot(self, lease):
+        self._new_xid()
+        pkt = self._build(REQUEST, requested_ip=lease["ip"])
+        msg = await self._transact(pkt, self._server, (ACK, NAK), 250, 2)
+        if msg is None or msg["type"] == NAK:
+            return False
+        self._bind(msg, lease["server"])
+        return True
+
+    # INIT: discover a server and request the address it offers.
+    async def _discover(self):
+        retry = 1
+        while True:
+            self._new_xid()
+            offer = await self._transact(self._build(DISCOVER), self._server, (OFFER,), 1000, 3)
+            if offer is not None and OPT_SERVER_ID in offer:
+                pkt = self._build(
+                    REQUEST, requested_ip=offer["yiaddr"], server_id=offer[OPT_SERVER_ID]
+                )
+                msg = await self._transact(pkt, self._server, (ACK, NAK), 1000, 3)
+                if msg is not None and msg["type"] == ACK:
+                    self._bind(msg, offer[OPT_SERVER_ID])
+                    return
+            await asyncio.sleep(retry)
+            retry = min(retry * 2, 64)
+
+    # RENEWING (to the server that granted the lease) or REBINDING (to any
+    # server).  Returns True if the lease was extended.
+    async def _renew(self, dest):
+        lease = self.lease
+        self._new_xid()
+        pkt = self._build(REQUEST, ciaddr=lease["ip"])
+        msg = await self._transact(pkt, dest, (ACK, NAK), 1000, 3)
+        if msg is None:
+            return False
+        if msg["type"] == NAK:
+            self._forget()
+            return False
+        self._bind(msg, lease["server"])
+        return True
+
+    def _elapsed(self):
+        return time.ticks_diff(time.ticks_ms(), self._bound_ticks) // 1000
+
+    # Wait until the given number of seconds after the lease was obtained.
+    async def _until(self, t):
+        while self._elapsed() < t:
+            await asyncio.sleep(min(t - self._elapsed(), 60))
+
+    ############################################################################
+    # Public API
+
+    # Bring the interface up, using the saved lease if the server confirms it.
+    async def start(self):
+        self._ep = await asyncio.open_datagram_endpoint(local_addr=("0.0.0.0", self.client_port))
+        try:
+            self._ep.s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        except (AttributeError, OSError):
+            # Not needed on all network stacks
+            pass
+        lease = self._load()
+        if lease is None or not await self._reboot(lease):
+            await self._discover()
+        return self.lease
+
+    # Keep a lease, running until cancelled.
+    async def run(self):
+        if self._ep is None:
+            await self.start()
+        while True:
+            if self.lease is None:
+                await self._discover()
+            lease = self.lease
+            await self._until(lease["t1"])
+            server = socket.getaddrinfo(lease["server"], self.server_addr[1])[0][-1]
+            while self.lease is lease and self._elapsed() < lease["t2"]:
+                if await self._renew(server):
+                    break
+                await asyncio.sleep(max(1, (lease["t2"] - self._elapsed()) // 2))
+            while self.lease is lease and self._elapsed() < lease["lease"]:
+                if await self._renew(self._server):
+                    break
+                await asyncio.sleep(max(1, (lease["lease"] - self._elapsed()) // 2))
+            if self.lease is lease:
+                # The lease expired without being renewed
+                self._forget()
+
+    def close(self):
+        if self._ep is not None:
+            self._ep.close()
+            self._ep = None
+
+
+# W5x00 chip initialization using DHCPClient instead of nic.ifconfig("dhcp")
+async def w5x00_init():
+    from machine import Pin, WIZNET_PIO_SPI
+    import network
+
+    spi = WIZNET_PIO_SPI(
+        baudrate=31_250_000, mosi=Pin(23), miso=Pin(22), sck=Pin(21)
+    )  # W55RP20 PIO_SPI
+    nic = network.WIZNET5K(spi, Pin(20), Pin(25))  # spi, cs, reset pin
+    nic.active(True)
+    nic.ifconfig(("0.0.0.0", "0.0.0.0", "0.0.0.0", "0.0.0.0"))
+
+    def apply(ip, netmask, gateway, dns):
+        nic.ifconfig((ip, netmask, gateway, dns))
+
+    client = DHCPClient(nic.config("mac"), apply, hostname="w55rp20")
+    asyncio.create_task(client.run())
+    return nic, client
+
+
+async def app(client_factory):
+    t0 = time.ticks_ms()
+    nic, client = await client_factory()
+    await client.bound.wait()
+    print("Bound in {} ms:".format(time.ticks_diff(time.ticks_ms(), t0)), client.lease)
+    # The application runs here while the lease is kept in the background
+    while True:
+        await asyncio.sleep(10)
+        print("Lease:", client.lease)
+
+
+def main():
+    import sys
+
+    if len(sys.argv) > 1:
+        # Server given as host:port, and optionally the client port, eg for
+        # testing against dhcp_test_server.py
+        host, _, port = sys.argv[1].partition(":")
+        client_port = int(sys.argv[2]) if len(sys.argv) > 2 else DHCP_CLIENT_PORT
+
+        async def factory():
+            client = DHCPClient(
+                b"\x02\x00\x00\x00\x00\x01",
+                lambda *cfg: print("ifconfig", cfg),
+                server_addr=(host, int(port or DHCP_SERVER_PORT)),
+                client_port=client_port,
+            )
+            asyncio.create_task(client.run())
+            return None, client
+
+        asyncio.run(app(factory))
+    else:
+        asyncio.run(app(w5x00_init))
+
+
+if __name__ == "__main__":
+    main()
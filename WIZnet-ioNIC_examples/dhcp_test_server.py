@@ -0,0 +1,110 @@
+"""
+Minimal DHCP server, as a local stand-in for testing dhcp_lease.py on Linux.
+
+It hands out addresses from a small pool and answers DISCOVER, and REQUEST in
+the SELECTING, INIT-REBOOT, RENEWING and REBINDING states.  Replies are sent
+back to the address the request came from, rather than broadcast, so that
+client and server can both run on the loopback interface:
+
+    python3 dhcp_test_server.py --port 6767 --lease 20
+    micropython dhcp_lease.py 127.0.0.1:6767 6868
+
+Use --nak-reboot to refuse INIT-REBOOT requests, as a server which has lost its
+leases would, and --ignore-reboot to not answer them at all.
+"""
+
+import argparse
+import socket
+import struct
+
+MAGIC_COOKIE = b"\x63\x82\x53\x63"
+DISCOVER, OFFER, REQUEST, DECLINE, ACK, NAK, RELEASE = 1, 2, 3, 4, 5, 6, 7
+NAMES = {1: "DISCOVER", 3: "REQUEST", 4: "DECLINE", 7: "RELEASE"}
+
+
+def parse_options(pkt):
+    opts = {}
+    i = 240
+    while i < len(pkt) and pkt[i] != 255:
+        if pkt[i] == 0:
+            i += 1
+            continue
+        opts[pkt[i]] = pkt[i + 2 : i + 2 + pkt[i + 1]]
+        i += 2 + pkt[i + 1]
+    return opts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=67)
+    parser.add_argument("--server-id", default="127.0.0.1", help="address clients renew from")
+    parser.add_argument("--subnet", default="192.168.50", help="first three octets of the pool")
+    parser.add_argument("--lease", type=int, default=3600, help="lease time in seconds")
+    parser.add_argument("--nak-reboot", action="store_true")
+    parser.add_argument("--ignore-reboot", action="store_true")
+    args = parser.parse_args()
+
+    server_id = socket.inet_aton(args.server_id)
+    leases = {}  # client id -> address
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind((args.host, args.port))
+    print("DHCP stand-in on {}:{}".format(args.host, args.port))
+
+    while True:
+        pkt, addr = s.recvfrom(1024)
+        if len(pkt) < 240 or pkt[0] != 1 or pkt[236:240] != MAGIC_COOKIE:
+            continue
+        opts = parse_options(pkt)
+        msg_type = opts.get(53, b"\x00")[0]
+        client = bytes(opts.get(61, pkt[28:34]))
+        ciaddr = pkt[12:16]
+        requested = bytes(opts.get(50, ciaddr))
+        if msg_type == DISCOVER:
+            if client not in leases:
+                leases[client] = socket.inet_aton("{}.{}".format(args.subnet, 100 + len(leases)))
+            reply_type, yiaddr = OFFER, leases[client]
+        elif msg_type == REQUEST:
+            if 54 in opts:
+                state = "SELECTING"
+            elif 50 in opts:
+                state = "INIT-REBOOT"
+            else:
+                state = "RENEWING/REBINDING"
+            if state == "INIT-REBOOT" and args.ignore_reboot:
+                print("REQUEST ({}) ignored".format(state))
+                continue
+            if state == "SELECTING" and bytes(opts[54]) != server_id:
+                continue
+            if leases.get(client) == requested and not (
+                state == "INIT-REBOOT" and args.nak_reboot
+            ):
+                reply_type, yiaddr = ACK, requested
+            else:
+                reply_type, yiaddr = NAK, b"\x00\x00\x00\x00"
+            print("REQUEST ({}) for {}".format(state, socket.inet_ntoa(requested)), end=" -> ")
+        else:
+            print(NAMES.get(msg_type, msg_type))
+            continue
+
+        resp = bytearray(240)
+        resp[0] = 2  # BOOTREPLY
+        resp[1:3] = b"\x01\x06"
+        resp[4:8] = pkt[4:8]  # xid
+        resp[10:12] = pkt[10:12]  # flags
+        resp[16:20] = yiaddr
+        resp[20:24] = server_id
+        resp[28:44] = pkt[28:44]  # chaddr
+        resp[236:240] = MAGIC_COOKIE
+        resp += bytes((53, 1, reply_type, 54, 4)) + server_id
+        if reply_type != NAK:
+            resp += bytes((1, 4, 255, 255, 255, 0, 3, 4)) + socket.inet_aton(args.subnet + ".1")
+            resp += bytes((6, 4)) + socket.inet_aton(args.subnet + ".1")
+            resp += bytes((51, 4)) + struct.pack("!I", args.lease)
+        resp += b"\xff"
+        print({OFFER: "OFFER", ACK: "ACK", NAK: "NAK"}[reply_type], socket.inet_ntoa(yiaddr))
+        s.sendto(resp, addr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,583 @@
+"""
+HTTP/1.1 client with persistent connections and streamed response bodies.
+
+Unlike urequests, which opens a new socket for every request and reads the
+whole body into memory, HTTPConnection keeps its connection open between
+requests, so periodic requests to the same server reuse one socket (and one
+of the W5500's eight hardware sockets) without a TCP handshake each time.
+Response bodies, including chunked ones, are read into the caller's buffer
+with Response.readinto(), and all reads go through a single preallocated
+buffer in the connection.
+
+AsyncHTTPConnection is the same client written for asyncio streams.
+
+Run on the W55RP20 through Thonny, or on the unix port against a local test
+server (see http_test_server.py):
+
+    micropython http11.py 127.0.0.1:8080
+"""
+
+import errno
+import socket
+
+# Methods whose requests can be sent twice without changing the result
+_IDEMPOTENT = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE")
+
+# Receive errors meaning the server has reset the connection
+_RESET = (errno.ECONNRESET, errno.ECONNABORTED)
+
+# Errors from a socket operation timing out (some ports give EAGAIN)
+_TIMEOUT = (errno.ETIMEDOUT, errno.EAGAIN)
+
+
+# Parse an HTTP status line, returning (version, status, reason)
+def _parse_status(line):
+    parts = line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+        raise ValueError("bad status line")
+    return parts[0], int(parts[1]), parts[2] if len(parts) > 2 else b""
+
+
+def _parse_header(line, headers):
+    k, _, v = line.partition(b":")
+    headers[k.strip().lower().decode()] = v.strip().decode()
+
+
+def _request_head(method, host, path, headers, body):
+    h = "{} {} HTTP/1.1\r\nHost: {}\r\n".format(method, path, host)
+    if headers:
+        for k in headers:
+            h += "{}: {}\r\n".format(k, headers[k])
+    if body is not None:
+        h += "Content-Length: {}\r\n".format(len(body))
+    return (h + "\r\n").encode()
+
+
+class Response:
+    def __init__(self, conn, method, version, status, reason, headers):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._conn = conn
+        self._chunked = False
+        self._after_chunk = False  # The end of a chunk's data has been read
+        self._trailers = False  # The last chunk has been read
+        # Bytes of the body (or of the current chunk) left to read, or -1 if
+        # the body runs until the server closes the connection
+        self._left = 0
+        self._done = True
+        conn_hdr = headers.get("connection", "").lower()
+        self.will_close = conn_hdr == "close" or (
+            version == b"HTTP/1.0" and conn_hdr != "keep-alive"
+        )
+        if method == "HEAD" or status < 200 or status in (204, 304):
+            pass
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            self._chunked = True
+            self._done = False
+        elif "content-length" in headers:
+            self._left = int(headers["content-length"])
+            self._done = self._left == 0
+        else:
+            self._left = -1
+            self._done = False
+            self.will_close = True
+
+    # Read up to len(buf) bytes of the body into buf, returning the number of
+    # bytes read, which is 0 at the end of the body
+    def readinto(self, buf):
+        return self._conn._body_readinto(self, memoryview(buf))
+
+    def read(self, n=-1):
+        out = b""
+        buf = bytearray(n if 0 < n < 512 else 512)
+        while n < 0 or len(out) < n:
+            m = self.readinto(buf if n < 0 else memoryview(buf)[: n - len(out)])
+            if not m:
+                break
+            out += buf[:m]
+        return out
+
+    # Read and discard the rest of the body, so the connection can be reused
+    def close(self):
+        self._conn._finish(self)
+
+
+# Buffering and parsing shared by the blocking and asyncio connections
+class _ConnBase:
+    def __init__(self, host, port, bufsize):
+        self.host = host
+        self.port = port
+        self.connects = 0  # Number of connections made to the server
+        self.requests = 0  # Number of requests sent
+        self._buf = bytearray(bufsize)
+        self._mv = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+        self._resp = None  # Response whose body is still to be read
+
+    # Return a complete line from the buffer without its line ending, or None
+    def _take_line(self):
+        i = self._buf.find(b"\n", self._start, self._end)
+        if i < 0:
+            if self._start == 0 and self._end == len(self._buf):
+                raise ValueError("line too long")
+            return None
+        line = bytes(self._mv[self._start : i])
+        self._start = i + 1
+        return line.rstrip(b"\r")
+
+    # Copy buffered data into mv, returning the number of bytes copied
+    def _take(self, mv):
+        n = min(len(mv), self._end - self._start)
+        mv[:n] = self._mv[self._start : self._start + n]
+        self._start += n
+        return n
+
+    # Return the free space at the end of the buffer to read into
+    def _space(self):
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif self._end == len(self._buf):
+            n = self._end - self._start
+            self._buf[:n] = bytes(self._mv[self._start : self._end])
+            self._start = 0
+            self._end = n
+        return self._mv[self._end :]
+
+    # Work out how much of the body to read next, returning the maximum
+    # number of bytes or 0 if the body has ended.  For a chunked body this
+    # needs the next chunk-size line, and returns None if it isn't buffered.
+    def _next_body_len(self, resp, n):
+        while resp._chunked and resp._left == 0:
+            line = self._take_line()
+            if line is None:
+                return None
+            if resp._after_chunk:
+                # The line ending after the data of a chunk
+                resp._after_chunk = False
+                continue
+            size = int(line.split(b";")[0], 16)
+            if size == 0:
+                # The last chunk, which may be followed by trailer headers
+                resp._trailers = True
+                return 0
+            resp._left = size
+        return n if resp._left < 0 else min(n, resp._left)
+
+    def _consumed(self, resp, n):
+        if resp._left > 0:
+            resp._left -= n
+            if resp._left == 0:
+                if resp._chunked:
+                    resp._after_chunk = True
+                else:
+                    resp._done = True
+
+
+class HTTPConnection(_ConnBase):
+    def __init__(self, host, port=80, bufsize=512, timeout=10):
+        super().__init__(host, port, bufsize)
+        self.timeout = timeout
+        self._sock = None
+
+    def _connect(self):
+        ai = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)[0]
+        s = socket.socket(ai[0], ai[1], ai[2])
+        s.settimeout(self.timeout)
+        try:
+            s.connect(ai[-1])
+        except:
+            s.close()
+            raise
+        self._sock = s
+        self._start = self._end = 0
+        self.connects += 1
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._resp = None
+
+    # Receive at most len(mv) bytes into mv, returning as soon as any data is
+    # available (a blocking socket's readinto() waits to fill all of mv)
+    def _recv_into(self, mv):
+        s = self._sock
+        if hasattr(s, "recv_into"):
+            return s.recv_into(mv)
+        data = s.recv(len(mv))
+        mv[: len(data)] = data
+        return len(data)
+
+    # Read more data into the buffer, returning the number of bytes read
+    def _fill(self):
+        n = self._recv_into(self._space())
+        self._end += n
+        return n
+
+    def _readline(self):
+        while True:
+            line = self._take_line()
+            if line is not None:
+                return line
+            if not self._fill():
+                raise OSError("connection closed")
+
+    # Read into mv from the buffer, or straight from the socket if the buffer
+    # is empty, so that large bodies aren't copied twice
+    def _readinto(self, mv):
+        if self._start == self._end:
+            return self._recv_into(mv)
+        return self._take(mv)
+
+    def _body_readinto(self, resp, mv):
+        while not resp._done:
+            if resp._trailers:
+                # Skip trailer headers up to the empty line ending the body
+                if not self._readline():
+                    resp._done = True
+                continue
+            n = self._next_body_len(resp, len(mv))
+            if n is None:
+                if not self._fill():
+                    raise OSError("connection closed")
+                continue
+            if n == 0:
+                continue
+            n = self._readinto(mv[:n])
+            if not n:
+                if resp._left >= 0:
+                    raise OSError("connection closed")
+                resp._done = True
+                break
+            self._consumed(resp, n)
+            return n
+        self._finish(resp)
+        return 0
+
+    def _finish(self, resp):
+        if self._resp is not resp:
+            return
+        buf = bytearray(64)
+        while not resp._done:
+            self._body_readinto(resp, buf)
+        self._resp = None
+        if resp.will_close:
+            self.close()
+
+    # Send a request and wait for the response to start, returning None once
+    # it has.  If the server closed the connection while it was idle, sending
+    # fails or the response ends or is reset before its first byte, and then
+    # the error is returned so the request can be sent again.  Any other
+    # error, including a timeout after sending, is raised.
+    def _start_request(self, head, body):
+        if body is not None and len(head) + len(body) <= len(self._buf):
+            # Send small requests with a single write
+            head += body
+            body = None
+        try:
+            self._sock.write(head)
+            if body is not None:
+                self._sock.write(body)
+        except OSError as e:
+            if e.errno in _TIMEOUT:
+                raise
+            return e
+        self.requests += 1
+        try:
+            if not self._fill():
+                return OSError("connection closed")
+        except OSError as e:
+            if e.errno not in _RESET:
+                raise
+            return e
+        return None
+
+    def _read_head(self):
+        line = self._readline()
+        while True:
+            version, status, reason = _parse_status(line)
+            headers = {}
+            while True:
+                line = self._readline()
+                if not line:
+                    break
+                _parse_header(line, headers)
+            if status != 100:
+                return version, status, reason, headers
+            # Skip an interim "100 Continue" response
+            line = self._readline()
+
+    # Send a request and return the Response, whose body must be read or
+    # closed before the next request on this connection.  If the server has
+    # closed an idle connection the request is sent again on a new one, but
+    # only if it is idempotent: by default only for GET, HEAD, PUT, DELETE,
+    # OPTIONS and TRACE, which idempotent=True or False overrides.
+    def request(self, method, path, body=None, headers=None, idempotent=None):
+        if self._resp is not None:
+            self._resp.close()
+        if isinstance(body, str):
+            body = body.encode()
+        head = _request_head(method, self.host, path, headers, body)
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT
+        for retry in (idempotent, False):
+            reused = self._sock is not None
+            if not reused:
+                self._connect()
+            try:
+                err = self._start_request(head, body)
+                if err is None:
+                    r = self._read_head()
+                    break
+            except OSError:
+                self.close()
+                raise
+            self.close()
+            if not (reused and retry):
+                raise err
+        resp = Response(self, method, *r)
+        self._resp = resp
+        if resp._done:
+            self._finish(resp)
+        return resp
+
+    def get(self, path, headers=None):
+        return self.request("GET", path, None, headers)
+
+    def post(self, path, body, headers=None):
+        return self.request("POST", path, body, headers)
+
+
+class AsyncHTTPConnection(_ConnBase):
+    def __init__(self, host, port=80, bufsize=512):
+        super().__init__(host, port, bufsize)
+        self._stream = None
+
+    async def _connect(self):
+        import asyncio
+
+        self._stream, _ = await asyncio.open_connection(self.host, self.port)
+        self._start = self._end = 0
+        self.connects += 1
+
+    async def close(self):
+        if self._stream is not None:
+            stream = self._stream
+            self._stream = None
+            stream.close()
+            await stream.wait_closed()
+        self._resp = None
+
+    async def _fill(self):
+        space = self._space()
+        while True:
+            n = await self._stream.readinto(space)
+            if n is not None:
+                self._end += n
+                return n
+
+    async def _readline(self):
+        while True:
+            line = self._take_line()
+            if line is not None:
+                return line
+            if not await self._fill():
+                raise OSError("connection closed")
+
+    async def _readinto(self, mv):
+        if self._start == self._end:
+            while True:
+                n = await self._stream.readinto(mv)
+                if n is not None:
+                    return n
+        return self._take(mv)
+
+    async def _body_readinto(self, resp, mv):
+        while not resp._done:
+            if resp._trailers:
+                if not await self._readline():
+                    resp._done = True
+                continue
+            n = self._next_body_len(resp, len(mv))
+            if n is None:
+                if not await self._fill():
+                    raise OSError("connection closed")
+                continue
+            if n == 0:
+                continue
+            n = await self._readinto(mv[:n])
+            if not n:
+                if resp._left >= 0:
+                    raise OSError("connection closed")
+                resp._done = True
+                break
+            self._consumed(resp, n)
+            return n
+        await self._finish(resp)
+        return 0
+
+    async def _finish(self, resp):
+        if self._resp is not resp:
+            return
+        buf = bytearray(64)
+        while not resp._done:
+            await self._body_readinto(resp, buf)
+        self._resp = None
+        if resp.will_close:
+            await self.close()
+
+    async def _start_request(self, head, body):
+        stream = self._stream
+        try:
+            stream.write(head)
+            if body is not None:
+                stream.write(body)
+            await stream.drain()
+        except OSError as e:
+            if e.errno in _TIMEOUT:
+                raise
+            return e
+        self.requests += 1
+        try:
+            if not await self._fill():
+                return OSError("connection closed")
+        except OSError as e:
+            if e.errno not in _RESET:
+                raise
+            return e
+        return None
+
+    async def _read_head(self):
+        line = await self._readline()
+        while True:
+            version, status, reason = _parse_status(line)
+            headers = {}
+            while True:
+                line = await self._readline()
+                if not line:
+                    break
+                _parse_header(line, headers)
+            if status != 100:
+                return version, status, reason, headers
+            line = await self._readline()
+
+    async def request(self, method, path, body=None, headers=None, idempotent=None):
+        if self._resp is not None:
+            await self._resp.close()
+        if isinstance(body, str):
+            body = body.encode()
+        head = _request_head(method, self.host, path, headers, body)
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT
+        for retry in (idempotent, False):
+            reused = self._stream is not None
+            if not reused:
+                await self._connect()
+            try:
+                err = await self._start_request(head, body)
+                if err is None:
+                    r = await self._read_head()
+                    break
+            except OSError:
+                await self.close()
+                raise
+            await self.close()
+            if not (reused and retry):
+                raise err
+        resp = AsyncResponse(self, method, *r)
+        self._resp = resp
+        if resp._done:
+            await self._finish(resp)
+        return resp
+
+    async def get(self, path, headers=None):
+        return await self.request("GET", path, None, headers)
+
+    async def post(self, path, body, headers=None):
+        return await self.request("POST", path, body, headers)
+
+
+class AsyncResponse(Response):
+    async def readinto(self, buf):
+        return await self._conn._body_readinto(self, memoryview(buf))
+
+    async def read(self, n=-1):
+        out = b""
+        buf = bytearray(n if 0 < n < 512 else 512)
+        while n < 0 or len(out) < n:
+            m = await self.readinto(buf if n < 0 else memoryview(buf)[: n - len(out)])
+            if not m:
+                break
+            out += buf[:m]
+        return out
+
+    async def close(self):
+        await self._conn._finish(self)
+
+
+# W5x00 chip initialization, see HTTP_Client.py
+def w5x00_init():
+    from machine import Pin, WIZNET_PIO_SPI
+    import network
+    import time
+
+    spi = WIZNET_PIO_SPI(
+        baudrate=31_250_000, mosi=Pin(23), miso=Pin(22), sck=Pin(21)
+    )  # W55RP20 PIO_SPI
+    nic = network.WIZNET5K(spi, Pin(20), Pin(25))  # spi, cs, reset pin
+    nic.active(True)
+    nic.ifconfig("dhcp")
+    while not nic.isconnected():
+        time.sleep(1)
+    print("IP address :", nic.ifconfig())
+    return nic
+
+
+def demo(host, port):
+    conn = HTTPConnection(host, port)
+    buf = bytearray(256)
+    # Periodic telemetry: every POST goes over the same connection
+    for i in range(5):
+        r = conn.post("/post", '{"seq": %d}' % i, {"Content-Type": "application/json"})
+        total = 0
+        while n := r.readinto(buf):
+            total += n
+        print("POST", r.status, total, "bytes")
+    # A chunked response, streamed into buf
+    r = conn.get("/stream/3")
+    total = 0
+    while n := r.readinto(buf):
+        total += n
+    print("GET", r.status, r.headers.get("transfer-encoding"), total, "bytes")
+    print("requests:", conn.requests, "connections:", conn.connects)
+    conn.close()
+
+
+async def demo_async(host, port):
+    conn = AsyncHTTPConnection(host, port)
+    for i in range(3):
+        r = await conn.get("/get")
+        print("async GET", r.status, len(await r.read()), "bytes")
+    print("requests:", conn.requests, "connections:", conn.connects)
+    await conn.close()
+
+
+def main():
+    import sys
+    import asyncio
+
+    if len(sys.argv) > 1:
+        # Server given as host:port on the command line, eg for testing
+        host, _, port = sys.argv[1].partition(":")
+        port = int(port or 80)
+    else:
+        w5x00_init()
+        host, port = "httpbin.org", 80
+    demo(host, port)
+    asyncio.run(demo_async(host, port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Minimal HTTP/1.1 server, as a local stand-in for testing http11.py on Linux.
+
+It implements a few httpbin.org endpoints with persistent connections:
+
+    /get            a small JSON response
+    /post           echoes the request body
+    /stream/<n>     a chunked response of n lines
+    /close          a response without Content-Length, ending the connection
+
+Every response has an X-Connection header numbering the TCP connection it
+was sent on, and each new connection is logged, so reuse can be checked:
+
+    python3 http_test_server.py --port 8080
+    micropython http11.py 127.0.0.1:8080
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+connections = 0
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        global connections
+        super().setup()
+        connections += 1
+        self.connection_id = connections
+        print("connection", self.connection_id, "from", self.client_address)
+
+    def log_message(self, format, *args):
+        print("  [{}]".format(self.connection_id), format % args)
+
+    def send_body(self, body, content_type="application/json"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Connection", str(self.connection_id))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/get":
+            self.send_body(json.dumps({"url": self.path, "headers": dict(self.headers)}).encode())
+        elif self.path.startswith("/stream/"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("X-Connection", str(self.connection_id))
+            self.end_headers()
+            for i in range(int(self.path[8:])):
+                line = json.dumps({"id": i, "url": self.path}).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/close":
+            self.send_response(200)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b"closing\n")
+            self.close_connection = True
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length", 0))
+        data = self.rfile.read(n)
+        self.send_body(json.dumps({"data": data.decode(), "len": n}).encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -18,22 +18,36 @@ import select
 import struct
 import sys
 import time
-from usocket import (
-    socket,
-    AF_INET,
-    SOL_SOCKET,
-    SOCK_STREAM,
-    SOCK_DGRAM,
-    getaddrinfo,
-    SO_REUSEADDR,
-    # SO_KEEPALIVESEND,
-)
-from machine import Pin, WIZNET_PIO_SPI
-import network
+
+try:
+    from usocket import (
+        socket,
+        AF_INET,
+        SOL_SOCKET,
+        SOCK_STREAM,
+        SOCK_DGRAM,
+        getaddrinfo,
+        SO_REUSEADDR,
+        # SO_KEEPALIVESEND,
+    )
+except ImportError:
+    # CPython, for testing the server on Linux
+    from socket import (
+        socket,
+        AF_INET,
+        SOL_SOCKET,
+        SOCK_STREAM,
+        SOCK_DGRAM,
+        getaddrinfo,
+        SO_REUSEADDR,
+    )
 
 
 # W5x00 chip initialization
 def w5x00_init(ip_info=None):
+    from machine import Pin, WIZNET_PIO_SPI
+    import network
+
     # ip_info = ('192.168.11.20','255.255.255.0','192.168.11.1','8.8.8.8')
     spi = WIZNET_PIO_SPI(
         baudrate=31_250_000, mosi=Pin(23), miso=Pin(22), sck=Pin(21)
@@ -116,10 +130,10 @@ def fmt_size(val, div):
 
 
 class Stats:
-    def __init__(self, param):
+    def __init__(self, param, receiver):
         self.pacing_timer_us = param["pacing_timer"] * 1000
         self.udp = param.get("udp", False)
-        self.reverse = param.get("reverse", False)
+        self.receiver = receiver  # Receiving the data, rather than sending it
         self.running = False
 
     def start(self):
@@ -128,8 +142,13 @@ class Stats:
         self.nb0 = self.nb1 = 0  # num bytes
         self.np0 = self.np1 = 0  # num packets
         self.nm0 = self.nm1 = 0  # num lost packets
+        self.no0 = 0  # num packets out of order
+        self.jitter = 0  # us
+        self.udp_seq = 0  # highest UDP packet sequence number seen
+        self.udp_t = None  # local ticks and sender time of the last packet
+        self.udp_sec = self.udp_usec = 0
         if self.udp:
-            if self.reverse:
+            if self.receiver:
                 extra = "         Jitter    Lost/Total Datagrams"
             else:
                 extra = "         Total Datagrams"
@@ -153,12 +172,39 @@ class Stats:
         self.np1 += 1
 
     def add_lost_packets(self, n):
-        print(f"npackets={n}")
+        if DEBUG:
+            print(f"npackets={n}")
         self.np0 += n
         self.np1 += n
         self.nm0 += n
         self.nm1 += n
 
+    def add_udp_packet(self, n, seq, sec, usec):
+        # Account for a received datagram of n bytes from its iperf3 header,
+        # as iperf3 does: a jump in the sequence number counts the packets
+        # skipped as lost, and a packet arriving after a later one counts as
+        # out of order and no longer lost.  The jitter is smoothed as in RFC
+        # 1889 from the change in transit time between packets, worked out
+        # from differences so the two clocks needn't agree.
+        if not self.running:
+            return
+        t = ticks_us()
+        if seq > self.udp_seq:
+            if seq > self.udp_seq + 1:
+                self.add_lost_packets(seq - self.udp_seq - 1)
+            self.udp_seq = seq
+        else:
+            self.no0 += 1
+            if self.nm0 > 0:
+                self.add_lost_packets(-1)
+        if self.udp_t is not None:
+            d = ticks_diff(t, self.udp_t) - ((sec - self.udp_sec) * 1000000 + usec - self.udp_usec)
+            self.jitter += (abs(d) - self.jitter) / 16
+        self.udp_t = t
+        self.udp_sec = sec
+        self.udp_usec = usec
+        self.add_bytes(n)
+
     def print_line(self, ta, tb, nb, np, nm, extra=""):
         dt = tb - ta
         print(
@@ -167,10 +213,10 @@ class Stats:
             end="",
         )
         if self.udp:
-            if self.reverse:
+            if self.receiver:
                 print(
-                    " %6.3f ms  %u/%u (%.1f%%)"
-                    % (0, nm, np, 100 * nm / (max(1, np + nm))),
+                    " %6.3f ms  %d/%u (%.2g%%)"
+                    % (self.jitter / 1000, nm, np, 100 * nm / max(1, np)),
                     end="",
                 )
             else:
@@ -197,7 +243,10 @@ class Stats:
         self.t3 = ticks_us()
         dt = ticks_diff(self.t3, self.t0)
         print("- " * 30)
-        self.print_line(0, dt * 1e-6, self.nb0, self.np0, self.nm0, "  sender")
+        extra = "  receiver" if self.receiver else "  sender"
+        self.print_line(0, dt * 1e-6, self.nb0, self.np0, self.nm0, extra)
+        if self.no0:
+            print("%u datagrams received out-of-order" % self.no0)
 
     def report_receiver(self, stats):
         st = stats["streams"][0]
@@ -241,6 +290,21 @@ def recvninto(s, buf):
             off += s.recv_into(mv[off:])
 
 
+def udp_connect_reply(msg):
+    # The client sends UDP_CONNECT_MSG, "9876" or "6789" depending on its
+    # byte order, and checks for UDP_CONNECT_REPLY in the same order, which
+    # is the same bytes reversed.  Older clients send 123456789 and expect
+    # 987654321.
+    if msg == b"9876":
+        return b"6789"
+    if msg == b"6789":
+        return b"9876"
+    for order in ("<I", ">I"):
+        if msg == struct.pack(order, 123456789):
+            return struct.pack(order, 987654321)
+    return b"\x12\x34\x56\x78"
+
+
 def make_cookie():
     cookie_chars = b"abcdefghijklmnopqrstuvwxyz234567"
     cookie = bytearray(COOKIE_SIZE)
@@ -276,6 +340,13 @@ def server_once():
     if DEBUG:
         print(param)
     reverse = param.get("reverse", False)
+    udp = param.get("udp", False)
+
+    if udp:
+        # Bind the UDP socket first, so it's ready for the client's first
+        # datagram as soon as the client is told to create streams
+        s_data = socket(ai[0], SOCK_DGRAM)
+        s_data.bind(ai[-1])
 
     # Ask to create streams
     s_ctrl.sendall(bytes([CREATE_STREAMS]))
@@ -285,13 +356,11 @@ def server_once():
         s_data, addr = s_listen.accept()
         print("Accepted connection:", addr)
         recvn(s_data, COOKIE_SIZE)
-    elif param.get("udp", False):
-        # Close TCP connection and open UDP "connection"
+    elif udp:
+        # Close TCP connection and wait for the UDP "connection"
         s_listen.close()
-        s_data = socket(ai[0], SOCK_DGRAM)
-        s_data.bind(ai[-1])
         data, addr = s_data.recvfrom(4)
-        s_data.sendto(b"\x12\x34\x56\x78", addr)
+        s_data.sendto(udp_connect_reply(data), addr)
     else:
         assert False
 
@@ -304,19 +373,41 @@ def server_once():
     # Read data, and wait for client to send TEST_END
     poll = select.poll()
     poll.register(s_ctrl, select.POLLIN)
-    if reverse:
+    if udp:
+        # UDP is always writable, so sending is paced by the poll timeout
+        if not reverse:
+            poll.register(s_data, select.POLLIN)
+    elif reverse:
         poll.register(s_data, select.POLLOUT)
     else:
         poll.register(s_data, select.POLLIN)
-    stats = Stats(param)
+    stats = Stats(param, not reverse)
     stats.start()
     running = True
-    # data_buf = bytearray(urandom(param["len"]))
-    data_buf = bytearray(
-        urandom(min(1024, param["len"]))
-    )  # Reduce buffer size to save memory
+    if udp:
+        # One datagram of the requested length, sent and received in place,
+        # starting with the iperf3 UDP header: the time it was sent (seconds
+        # and microseconds) and its sequence number, counting from 1
+        data_buf = bytearray(urandom(param["len"]))
+        udp_hdr = ">IIQ" if param.get("udp_counters_64bit", 0) else ">III"
+        udp_hdr_len = struct.calcsize(udp_hdr)
+        udp_seq = 0
+        # The sender wakes every pacing_timer microseconds, and sends the
+        # packets due by then at the requested bitrate (0 means no limit)
+        pacing_ms = max(1, param.get("pacing_timer", 1000) // 1000)
+        bandwidth = param.get("bandwidth", 0)
+        udp_interval_us = param["len"] * 8_000_000 // bandwidth if bandwidth else 0
+        udp_next = ticks_us()
+    else:
+        # data_buf = bytearray(urandom(param["len"]))
+        data_buf = bytearray(
+            urandom(min(1024, param["len"]))
+        )  # Reduce buffer size to save memory
     while running:
-        for pollable in poll.poll(stats.max_dt_ms()):
+        timeout = stats.max_dt_ms()
+        if udp and reverse:
+            timeout = min(timeout, pacing_ms)
+        for pollable in poll.poll(timeout):
             if pollable_is_sock(pollable, s_ctrl):
                 cmd = recvn(s_ctrl, 1)[0]
                 print(f"received:{cmd}")
@@ -325,6 +416,12 @@ def server_once():
                 if cmd == TEST_END:
                     running = False
             elif pollable_is_sock(pollable, s_data):
+                if udp:
+                    n = recvinto(s_data, data_buf)
+                    if n >= udp_hdr_len:
+                        sec, usec, seq = struct.unpack_from(udp_hdr, data_buf)
+                        stats.add_udp_packet(n, seq, sec, usec)
+                    continue
                 time.sleep(0.01)  # Add a small delay to prevent overloading
                 if reverse:
                     n = s_data.send(data_buf)
@@ -333,10 +430,21 @@ def server_once():
                 else:
                     recvninto(s_data, data_buf)
                     stats.add_bytes(len(data_buf))
+        if udp and reverse and running:
+            # Catch up in bursts of up to 16 packets if behind
+            for _ in range(16):
+                t = ticks_us()
+                if udp_interval_us and ticks_diff(t, udp_next) < 0:
+                    break
+                udp_seq += 1
+                struct.pack_into(udp_hdr, data_buf, 0, t // 1000000, t % 1000000, udp_seq)
+                s_data.sendto(data_buf, addr)
+                stats.add_bytes(len(data_buf))
+                udp_next = ticks_add(udp_next, udp_interval_us)
         stats.update()
 
     # Need to continue writing so other side doesn't get blocked waiting for data
-    if reverse:
+    if reverse and not udp:
         while True:
             for pollable in poll.poll(0):
                 if pollable_is_sock(pollable, s_data):
@@ -369,8 +477,8 @@ def server_once():
                 "id": 1,
                 "bytes": stats.nb0,
                 "retransmits": 0,
-                "jitter": 0,
-                "errors": 0,
+                "jitter": stats.jitter * 1e-6,
+                "errors": stats.nm0,
                 "packets": stats.np0,
                 "start_time": 0,
                 "end_time": ticks_diff(stats.t3, stats.t0) * 1e-6,
@@ -445,6 +553,9 @@ if sys.platform == "linux":
     def ticks_diff(a, b):
         return a - b
 
+    def ticks_add(a, b):
+        return a + b
+
     if __name__ == "__main__":
         main()
 else:
@@ -452,7 +563,7 @@ else:
     def pollable_is_sock(pollable, sock):
         return pollable[0] == sock
 
-    from time import ticks_us, ticks_diff
+    from time import ticks_us, ticks_diff, ticks_add
 
     nic = w5x00_init()
     server()
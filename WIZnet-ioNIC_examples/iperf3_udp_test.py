@@ -0,0 +1,238 @@
+"""
+iperf3 UDP client for testing the UDP mode of iperf3.py, run with CPython.
+
+It speaks the iperf3 protocol like "iperf3 -c HOST -u", and can also damage
+the stream it sends in known ways, so that the loss and out-of-order counts
+the server reports can be checked against what was done:
+
+    micropython iperf3.py -s
+    python3 iperf3_udp_test.py 127.0.0.1 -b 2M -t 3 --drop 50 --reorder 70
+    python3 iperf3_udp_test.py 127.0.0.1 -b 2M -t 3 -R
+
+--drop N skips sending every Nth packet and --reorder N sends every Nth
+packet after the one following it.  With -R the server sends, and this
+client reports the loss, out-of-order packets and jitter it sees.
+"""
+
+import argparse
+import json
+import random
+import select
+import socket
+import struct
+import time
+
+COOKIE_SIZE = 37
+TEST_START = 1
+TEST_RUNNING = 2
+TEST_END = 4
+PARAM_EXCHANGE = 9
+CREATE_STREAMS = 10
+EXCHANGE_RESULTS = 13
+DISPLAY_RESULTS = 14
+IPERF_DONE = 16
+UDP_CONNECT_MSG = 0x36373839
+UDP_CONNECT_REPLY = 0x39383736
+
+
+def recvn(s, n):
+    data = b""
+    while len(data) < n:
+        chunk = s.recv(n - len(data))
+        if not chunk:
+            raise EOFError("connection closed")
+        data += chunk
+    return data
+
+
+def send_json(s, obj):
+    data = json.dumps(obj).encode()
+    s.sendall(struct.pack(">I", len(data)) + data)
+
+
+def recv_json(s):
+    return json.loads(recvn(s, struct.unpack(">I", recvn(s, 4))[0]))
+
+
+class Receiver:
+    # Loss, out-of-order and jitter accounting as done by iperf3
+    def __init__(self, hdr):
+        self.hdr = hdr
+        self.bytes = 0
+        self.seq = 0
+        self.lost = 0
+        self.out_of_order = 0
+        self.jitter = 0.0
+        self.prev_transit = None
+
+    def add(self, data):
+        sec, usec, seq = struct.unpack_from(self.hdr, data)
+        self.bytes += len(data)
+        if seq > self.seq:
+            self.lost += seq - self.seq - 1
+            self.seq = seq
+        else:
+            self.out_of_order += 1
+            if self.lost > 0:
+                self.lost -= 1
+        transit = time.time() - (sec + usec * 1e-6)
+        if self.prev_transit is not None:
+            self.jitter += (abs(transit - self.prev_transit) - self.jitter) / 16
+        self.prev_transit = transit
+
+
+def send_stream(s_data, s_ctrl, args, hdr):
+    # Send paced packets for the test duration, damaged as asked
+    buf = bytearray(random.randbytes(args.len))
+    interval = args.len * 8 / args.bandwidth if args.bandwidth else 0
+    t_end = time.monotonic() + args.time
+    t_next = time.monotonic()
+    seq = 0
+    held = None
+    sent = dropped = reordered = 0
+    while time.monotonic() < t_end:
+        delay = t_next - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        t_next += interval
+        seq += 1
+        t = time.time()
+        struct.pack_into(hdr, buf, 0, int(t), int(t % 1 * 1e6), seq)
+        if args.drop and seq % args.drop == 0:
+            dropped += 1
+            continue
+        if args.reorder and seq % args.reorder == 0 and held is None:
+            held = bytes(buf)
+            reordered += 1
+            continue
+        s_data.send(buf)
+        sent += 1
+        if held is not None:
+            s_data.send(held)
+            sent += 1
+            held = None
+    if held is not None:
+        s_data.send(held)
+        sent += 1
+    print(
+        "sent {} packets, {} bytes; dropped {}, reordered {}".format(
+            sent, sent * args.len, dropped, reordered
+        )
+    )
+    return {"bytes": sent * args.len, "packets": seq, "errors": 0, "jitter": 0}
+
+
+def receive_stream(s_data, args, hdr):
+    rx = Receiver(hdr)
+    t_end = time.monotonic() + args.time
+    s_data.settimeout(0.1)
+    while time.monotonic() < t_end:
+        try:
+            data = s_data.recv(65536)
+        except socket.timeout:
+            continue
+        if len(data) >= struct.calcsize(hdr):
+            rx.add(data)
+    print(
+        "received {} bytes, {:.3f} ms jitter, {}/{} lost, {} out-of-order".format(
+            rx.bytes, rx.jitter * 1000, rx.lost, rx.seq, rx.out_of_order
+        )
+    )
+    return {"bytes": rx.bytes, "packets": rx.seq, "errors": rx.lost, "jitter": rx.jitter}
+
+
+def run(args):
+    hdr = ">IIQ" if args.counters_64bit else ">III"
+    s_ctrl = socket.create_connection((args.host, args.port))
+    cookie = bytes(random.choice(b"abcdefghijklmnopqrstuvwxyz234567") for _ in range(36))
+    s_ctrl.sendall(cookie + b"\0")
+    param = {
+        "udp": True,
+        "omit": 0,
+        "time": args.time,
+        "parallel": 1,
+        "len": args.len,
+        "bandwidth": args.bandwidth,
+        "pacing_timer": 1000,
+        "client_version": "3.6",
+    }
+    if args.reverse:
+        param["reverse"] = True
+    if args.counters_64bit:
+        param["udp_counters_64bit"] = 1
+    s_data = None
+    result = None
+    t0 = time.monotonic()
+    while True:
+        cmd = recvn(s_ctrl, 1)[0]
+        if cmd == PARAM_EXCHANGE:
+            send_json(s_ctrl, param)
+        elif cmd == CREATE_STREAMS:
+            s_data = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s_data.connect((args.host, args.port))
+            s_data.send(struct.pack("=I", UDP_CONNECT_MSG))
+            reply = s_data.recv(4)
+            if reply != struct.pack("=I", UDP_CONNECT_REPLY):
+                print("unexpected connect reply", reply)
+        elif cmd == TEST_START:
+            t0 = time.monotonic()
+        elif cmd == TEST_RUNNING:
+            if args.reverse:
+                result = receive_stream(s_data, args, hdr)
+            else:
+                result = send_stream(s_data, s_ctrl, args, hdr)
+            s_ctrl.sendall(bytes([TEST_END]))
+        elif cmd == EXCHANGE_RESULTS:
+            result.update(id=1, retransmits=0, start_time=0, end_time=time.monotonic() - t0)
+            send_json(
+                s_ctrl,
+                {
+                    "cpu_util_total": 0,
+                    "cpu_util_user": 0,
+                    "cpu_util_system": 0,
+                    "sender_has_retransmits": 0,
+                    "streams": [result],
+                },
+            )
+            st = recv_json(s_ctrl)["streams"][0]
+            print(
+                "server: {} bytes, {:.3f} ms jitter, {}/{} lost".format(
+                    st["bytes"], st["jitter"] * 1000, st["errors"], st["packets"]
+                )
+            )
+        elif cmd == DISPLAY_RESULTS:
+            s_ctrl.sendall(bytes([IPERF_DONE]))
+            break
+        else:
+            print("unexpected command", cmd)
+    s_data.close()
+    s_ctrl.close()
+
+
+def bitrate(s):
+    mult = {"K": 1000, "M": 1000000, "G": 1000000000}
+    if s[-1:].upper() in mult:
+        return int(float(s[:-1]) * mult[s[-1:].upper()])
+    return int(s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("host")
+    parser.add_argument("-p", "--port", type=int, default=5201)
+    parser.add_argument("-R", "--reverse", action="store_true", help="server sends")
+    parser.add_argument(
+        "-b", "--bandwidth", type=bitrate, default=1000000, help="bits/sec, 0 for no limit"
+    )
+    parser.add_argument("-l", "--len", type=int, default=1448, help="datagram length")
+    parser.add_argument("-t", "--time", type=float, default=5, help="seconds to run for")
+    parser.add_argument("--drop", type=int, default=0, metavar="N", help="skip every Nth packet")
+    parser.add_argument(
+        "--reorder", type=int, default=0, metavar="N", help="delay every Nth packet"
+    )
+    parser.add_argument("--counters-64bit", action="store_true")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
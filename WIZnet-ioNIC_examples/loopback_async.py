@@ -0,0 +1,205 @@
+"""
+Concurrent echo, discard and chargen TCP server for loopback testing.
+
+Loopback_dhcp.py serves a single connection, and decodes and prints every
+payload it echoes, so it can't be used to measure anything.  This server
+handles several clients at once with asyncio, up to max_clients in total
+(by default 8, the number of hardware sockets on the W5500).  Each client is
+given one of a pool of buffers allocated up front, and data is received with
+readinto() so that serving a connection doesn't allocate a new buffer for
+every read.  Clients over the limit are closed straight away.
+
+The three services follow RFC 862, 863 and 864, on their standard ports plus
+an optional base offset:
+
+    echo     base + 7    sends back everything received
+    discard  base + 9    reads and throws away everything received
+    chargen  base + 19   sends the rotating 72-character pattern until closed
+
+Run on the W55RP20 through Thonny, or on the unix port with a port base, and
+drive it from a host with loopback_load.py:
+
+    micropython loopback_async.py 127.0.0.1 5000
+    python3 loopback_load.py 127.0.0.1:5007 --clients 8
+"""
+
+import asyncio
+import time
+
+ECHO_PORT = 7
+DISCARD_PORT = 9
+CHARGEN_PORT = 19
+
+
+# The 95 lines of the RFC 864 pattern, each 72 printable characters rotated
+# by one from the last and followed by CRLF
+def _chargen_pattern():
+    buf = bytearray(95 * 74)
+    i = 0
+    for line in range(95):
+        for c in range(72):
+            buf[i] = 32 + (line + c) % 95
+            i += 1
+        buf[i] = 13
+        buf[i + 1] = 10
+        i += 2
+    return buf
+
+
+class LoopbackServer:
+    def __init__(self, max_clients=8, bufsize=2048, verbose=True):
+        self.max_clients = max_clients
+        self.verbose = verbose
+        self._bufs = [bytearray(bufsize) for _ in range(max_clients)]
+        self._pattern = None
+        self._servers = []
+        self.active = 0
+        self.accepted = 0
+        self.refused = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def start(self, host="0.0.0.0", base=0, echo=True, discard=True, chargen=True):
+        for enabled, port, name, handler in (
+            (echo, ECHO_PORT, "echo", self._echo),
+            (discard, DISCARD_PORT, "discard", self._discard),
+            (chargen, CHARGEN_PORT, "chargen", self._chargen),
+        ):
+            if enabled:
+                srv = await asyncio.start_server(self._client(name, handler), host, base + port)
+                self._servers.append(srv)
+        if chargen:
+            self._pattern = memoryview(_chargen_pattern())
+
+    def close(self):
+        for srv in self._servers:
+            srv.close()
+        self._servers = []
+
+    # Wrap a service handler with the client limit, buffer pool and stats
+    def _client(self, name, handler):
+        async def serve(reader, writer):
+            if not self._bufs:
+                self.refused += 1
+                await writer.wait_closed()
+                return
+            buf = self._bufs.pop()
+            self.active += 1
+            self.accepted += 1
+            conn = self.accepted
+            t0 = time.ticks_ms()
+            counts = [0, 0]  # Bytes in and out, kept if the connection is reset
+            try:
+                await handler(reader, writer, memoryview(buf), counts)
+            except OSError:
+                # Connection reset by the client
+                pass
+            finally:
+                self._bufs.append(buf)
+                self.active -= 1
+                await writer.wait_closed()
+            if self.verbose:
+                dt = max(1, time.ticks_diff(time.ticks_ms(), t0))
+                n_in, n_out = counts
+                print(
+                    "{} #{}: in {} out {} bytes, {} ms, {} kbit/s".format(
+                        name,
+                        conn,
+                        n_in,
+                        n_out,
+                        dt,
+                        (n_in + n_out) * 8 // dt,
+                    )
+                )
+
+        return serve
+
+    async def _echo(self, reader, writer, mv, counts):
+        while True:
+            n = await reader.readinto(mv)
+            if not n:
+                return
+            # Stream.write copies whatever can't be sent at once, so the
+            # buffer can be reused as soon as drain returns
+            writer.write(mv[:n])
+            await writer.drain()
+            counts[0] += n
+            counts[1] += n
+            self.bytes_in += n
+            self.bytes_out += n
+
+    async def _discard(self, reader, writer, mv, counts):
+        while True:
+            n = await reader.readinto(mv)
+            if not n:
+                return
+            counts[0] += n
+            self.bytes_in += n
+
+    async def _chargen(self, reader, writer, mv, counts):
+        # The pattern is shared by all clients, and sent in pieces of at most
+        # one buffer length, so only the client's own buffer limits the size
+        # of each write.  The connection ends when the client closes it and a
+        # write fails.
+        pattern = self._pattern
+        size = len(mv)
+        off = 0
+        while True:
+            n = min(size, len(pattern) - off)
+            writer.write(pattern[off : off + n])
+            await writer.drain()
+            counts[1] += n
+            self.bytes_out += n
+            off = (off + n) % len(pattern)
+
+
+# W5x00 chip initialization, see Loopback_dhcp.py
+def w5x00_init():
+    from machine import Pin, WIZNET_PIO_SPI
+    import network
+
+    spi = WIZNET_PIO_SPI(
+        baudrate=31_250_000, mosi=Pin(23), miso=Pin(22), sck=Pin(21)
+    )  # W55RP20 PIO_SPI
+    nic = network.WIZNET5K(spi, Pin(20), Pin(25))  # spi, cs, reset pin
+    nic.active(True)
+    nic.ifconfig("dhcp")
+    while not nic.isconnected():
+        print("Waiting for the network to connect...")
+        time.sleep(1)
+    print("IP Address:", nic.ifconfig())
+    return nic
+
+
+async def app(host, base):
+    server = LoopbackServer()
+    await server.start(host, base)
+    print(
+        "echo on {}, discard on {}, chargen on {}".format(
+            base + ECHO_PORT, base + DISCARD_PORT, base + CHARGEN_PORT
+        )
+    )
+    while True:
+        await asyncio.sleep(10)
+        print(
+            "clients: {} active, {} served, {} refused; {} bytes in, {} bytes out".format(
+                server.active, server.accepted, server.refused, server.bytes_in, server.bytes_out
+            )
+        )
+
+
+def main():
+    import sys
+
+    if len(sys.argv) > 1:
+        # Address and port base given on the command line, eg for testing
+        host = sys.argv[1]
+        base = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    else:
+        host = w5x00_init().ifconfig()[0]
+        base = 0
+    asyncio.run(app(host, base))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Load generator for loopback_async.py, run with CPython on the host.
+
+Opens several connections to the server at once and drives them for a fixed
+time, then reports the throughput of every connection and, for echo, the
+round-trip latency percentiles of the individual messages:
+
+    python3 loopback_load.py 192.168.11.20:7 --clients 8 --size 1024
+    python3 loopback_load.py 192.168.11.20:9 --mode discard --duration 10
+    python3 loopback_load.py 192.168.11.20:19 --mode chargen
+
+In echo mode each client sends one message, waits for all of it to come back
+and checks it before sending the next, so the latency includes the time the
+server takes to receive, copy and send the message.
+"""
+
+import argparse
+import asyncio
+import time
+
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0
+    k = max(0, min(len(sorted_values) - 1, -(-p * len(sorted_values) // 100) - 1))
+    return sorted_values[k]
+
+
+class Result:
+    def __init__(self, index):
+        self.index = index
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latencies_us = []
+        self.elapsed = 0
+        self.error = None
+
+
+async def echo_client(reader, writer, result, size, deadline):
+    msg = bytes((result.index + i) & 0xFF for i in range(size))
+    while time.monotonic() < deadline:
+        t0 = time.perf_counter_ns()
+        writer.write(msg)
+        await writer.drain()
+        try:
+            data = await reader.readexactly(size)
+        except asyncio.IncompleteReadError:
+            # Also what a client over the server's limit sees
+            raise EOFError("closed by server")
+        result.latencies_us.append((time.perf_counter_ns() - t0) // 1000)
+        if data != msg:
+            raise ValueError("echoed data differs")
+        result.bytes_out += size
+        result.bytes_in += size
+
+
+async def discard_client(reader, writer, result, size, deadline):
+    msg = bytes(size)
+    while time.monotonic() < deadline:
+        writer.write(msg)
+        await writer.drain()
+        result.bytes_out += size
+
+
+async def chargen_client(reader, writer, result, size, deadline):
+    while time.monotonic() < deadline:
+        data = await reader.read(size)
+        if not data:
+            raise EOFError("closed by server")
+        result.bytes_in += len(data)
+
+
+MODES = {"echo": echo_client, "discard": discard_client, "chargen": chargen_client}
+
+
+async def run_client(index, args):
+    result = Result(index)
+    try:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    except OSError as e:
+        result.error = e
+        return result
+    t0 = time.monotonic()
+    try:
+        await MODES[args.mode](reader, writer, result, args.size, t0 + args.duration)
+    except (OSError, EOFError, ValueError) as e:
+        result.error = e
+    result.elapsed = time.monotonic() - t0
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return result
+
+
+def report(results):
+    print(" conn       bytes   kbit/s   msgs    p50    p90    p99    max (us)")
+    all_lat = []
+    total_bytes = 0
+    elapsed = 0
+    for r in results:
+        lat = sorted(r.latencies_us)
+        all_lat += lat
+        n = r.bytes_in + r.bytes_out
+        total_bytes += n
+        elapsed = max(elapsed, r.elapsed)
+        line = "{:5} {:11} {:8.0f} {:6}".format(
+            r.index, n, n * 8 / 1000 / r.elapsed if r.elapsed else 0, len(lat)
+        )
+        if lat:
+            line += " {:6} {:6} {:6} {:6}".format(
+                percentile(lat, 50), percentile(lat, 90), percentile(lat, 99), lat[-1]
+            )
+        if r.error:
+            line += "  ({})".format(str(r.error) or type(r.error).__name__)
+        print(line)
+    all_lat.sort()
+    print(
+        "total {:11} {:8.0f} {:6}".format(
+            total_bytes, total_bytes * 8 / 1000 / elapsed if elapsed else 0, len(all_lat)
+        ),
+        end="",
+    )
+    if all_lat:
+        print(
+            " {:6} {:6} {:6} {:6}".format(
+                percentile(all_lat, 50),
+                percentile(all_lat, 90),
+                percentile(all_lat, 99),
+                all_lat[-1],
+            ),
+            end="",
+        )
+    print()
+
+
+async def run(args):
+    results = await asyncio.gather(*(run_client(i, args) for i in range(args.clients)))
+    report(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("server", help="host:port of the server")
+    parser.add_argument("--mode", choices=MODES, default="echo")
+    parser.add_argument("--clients", type=int, default=8, help="number of connections")
+    parser.add_argument("--size", type=int, default=1024, help="bytes per message or read")
+    parser.add_argument("--duration", type=float, default=5, help="seconds to run for")
+    args = parser.parse_args()
+    args.host, _, port = args.server.rpartition(":")
+    args.port = int(port)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Asynchronous SNTP client which queries several servers in parallel.
+
+Each round sends a request to every server at once, computes the clock offset
+and round-trip delay of each reply from all four NTP timestamps, and keeps the
+sample with the smallest delay.  The clock drift is estimated from successive
+offsets, and the client re-syncs periodically in the background, backing off
+exponentially while the clock stays in sync and while servers don't answer.
+
+The local clock isn't changed: SNTPClient.time() returns the corrected time,
+and an on_sync callback can be given to set the RTC.
+
+Run on the W55RP20 through Thonny, or on the unix port against a local NTP
+stand-in (see sntp_test_server.py):
+
+    micropython sntp_async.py 127.0.0.1:12300 127.0.0.1:12301
+"""
+
+import asyncio
+import socket
+import struct
+import time
+
+NTP_PORT = 123
+# Seconds from the NTP epoch (1900) to the epoch used by the time module
+NTP_DELTA = 2208988800 if time.gmtime(0)[0] == 1970 else 3155673600
+
+
+# The local clock, in microseconds since the epoch used by the time module
+def _local_us():
+    return time.time_ns() // 1000
+
+
+# Encode a local time in microseconds as a 64-bit NTP timestamp
+def _to_ntp(buf, off, us):
+    s, us = divmod(us, 1_000_000)
+    struct.pack_into("!II", buf, off, (s + NTP_DELTA) & 0xFFFFFFFF, (us << 32) // 1_000_000)
+
+
+# Decode a 64-bit NTP timestamp to a local time in microseconds
+def _from_ntp(buf, off):
+    s, f = struct.unpack_from("!II", buf, off)
+    if s < 0x80000000:
+        # NTP era 1 starts in 2036
+        s += 0x100000000
+    return (s - NTP_DELTA) * 1_000_000 + ((f * 1_000_000) >> 32)
+
+
+class SNTPClient:
+    def __init__(self, servers, timeout_ms=2000, min_poll=64, max_poll=1024, on_sync=None):
+        # Servers are given as hostnames or (host, port) tuples
+        self.servers = [s if isinstance(s, tuple) else (s, NTP_PORT) for s in servers]
+        self.timeout_ms = timeout_ms
+        self.min_poll = min_poll  # Seconds between syncs, doubled up to max_poll
+        self.max_poll = max_poll
+        self.poll = min_poll
+        self.on_sync = on_sync
+        self.offset_us = None  # Local clock + offset_us = NTP time, at sync_local_us
+        self.delay_us = None  # Round-trip delay of the sample used
+        self.drift_ppb = 0  # Rate of the local clock relative to NTP
+        self.sync_local_us = None
+        self.syncs = 0
+        self._addrs = None
+        self._last_t1 = 0
+        self._req = bytearray(48)
+        self._req[0] = 0b00100011  # LI=0 (no warning), VN=4, Mode=3 (client)
+        self._resp = bytearray(48)
+
+    # Return the current NTP time in microseconds (using the time module's
+    # epoch), corrected for the offset and drift of the local clock.
+    def time_us(self):
+        if self.offset_us is None:
+            raise OSError("not synchronised")
+        local = _local_us()
+        elapsed = local - self.sync_local_us
+        return local + self.offset_us + elapsed * self.drift_ppb // 1_000_000_000
+
+    def time(self):
+        return self.time_us() // 1_000_000
+
+    def _resolve(self):
+        if self._addrs is None:
+            addrs = []
+            for host, port in self.servers:
+                try:
+                    addrs.append(socket.getaddrinfo(host, port)[0][-1])  # TODO this is blocking!
+                except OSError:
+                    pass
+            self._addrs = addrs
+        return self._addrs
+
+    # Check a reply and return (offset, delay, t4) in microseconds, or None if
+    # it isn't a valid answer to one of the pending requests.
+    def _sample(self, n, pending, t4):
+        buf = self._resp
+        if n < 48:
+            return None
+        mode = buf[0] & 7
+        stratum = buf[1]
+        if mode != 4 or buf[0] >> 6 == 3 or not 0 < stratum < 16:
+            # Not a server reply, server not synchronised, or kiss-o'-death
+            return None
+        # The originate timestamp must echo the transmit timestamp of a request
+        # still waiting for a reply, otherwise the reply is stale or spoofed.
+        t1 = pending.pop(bytes(buf[24:32]), None)
+        if t1 is None:
+            return None
+        t2 = _from_ntp(buf, 32)  # Server receive time
+        t3 = _from_ntp(buf, 40)  # Server transmit time
+        offset = ((t2 - t1) + (t3 - t4)) // 2
+        delay = max(0, (t4 - t1) - (t3 - t2))
+        return offset, delay, t4
+
+    def _update(self, offset, delay, local):
+        if self.offset_us is not None:
+            elapsed = local - self.sync_local_us
+            if elapsed > 0:
+                drift = (offset - self.offset_us) * 1_000_000_000 // elapsed
+                if self.syncs == 1:
+                    self.drift_ppb = drift
+                else:
+                    # Smooth out the jitter of the individual measurements
+                    self.drift_ppb = (3 * self.drift_ppb + drift) // 4
+        self.offset_us = offset
+        self.delay_us = delay
+        self.sync_local_us = local
+        self.syncs += 1
+
+    # Query all servers once and update the clock estimate from the best reply.
+    # Returns True if a valid reply was received.
+    async def sync(self):
+        addrs = self._resolve()
+        ep = await asyncio.open_datagram_endpoint()
+        best = None
+        try:
+            pending = {}
+            req = self._req
+            for addr in addrs:
+                # Each request gets a distinct transmit timestamp, which
+                # identifies the reply to it
+                t1 = max(_local_us(), self._last_t1 + 1)
+                self._last_t1 = t1
+                _to_ntp(req, 40, t1)
+                pending[bytes(req[40:48])] = t1
+                await ep.sendto(req, addr)
+            deadline = time.ticks_add(time.ticks_ms(), self.timeout_ms)
+            while pending:
+                remaining = time.ticks_diff(deadline, time.ticks_ms())
+                if remaining <= 0:
+                    break
+                try:
+                    n, _ = await asyncio.wait_for_ms(ep.recvfrom_into(self._resp), remaining)
+                except asyncio.TimeoutError:
+                    break
+                sample = self._sample(n, pending, _local_us())
+                if sample is not None and (best is None or sample[1] < best[1]):
+                    best = sample
+        finally:
+            ep.close()
+        if best is None:
+            # Resolve the servers again next time, in case their address changed
+            self._addrs = None
+            return False
+        self._update(*best)
+        if self.on_sync:
+            self.on_sync(self)
+        return True
+
+    # Keep the clock in sync, running until cancelled.
+    async def run(self):
+        retry = 2
+        while True:
+            if await self.sync():
+                retry = 2
+                await asyncio.sleep(self.poll)
+                self.poll = min(self.poll * 2, self.max_poll)
+            else:
+                await asyncio.sleep(retry)
+                retry = min(retry * 2, self.min_poll)
+
+
+# W5x00 chip initialization, see sntp.py
+def w5x00_init():
+    from machine import Pin, WIZNET_PIO_SPI
+    import network
+
+    spi = WIZNET_PIO_SPI(
+        baudrate=31_250_000, mosi=Pin(23), miso=Pin(22), sck=Pin(21)
+    )  # W55RP20 PIO_SPI
+    nic = network.WIZNET5K(spi, Pin(20), Pin(25))  # spi, cs, reset pin
+    nic.active(True)
+    nic.ifconfig("dhcp")
+    while not nic.isconnected():
+        print("Waiting for the network to connect...")
+        time.sleep(1)
+    print("IP Address:", nic.ifconfig())
+    return nic
+
+
+def print_sync(client):
+    print(
+        "sync: offset {} us, delay {} us, drift {} ppb, next in {} s".format(
+            client.offset_us, client.delay_us, client.drift_ppb, client.poll
+        )
+    )
+
+
+async def app(client):
+    asyncio.create_task(client.run())
+    # The application keeps running while the client syncs in the background
+    while True:
+        await asyncio.sleep(10)
+        try:
+            print("NTP Time (UTC):", time.gmtime(client.time()))
+        except OSError:
+            print("Waiting for SNTP sync...")
+
+
+def main():
+    import sys
+
+    if len(sys.argv) > 1:
+        # Servers given as host:port on the command line, eg for testing
+        servers = []
+        for arg in sys.argv[1:]:
+            host, _, port = arg.partition(":")
+            servers.append((host, int(port or NTP_PORT)))
+        client = SNTPClient(servers, min_poll=2, max_poll=16, on_sync=print_sync)
+    else:
+        w5x00_init()
+        client = SNTPClient(
+            ("pool.ntp.org", "time.google.com", "time.cloudflare.com"), on_sync=print_sync
+        )
+    asyncio.run(app(client))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Minimal NTP server, as a local stand-in for testing sntp_async.py on Linux.
+
+It answers client requests with the host clock shifted by a fixed offset,
+optionally delaying its replies and dropping some requests.  Run one instance
+per port to simulate several servers, for example:
+
+    python3 sntp_test_server.py --port 12300 --offset 100.25
+    python3 sntp_test_server.py --port 12301 --offset 100.25 --delay 0.2 --loss 0.5
+"""
+
+import argparse
+import random
+import socket
+import struct
+import time
+
+NTP_DELTA = 2208988800  # Seconds from 1900 to 1970
+
+
+def to_ntp(t):
+    s = int(t)
+    return struct.pack("!II", (s + NTP_DELTA) & 0xFFFFFFFF, int((t - s) * (1 << 32)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12300)
+    parser.add_argument("--offset", type=float, default=0, help="seconds added to the host clock")
+    parser.add_argument("--delay", type=float, default=0, help="seconds to wait before replying")
+    parser.add_argument("--loss", type=float, default=0, help="fraction of requests to drop")
+    parser.add_argument("--stratum", type=int, default=2)
+    args = parser.parse_args()
+
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind((args.host, args.port))
+    print("NTP stand-in on {}:{}".format(args.host, args.port))
+    while True:
+        req, addr = s.recvfrom(48)
+        if len(req) < 48 or req[0] & 7 != 3 or random.random() < args.loss:
+            continue
+        # Split the delay between the request and the reply, like a network
+        time.sleep(args.delay / 2)
+        t2 = time.time() + args.offset
+        resp = bytearray(48)
+        resp[0] = 0b00100100  # LI=0, VN=4, Mode=4 (server)
+        resp[1] = args.stratum
+        resp[12:16] = b"LOCL"  # Reference identifier
+        resp[16:24] = to_ntp(t2)  # Reference time
+        resp[24:32] = req[40:48]  # Originate time = client's transmit time
+        resp[32:40] = to_ntp(t2)  # Receive time
+        resp[40:48] = to_ntp(time.time() + args.offset)  # Transmit time
+        time.sleep(args.delay / 2)
+        s.sendto(resp, addr)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,9 +30,17 @@ class SSD1306:
         self.height = height
         self.external_vcc = external_vcc
         self.pages = self.height // 8
-        # Note the subclass must initialize self.framebuf to a framebuffer.
-        # This is necessary because the underlying data buffer is different
-        # between I2C and SPI implementations (I2C needs an extra byte).
+        # Displays with width of 64 pixels are shifted by 32
+        self.col_offset = 32 if width == 64 else 0
+        # Column address and page address commands for show(), and the
+        # region changed since the last show(): columns dirty_x0..dirty_x1 of
+        # pages dirty_p0..dirty_p1, empty when dirty_x0 > dirty_x1.
+        self.window = bytearray((SET_COL_ADDR, 0, 0, SET_PAGE_ADDR, 0, 0))
+        self.mark_all()
+        # Note the subclass must initialize self.framebuf to a framebuffer,
+        # self.rows to a memoryview of each of its pages, and provide
+        # write_cmd and write_window to send a command and the framebuffer
+        # for a window.
         self.poweron()
         self.init_display()
 
@@ -83,32 +91,87 @@ class SSD1306:
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_framebuf()
+    def mark(self, x, y, w, h):
+        # Add a rectangle, clipped to the display, to the dirty region
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        x1 = min(x + w, self.width) - 1
+        y1 = min(y + h, self.height) - 1
+        if x > x1 or y > y1:
+            return
+        if x < self.dirty_x0:
+            self.dirty_x0 = x
+        if x1 > self.dirty_x1:
+            self.dirty_x1 = x1
+        if y >> 3 < self.dirty_p0:
+            self.dirty_p0 = y >> 3
+        if y1 >> 3 > self.dirty_p1:
+            self.dirty_p1 = y1 >> 3
+
+    def mark_all(self):
+        # Call after drawing on self.framebuf directly
+        self.dirty_x0 = 0
+        self.dirty_x1 = self.width - 1
+        self.dirty_p0 = 0
+        self.dirty_p1 = self.pages - 1
+
+    def show(self, full=False):
+        # Send the pages and columns changed since the last call, in one
+        # transaction after setting the display's address window to them
+        if full:
+            self.mark_all()
+        if self.dirty_x0 > self.dirty_x1:
+            return
+        w = self.window
+        w[1] = self.dirty_x0 + self.col_offset
+        w[2] = self.dirty_x1 + self.col_offset
+        w[4] = self.dirty_p0
+        w[5] = self.dirty_p1
+        self.write_window(self.dirty_x0, self.dirty_x1, self.dirty_p0, self.dirty_p1)
+        self.dirty_x0 = self.width
+        self.dirty_x1 = -1
+        self.dirty_p0 = self.pages
+        self.dirty_p1 = -1
 
     def fill(self, col):
         self.framebuf.fill(col)
+        self.mark_all()
 
     def pixel(self, x, y, col):
         self.framebuf.pixel(x, y, col)
+        self.mark(x, y, 1, 1)
 
     def scroll(self, dx, dy):
         self.framebuf.scroll(dx, dy)
+        self.mark_all()
 
     def text(self, string, x, y, col=1):
         self.framebuf.text(string, x, y, col)
+        self.mark(x, y, 8 * len(string), 8)
+
+    def hline(self, x, y, w, col):
+        self.framebuf.hline(x, y, w, col)
+        self.mark(x, y, w, 1)
+
+    def vline(self, x, y, h, col):
+        self.framebuf.vline(x, y, h, col)
+        self.mark(x, y, 1, h)
+
+    def line(self, x1, y1, x2, y2, col):
+        self.framebuf.line(x1, y1, x2, y2, col)
+        self.mark(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+
+    def rect(self, x, y, w, h, col, fill=False):
+        self.framebuf.rect(x, y, w, h, col, fill)
+        self.mark(x, y, w, h)
+
+    def fill_rect(self, x, y, w, h, col):
+        self.framebuf.fill_rect(x, y, w, h, col)
+        self.mark(x, y, w, h)
 
 
 class SSD1306_I2C(SSD1306):
@@ -116,16 +179,19 @@ class SSD1306_I2C(SSD1306):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
-        # Add an extra byte to the data buffer to hold an I2C data/command byte
-        # to use hardware-compatible I2C transactions.  A memoryview of the
-        # buffer is used to mask this byte from the framebuffer operations
-        # (without a major memory hit as memoryview doesn't copy to a separate
-        # buffer).
-        self.buffer = bytearray(((height // 8) * width) + 1)
-        self.buffer[0] = 0x40  # Set first byte of data buffer to Co=0, D/C=1
-        self.framebuf = framebuf.FrameBuffer1(
-            memoryview(self.buffer)[1:], width, height
-        )
+        # Each page of the framebuffer is preceded by a control byte with
+        # Co=0, D/C#=1, so a page is sent as data straight from the buffer.
+        # The control bytes are an extra column of the framebuffer, past the
+        # width, which drawing doesn't touch.
+        pages = height // 8
+        self.buffer = bytearray(b"\x40" * (1 + pages * (width + 1)))
+        buf = memoryview(self.buffer)
+        self.framebuf = framebuf.FrameBuffer(buf[1:], width, height, framebuf.MONO_VLSB, width + 1)
+        self.writes = [buf[p * (width + 1) : (p + 1) * (width + 1)] for p in range(pages)]
+        self.rows = [w[1:] for w in self.writes]
+        # The window commands, each preceded by a control byte with Co=1,
+        # D/C#=0
+        self.window_cmds = bytearray(b"\x80\x00" * 6)
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
@@ -133,10 +199,21 @@ class SSD1306_I2C(SSD1306):
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
-    def write_framebuf(self):
-        # Blast out the frame buffer using a single I2C transaction to support
-        # hardware I2C interfaces.
-        self.i2c.writeto(self.addr, self.buffer)
+    def write_window(self, x0, x1, p0, p1):
+        # The window commands in one transaction, then a transaction per
+        # page.  As over SPI, the window is widened to whole pages so that
+        # the data is the views in self.writes and nothing is allocated; a
+        # single buffer per transaction also keeps I2C drivers from joining
+        # buffers into a new one.
+        w = self.window
+        w[1] = self.col_offset
+        w[2] = self.col_offset + self.width - 1
+        cmds = self.window_cmds
+        for i in range(6):
+            cmds[2 * i + 1] = w[i]
+        self.i2c.writeto(self.addr, cmds)
+        for p in range(p0, p1 + 1):
+            self.i2c.writeto(self.addr, self.writes[p])
 
     def poweron(self):
         pass
@@ -152,24 +229,38 @@ class SSD1306_SPI(SSD1306):
         self.dc = dc
         self.res = res
         self.cs = cs
+        self.temp = bytearray(1)
         self.buffer = bytearray((height // 8) * width)
         self.framebuf = framebuf.FrameBuffer1(self.buffer, width, height)
+        # The framebuffer's pages, for write_window
+        buf = memoryview(self.buffer)
+        self.rows = [buf[p * width : (p + 1) * width] for p in range(height // 8)]
+        spi.init(baudrate=self.rate, polarity=0, phase=0)
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
-        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs.high()
         self.dc.low()
         self.cs.low()
-        self.spi.write(bytearray([cmd]))
+        self.temp[0] = cmd
+        self.spi.write(self.temp)
         self.cs.high()
 
-    def write_framebuf(self):
-        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+    def write_window(self, x0, x1, p0, p1):
+        # Commands and data under one chip select, switching D/C# between.
+        # The window is widened to whole pages, which costs little at SPI
+        # speeds, so the data is the views in self.rows and nothing is
+        # allocated.
+        w = self.window
+        w[1] = self.col_offset
+        w[2] = self.col_offset + self.width - 1
         self.cs.high()
-        self.dc.high()
+        self.dc.low()
         self.cs.low()
-        self.spi.write(self.buffer)
+        self.spi.write(w)
+        self.dc.high()
+        for p in range(p0, p1 + 1):
+            self.spi.write(self.rows[p])
         self.cs.high()
 
     def poweron(self):
@@ -0,0 +1,255 @@
+"""
+Mock I2C and SPI buses for checking ssd1306.py with the unix port.
+
+The mocks record every transaction the driver makes and feed it to a model
+of the SSD1306's display RAM, which follows the column and page address
+commands like the real controller.  After each show() the model must match
+the framebuffer, so partial refreshes that send the wrong window or bytes
+are caught, and the bytes sent per refresh are reported.  show() runs with
+the heap locked, to check that it doesn't allocate:
+
+    micropython ssd1306_mock.py
+"""
+
+import micropython
+import ssd1306
+
+# Number of argument bytes taken by the commands the driver sends
+CMD_ARGS = {
+    0x20: 1,  # memory addressing mode
+    0x21: 2,  # column address
+    0x22: 2,  # page address
+    0x81: 1,  # contrast
+    0x8D: 1,  # charge pump
+    0xA8: 1,  # multiplex ratio
+    0xD3: 1,  # display offset
+    0xD5: 1,  # clock divide
+    0xD9: 1,  # precharge
+    0xDA: 1,  # COM pins
+    0xDB: 1,  # VCOMH deselect
+}
+
+
+class DisplayModel:
+    # 128 columns by 8 pages of display RAM, in horizontal addressing mode
+    def __init__(self):
+        self.ram = bytearray(b"\x55" * 1024)  # not what the driver clears it to
+        self.cmd = []
+        self.col_start, self.col_end, self.col = 0, 127, 0
+        self.page_start, self.page_end, self.page = 0, 7, 0
+
+    def command(self, b):
+        self.cmd.append(b)
+        if len(self.cmd) <= CMD_ARGS.get(self.cmd[0], 0):
+            return
+        cmd, self.cmd = self.cmd, []
+        if cmd[0] == 0x20:
+            assert cmd[1] == 0, "only horizontal addressing is modelled"
+        elif cmd[0] == 0x21:
+            self.col_start, self.col_end = cmd[1], cmd[2]
+            self.col = cmd[1]
+        elif cmd[0] == 0x22:
+            self.page_start, self.page_end = cmd[1], cmd[2]
+            self.page = cmd[1]
+
+    def data(self, b):
+        assert not self.cmd, "data in the middle of a command"
+        self.ram[self.page * 128 + self.col] = b
+        self.col += 1
+        if self.col > self.col_end:
+            self.col = self.col_start
+            self.page += 1
+            if self.page > self.page_end:
+                self.page = self.page_start
+
+    def check(self, display):
+        # The part of the RAM the display shows must match the framebuffer
+        w = display.width
+        for p in range(display.pages):
+            row = p * 128 + display.col_offset
+            if self.ram[row : row + w] != display.rows[p]:
+                raise AssertionError("page {} differs".format(p))
+
+
+class MockI2C:
+    def __init__(self):
+        self._model = DisplayModel()
+        self.transactions = 0
+        self.bytes = 0
+        # The bytes written, and the lengths of the transactions, kept until
+        # the model is next used, so that writeto() doesn't allocate
+        self.log = bytearray(4096)
+        self.logged = 0
+        self.lens = [0] * 64
+        self.n_lens = 0
+
+    @property
+    def model(self):
+        i = 0
+        for t in range(self.n_lens):
+            self.transaction(self.log[i : i + self.lens[t]])
+            i += self.lens[t]
+        self.logged = self.n_lens = 0
+        return self._model
+
+    def transaction(self, data):
+        # Each control byte with Co=1 applies to one byte, with Co=0 to the
+        # rest of the transaction; D/C# selects command or data
+        i = 0
+        while i < len(data):
+            ctrl = data[i]
+            n = 1 if ctrl & 0x80 else len(data) - i - 1
+            for b in data[i + 1 : i + 1 + n]:
+                if ctrl & 0x40:
+                    self._model.data(b)
+                else:
+                    self._model.command(b)
+            i += 1 + n
+
+    def writeto(self, addr, buf):
+        n = self.logged
+        assert n + len(buf) <= len(self.log), "log full"
+        assert self.n_lens < len(self.lens), "too many transactions"
+        for i in range(len(buf)):
+            self.log[n + i] = buf[i]
+        self.logged = n + len(buf)
+        self.lens[self.n_lens] = len(buf)
+        self.n_lens += 1
+        self.transactions += 1
+        self.bytes += len(buf)
+
+
+class MockPin:
+    OUT = 1
+
+    def __init__(self):
+        self.v = 0
+        self.falls = 0
+
+    def init(self, mode=None, value=None):
+        if value is not None:
+            self.v = value
+
+    def value(self, v=None):
+        if v is None:
+            return self.v
+        if self.v and not v:
+            self.falls += 1
+        self.v = v
+
+    def high(self):
+        self.value(1)
+
+    def low(self):
+        self.value(0)
+
+
+class MockSPI:
+    def __init__(self, dc, cs):
+        self._model = DisplayModel()
+        self.dc = dc
+        self.cs = cs
+        self.inits = 0
+        self.bytes = 0
+        # The bytes written and the D/C# level for each, kept until the model
+        # is next used, so that write() doesn't allocate
+        self.log = bytearray(4096)
+        self.log_dc = bytearray(len(self.log))
+        self.logged = 0
+
+    @property
+    def transactions(self):
+        return self.cs.falls
+
+    @property
+    def model(self):
+        for i in range(self.logged):
+            if self.log_dc[i]:
+                self._model.data(self.log[i])
+            else:
+                self._model.command(self.log[i])
+        self.logged = 0
+        return self._model
+
+    def init(self, **kwargs):
+        self.inits += 1
+
+    def write(self, buf):
+        assert not self.cs.value(), "write without chip select"
+        n = self.logged
+        assert n + len(buf) <= len(self.log), "log full"
+        dc = self.dc.value()
+        for i in range(len(buf)):
+            self.log[n + i] = buf[i]
+            self.log_dc[n + i] = dc
+        self.logged = n + len(buf)
+        self.bytes += len(buf)
+
+
+def make_display(bus, width=128, height=64):
+    if bus == "i2c":
+        i2c = MockI2C()
+        return ssd1306.SSD1306_I2C(width, height, i2c), i2c
+    dc, cs = MockPin(), MockPin()
+    spi = MockSPI(dc, cs)
+    return ssd1306.SSD1306_SPI(width, height, spi, dc, MockPin(), cs), spi
+
+
+def refresh(oled, bus, label):
+    # show() and check the model, printing what went over the bus
+    t, n = bus.transactions, bus.bytes
+    micropython.heap_lock()
+    try:
+        oled.show()
+    finally:
+        micropython.heap_unlock()
+    bus.model.check(oled)
+    t, n = bus.transactions - t, bus.bytes - n
+    print("  {:<24} {} transaction(s), {} bytes".format(label, t, n))
+
+
+def run(bus_name, width, height):
+    print("{} {}x{}".format(bus_name, width, height))
+    oled, bus = make_display(bus_name, width, height)
+    bus.model.check(oled)
+
+    # A status screen, then one number on it changing
+    for i, line in enumerate(("W55RP20", "IP 192.168.11.2", "rx 0", "tx 0")):
+        oled.text(line, 0, i * 10)
+    refresh(oled, bus, "status screen")
+    for count in (7, 42):
+        oled.fill_rect(24, 20, 40, 8, 0)
+        oled.text(str(count), 24, 20)
+        refresh(oled, bus, "update rx={}".format(count))
+    refresh(oled, bus, "nothing changed")
+
+    # Drawing at the edges, and partly off screen
+    oled.pixel(width - 1, height - 1, 1)
+    oled.line(-5, height - 2, 3, height + 5, 1)
+    oled.hline(0, 0, width * 2, 1)
+    refresh(oled, bus, "edges")
+    oled.rect(width - 10, 3, 20, 9, 1, True)
+    oled.vline(1, 5, 20, 1)
+    refresh(oled, bus, "two corners")
+    oled.scroll(0, 1)
+    refresh(oled, bus, "scroll")
+
+    # Drawing on the framebuffer directly needs a full refresh
+    oled.framebuf.fill_rect(2, 40 % height, 5, 5, 1)
+    oled.show(full=True)
+    bus.model.check(oled)
+    oled.fill(0)
+    refresh(oled, bus, "clear")
+    if bus_name == "spi":
+        assert bus.inits == 1, "SPI configured more than once"
+
+
+def main():
+    for bus_name in ("i2c", "spi"):
+        for width, height in ((128, 64), (128, 32), (64, 48)):
+            run(bus_name, width, height)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,15 @@ _attrs = {
     "Event": "event",
     "ThreadSafeFlag": "event",
     "Lock": "lock",
+    "Queue": "queue",
+    "LifoQueue": "queue",
+    "PriorityQueue": "queue",
+    "QueueEmpty": "queue",
+    "QueueFull": "queue",
+    "ThreadPoolExecutor": "executor",
+    "to_thread": "executor",
+    "open_datagram_endpoint": "datagram",
+    "DatagramEndpoint": "datagram",
     "open_connection": "stream",
     "start_server": "stream",
     "StreamReader": "stream",
@@ -1,7 +1,7 @@
 # MicroPython asyncio module
 # MIT license; Copyright (c) 2019 Damien P. George
 
-from time import ticks_ms as ticks, ticks_diff, ticks_add
+from time import ticks_ms as ticks, ticks_us, ticks_diff, ticks_add
 import sys, select
 
 # Import TaskQueue and Task, preferring built-in C code over Python code
@@ -148,6 +148,49 @@ def create_task(coro):
     return t
 
 
+# Run one slice of a task and record scheduler statistics about it; used
+# instead of the code in run_until_complete when Loop.set_debug(True) is active
+def _run_timed(t, exc):
+    s = _stats.get(t)
+    if s is None:
+        s = _stats[t] = [0, 0, 0, 0, 0]
+    # How long the task has been waiting to run since it was due
+    late = max(0, ticks_diff(ticks(), t.ph_key))
+    t0 = ticks_us()
+    done = True
+    try:
+        if not exc:
+            t.coro.send(None)
+        else:
+            t.data = None
+            t.coro.throw(exc)
+        done = False
+    finally:
+        dt = ticks_diff(ticks_us(), t0)
+        s[0] += 1
+        s[1] += dt
+        if dt > s[2]:
+            s[2] = dt
+        s[3] += late
+        if late > s[4]:
+            s[4] = late
+        if done and _stats is not None and _stats.pop(t, None):
+            # The task finished, so add its statistics to those of all finished
+            # tasks, kept under None, rather than keep the task alive
+            f = _stats.get(None)
+            if f is None:
+                _stats[None] = s
+            else:
+                f[0] += s[0]
+                f[1] += s[1]
+                f[2] = max(f[2], s[2])
+                f[3] += s[3]
+                f[4] = max(f[4], s[4])
+        slow = Loop.slow_callback_ms
+        if slow is not None and dt > slow * 1000:
+            print("Executing", t, "took", dt // 1000, "ms", file=sys.stderr)
+
+
 # Keep scheduling tasks until there are none left to schedule
 def run_until_complete(main_task=None):
     global cur_task
@@ -175,7 +218,9 @@ def run_until_complete(main_task=None):
         try:
             # Continue running the coroutine, it's responsible for rescheduling itself
             exc = t.data
-            if not exc:
+            if _stats is not None:
+                _run_timed(t, exc)
+            elif not exc:
                 t.coro.send(None)
             else:
                 # If the task is finished and on the run queue and gets here, then it
@@ -246,10 +291,12 @@ async def _stopper():
 
 cur_task = None
 _stop_task = None
+_stats = None  # Maps Task, or None when finished, to statistics while debug is active
 
 
 class Loop:
     _exc_handler = None
+    slow_callback_ms = 100  # Warn about tasks that run longer than this in debug mode
 
     def create_task(coro):
         return create_task(coro)
@@ -263,6 +310,11 @@ class Loop:
     def run_until_complete(aw):
         return run_until_complete(_promote_to_task(aw))
 
+    def run_in_executor(executor, func, *args):
+        from .executor import run_in_executor
+
+        return run_in_executor(executor, func, *args)
+
     def stop():
         global _stop_task
         if _stop_task is not None:
@@ -287,6 +339,16 @@ class Loop:
     def call_exception_handler(context):
         (Loop._exc_handler or Loop.default_exception_handler)(Loop, context)
 
+    def set_debug(enabled):
+        global _stats
+        if not enabled:
+            _stats = None
+        elif _stats is None:
+            _stats = {}
+
+    def get_debug():
+        return _stats is not None
+
 
 # The runq_len and waitq_len arguments are for legacy uasyncio compatibility
 def get_event_loop(runq_len=0, waitq_len=0):
@@ -299,6 +361,19 @@ def current_task():
     return cur_task
 
 
+# Return the scheduler statistics collected while Loop.set_debug(True) is
+# active, as a dict mapping each unfinished Task, and None for all finished
+# ones, to a list of: number of times it was run, total and maximum run time in
+# microseconds, and total and maximum time in milliseconds it waited to run
+# after it was due (uPy extension)
+def stats(reset=False):
+    global _stats
+    s = _stats
+    if reset and s is not None:
+        _stats = {}
+    return s
+
+
 def new_event_loop():
     global _task_queue, _io_queue
     # TaskQueue of Task instances
@@ -0,0 +1,90 @@
+# MicroPython asyncio module
+# MIT license; Copyright (c) 2024 MicroPython contributors
+
+from . import core
+from errno import EAGAIN
+
+
+# A UDP socket which can send and receive datagrams without blocking the
+# scheduler.  Receiving into a caller-supplied buffer with recvfrom_into()
+# doesn't allocate a new bytes object for each datagram.
+class DatagramEndpoint:
+    def __init__(self, s):
+        self.s = s
+
+    def close(self):
+        self.s.close()
+
+    # async
+    def recvfrom(self, n):
+        while True:
+            yield core._io_queue.queue_read(self.s)
+            try:
+                return self.s.recvfrom(n)
+            except OSError as er:
+                if er.errno != EAGAIN:
+                    raise er
+
+    # async
+    def recvfrom_into(self, buf, n=0):
+        while True:
+            yield core._io_queue.queue_read(self.s)
+            try:
+                if hasattr(self.s, "recvfrom_into"):
+                    return self.s.recvfrom_into(buf, n)
+                # The socket doesn't support receiving into a buffer, so copy
+                data, addr = self.s.recvfrom(n or len(buf))
+                buf[: len(data)] = data
+                return len(data), addr
+            except OSError as er:
+                if er.errno != EAGAIN:
+                    raise er
+
+    # Send buf to addr, or to the remote address given when the endpoint was
+    # opened if addr is None, waiting for the socket to become writable if the
+    # network stack can't take the datagram yet.
+    def _send(self, buf, addr):
+        while True:
+            try:
+                if addr is None:
+                    return self.s.send(buf)
+                return self.s.sendto(buf, addr)
+            except OSError as er:
+                if er.errno != EAGAIN:
+                    raise er
+            yield core._io_queue.queue_write(self.s)
+
+    # async
+    def sendto(self, buf, addr=None):
+        n = yield from self._send(buf, addr)
+        # Always yield, so a tight loop of sends can't block the scheduler
+        yield from core.sleep_ms(0)
+        return n
+
+    # Send each buffer in bufs as a separate datagram, yielding to the
+    # scheduler once for the whole batch rather than once per datagram.
+    #
+    # async
+    def sendmany(self, bufs, addr=None):
+        for buf in bufs:
+            yield from self._send(buf, addr)
+        yield from core.sleep_ms(0)
+
+
+# Create a UDP endpoint bound to local_addr and/or connected to remote_addr,
+# each given as a (host, port) tuple
+async def open_datagram_endpoint(local_addr=None, remote_addr=None):
+    import socket
+
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.setblocking(False)
+        if local_addr is not None:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind(socket.getaddrinfo(*local_addr)[0][-1])
+        if remote_addr is not None:
+            s.connect(socket.getaddrinfo(*remote_addr)[0][-1])
+    except:
+        s.close()
+        raise
+    return DatagramEndpoint(s)
@@ -0,0 +1,134 @@
+# MicroPython asyncio module
+# MIT license; Copyright (c) 2024 MicroPython contributors
+
+from .event import ThreadSafeFlag
+import _thread
+
+
+# A call to run on a worker thread.  The worker sets the flag when the call
+# finishes, which wakes the task waiting on it without the loop having to poll
+# the job's state.
+class _Job:
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.flag = ThreadSafeFlag()
+        self.result = None
+        self.exc = None
+
+    def run(self):
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+        except BaseException as er:
+            self.exc = er
+        self.flag.set()
+
+    async def wait(self):
+        await self.flag.wait()
+        if self.exc is not None:
+            raise self.exc
+        return self.result
+
+
+# Pool of threads to run blocking calls on, so they don't stall the asyncio
+# loop.  Threads are started when needed, up to max_workers of them, and then
+# wait for more work until the pool is shut down.
+class ThreadPoolExecutor:
+    def __init__(self, max_workers=4):
+        if max_workers <= 0:
+            raise ValueError("max_workers")
+        self._max_workers = max_workers
+        self._workers = 0  # Number of worker threads running
+        self._idle = 0  # Number of worker threads waiting for a job
+        self._jobs = []
+        self._shutdown = False
+        self._lock = _thread.allocate_lock()  # Protects all of the above
+        # Binary semaphore which is released while there are jobs to take
+        self._ready = _thread.allocate_lock()
+        self._ready.acquire()
+        self._signalled = False
+
+    def _signal(self):
+        # Must be called with self._lock held
+        if not self._signalled:
+            self._signalled = True
+            self._ready.release()
+
+    def _worker(self):
+        while True:
+            self._ready.acquire()
+            with self._lock:
+                self._signalled = False
+                job = self._jobs.pop(0)
+                self._idle -= 1
+                if self._jobs:
+                    # Let another idle worker take the next job
+                    self._signal()
+            if job is None:
+                break
+            job.run()
+            with self._lock:
+                self._idle += 1
+        with self._lock:
+            self._workers -= 1
+
+    def _submit(self, job):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("executor shut down")
+            self._jobs.append(job)
+            if self._idle < len(self._jobs) and self._workers < self._max_workers:
+                try:
+                    _thread.start_new_thread(self._worker, ())
+                    self._workers += 1
+                    self._idle += 1
+                except OSError:
+                    # A port may support fewer threads than max_workers, in
+                    # which case the running workers take the job.
+                    if not self._workers:
+                        self._jobs.pop()
+                        raise
+            self._signal()
+
+    # Run func(*args, **kwargs) on a worker thread and return its result.
+    def run(self, func, *args, **kwargs):
+        job = _Job(func, args, kwargs)
+        self._submit(job)
+        return job.wait()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if not self._shutdown:
+                self._shutdown = True
+                # Each worker exits when it takes one of these
+                for _ in range(self._workers):
+                    self._jobs.append(None)
+                if self._jobs:
+                    self._signal()
+        if wait:
+            import time
+
+            while self._workers:
+                time.sleep_ms(1)
+
+
+_default_executor = None
+
+
+def _get_default_executor():
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor()
+    return _default_executor
+
+
+# Run func(*args) in the given executor, or the default one if it's None.
+# This is used by Loop.run_in_executor().
+def run_in_executor(executor, func, *args):
+    return (executor or _get_default_executor()).run(func, *args)
+
+
+# async
+def to_thread(func, *args, **kwargs):
+    return _get_default_executor().run(func, *args, **kwargs)
@@ -5,9 +5,12 @@ package(
     (
         "__init__.py",
         "core.py",
+        "datagram.py",
         "event.py",
+        "executor.py",
         "funcs.py",
         "lock.py",
+        "queue.py",
         "stream.py",
     ),
     base_path="..",
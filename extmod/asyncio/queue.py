@@ -0,0 +1,161 @@
+# MicroPython asyncio module
+# MIT license; Copyright (c) 2024 MicroPython contributors
+
+from . import core
+
+
+class QueueEmpty(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+# Wake the first Task waiting on the given TaskQueue, if any
+def _wake_one(waiting):
+    if waiting.peek():
+        core._task_queue.push(waiting.pop())
+
+
+# FIFO queue of items for passing data between tasks.  The items are stored in
+# a ring buffer which, for a bounded queue, is allocated up front so that
+# putting and getting items doesn't allocate memory.  An unbounded queue
+# (maxsize <= 0) grows its buffer as needed.
+class Queue:
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._init(maxsize)
+        self._len = 0
+        self._get_waiting = core.TaskQueue()  # Tasks waiting for an item
+        self._put_waiting = core.TaskQueue()  # Tasks waiting for a free slot
+        self._unfinished = 0  # Items put but not yet marked done with task_done()
+        self._finished = None  # Event for join(), created on demand
+
+    def _init(self, maxsize):
+        self._buf = [None] * (maxsize if maxsize > 0 else 4)
+        self._head = 0
+
+    def _put(self, item):
+        buf = self._buf
+        n = len(buf)
+        if self._len == n:
+            # Only an unbounded queue gets here: double the size of the buffer,
+            # moving the items so they start at the beginning.
+            head = self._head
+            self._buf = buf = buf[head:] + buf[:head] + [None] * n
+            self._head = 0
+            n *= 2
+        buf[(self._head + self._len) % n] = item
+
+    def _get(self):
+        buf = self._buf
+        head = self._head
+        item = buf[head]
+        buf[head] = None  # so we don't retain a reference to the item
+        self._head = (head + 1) % len(buf)
+        return item
+
+    def qsize(self):
+        return self._len
+
+    def empty(self):
+        return self._len == 0
+
+    def full(self):
+        return 0 < self.maxsize <= self._len
+
+    def put_nowait(self, item):
+        if self.full():
+            raise QueueFull
+        self._put(item)
+        self._len += 1
+        self._unfinished += 1
+        # Wake a single Task waiting for an item
+        _wake_one(self._get_waiting)
+
+    def get_nowait(self):
+        if not self._len:
+            raise QueueEmpty
+        item = self._get()
+        self._len -= 1
+        # Wake a single Task waiting for a free slot
+        _wake_one(self._put_waiting)
+        return item
+
+    # async
+    def put(self, item):
+        while self.full():
+            # Queue full, put the calling Task on the queue of putters
+            self._put_waiting.push(core.cur_task)
+            # Set calling task's data to that queue so it can be removed if needed
+            core.cur_task.data = self._put_waiting
+            try:
+                yield
+            except core.CancelledError as er:
+                # If this Task was woken to take a free slot, pass that on
+                if not self.full():
+                    _wake_one(self._put_waiting)
+                raise er
+        self.put_nowait(item)
+
+    # async
+    def get(self):
+        while not self._len:
+            # Queue empty, put the calling Task on the queue of getters
+            self._get_waiting.push(core.cur_task)
+            # Set calling task's data to that queue so it can be removed if needed
+            core.cur_task.data = self._get_waiting
+            try:
+                yield
+            except core.CancelledError as er:
+                # If this Task was woken to take an item, pass that on
+                if self._len:
+                    _wake_one(self._get_waiting)
+                raise er
+        return self.get_nowait()
+
+    def task_done(self):
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if not self._unfinished and self._finished:
+            self._finished.set()
+
+    async def join(self):
+        if self._unfinished:
+            if not self._finished:
+                from .event import Event
+
+                self._finished = Event()
+            self._finished.clear()
+            await self._finished.wait()
+
+
+# LIFO queue, which gets the most recently put item first
+class LifoQueue(Queue):
+    def _get(self):
+        buf = self._buf
+        i = (self._head + self._len - 1) % len(buf)
+        item = buf[i]
+        buf[i] = None
+        return item
+
+
+# Priority queue, which gets the smallest item first.  Items are typically
+# (priority, data) tuples.
+try:
+    from heapq import heappush, heappop
+
+    class PriorityQueue(Queue):
+        def _init(self, maxsize):
+            self._buf = []
+
+        def _put(self, item):
+            heappush(self._buf, item)
+
+        def _get(self):
+            return heappop(self._buf)
+
+except ImportError:
+    pass
@@ -183,6 +183,147 @@ static mp_obj_t mod_binascii_crc32(size_t n_args, const mp_obj_t *args) {
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mod_binascii_crc32_obj, 1, 2, mod_binascii_crc32);
 #endif
 
+#if MICROPY_PY_BINASCII_CRC
+
+// A CRC in the usual parameterised model: the register is width bits wide,
+// poly and init are given MSB first, refin/refout reflect each input byte and
+// the final register, and xorout is applied to the result.
+typedef struct _binascii_crc_params_t {
+    uint8_t width;
+    uint8_t refin;
+    uint8_t refout;
+    uint32_t poly;
+    uint32_t init;
+    uint32_t xorout;
+} binascii_crc_params_t;
+
+// Indexed by the CRC* constants in the module.
+static const binascii_crc_params_t binascii_crc_presets[] = {
+    { 16, false, false, 0x1021, 0xffff, 0 }, // CRC16_CCITT, aka CRC-16/CCITT-FALSE
+    { 16, true, true, 0x8005, 0xffff, 0 }, // CRC16_MODBUS
+    { 32, true, true, 0x1edc6f41, 0xffffffff, 0xffffffff }, // CRC32C
+};
+
+static uint32_t binascii_crc_reflect(uint32_t v, unsigned int width) {
+    uint32_t r = 0;
+    for (unsigned int i = 0; i < width; ++i) {
+        r = (r << 1) | (v & 1);
+        v >>= 1;
+    }
+    return r;
+}
+
+// Compute the CRC of buf, starting from value, which is either the previous
+// result for an incremental computation or, if starting afresh, init with
+// refout and xorout applied so that it gives init back below.
+static uint32_t binascii_crc_compute(const binascii_crc_params_t *p, const byte *buf, size_t len, uint32_t value) {
+    unsigned int width = p->width;
+    uint32_t mask = 0xffffffff >> (32 - width);
+    uint32_t reg = (value ^ p->xorout) & mask;
+    if (p->refout) {
+        reg = binascii_crc_reflect(reg, width);
+    }
+
+    // A 16-entry table, built for each call as it's only 16 * 4 steps, makes
+    // this two lookups per byte and works for any width and polynomial.
+    uint32_t table[16];
+    if (p->refin) {
+        // Process the bytes LSB first with the register reflected, so it
+        // shifts right.  This is how CRC32 works in uzlib.
+        uint32_t poly = binascii_crc_reflect(p->poly, width);
+        for (uint32_t i = 0; i < 16; ++i) {
+            uint32_t c = i;
+            for (int j = 0; j < 4; ++j) {
+                c = (c >> 1) ^ ((c & 1) ? poly : 0);
+            }
+            table[i] = c;
+        }
+        reg = binascii_crc_reflect(reg, width);
+        for (size_t i = 0; i < len; ++i) {
+            reg ^= buf[i];
+            reg = table[reg & 0x0f] ^ (reg >> 4);
+            reg = table[reg & 0x0f] ^ (reg >> 4);
+        }
+        reg = binascii_crc_reflect(reg, width);
+    } else {
+        // Process the bytes MSB first with the register held in the top bits
+        // of a 32-bit word, so it shifts left.
+        unsigned int shift = 32 - width;
+        uint32_t poly = p->poly << shift;
+        for (uint32_t i = 0; i < 16; ++i) {
+            uint32_t c = i << 28;
+            for (int j = 0; j < 4; ++j) {
+                c = (c << 1) ^ ((c & 0x80000000) ? poly : 0);
+            }
+            table[i] = c;
+        }
+        reg <<= shift;
+        for (size_t i = 0; i < len; ++i) {
+            reg ^= (uint32_t)buf[i] << 24;
+            reg = table[reg >> 28] ^ (reg << 4);
+            reg = table[reg >> 28] ^ (reg << 4);
+        }
+        reg >>= shift;
+    }
+
+    if (p->refout) {
+        reg = binascii_crc_reflect(reg, width);
+    }
+    return (reg ^ p->xorout) & mask;
+}
+
+static mp_obj_t mod_binascii_crc(size_t n_args, const mp_obj_t *args) {
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(args[0], &bufinfo, MP_BUFFER_READ);
+
+    binascii_crc_params_t custom;
+    const binascii_crc_params_t *p;
+    if (mp_obj_is_small_int(args[1])) {
+        mp_int_t i = MP_OBJ_SMALL_INT_VALUE(args[1]);
+        if (i < 0 || i >= (mp_int_t)MP_ARRAY_SIZE(binascii_crc_presets)) {
+            mp_raise_ValueError(MP_ERROR_TEXT("unknown CRC"));
+        }
+        p = &binascii_crc_presets[i];
+    } else {
+        // (width, poly, init, refin, refout, xorout)
+        mp_obj_t *items;
+        mp_obj_get_array_fixed_n(args[1], 6, &items);
+        mp_int_t width = mp_obj_get_int(items[0]);
+        if (width < 1 || width > 32) {
+            mp_raise_ValueError(MP_ERROR_TEXT("bad CRC width"));
+        }
+        custom.width = width;
+        custom.poly = mp_obj_get_int_truncated(items[1]);
+        custom.init = mp_obj_get_int_truncated(items[2]);
+        custom.refin = mp_obj_is_true(items[3]);
+        custom.refout = mp_obj_is_true(items[4]);
+        custom.xorout = mp_obj_get_int_truncated(items[5]);
+        p = &custom;
+    }
+
+    uint32_t value;
+    if (n_args > 2) {
+        value = mp_obj_get_int_truncated(args[2]);
+    } else {
+        value = p->init;
+        if (p->refout) {
+            value = binascii_crc_reflect(value, p->width);
+        }
+        value ^= p->xorout;
+    }
+    return mp_obj_new_int_from_uint(binascii_crc_compute(p, bufinfo.buf, bufinfo.len, value));
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mod_binascii_crc_obj, 2, 3, mod_binascii_crc);
+
+static mp_obj_t mod_binascii_crc_hqx(mp_obj_t data, mp_obj_t value) {
+    static const binascii_crc_params_t hqx = { 16, false, false, 0x1021, 0, 0 };
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(data, &bufinfo, MP_BUFFER_READ);
+    return MP_OBJ_NEW_SMALL_INT(binascii_crc_compute(&hqx, bufinfo.buf, bufinfo.len, mp_obj_get_int_truncated(value)));
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(mod_binascii_crc_hqx_obj, mod_binascii_crc_hqx);
+#endif
+
 static const mp_rom_map_elem_t mp_module_binascii_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_binascii) },
     #if MICROPY_PY_BUILTINS_BYTES_HEX
@@ -194,6 +335,13 @@ static const mp_rom_map_elem_t mp_module_binascii_globals_table[] = {
     #if MICROPY_PY_BINASCII_CRC32 && MICROPY_PY_DEFLATE
     { MP_ROM_QSTR(MP_QSTR_crc32), MP_ROM_PTR(&mod_binascii_crc32_obj) },
     #endif
+    #if MICROPY_PY_BINASCII_CRC
+    { MP_ROM_QSTR(MP_QSTR_crc), MP_ROM_PTR(&mod_binascii_crc_obj) },
+    { MP_ROM_QSTR(MP_QSTR_crc_hqx), MP_ROM_PTR(&mod_binascii_crc_hqx_obj) },
+    { MP_ROM_QSTR(MP_QSTR_CRC16_CCITT), MP_ROM_INT(0) },
+    { MP_ROM_QSTR(MP_QSTR_CRC16_MODBUS), MP_ROM_INT(1) },
+    { MP_ROM_QSTR(MP_QSTR_CRC32C), MP_ROM_INT(2) },
+    #endif
 };
 
 static MP_DEFINE_CONST_DICT(mp_module_binascii_globals, mp_module_binascii_globals_table);
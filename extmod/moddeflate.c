@@ -37,6 +37,7 @@
 
 #if MICROPY_PY_DEFLATE
 
+#define UZLIB_CONF_CRC32_TABLE (MICROPY_PY_DEFLATE_CRC32_TABLE)
 #include "lib/uzlib/uzlib.h"
 
 #if 0 // print debugging info
@@ -58,8 +59,16 @@ typedef enum {
 // to the smallest window size (faster compression, less RAM usage, etc).
 const int DEFLATEIO_DEFAULT_WBITS = 8;
 
+// This is used when the bufsize is unset in the DeflateIO constructor and the
+// underlying stream is seekable. It's the size of the buffer for compressed
+// data read from or written to that stream, so it isn't accessed one byte at a
+// time. A stream that can't seek couldn't be given back data read ahead of the
+// end of the compressed data, so is left unbuffered unless a bufsize is given.
+const int DEFLATEIO_DEFAULT_BUFSIZE = 256;
+
 typedef struct {
     void *window;
+    uint8_t *buf;
     uzlib_uncomp_t decomp;
     bool eof;
 } mp_obj_deflateio_read_t;
@@ -67,6 +76,8 @@ typedef struct {
 #if MICROPY_PY_DEFLATE_COMPRESS
 typedef struct {
     void *window;
+    uint8_t *buf;
+    size_t buf_len;
     size_t input_len;
     uint32_t input_checksum;
     uzlib_lz77_state_t lz77;
@@ -79,6 +90,8 @@ typedef struct {
     uint8_t format : 2;
     uint8_t window_bits : 4;
     bool close : 1;
+    bool bufsize_unset : 1;
+    size_t bufsize;
     mp_obj_deflateio_read_t *read;
     #if MICROPY_PY_DEFLATE_COMPRESS
     mp_obj_deflateio_write_t *write;
@@ -90,14 +103,60 @@ static int deflateio_read_stream(void *data) {
     const mp_stream_p_t *stream = mp_get_stream(self->stream);
     int err;
     byte c;
-    mp_uint_t out_sz = stream->read(self->stream, &c, 1, &err);
+    byte *buf = &c;
+    size_t size = 1;
+    if (self->bufsize > 0) {
+        buf = self->read->buf;
+        size = self->bufsize;
+    }
+    mp_uint_t out_sz = stream->read(self->stream, buf, size, &err);
     if (out_sz == MP_STREAM_ERROR) {
         mp_raise_OSError(err);
     }
     if (out_sz == 0) {
         mp_raise_type(&mp_type_EOFError);
     }
-    return c;
+    if (self->bufsize > 0) {
+        // Let uzlib take the rest of the data straight from the buffer.
+        self->read->decomp.source = buf + 1;
+        self->read->decomp.source_limit = buf + out_sz;
+    }
+    return buf[0];
+}
+
+// Move the underlying stream by offset from where it is, returning false if
+// it can't seek. Python streams may raise rather than return an error.
+static bool deflateio_stream_seek(mp_obj_deflateio_t *self, const mp_stream_p_t *stream, mp_int_t offset) {
+    if (stream->ioctl == NULL) {
+        return false;
+    }
+    struct mp_stream_seek_t seek = { .offset = offset, .whence = MP_SEEK_CUR };
+    int err;
+    bool ok = false;
+    nlr_buf_t nlr;
+    if (nlr_push(&nlr) == 0) {
+        ok = stream->ioctl(self->stream, MP_STREAM_SEEK, (uintptr_t)&seek, &err) != MP_STREAM_ERROR;
+        nlr_pop();
+    }
+    return ok;
+}
+
+// Set the default bufsize, if none was given, once the stream is known to
+// support reading or writing.
+static void deflateio_init_bufsize(mp_obj_deflateio_t *self, const mp_stream_p_t *stream) {
+    if (self->bufsize_unset) {
+        self->bufsize_unset = false;
+        self->bufsize = deflateio_stream_seek(self, stream, 0) ? DEFLATEIO_DEFAULT_BUFSIZE : 0;
+    }
+}
+
+static void deflateio_read_done(mp_obj_deflateio_t *self) {
+    // Input that was read ahead of the end of the compressed data belongs to
+    // whatever follows it, so if possible seek the stream back to it.
+    mp_int_t unused = self->read->decomp.source_limit - self->read->decomp.source;
+    if (unused > 0) {
+        deflateio_stream_seek(self, mp_get_stream(self->stream), -unused);
+    }
 }
 
 static bool deflateio_init_read(mp_obj_deflateio_t *self) {
@@ -105,9 +164,11 @@ static bool deflateio_init_read(mp_obj_deflateio_t *self) {
         return true;
     }
 
-    mp_get_stream_raise(self->stream, MP_STREAM_OP_READ);
+    const mp_stream_p_t *stream = mp_get_stream_raise(self->stream, MP_STREAM_OP_READ);
+    deflateio_init_bufsize(self, stream);
 
     self->read = m_new_obj(mp_obj_deflateio_read_t);
+    self->read->buf = self->bufsize > 0 ? m_new(uint8_t, self->bufsize) : NULL;
     memset(&self->read->decomp, 0, sizeof(self->read->decomp));
     self->read->decomp.source_read_data = self;
     self->read->decomp.source_read_cb = deflateio_read_stream;
@@ -151,13 +212,37 @@ static bool deflateio_init_read(mp_obj_deflateio_t *self) {
 }
 
 #if MICROPY_PY_DEFLATE_COMPRESS
+static void deflateio_write_stream(mp_obj_deflateio_t *self, const uint8_t *buf, size_t len) {
+    const mp_stream_p_t *stream = mp_get_stream(self->stream);
+    while (len > 0) {
+        int err;
+        mp_uint_t ret = stream->write(self->stream, buf, len, &err);
+        if (ret == MP_STREAM_ERROR) {
+            mp_raise_OSError(err);
+        }
+        if (ret == 0) {
+            break;
+        }
+        buf += ret;
+        len -= ret;
+    }
+}
+
+static void deflateio_write_flush(mp_obj_deflateio_t *self) {
+    size_t len = self->write->buf_len;
+    self->write->buf_len = 0;
+    deflateio_write_stream(self, self->write->buf, len);
+}
+
 static void deflateio_out_byte(void *data, uint8_t b) {
     mp_obj_deflateio_t *self = data;
-    const mp_stream_p_t *stream = mp_get_stream(self->stream);
-    int err;
-    mp_uint_t ret = stream->write(self->stream, &b, 1, &err);
-    if (ret == MP_STREAM_ERROR) {
-        mp_raise_OSError(err);
+    if (self->bufsize == 0) {
+        deflateio_write_stream(self, &b, 1);
+        return;
+    }
+    self->write->buf[self->write->buf_len++] = b;
+    if (self->write->buf_len == self->bufsize) {
+        deflateio_write_flush(self);
     }
 }
 
@@ -167,8 +252,11 @@ static bool deflateio_init_write(mp_obj_deflateio_t *self) {
     }
 
     const mp_stream_p_t *stream = mp_get_stream_raise(self->stream, MP_STREAM_OP_WRITE);
+    deflateio_init_bufsize(self, stream);
 
     self->write = m_new_obj(mp_obj_deflateio_write_t);
+    self->write->buf = self->bufsize > 0 ? m_new(uint8_t, self->bufsize) : NULL;
+    self->write->buf_len = 0;
     self->write->input_len = 0;
 
     int wbits = self->window_bits;
@@ -215,11 +303,14 @@ static bool deflateio_init_write(mp_obj_deflateio_t *self) {
 #endif
 
 static mp_obj_t deflateio_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *args_in) {
-    // args: stream, format=NONE, wbits=0, close=False
-    mp_arg_check_num(n_args, n_kw, 1, 4, false);
+    // args: stream, format=NONE, wbits=0, close=False, bufsize=None
+    mp_arg_check_num(n_args, n_kw, 1, 5, false);
 
     mp_int_t format = n_args > 1 ? mp_obj_get_int(args_in[1]) : DEFLATEIO_FORMAT_AUTO;
     mp_int_t wbits = n_args > 2 ? mp_obj_get_int(args_in[2]) : 0;
+    // The default bufsize depends on the stream, see deflateio_init_bufsize().
+    bool bufsize_unset = n_args <= 4 || args_in[4] == mp_const_none;
+    mp_int_t bufsize = bufsize_unset ? 0 : mp_obj_get_int(args_in[4]);
 
     if (format < DEFLATEIO_FORMAT_MIN || format > DEFLATEIO_FORMAT_MAX) {
         mp_raise_ValueError(MP_ERROR_TEXT("format"));
@@ -227,11 +318,16 @@ static mp_obj_t deflateio_make_new(const mp_obj_type_t *type, size_t n_args, siz
     if (wbits != 0 && (wbits < 5 || wbits > 15)) {
         mp_raise_ValueError(MP_ERROR_TEXT("wbits"));
     }
+    if (bufsize < 0) {
+        mp_raise_ValueError(MP_ERROR_TEXT("bufsize"));
+    }
 
     mp_obj_deflateio_t *self = mp_obj_malloc(mp_obj_deflateio_t, type);
     self->stream = args_in[0];
     self->format = format;
     self->window_bits = wbits;
+    self->bufsize_unset = bufsize_unset;
+    self->bufsize = bufsize;
     self->read = NULL;
     #if MICROPY_PY_DEFLATE_COMPRESS
     self->write = NULL;
@@ -258,6 +354,7 @@ static mp_uint_t deflateio_read(mp_obj_t o_in, void *buf, mp_uint_t size, int *e
     int st = uzlib_uncompress_chksum(&self->read->decomp);
     if (st == UZLIB_DONE) {
         self->read->eof = true;
+        deflateio_read_done(self);
     }
     if (st < 0) {
         DEBUG_printf("uncompress error=" INT_FMT "\n", st);
@@ -303,15 +400,24 @@ static inline void put_be32(char *buf, uint32_t value) {
 #endif
 
 static mp_uint_t deflateio_ioctl(mp_obj_t self_in, mp_uint_t request, uintptr_t arg, int *errcode) {
-    if (request == MP_STREAM_CLOSE) {
-        mp_obj_deflateio_t *self = MP_OBJ_TO_PTR(self_in);
-
+    mp_obj_deflateio_t *self = MP_OBJ_TO_PTR(self_in);
+    if (request == MP_STREAM_FLUSH) {
+        // Write out the compressed data buffered so far.  This doesn't end the
+        // current deflate block, so the output is still not complete.
+        #if MICROPY_PY_DEFLATE_COMPRESS
+        if (self->stream != MP_OBJ_NULL && self->write) {
+            deflateio_write_flush(self);
+        }
+        #endif
+        return 0;
+    } else if (request == MP_STREAM_CLOSE) {
         mp_uint_t ret = 0;
 
         if (self->stream != MP_OBJ_NULL) {
             #if MICROPY_PY_DEFLATE_COMPRESS
             if (self->write) {
                 uzlib_finish_block(&self->write->lz77);
+                deflateio_write_flush(self);
 
                 const mp_stream_p_t *stream = mp_get_stream(self->stream);
 
@@ -366,6 +472,7 @@ static const mp_rom_map_elem_t deflateio_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_readline), MP_ROM_PTR(&mp_stream_unbuffered_readline_obj) },
     #if MICROPY_PY_DEFLATE_COMPRESS
     { MP_ROM_QSTR(MP_QSTR_write), MP_ROM_PTR(&mp_stream_write_obj) },
+    { MP_ROM_QSTR(MP_QSTR_flush), MP_ROM_PTR(&mp_stream_flush_obj) },
     #endif
     { MP_ROM_QSTR(MP_QSTR_close), MP_ROM_PTR(&mp_stream_close_obj) },
     { MP_ROM_QSTR(MP_QSTR___enter__), MP_ROM_PTR(&mp_identity_obj) },
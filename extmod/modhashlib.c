@@ -28,6 +28,8 @@
 #include <string.h>
 
 #include "py/runtime.h"
+#include "py/objarray.h"
+#include "py/stream.h"
 
 #if MICROPY_PY_HASHLIB
 
@@ -70,6 +72,15 @@ static void hashlib_ensure_not_final(mp_obj_hash_t *self) {
     }
 }
 
+// Allocate a new hash object of the same type as self, for copy() to fill in
+// the state.
+static mp_obj_hash_t *hashlib_new_copy(mp_obj_hash_t *self, size_t state_size) {
+    hashlib_ensure_not_final(self);
+    mp_obj_hash_t *o = mp_obj_malloc_var(mp_obj_hash_t, state, char, state_size, self->base.type);
+    o->final = false;
+    return o;
+}
+
 #if MICROPY_PY_HASHLIB_SHA256
 static mp_obj_t hashlib_sha256_update(mp_obj_t self_in, mp_obj_t arg);
 
@@ -112,6 +123,14 @@ static mp_obj_t hashlib_sha256_digest(mp_obj_t self_in) {
     return mp_obj_new_bytes_from_vstr(&vstr);
 }
 
+static mp_obj_t hashlib_sha256_copy(mp_obj_t self_in) {
+    mp_obj_hash_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_hash_t *o = hashlib_new_copy(self, sizeof(mbedtls_sha256_context));
+    mbedtls_sha256_init((mbedtls_sha256_context *)&o->state);
+    mbedtls_sha256_clone((mbedtls_sha256_context *)&o->state, (mbedtls_sha256_context *)&self->state);
+    return MP_OBJ_FROM_PTR(o);
+}
+
 #else
 
 #include "lib/crypto-algorithms/sha256.c"
@@ -145,14 +164,23 @@ static mp_obj_t hashlib_sha256_digest(mp_obj_t self_in) {
     sha256_final((CRYAL_SHA256_CTX *)self->state, (byte *)vstr.buf);
     return mp_obj_new_bytes_from_vstr(&vstr);
 }
+
+static mp_obj_t hashlib_sha256_copy(mp_obj_t self_in) {
+    mp_obj_hash_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_hash_t *o = hashlib_new_copy(self, sizeof(CRYAL_SHA256_CTX));
+    memcpy(o->state, self->state, sizeof(CRYAL_SHA256_CTX));
+    return MP_OBJ_FROM_PTR(o);
+}
 #endif
 
 static MP_DEFINE_CONST_FUN_OBJ_2(hashlib_sha256_update_obj, hashlib_sha256_update);
 static MP_DEFINE_CONST_FUN_OBJ_1(hashlib_sha256_digest_obj, hashlib_sha256_digest);
+static MP_DEFINE_CONST_FUN_OBJ_1(hashlib_sha256_copy_obj, hashlib_sha256_copy);
 
 static const mp_rom_map_elem_t hashlib_sha256_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_update), MP_ROM_PTR(&hashlib_sha256_update_obj) },
     { MP_ROM_QSTR(MP_QSTR_digest), MP_ROM_PTR(&hashlib_sha256_digest_obj) },
+    { MP_ROM_QSTR(MP_QSTR_copy), MP_ROM_PTR(&hashlib_sha256_copy_obj) },
 };
 
 static MP_DEFINE_CONST_DICT(hashlib_sha256_locals_dict, hashlib_sha256_locals_dict_table);
@@ -199,6 +227,13 @@ static mp_obj_t hashlib_sha1_digest(mp_obj_t self_in) {
     SHA1_Final((byte *)vstr.buf, (SHA1_CTX *)self->state);
     return mp_obj_new_bytes_from_vstr(&vstr);
 }
+
+static mp_obj_t hashlib_sha1_copy(mp_obj_t self_in) {
+    mp_obj_hash_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_hash_t *o = hashlib_new_copy(self, sizeof(SHA1_CTX));
+    memcpy(o->state, self->state, sizeof(SHA1_CTX));
+    return MP_OBJ_FROM_PTR(o);
+}
 #endif
 
 #if MICROPY_SSL_MBEDTLS
@@ -240,14 +275,24 @@ static mp_obj_t hashlib_sha1_digest(mp_obj_t self_in) {
     mbedtls_sha1_free((mbedtls_sha1_context *)self->state);
     return mp_obj_new_bytes_from_vstr(&vstr);
 }
+
+static mp_obj_t hashlib_sha1_copy(mp_obj_t self_in) {
+    mp_obj_hash_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_hash_t *o = hashlib_new_copy(self, sizeof(mbedtls_sha1_context));
+    mbedtls_sha1_init((mbedtls_sha1_context *)o->state);
+    mbedtls_sha1_clone((mbedtls_sha1_context *)o->state, (mbedtls_sha1_context *)self->state);
+    return MP_OBJ_FROM_PTR(o);
+}
 #endif
 
 static MP_DEFINE_CONST_FUN_OBJ_2(hashlib_sha1_update_obj, hashlib_sha1_update);
 static MP_DEFINE_CONST_FUN_OBJ_1(hashlib_sha1_digest_obj, hashlib_sha1_digest);
+static MP_DEFINE_CONST_FUN_OBJ_1(hashlib_sha1_copy_obj, hashlib_sha1_copy);
 
 static const mp_rom_map_elem_t hashlib_sha1_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_update), MP_ROM_PTR(&hashlib_sha1_update_obj) },
     { MP_ROM_QSTR(MP_QSTR_digest), MP_ROM_PTR(&hashlib_sha1_digest_obj) },
+    { MP_ROM_QSTR(MP_QSTR_copy), MP_ROM_PTR(&hashlib_sha1_copy_obj) },
 };
 static MP_DEFINE_CONST_DICT(hashlib_sha1_locals_dict, hashlib_sha1_locals_dict_table);
 
@@ -293,6 +338,13 @@ static mp_obj_t hashlib_md5_digest(mp_obj_t self_in) {
     MD5_Final((byte *)vstr.buf, (MD5_CTX *)self->state);
     return mp_obj_new_bytes_from_vstr(&vstr);
 }
+
+static mp_obj_t hashlib_md5_copy(mp_obj_t self_in) {
+    mp_obj_hash_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_hash_t *o = hashlib_new_copy(self, sizeof(MD5_CTX));
+    memcpy(o->state, self->state, sizeof(MD5_CTX));
+    return MP_OBJ_FROM_PTR(o);
+}
 #endif // MICROPY_SSL_AXTLS
 
 #if MICROPY_SSL_MBEDTLS
@@ -334,14 +386,24 @@ static mp_obj_t hashlib_md5_digest(mp_obj_t self_in) {
     mbedtls_md5_free((mbedtls_md5_context *)self->state);
     return mp_obj_new_bytes_from_vstr(&vstr);
 }
+
+static mp_obj_t hashlib_md5_copy(mp_obj_t self_in) {
+    mp_obj_hash_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_hash_t *o = hashlib_new_copy(self, sizeof(mbedtls_md5_context));
+    mbedtls_md5_init((mbedtls_md5_context *)o->state);
+    mbedtls_md5_clone((mbedtls_md5_context *)o->state, (mbedtls_md5_context *)self->state);
+    return MP_OBJ_FROM_PTR(o);
+}
 #endif // MICROPY_SSL_MBEDTLS
 
 static MP_DEFINE_CONST_FUN_OBJ_2(hashlib_md5_update_obj, hashlib_md5_update);
 static MP_DEFINE_CONST_FUN_OBJ_1(hashlib_md5_digest_obj, hashlib_md5_digest);
+static MP_DEFINE_CONST_FUN_OBJ_1(hashlib_md5_copy_obj, hashlib_md5_copy);
 
 static const mp_rom_map_elem_t hashlib_md5_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_update), MP_ROM_PTR(&hashlib_md5_update_obj) },
     { MP_ROM_QSTR(MP_QSTR_digest), MP_ROM_PTR(&hashlib_md5_digest_obj) },
+    { MP_ROM_QSTR(MP_QSTR_copy), MP_ROM_PTR(&hashlib_md5_copy_obj) },
 };
 static MP_DEFINE_CONST_DICT(hashlib_md5_locals_dict, hashlib_md5_locals_dict_table);
 
@@ -354,8 +416,62 @@ static MP_DEFINE_CONST_OBJ_TYPE(
     );
 #endif // MICROPY_PY_HASHLIB_MD5
 
+extern const mp_obj_module_t mp_module_hashlib;
+
+// Feed a stream into a new hash object, reading it in blocks into one buffer
+// so that nothing is allocated per block.  digest is the constructor of the
+// hash, or its name.
+static mp_obj_t hashlib_file_digest(size_t n_args, const mp_obj_t *args) {
+    mp_obj_t stream = args[0];
+    mp_get_stream_raise(stream, MP_STREAM_OP_READ);
+    mp_obj_t digest = args[1];
+    if (mp_obj_is_str(digest)) {
+        // Only the hash types in this module can be named, as in CPython
+        size_t len;
+        const char *name = mp_obj_str_get_data(digest, &len);
+        qstr q = qstr_find_strn(name, len);
+        mp_map_elem_t *elem = NULL;
+        if (q != MP_QSTRnull) {
+            elem = mp_map_lookup(&mp_module_hashlib.globals->map, MP_OBJ_NEW_QSTR(q), MP_MAP_LOOKUP);
+        }
+        if (elem == NULL || !mp_obj_is_type(elem->value, &mp_type_type)) {
+            mp_raise_ValueError(MP_ERROR_TEXT("unsupported hash type"));
+        }
+        digest = elem->value;
+    }
+    mp_int_t bufsize = n_args > 2 ? mp_obj_get_int(args[2]) : 1024;
+    if (bufsize <= 0) {
+        mp_raise_ValueError(NULL);
+    }
+
+    mp_obj_t hash = mp_call_function_0(digest);
+    mp_obj_t update[3];
+    mp_load_method(hash, MP_QSTR_update, update);
+
+    // The hash is updated with a bytearray over the buffer, its length set
+    // to the number of bytes read each time.
+    byte *buf = m_new(byte, bufsize);
+    mp_obj_array_t *chunk = MP_OBJ_TO_PTR(mp_obj_new_bytearray_by_ref(bufsize, buf));
+    for (;;) {
+        int errcode;
+        mp_uint_t n = mp_stream_rw(stream, buf, bufsize, &errcode, MP_STREAM_RW_READ | MP_STREAM_RW_ONCE);
+        if (errcode != 0) {
+            mp_raise_OSError(errcode);
+        }
+        if (n == 0) {
+            break;
+        }
+        chunk->len = n;
+        update[2] = MP_OBJ_FROM_PTR(chunk);
+        mp_call_method_n_kw(1, 0, update);
+    }
+    return hash;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(hashlib_file_digest_obj, 2, 3, hashlib_file_digest);
+
 static const mp_rom_map_elem_t mp_module_hashlib_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_hashlib) },
+    { MP_ROM_QSTR(MP_QSTR_file_digest), MP_ROM_PTR(&hashlib_file_digest_obj) },
     #if MICROPY_PY_HASHLIB_SHA256
     { MP_ROM_QSTR(MP_QSTR_sha256), MP_ROM_PTR(&hashlib_sha256_type) },
     #endif
@@ -25,6 +25,7 @@
  */
 
 #include "py/objlist.h"
+#include "py/objtuple.h"
 #include "py/runtime.h"
 
 #if MICROPY_PY_HEAPQ
@@ -38,12 +39,47 @@ static mp_obj_list_t *heapq_get_heap(mp_obj_t heap_in) {
     return MP_OBJ_TO_PTR(heap_in);
 }
 
-static void heapq_heap_siftdown(mp_obj_list_t *heap, mp_uint_t start_pos, mp_uint_t pos) {
+// Returns a < b.  Heaps are commonly keyed on small ints, or on tuples that
+// start with a small int (eg (priority, task)), so those are compared here
+// without going through mp_binary_op.
+static bool heapq_lt(mp_obj_t a, mp_obj_t b) {
+    if (mp_obj_is_small_int(a) && mp_obj_is_small_int(b)) {
+        return MP_OBJ_SMALL_INT_VALUE(a) < MP_OBJ_SMALL_INT_VALUE(b);
+    }
+    if (mp_obj_is_exact_type(a, &mp_type_tuple) && mp_obj_is_exact_type(b, &mp_type_tuple)) {
+        mp_obj_tuple_t *a_tuple = MP_OBJ_TO_PTR(a);
+        mp_obj_tuple_t *b_tuple = MP_OBJ_TO_PTR(b);
+        size_t i = 0;
+        for (; i < a_tuple->len && i < b_tuple->len; ++i) {
+            mp_obj_t a_item = a_tuple->items[i];
+            mp_obj_t b_item = b_tuple->items[i];
+            if (!mp_obj_is_small_int(a_item) || !mp_obj_is_small_int(b_item)) {
+                // Let the tuple comparison do the rest.
+                break;
+            }
+            if (a_item != b_item) {
+                return MP_OBJ_SMALL_INT_VALUE(a_item) < MP_OBJ_SMALL_INT_VALUE(b_item);
+            }
+        }
+        if (i == a_tuple->len || i == b_tuple->len) {
+            return a_tuple->len < b_tuple->len;
+        }
+    }
+    return mp_obj_is_true(mp_binary_op(MP_BINARY_OP_LESS, a, b));
+}
+
+// Returns whether a goes nearer the top of the heap than b.  nsmallest uses
+// a max-heap, all other heaps are min-heaps.
+static inline bool heapq_before(mp_obj_t a, mp_obj_t b, bool max_heap) {
+    return max_heap ? heapq_lt(b, a) : heapq_lt(a, b);
+}
+
+static void heapq_heap_siftdown(mp_obj_list_t *heap, mp_uint_t start_pos, mp_uint_t pos, bool max_heap) {
     mp_obj_t item = heap->items[pos];
     while (pos > start_pos) {
         mp_uint_t parent_pos = (pos - 1) >> 1;
         mp_obj_t parent = heap->items[parent_pos];
-        if (mp_binary_op(MP_BINARY_OP_LESS, item, parent) == mp_const_true) {
+        if (heapq_before(item, parent, max_heap)) {
             heap->items[pos] = parent;
             pos = parent_pos;
         } else {
@@ -53,13 +89,13 @@ static void heapq_heap_siftdown(mp_obj_list_t *heap, mp_uint_t start_pos, mp_uin
     heap->items[pos] = item;
 }
 
-static void heapq_heap_siftup(mp_obj_list_t *heap, mp_uint_t pos) {
+static void heapq_heap_siftup(mp_obj_list_t *heap, mp_uint_t pos, bool max_heap) {
     mp_uint_t start_pos = pos;
     mp_uint_t end_pos = heap->len;
     mp_obj_t item = heap->items[pos];
     for (mp_uint_t child_pos = 2 * pos + 1; child_pos < end_pos; child_pos = 2 * pos + 1) {
         // choose right child if it's <= left child
-        if (child_pos + 1 < end_pos && mp_binary_op(MP_BINARY_OP_LESS, heap->items[child_pos], heap->items[child_pos + 1]) == mp_const_false) {
+        if (child_pos + 1 < end_pos && !heapq_before(heap->items[child_pos], heap->items[child_pos + 1], max_heap)) {
             child_pos += 1;
         }
         // bubble up the smaller child
@@ -67,13 +103,24 @@ static void heapq_heap_siftup(mp_obj_list_t *heap, mp_uint_t pos) {
         pos = child_pos;
     }
     heap->items[pos] = item;
-    heapq_heap_siftdown(heap, start_pos, pos);
+    heapq_heap_siftdown(heap, start_pos, pos, max_heap);
+}
+
+static mp_obj_t heapq_heap_pop(mp_obj_list_t *heap, bool max_heap) {
+    mp_obj_t item = heap->items[0];
+    heap->len -= 1;
+    heap->items[0] = heap->items[heap->len];
+    heap->items[heap->len] = MP_OBJ_NULL; // so we don't retain a pointer
+    if (heap->len) {
+        heapq_heap_siftup(heap, 0, max_heap);
+    }
+    return item;
 }
 
 static mp_obj_t mod_heapq_heappush(mp_obj_t heap_in, mp_obj_t item) {
     mp_obj_list_t *heap = heapq_get_heap(heap_in);
     mp_obj_list_append(heap_in, item);
-    heapq_heap_siftdown(heap, 0, heap->len - 1);
+    heapq_heap_siftdown(heap, 0, heap->len - 1, false);
     return mp_const_none;
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(mod_heapq_heappush_obj, mod_heapq_heappush);
@@ -83,32 +130,218 @@ static mp_obj_t mod_heapq_heappop(mp_obj_t heap_in) {
     if (heap->len == 0) {
         mp_raise_msg(&mp_type_IndexError, MP_ERROR_TEXT("empty heap"));
     }
-    mp_obj_t item = heap->items[0];
-    heap->len -= 1;
-    heap->items[0] = heap->items[heap->len];
-    heap->items[heap->len] = MP_OBJ_NULL; // so we don't retain a pointer
-    if (heap->len) {
-        heapq_heap_siftup(heap, 0);
+    return heapq_heap_pop(heap, false);
+}
+static MP_DEFINE_CONST_FUN_OBJ_1(mod_heapq_heappop_obj, mod_heapq_heappop);
+
+static mp_obj_t mod_heapq_heapreplace(mp_obj_t heap_in, mp_obj_t item) {
+    mp_obj_list_t *heap = heapq_get_heap(heap_in);
+    if (heap->len == 0) {
+        mp_raise_msg(&mp_type_IndexError, MP_ERROR_TEXT("empty heap"));
+    }
+    mp_obj_t smallest = heap->items[0];
+    heap->items[0] = item;
+    heapq_heap_siftup(heap, 0, false);
+    return smallest;
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(mod_heapq_heapreplace_obj, mod_heapq_heapreplace);
+
+static mp_obj_t mod_heapq_heappushpop(mp_obj_t heap_in, mp_obj_t item) {
+    mp_obj_list_t *heap = heapq_get_heap(heap_in);
+    if (heap->len != 0 && heapq_lt(heap->items[0], item)) {
+        mp_obj_t smallest = heap->items[0];
+        heap->items[0] = item;
+        heapq_heap_siftup(heap, 0, false);
+        item = smallest;
     }
     return item;
 }
-static MP_DEFINE_CONST_FUN_OBJ_1(mod_heapq_heappop_obj, mod_heapq_heappop);
+static MP_DEFINE_CONST_FUN_OBJ_2(mod_heapq_heappushpop_obj, mod_heapq_heappushpop);
 
 static mp_obj_t mod_heapq_heapify(mp_obj_t heap_in) {
     mp_obj_list_t *heap = heapq_get_heap(heap_in);
     for (mp_uint_t i = heap->len / 2; i > 0;) {
-        heapq_heap_siftup(heap, --i);
+        heapq_heap_siftup(heap, --i, false);
     }
     return mp_const_none;
 }
 static MP_DEFINE_CONST_FUN_OBJ_1(mod_heapq_heapify_obj, mod_heapq_heapify);
 
+#if MICROPY_PY_HEAPQ_NSMALLEST_MERGE
+
+// Implements nsmallest and nlargest, which return the same as
+// sorted(iterable, key=key, reverse=largest)[:n].  The n items found so far
+// are kept in a heap with the one that would be dropped next at the top, as
+// (key, order, item) tuples.  The order (negated for nlargest) makes items
+// with equal keys come out in the order they were given, as in CPython.
+static mp_obj_t heapq_nselect(size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args, bool largest) {
+    enum { ARG_n, ARG_iterable, ARG_key };
+    static const mp_arg_t allowed_args[] = {
+        { MP_QSTR_n, MP_ARG_REQUIRED | MP_ARG_INT, {.u_int = 0} },
+        { MP_QSTR_iterable, MP_ARG_REQUIRED | MP_ARG_OBJ, {.u_obj = MP_OBJ_NULL} },
+        { MP_QSTR_key, MP_ARG_OBJ, {.u_obj = mp_const_none} },
+    };
+    mp_arg_val_t args[MP_ARRAY_SIZE(allowed_args)];
+    mp_arg_parse_all(n_args, pos_args, kw_args, MP_ARRAY_SIZE(allowed_args), allowed_args, args);
+    mp_int_t n = args[ARG_n].u_int;
+    mp_obj_t key_fn = args[ARG_key].u_obj;
+
+    mp_obj_list_t *heap = MP_OBJ_TO_PTR(mp_obj_new_list(0, NULL));
+    if (n > 0) {
+        bool max_heap = !largest;
+        mp_obj_iter_buf_t iter_buf;
+        mp_obj_t iterable = mp_getiter(args[ARG_iterable].u_obj, &iter_buf);
+        mp_obj_t item;
+        for (mp_int_t order = 0; (item = mp_iternext(iterable)) != MP_OBJ_STOP_ITERATION; ++order) {
+            mp_obj_t key = key_fn == mp_const_none ? item : mp_call_function_1(key_fn, item);
+            if ((mp_int_t)heap->len < n) {
+                mp_obj_t entry[3] = { key, MP_OBJ_NEW_SMALL_INT(largest ? -order : order), item };
+                mp_obj_list_append(MP_OBJ_FROM_PTR(heap), mp_obj_new_tuple(3, entry));
+                heapq_heap_siftdown(heap, 0, heap->len - 1, max_heap);
+            } else {
+                // Only replace the top if the new item is strictly better, so
+                // that of equal items the earliest are kept.
+                mp_obj_t top_key = ((mp_obj_tuple_t *)MP_OBJ_TO_PTR(heap->items[0]))->items[0];
+                if (heapq_before(top_key, key, max_heap)) {
+                    mp_obj_t entry[3] = { key, MP_OBJ_NEW_SMALL_INT(largest ? -order : order), item };
+                    heap->items[0] = mp_obj_new_tuple(3, entry);
+                    heapq_heap_siftup(heap, 0, max_heap);
+                }
+            }
+        }
+    }
+
+    // Popping the heap gives the items from last to first.
+    mp_obj_list_t *result = MP_OBJ_TO_PTR(mp_obj_new_list(heap->len, NULL));
+    for (size_t i = heap->len; i > 0;) {
+        mp_obj_tuple_t *entry = MP_OBJ_TO_PTR(heapq_heap_pop(heap, !largest));
+        result->items[--i] = entry->items[2];
+    }
+    return MP_OBJ_FROM_PTR(result);
+}
+
+static mp_obj_t mod_heapq_nsmallest(size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args) {
+    return heapq_nselect(n_args, pos_args, kw_args, false);
+}
+static MP_DEFINE_CONST_FUN_OBJ_KW(mod_heapq_nsmallest_obj, 2, mod_heapq_nsmallest);
+
+static mp_obj_t mod_heapq_nlargest(size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args) {
+    return heapq_nselect(n_args, pos_args, kw_args, true);
+}
+static MP_DEFINE_CONST_FUN_OBJ_KW(mod_heapq_nlargest_obj, 2, mod_heapq_nlargest);
+
+// The merge iterator keeps a heap of the input iterators, ordered by their
+// current item and then by their position in the arguments.
+typedef struct _heapq_merge_input_t {
+    mp_obj_t iter;
+    mp_obj_t item;
+    mp_obj_t key;
+    size_t order;
+} heapq_merge_input_t;
+
+typedef struct _mp_obj_heapq_merge_t {
+    mp_obj_base_t base;
+    mp_obj_t key_fn;
+    bool reverse;
+    size_t len;
+    heapq_merge_input_t inputs[];
+} mp_obj_heapq_merge_t;
+
+static bool heapq_merge_before(mp_obj_heapq_merge_t *self, const heapq_merge_input_t *a, const heapq_merge_input_t *b) {
+    if (heapq_before(a->key, b->key, self->reverse)) {
+        return true;
+    }
+    return a->order < b->order && !heapq_before(b->key, a->key, self->reverse);
+}
+
+static void heapq_merge_siftup(mp_obj_heapq_merge_t *self, size_t pos) {
+    heapq_merge_input_t item = self->inputs[pos];
+    for (size_t child_pos = 2 * pos + 1; child_pos < self->len; child_pos = 2 * pos + 1) {
+        if (child_pos + 1 < self->len && heapq_merge_before(self, &self->inputs[child_pos + 1], &self->inputs[child_pos])) {
+            child_pos += 1;
+        }
+        if (!heapq_merge_before(self, &self->inputs[child_pos], &item)) {
+            break;
+        }
+        self->inputs[pos] = self->inputs[child_pos];
+        pos = child_pos;
+    }
+    self->inputs[pos] = item;
+}
+
+// Fetches the next item of the given input, returning false if it's exhausted.
+static bool heapq_merge_next(mp_obj_heapq_merge_t *self, heapq_merge_input_t *input) {
+    input->item = mp_iternext(input->iter);
+    if (input->item == MP_OBJ_STOP_ITERATION) {
+        return false;
+    }
+    input->key = self->key_fn == mp_const_none ? input->item : mp_call_function_1(self->key_fn, input->item);
+    return true;
+}
+
+static mp_obj_t heapq_merge_iternext(mp_obj_t self_in) {
+    mp_obj_heapq_merge_t *self = MP_OBJ_TO_PTR(self_in);
+    if (self->len == 0) {
+        return MP_OBJ_STOP_ITERATION;
+    }
+    mp_obj_t item = self->inputs[0].item;
+    if (!heapq_merge_next(self, &self->inputs[0])) {
+        // Drop the exhausted input.
+        self->len -= 1;
+        self->inputs[0] = self->inputs[self->len];
+        memset(&self->inputs[self->len], 0, sizeof(heapq_merge_input_t));
+    }
+    heapq_merge_siftup(self, 0);
+    return item;
+}
+
+static MP_DEFINE_CONST_OBJ_TYPE(
+    heapq_merge_type,
+    MP_QSTR_merge,
+    MP_TYPE_FLAG_ITER_IS_ITERNEXT,
+    iter, heapq_merge_iternext
+    );
+
+static mp_obj_t mod_heapq_merge(size_t n_args, const mp_obj_t *args, mp_map_t *kw_args) {
+    mp_map_elem_t *key_elem = mp_map_lookup(kw_args, MP_OBJ_NEW_QSTR(MP_QSTR_key), MP_MAP_LOOKUP);
+    mp_map_elem_t *reverse_elem = mp_map_lookup(kw_args, MP_OBJ_NEW_QSTR(MP_QSTR_reverse), MP_MAP_LOOKUP);
+    if (kw_args->used > (size_t)(key_elem != NULL) + (reverse_elem != NULL)) {
+        mp_raise_TypeError(MP_ERROR_TEXT("unexpected keyword argument"));
+    }
+    mp_obj_heapq_merge_t *self = mp_obj_malloc_var(mp_obj_heapq_merge_t, inputs, heapq_merge_input_t, n_args, &heapq_merge_type);
+    self->key_fn = key_elem == NULL ? mp_const_none : key_elem->value;
+    self->reverse = reverse_elem != NULL && mp_obj_is_true(reverse_elem->value);
+    self->len = 0;
+    for (size_t i = 0; i < n_args; ++i) {
+        heapq_merge_input_t *input = &self->inputs[self->len];
+        input->iter = mp_getiter(args[i], NULL);
+        input->order = i;
+        if (heapq_merge_next(self, input)) {
+            self->len += 1;
+        }
+    }
+    for (size_t i = self->len / 2; i > 0;) {
+        heapq_merge_siftup(self, --i);
+    }
+    return MP_OBJ_FROM_PTR(self);
+}
+static MP_DEFINE_CONST_FUN_OBJ_KW(mod_heapq_merge_obj, 0, mod_heapq_merge);
+
+#endif // MICROPY_PY_HEAPQ_NSMALLEST_MERGE
+
 #if !MICROPY_ENABLE_DYNRUNTIME
 static const mp_rom_map_elem_t mp_module_heapq_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_heapq) },
     { MP_ROM_QSTR(MP_QSTR_heappush), MP_ROM_PTR(&mod_heapq_heappush_obj) },
     { MP_ROM_QSTR(MP_QSTR_heappop), MP_ROM_PTR(&mod_heapq_heappop_obj) },
+    { MP_ROM_QSTR(MP_QSTR_heapreplace), MP_ROM_PTR(&mod_heapq_heapreplace_obj) },
+    { MP_ROM_QSTR(MP_QSTR_heappushpop), MP_ROM_PTR(&mod_heapq_heappushpop_obj) },
     { MP_ROM_QSTR(MP_QSTR_heapify), MP_ROM_PTR(&mod_heapq_heapify_obj) },
+    #if MICROPY_PY_HEAPQ_NSMALLEST_MERGE
+    { MP_ROM_QSTR(MP_QSTR_nsmallest), MP_ROM_PTR(&mod_heapq_nsmallest_obj) },
+    { MP_ROM_QSTR(MP_QSTR_nlargest), MP_ROM_PTR(&mod_heapq_nlargest_obj) },
+    { MP_ROM_QSTR(MP_QSTR_merge), MP_ROM_PTR(&mod_heapq_merge_obj) },
+    #endif
 };
 
 static MP_DEFINE_CONST_DICT(mp_module_heapq_globals, mp_module_heapq_globals_table);
@@ -582,8 +582,13 @@ static err_t _lwip_tcp_recv(void *arg, struct tcp_pcb *tcpb, struct pbuf *p, err
 // Functions for socket send/receive operations. Socket send/recv and friends call
 // these to do the work.
 
-// Helper function for send/sendto to handle raw/UDP packets.
-static mp_uint_t lwip_raw_udp_send(lwip_socket_obj_t *socket, const byte *buf, mp_uint_t len, ip_addr_t *ip, mp_uint_t port, int *_errno) {
+// Helper function for send/sendto/sendmsg to handle raw/UDP packets.  The
+// buffers are sent as one packet.
+static mp_uint_t lwip_raw_udp_sendv(lwip_socket_obj_t *socket, const mp_buffer_info_t *bufs, size_t nbufs, ip_addr_t *ip, mp_uint_t port, int *_errno) {
+    mp_uint_t len = 0;
+    for (size_t i = 0; i < nbufs; ++i) {
+        len += bufs[i].len;
+    }
     if (len > 0xffff) {
         // Any packet that big is probably going to fail the pbuf_alloc anyway, but may as well try
         len = 0xffff;
@@ -599,7 +604,13 @@ static mp_uint_t lwip_raw_udp_send(lwip_socket_obj_t *socket, const byte *buf, m
         return -1;
     }
 
-    memcpy(p->payload, buf, len);
+    byte *payload = p->payload;
+    mp_uint_t copied = 0;
+    for (size_t i = 0; i < nbufs && copied < len; ++i) {
+        mp_uint_t n = MIN(bufs[i].len, len - copied);
+        memcpy(payload + copied, bufs[i].buf, n);
+        copied += n;
+    }
 
     err_t err;
     if (ip == NULL) {
@@ -637,6 +648,11 @@ static mp_uint_t lwip_raw_udp_send(lwip_socket_obj_t *socket, const byte *buf, m
     return len;
 }
 
+static mp_uint_t lwip_raw_udp_send(lwip_socket_obj_t *socket, const byte *buf, mp_uint_t len, ip_addr_t *ip, mp_uint_t port, int *_errno) {
+    mp_buffer_info_t bufinfo = { .buf = (void *)buf, .len = len };
+    return lwip_raw_udp_sendv(socket, &bufinfo, 1, ip, port, _errno);
+}
+
 // Helper function for recv/recvfrom to handle raw/UDP packets
 static mp_uint_t lwip_raw_udp_receive(lwip_socket_obj_t *socket, byte *buf, mp_uint_t len, byte *ip, mp_uint_t *port, int *_errno) {
 
@@ -694,8 +710,10 @@ static mp_uint_t lwip_raw_udp_receive(lwip_socket_obj_t *socket, byte *buf, mp_u
     assert(socket->pcb.tcp);
 
 
-// Helper function for send/sendto to handle TCP packets
-static mp_uint_t lwip_tcp_send(lwip_socket_obj_t *socket, const byte *buf, mp_uint_t len, int *_errno) {
+// Helper function for send/sendto/sendmsg to handle TCP packets.  As much of
+// the buffers as fits in the send buffer is queued, in order, and the number
+// of bytes queued is returned.
+static mp_uint_t lwip_tcp_sendv(lwip_socket_obj_t *socket, const mp_buffer_info_t *bufs, size_t nbufs, int *_errno) {
     // Check for any pending errors
     STREAM_ERROR_CHECK(socket);
 
@@ -738,26 +756,48 @@ static mp_uint_t lwip_tcp_send(lwip_socket_obj_t *socket, const byte *buf, mp_ui
         STREAM_ERROR_CHECK_WITH_LOCK(socket);
     }
 
-    u16_t write_len = MIN(available, len);
+    mp_uint_t total = 0;
+    err_t err = ERR_OK;
+    for (size_t b = 0; b < nbufs; ++b) {
+        u16_t write_len = MIN(available, bufs[b].len);
 
-    // If tcp_write returns ERR_MEM then there's currently not enough memory to
-    // queue the write, so wait and keep trying until it succeeds (with 10s limit).
-    // Note: if the socket is non-blocking then this code will actually block until
-    // there's enough memory to do the write, but by this stage we have already
-    // committed to being able to write the data.
-    err_t err;
-    for (int i = 0; i < 200; ++i) {
-        err = tcp_write(socket->pcb.tcp, buf, write_len, TCP_WRITE_FLAG_COPY);
-        if (err != ERR_MEM) {
-            break;
+        // When more data follows, TCP_WRITE_FLAG_MORE lets lwIP fill the same
+        // segments with it, and not set PSH until the last of it
+        u8_t flags = TCP_WRITE_FLAG_COPY;
+        if (b + 1 < nbufs && write_len < available) {
+            flags |= TCP_WRITE_FLAG_MORE;
+        }
+
+        // If tcp_write returns ERR_MEM then there's currently not enough memory to
+        // queue the write, so wait and keep trying until it succeeds (with 10s limit).
+        // Note: if the socket is non-blocking then this code will actually block until
+        // there's enough memory to do the write, but by this stage we have already
+        // committed to being able to write the data.
+        for (int i = 0; i < 200; ++i) {
+            err = tcp_write(socket->pcb.tcp, bufs[b].buf, write_len, flags);
+            if (err != ERR_MEM) {
+                break;
+            }
+            err = tcp_output(socket->pcb.tcp);
+            if (err != ERR_OK) {
+                break;
+            }
+            MICROPY_PY_LWIP_EXIT
+            mp_hal_delay_ms(50);
+            MICROPY_PY_LWIP_REENTER
         }
-        err = tcp_output(socket->pcb.tcp);
         if (err != ERR_OK) {
+            if (total > 0) {
+                // Send what was queued from the earlier buffers, as a short write
+                err = ERR_OK;
+            }
+            break;
+        }
+        total += write_len;
+        available -= write_len;
+        if (write_len < bufs[b].len) {
             break;
         }
-        MICROPY_PY_LWIP_EXIT
-        mp_hal_delay_ms(50);
-        MICROPY_PY_LWIP_REENTER
     }
 
     // Use nagle algorithm to determine when to send segment buffer (can be
@@ -773,7 +813,12 @@ static mp_uint_t lwip_tcp_send(lwip_socket_obj_t *socket, const byte *buf, mp_ui
         return MP_STREAM_ERROR;
     }
 
-    return write_len;
+    return total;
+}
+
+static mp_uint_t lwip_tcp_send(lwip_socket_obj_t *socket, const byte *buf, mp_uint_t len, int *_errno) {
+    mp_buffer_info_t bufinfo = { .buf = (void *)buf, .len = len };
+    return lwip_tcp_sendv(socket, &bufinfo, 1, _errno);
 }
 
 // Helper function for recv/recvfrom to handle TCP packets
@@ -1217,32 +1262,62 @@ static mp_obj_t lwip_socket_send(mp_obj_t self_in, mp_obj_t buf_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(lwip_socket_send_obj, lwip_socket_send);
 
-static mp_obj_t lwip_socket_recv(mp_obj_t self_in, mp_obj_t len_in) {
-    lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(self_in);
+// Receive into buf for the recv methods, setting ip and port to the address
+// the data came from if ip isn't NULL.
+static mp_uint_t lwip_socket_recvfrom_buf(lwip_socket_obj_t *socket, byte *buf, mp_uint_t len, byte *ip, mp_uint_t *port) {
     int _errno;
 
     lwip_socket_check_connected(socket);
 
-    mp_int_t len = mp_obj_get_int(len_in);
-    vstr_t vstr;
-    vstr_init_len(&vstr, len);
-
     mp_uint_t ret = 0;
     switch (socket->type) {
         case MOD_NETWORK_SOCK_STREAM: {
-            ret = lwip_tcp_receive(socket, (byte *)vstr.buf, len, &_errno);
+            if (ip != NULL) {
+                memcpy(ip, &socket->peer, sizeof(socket->peer));
+                *port = (mp_uint_t)socket->peer_port;
+            }
+            ret = lwip_tcp_receive(socket, buf, len, &_errno);
             break;
         }
         case MOD_NETWORK_SOCK_DGRAM:
         #if MICROPY_PY_LWIP_SOCK_RAW
         case MOD_NETWORK_SOCK_RAW:
         #endif
-            ret = lwip_raw_udp_receive(socket, (byte *)vstr.buf, len, NULL, NULL, &_errno);
+            ret = lwip_raw_udp_receive(socket, buf, len, ip, port, &_errno);
             break;
     }
     if (ret == -1) {
         mp_raise_OSError(_errno);
     }
+    return ret;
+}
+
+// Get the buffer to receive into for an _into method, limited to nbytes if
+// given and non-zero
+static void lwip_socket_get_into_buffer(qstr method, size_t n_args, const mp_obj_t *args, mp_buffer_info_t *bufinfo) {
+    mp_get_buffer_raise(args[1], bufinfo, MP_BUFFER_WRITE);
+    if (n_args > 2) {
+        mp_int_t n = mp_obj_get_int(args[2]);
+        if (n < 0) {
+            mp_raise_msg_varg(&mp_type_ValueError, MP_ERROR_TEXT("negative buffersize in %q"), method);
+        }
+        if ((size_t)n > bufinfo->len) {
+            mp_raise_ValueError(MP_ERROR_TEXT("nbytes is greater than the length of the buffer"));
+        }
+        if (n > 0) {
+            bufinfo->len = n;
+        }
+    }
+}
+
+static mp_obj_t lwip_socket_recv(mp_obj_t self_in, mp_obj_t len_in) {
+    lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(self_in);
+
+    mp_int_t len = mp_obj_get_int(len_in);
+    vstr_t vstr;
+    vstr_init_len(&vstr, len);
+
+    mp_uint_t ret = lwip_socket_recvfrom_buf(socket, (byte *)vstr.buf, len, NULL, NULL);
 
     if (ret == 0) {
         return mp_const_empty_bytes;
@@ -1252,6 +1327,17 @@ static mp_obj_t lwip_socket_recv(mp_obj_t self_in, mp_obj_t len_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(lwip_socket_recv_obj, lwip_socket_recv);
 
+static mp_obj_t lwip_socket_recv_into(size_t n_args, const mp_obj_t *args) {
+    lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(args[0]);
+    mp_buffer_info_t bufinfo;
+    lwip_socket_get_into_buffer(MP_QSTR_recv_into, n_args, args, &bufinfo);
+
+    mp_uint_t ret = lwip_socket_recvfrom_buf(socket, bufinfo.buf, bufinfo.len, NULL, NULL);
+
+    return mp_obj_new_int_from_uint(ret);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(lwip_socket_recv_into_obj, 2, 3, lwip_socket_recv_into);
+
 static mp_obj_t lwip_socket_sendto(mp_obj_t self_in, mp_obj_t data_in, mp_obj_t addr_in) {
     lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(self_in);
     int _errno;
@@ -1287,9 +1373,6 @@ static MP_DEFINE_CONST_FUN_OBJ_3(lwip_socket_sendto_obj, lwip_socket_sendto);
 
 static mp_obj_t lwip_socket_recvfrom(mp_obj_t self_in, mp_obj_t len_in) {
     lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(self_in);
-    int _errno;
-
-    lwip_socket_check_connected(socket);
 
     mp_int_t len = mp_obj_get_int(len_in);
     vstr_t vstr;
@@ -1297,24 +1380,7 @@ static mp_obj_t lwip_socket_recvfrom(mp_obj_t self_in, mp_obj_t len_in) {
     byte ip[4];
     mp_uint_t port;
 
-    mp_uint_t ret = 0;
-    switch (socket->type) {
-        case MOD_NETWORK_SOCK_STREAM: {
-            memcpy(ip, &socket->peer, sizeof(socket->peer));
-            port = (mp_uint_t)socket->peer_port;
-            ret = lwip_tcp_receive(socket, (byte *)vstr.buf, len, &_errno);
-            break;
-        }
-        case MOD_NETWORK_SOCK_DGRAM:
-        #if MICROPY_PY_LWIP_SOCK_RAW
-        case MOD_NETWORK_SOCK_RAW:
-        #endif
-            ret = lwip_raw_udp_receive(socket, (byte *)vstr.buf, len, ip, &port, &_errno);
-            break;
-    }
-    if (ret == -1) {
-        mp_raise_OSError(_errno);
-    }
+    mp_uint_t ret = lwip_socket_recvfrom_buf(socket, (byte *)vstr.buf, len, ip, &port);
 
     mp_obj_t tuple[2];
     if (ret == 0) {
@@ -1328,6 +1394,23 @@ static mp_obj_t lwip_socket_recvfrom(mp_obj_t self_in, mp_obj_t len_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(lwip_socket_recvfrom_obj, lwip_socket_recvfrom);
 
+static mp_obj_t lwip_socket_recvfrom_into(size_t n_args, const mp_obj_t *args) {
+    lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(args[0]);
+    mp_buffer_info_t bufinfo;
+    lwip_socket_get_into_buffer(MP_QSTR_recvfrom_into, n_args, args, &bufinfo);
+    byte ip[4];
+    mp_uint_t port;
+
+    mp_uint_t ret = lwip_socket_recvfrom_buf(socket, bufinfo.buf, bufinfo.len, ip, &port);
+
+    mp_obj_t tuple[2] = {
+        mp_obj_new_int_from_uint(ret),
+        netutils_format_inet_addr(ip, port, NETUTILS_BIG),
+    };
+    return mp_obj_new_tuple(2, tuple);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(lwip_socket_recvfrom_into_obj, 2, 3, lwip_socket_recvfrom_into);
+
 static mp_obj_t lwip_socket_sendall(mp_obj_t self_in, mp_obj_t buf_in) {
     lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(self_in);
     lwip_socket_check_connected(socket);
@@ -1370,6 +1453,51 @@ static mp_obj_t lwip_socket_sendall(mp_obj_t self_in, mp_obj_t buf_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(lwip_socket_sendall_obj, lwip_socket_sendall);
 
+// Send the buffers as if they had been joined, without joining them: TCP data
+// is queued from each buffer in turn and UDP data copied into one packet.
+static mp_obj_t lwip_socket_sendmsg(mp_obj_t self_in, mp_obj_t buffers_in) {
+    lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(self_in);
+    int _errno;
+
+    lwip_socket_check_connected(socket);
+
+    // Get the list of data buffer(s) to send, skipping zero-length buffers
+    size_t nitems;
+    mp_obj_t *items;
+    mp_obj_get_array(buffers_in, &nitems, &items);
+    size_t nbufs = 0;
+    mp_buffer_info_t *bufs = mp_local_alloc((nitems == 0 ? 1 : nitems) * sizeof(mp_buffer_info_t));
+    for (size_t i = 0; i < nitems; ++i) {
+        mp_get_buffer_raise(items[i], &bufs[nbufs], MP_BUFFER_READ);
+        if (bufs[nbufs].len > 0) {
+            ++nbufs;
+        }
+    }
+
+    mp_uint_t ret = 0;
+    switch (socket->type) {
+        case MOD_NETWORK_SOCK_STREAM: {
+            if (nbufs > 0) {
+                ret = lwip_tcp_sendv(socket, bufs, nbufs, &_errno);
+            }
+            break;
+        }
+        case MOD_NETWORK_SOCK_DGRAM:
+        #if MICROPY_PY_LWIP_SOCK_RAW
+        case MOD_NETWORK_SOCK_RAW:
+        #endif
+            ret = lwip_raw_udp_sendv(socket, bufs, nbufs, NULL, 0, &_errno);
+            break;
+    }
+    mp_local_free(bufs);
+    if (ret == -1) {
+        mp_raise_OSError(_errno);
+    }
+
+    return mp_obj_new_int_from_uint(ret);
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(lwip_socket_sendmsg_obj, lwip_socket_sendmsg);
+
 static mp_obj_t lwip_socket_settimeout(mp_obj_t self_in, mp_obj_t timeout_in) {
     lwip_socket_obj_t *socket = MP_OBJ_TO_PTR(self_in);
     mp_uint_t timeout;
@@ -1644,9 +1772,12 @@ static const mp_rom_map_elem_t lwip_socket_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_connect), MP_ROM_PTR(&lwip_socket_connect_obj) },
     { MP_ROM_QSTR(MP_QSTR_send), MP_ROM_PTR(&lwip_socket_send_obj) },
     { MP_ROM_QSTR(MP_QSTR_recv), MP_ROM_PTR(&lwip_socket_recv_obj) },
+    { MP_ROM_QSTR(MP_QSTR_recv_into), MP_ROM_PTR(&lwip_socket_recv_into_obj) },
     { MP_ROM_QSTR(MP_QSTR_sendto), MP_ROM_PTR(&lwip_socket_sendto_obj) },
     { MP_ROM_QSTR(MP_QSTR_recvfrom), MP_ROM_PTR(&lwip_socket_recvfrom_obj) },
+    { MP_ROM_QSTR(MP_QSTR_recvfrom_into), MP_ROM_PTR(&lwip_socket_recvfrom_into_obj) },
     { MP_ROM_QSTR(MP_QSTR_sendall), MP_ROM_PTR(&lwip_socket_sendall_obj) },
+    { MP_ROM_QSTR(MP_QSTR_sendmsg), MP_ROM_PTR(&lwip_socket_sendmsg_obj) },
     { MP_ROM_QSTR(MP_QSTR_settimeout), MP_ROM_PTR(&lwip_socket_settimeout_obj) },
     { MP_ROM_QSTR(MP_QSTR_setblocking), MP_ROM_PTR(&lwip_socket_setblocking_obj) },
     { MP_ROM_QSTR(MP_QSTR_setsockopt), MP_ROM_PTR(&lwip_socket_setsockopt_obj) },
@@ -175,15 +175,16 @@ typedef struct _mp_machine_soft_i2c_obj_t {
 
 #endif
 
-#if MICROPY_PY_MACHINE_SPI || MICROPY_PY_MACHINE_SOFTSPI || MICROPY_PY_MACHINE_PIO_SPI
-
-// SPI protocol.
+// SPI protocol.  It's declared without machine.SPI as well, for a port's
+// drivers of SPI devices and for SPI buses that aren't machine.SPI.
 typedef struct _mp_machine_spi_p_t {
     void (*init)(mp_obj_base_t *obj, size_t n_args, const mp_obj_t *pos_args, mp_map_t *kw_args);
     void (*deinit)(mp_obj_base_t *obj); // can be NULL
     void (*transfer)(mp_obj_base_t *obj, size_t len, const uint8_t *src, uint8_t *dest);
 } mp_machine_spi_p_t;
 
+#if MICROPY_PY_MACHINE_SPI || MICROPY_PY_MACHINE_SOFTSPI || MICROPY_PY_MACHINE_PIO_SPI
+
 // SoftSPI object.
 typedef struct _mp_machine_soft_spi_obj_t {
     mp_obj_base_t base;
@@ -112,6 +112,9 @@ typedef struct _mod_network_nic_protocol_t {
     int (*setsockopt)(struct _mod_network_socket_obj_t *socket, mp_uint_t level, mp_uint_t opt, const void *optval, mp_uint_t optlen, int *_errno);
     int (*settimeout)(struct _mod_network_socket_obj_t *socket, mp_uint_t timeout_ms, int *_errno);
     int (*ioctl)(struct _mod_network_socket_obj_t *socket, mp_uint_t request, mp_uint_t arg, int *_errno);
+    // Optional: send nbufs non-empty buffers on a stream socket as if they were
+    // one, without joining them
+    mp_uint_t (*sendv)(struct _mod_network_socket_obj_t *socket, const mp_buffer_info_t *bufs, size_t nbufs, int *_errno);
 } mod_network_nic_protocol_t;
 
 typedef struct _mod_network_socket_obj_t {
@@ -44,9 +44,20 @@
 #include "lib/re1.5/re1.5.h"
 
 #define FLAG_DEBUG 0x1000
+#define FLAG_LINEAR 0x2000
+
+// Compiled patterns are cached by pattern string and flags, as the module-level
+// functions compile their pattern on every call.
+#if MICROPY_ENABLE_DYNRUNTIME
+#define RE_CACHE_SIZE (0)
+#else
+#define RE_CACHE_SIZE (MICROPY_PY_RE_CACHE_SIZE)
+#endif
 
 typedef struct _mp_obj_re_t {
     mp_obj_base_t base;
+    mp_obj_t pattern;
+    mp_int_t flags;
     ByteProg re;
 } mp_obj_re_t;
 
@@ -194,6 +205,31 @@ static void re_print(const mp_print_t *print, mp_obj_t self_in, mp_print_kind_t
     mp_printf(print, "<re %p>", self);
 }
 
+// Return the memory needed to run the Pike VM for this pattern, or 0 if it
+// uses the backtracking matcher.
+static size_t re_vm_memsize(mp_obj_re_t *self, int caps_num) {
+    #if MICROPY_PY_RE_PIKEVM
+    if (self->flags & FLAG_LINEAR) {
+        return re1_5_pikevm_memsize(&self->re, caps_num);
+    }
+    #else
+    (void)self;
+    (void)caps_num;
+    #endif
+    return 0;
+}
+
+static int re_exec_prog(mp_obj_re_t *self, Subject *subj, const char **caps, int caps_num, bool is_anchored, void *vm_mem) {
+    #if MICROPY_PY_RE_PIKEVM
+    if (vm_mem != NULL) {
+        return re1_5_pikevm(&self->re, subj, caps, caps_num, is_anchored, vm_mem);
+    }
+    #else
+    (void)vm_mem;
+    #endif
+    return re1_5_recursiveloopprog(&self->re, subj, caps, caps_num, is_anchored);
+}
+
 // Note: this function can't be named re_exec because it may clash with system headers, eg on FreeBSD
 static mp_obj_t re_exec_helper(bool is_anchored, uint n_args, const mp_obj_t *args) {
     (void)n_args;
@@ -201,7 +237,9 @@ static mp_obj_t re_exec_helper(bool is_anchored, uint n_args, const mp_obj_t *ar
     if (mp_obj_is_type(args[0], (mp_obj_type_t *)&re_type)) {
         self = MP_OBJ_TO_PTR(args[0]);
     } else {
-        self = MP_OBJ_TO_PTR(mod_re_compile(1, args));
+        // Module-level function, with signature (pattern, string, flags=0)
+        mp_obj_t compile_args[2] = {args[0], n_args > 2 ? args[2] : MP_OBJ_NEW_SMALL_INT(0)};
+        self = MP_OBJ_TO_PTR(mod_re_compile(2, compile_args));
     }
     Subject subj;
     size_t len;
@@ -211,7 +249,12 @@ static mp_obj_t re_exec_helper(bool is_anchored, uint n_args, const mp_obj_t *ar
     mp_obj_match_t *match = m_new_obj_var(mp_obj_match_t, caps, char *, caps_num);
     // cast is a workaround for a bug in msvc: it treats const char** as a const pointer instead of a pointer to pointer to const char
     memset((char *)match->caps, 0, caps_num * sizeof(char *));
-    int res = re1_5_recursiveloopprog(&self->re, &subj, match->caps, caps_num, is_anchored);
+    size_t vm_size = re_vm_memsize(self, caps_num);
+    void *vm_mem = vm_size ? m_new(char, vm_size) : NULL;
+    int res = re_exec_prog(self, &subj, match->caps, caps_num, is_anchored, vm_mem);
+    if (vm_mem != NULL) {
+        m_del(char, vm_mem, vm_size);
+    }
     if (res == 0) {
         m_del_var(mp_obj_match_t, caps, char *, caps_num, match);
         return mp_const_none;
@@ -249,10 +292,12 @@ static mp_obj_t re_split(size_t n_args, const mp_obj_t *args) {
 
     mp_obj_t retval = mp_obj_new_list(0, NULL);
     const char **caps = mp_local_alloc(caps_num * sizeof(char *));
+    size_t vm_size = re_vm_memsize(self, caps_num);
+    void *vm_mem = vm_size ? m_new(char, vm_size) : NULL;
     while (true) {
         // cast is a workaround for a bug in msvc: it treats const char** as a const pointer instead of a pointer to pointer to const char
         memset((char **)caps, 0, caps_num * sizeof(char *));
-        int res = re1_5_recursiveloopprog(&self->re, &subj, caps, caps_num, false);
+        int res = re_exec_prog(self, &subj, caps, caps_num, false, vm_mem);
 
         // if we didn't have a match, or had an empty match, it's time to stop
         if (!res || caps[0] == caps[1]) {
@@ -269,6 +314,9 @@ static mp_obj_t re_split(size_t n_args, const mp_obj_t *args) {
             break;
         }
     }
+    if (vm_mem != NULL) {
+        m_del(char, vm_mem, vm_size);
+    }
     // cast is a workaround for a bug in msvc (see above)
     mp_local_free((char **)caps);
 
@@ -285,7 +333,9 @@ static mp_obj_t re_sub_helper(size_t n_args, const mp_obj_t *args) {
     if (mp_obj_is_type(args[0], (mp_obj_type_t *)&re_type)) {
         self = MP_OBJ_TO_PTR(args[0]);
     } else {
-        self = MP_OBJ_TO_PTR(mod_re_compile(1, args));
+        // Module-level function, with signature (pattern, repl, string, count=0, flags=0)
+        mp_obj_t compile_args[2] = {args[0], n_args > 4 ? args[4] : MP_OBJ_NEW_SMALL_INT(0)};
+        self = MP_OBJ_TO_PTR(mod_re_compile(2, compile_args));
     }
     mp_obj_t replace = args[1];
     mp_obj_t where = args[2];
@@ -308,11 +358,13 @@ static mp_obj_t re_sub_helper(size_t n_args, const mp_obj_t *args) {
     match->base.type = (mp_obj_type_t *)&match_type;
     match->num_matches = caps_num / 2; // caps_num counts start and end pointers
     match->str = where;
+    size_t vm_size = re_vm_memsize(self, caps_num);
+    void *vm_mem = vm_size ? m_new(char, vm_size) : NULL;
 
     for (;;) {
         // cast is a workaround for a bug in msvc: it treats const char** as a const pointer instead of a pointer to pointer to const char
         memset((char *)match->caps, 0, caps_num * sizeof(char *));
-        int res = re1_5_recursiveloopprog(&self->re, &subj, match->caps, caps_num, false);
+        int res = re_exec_prog(self, &subj, match->caps, caps_num, false, vm_mem);
 
         // If we didn't have a match, or had an empty match, it's time to stop
         if (!res || match->caps[0] == match->caps[1]) {
@@ -380,6 +432,9 @@ static mp_obj_t re_sub_helper(size_t n_args, const mp_obj_t *args) {
         }
     }
 
+    if (vm_mem != NULL) {
+        m_del(char, vm_mem, vm_size);
+    }
     mp_local_free(match);
 
     if (vstr_return.buf == NULL) {
@@ -422,20 +477,58 @@ static MP_DEFINE_CONST_OBJ_TYPE(
     );
 #endif
 
+#if RE_CACHE_SIZE
+MP_REGISTER_ROOT_POINTER(mp_obj_t re_cache[MICROPY_PY_RE_CACHE_SIZE]);
+
+// Look up a compiled pattern in the cache, which is kept in most recently
+// used order, moving it to the front if found.
+static mp_obj_t re_cache_lookup(mp_obj_t pattern, mp_int_t flags) {
+    mp_obj_t *cache = MP_STATE_VM(re_cache);
+    for (size_t i = 0; i < RE_CACHE_SIZE && cache[i] != MP_OBJ_NULL; ++i) {
+        mp_obj_re_t *o = MP_OBJ_TO_PTR(cache[i]);
+        if (o->flags == flags
+            && (o->pattern == pattern
+                || (mp_obj_get_type(o->pattern) == mp_obj_get_type(pattern)
+                    && mp_obj_str_equal(o->pattern, pattern)))) {
+            mp_obj_t found = cache[i];
+            memmove(&cache[1], &cache[0], i * sizeof(mp_obj_t));
+            cache[0] = found;
+            return found;
+        }
+    }
+    return MP_OBJ_NULL;
+}
+
+// Add a compiled pattern to the front of the cache, evicting the least
+// recently used one if it is full.
+static void re_cache_add(mp_obj_t re) {
+    mp_obj_t *cache = MP_STATE_VM(re_cache);
+    memmove(&cache[1], &cache[0], (RE_CACHE_SIZE - 1) * sizeof(mp_obj_t));
+    cache[0] = re;
+}
+#endif
+
 static mp_obj_t mod_re_compile(size_t n_args, const mp_obj_t *args) {
-    (void)n_args;
     const char *re_str = mp_obj_str_get_str(args[0]);
+    mp_int_t flags = 0;
+    if (n_args > 1) {
+        flags = mp_obj_get_int(args[1]);
+    }
+    #if RE_CACHE_SIZE
+    if (!(flags & FLAG_DEBUG)) {
+        mp_obj_t cached = re_cache_lookup(args[0], flags);
+        if (cached != MP_OBJ_NULL) {
+            return cached;
+        }
+    }
+    #endif
     int size = re1_5_sizecode(re_str);
     if (size == -1) {
         goto error;
     }
     mp_obj_re_t *o = mp_obj_malloc_var(mp_obj_re_t, re.insts, char, size, (mp_obj_type_t *)&re_type);
-    #if MICROPY_PY_RE_DEBUG
-    int flags = 0;
-    if (n_args > 1) {
-        flags = mp_obj_get_int(args[1]);
-    }
-    #endif
+    o->pattern = args[0];
+    o->flags = flags;
     int error = re1_5_compilecode(&o->re, re_str);
     if (error != 0) {
     error:
@@ -446,6 +539,11 @@ static mp_obj_t mod_re_compile(size_t n_args, const mp_obj_t *args) {
         re1_5_dumpcode(&o->re);
     }
     #endif
+    #if RE_CACHE_SIZE
+    if (!(flags & FLAG_DEBUG)) {
+        re_cache_add(MP_OBJ_FROM_PTR(o));
+    }
+    #endif
     return MP_OBJ_FROM_PTR(o);
 }
 MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mod_re_compile_obj, 1, 2, mod_re_compile);
@@ -462,6 +560,9 @@ static const mp_rom_map_elem_t mp_module_re_globals_table[] = {
     #if MICROPY_PY_RE_DEBUG
     { MP_ROM_QSTR(MP_QSTR_DEBUG), MP_ROM_INT(FLAG_DEBUG) },
     #endif
+    #if MICROPY_PY_RE_PIKEVM
+    { MP_ROM_QSTR(MP_QSTR_LINEAR), MP_ROM_INT(FLAG_LINEAR) },
+    #endif
 };
 
 static MP_DEFINE_CONST_DICT(mp_module_re_globals, mp_module_re_globals_table);
@@ -481,6 +582,9 @@ MP_REGISTER_EXTENSIBLE_MODULE(MP_QSTR_re, mp_module_re);
 
 #include "lib/re1.5/compilecode.c"
 #include "lib/re1.5/recursiveloop.c"
+#if MICROPY_PY_RE_PIKEVM
+#include "lib/re1.5/pikevm.c"
+#endif
 #include "lib/re1.5/charclass.c"
 
 #if MICROPY_PY_RE_DEBUG
@@ -235,7 +235,7 @@ static mp_obj_t socket_send(mp_obj_t self_in, mp_obj_t buf_in) {
     mp_get_buffer_raise(buf_in, &bufinfo, MP_BUFFER_READ);
     int _errno;
     mp_uint_t ret = self->nic_protocol->send(self, bufinfo.buf, bufinfo.len, &_errno);
-    if (ret == -1) {
+    if (ret == MP_STREAM_ERROR) {
         mp_raise_OSError(_errno);
     }
     return mp_obj_new_int_from_uint(ret);
@@ -255,7 +255,7 @@ static mp_obj_t socket_sendall(mp_obj_t self_in, mp_obj_t buf_in) {
     mp_uint_t ret = 0;
     if (self->timeout == 0) {
         ret = self->nic_protocol->send(self, bufinfo.buf, bufinfo.len, &_errno);
-        if (ret == -1) {
+        if (ret == MP_STREAM_ERROR) {
             mp_raise_OSError(_errno);
         } else if (bufinfo.len > ret) {
             mp_raise_OSError(MP_EAGAIN);
@@ -265,7 +265,7 @@ static mp_obj_t socket_sendall(mp_obj_t self_in, mp_obj_t buf_in) {
         // entire sendall() operation, not to individual send() chunks.
         while (bufinfo.len != 0) {
             ret = self->nic_protocol->send(self, bufinfo.buf, bufinfo.len, &_errno);
-            if (ret == -1) {
+            if (ret == MP_STREAM_ERROR) {
                 mp_raise_OSError(_errno);
             }
             bufinfo.len -= ret;
@@ -276,6 +276,72 @@ static mp_obj_t socket_sendall(mp_obj_t self_in, mp_obj_t buf_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(socket_sendall_obj, socket_sendall);
 
+// method socket.sendmsg(buffers)
+static mp_obj_t socket_sendmsg(mp_obj_t self_in, mp_obj_t buffers_in) {
+    mod_network_socket_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    if (self->nic == MP_OBJ_NULL) {
+        // not connected
+        mp_raise_OSError(MP_EPIPE);
+    }
+
+    // Get the list of data buffer(s) to send, skipping zero-length buffers
+    size_t nitems;
+    mp_obj_t *items;
+    mp_obj_get_array(buffers_in, &nitems, &items);
+    size_t nbufs = 0;
+    size_t total = 0;
+    mp_buffer_info_t *bufs = mp_local_alloc((nitems == 0 ? 1 : nitems) * sizeof(mp_buffer_info_t));
+    for (size_t i = 0; i < nitems; ++i) {
+        mp_get_buffer_raise(items[i], &bufs[nbufs], MP_BUFFER_READ);
+        if (bufs[nbufs].len > 0) {
+            total += bufs[nbufs++].len;
+        }
+    }
+
+    int _errno;
+    mp_uint_t ret;
+    if (nbufs == 0) {
+        ret = 0;
+    } else if (nbufs == 1) {
+        ret = self->nic_protocol->send(self, bufs[0].buf, total, &_errno);
+    } else if (self->type == MOD_NETWORK_SOCK_STREAM && self->nic_protocol->sendv != NULL) {
+        ret = self->nic_protocol->sendv(self, bufs, nbufs, &_errno);
+    } else if (self->type == MOD_NETWORK_SOCK_STREAM) {
+        // Send the buffers in turn, stopping at a short write
+        ret = 0;
+        for (size_t i = 0; i < nbufs; ++i) {
+            mp_uint_t n = self->nic_protocol->send(self, bufs[i].buf, bufs[i].len, &_errno);
+            if (n == MP_STREAM_ERROR) {
+                // Report the error only if nothing was sent
+                if (i == 0) {
+                    ret = -1;
+                }
+                break;
+            }
+            ret += n;
+            if (n < bufs[i].len) {
+                break;
+            }
+        }
+    } else {
+        // A datagram must be sent in one piece, so join the buffers
+        vstr_t vstr;
+        vstr_init(&vstr, total);
+        for (size_t i = 0; i < nbufs; ++i) {
+            vstr_add_strn(&vstr, bufs[i].buf, bufs[i].len);
+        }
+        ret = self->nic_protocol->send(self, (byte *)vstr.buf, total, &_errno);
+        vstr_clear(&vstr);
+    }
+    mp_local_free(bufs);
+
+    if (ret == MP_STREAM_ERROR) {
+        mp_raise_OSError(_errno);
+    }
+    return mp_obj_new_int_from_uint(ret);
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(socket_sendmsg_obj, socket_sendmsg);
+
 // method socket.recv(bufsize)
 static mp_obj_t socket_recv(mp_obj_t self_in, mp_obj_t len_in) {
     mod_network_socket_obj_t *self = MP_OBJ_TO_PTR(self_in);
@@ -288,7 +354,7 @@ static mp_obj_t socket_recv(mp_obj_t self_in, mp_obj_t len_in) {
     vstr_init_len(&vstr, len);
     int _errno;
     mp_uint_t ret = self->nic_protocol->recv(self, (byte *)vstr.buf, len, &_errno);
-    if (ret == -1) {
+    if (ret == MP_STREAM_ERROR) {
         mp_raise_OSError(_errno);
     }
     if (ret == 0) {
@@ -299,6 +365,42 @@ static mp_obj_t socket_recv(mp_obj_t self_in, mp_obj_t len_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(socket_recv_obj, socket_recv);
 
+// Get the buffer to receive into for an _into method, limited to nbytes if
+// given and non-zero
+static void socket_get_into_buffer(qstr method, size_t n_args, const mp_obj_t *args, mp_buffer_info_t *bufinfo) {
+    mp_get_buffer_raise(args[1], bufinfo, MP_BUFFER_WRITE);
+    if (n_args > 2) {
+        mp_int_t n = mp_obj_get_int(args[2]);
+        if (n < 0) {
+            mp_raise_msg_varg(&mp_type_ValueError, MP_ERROR_TEXT("negative buffersize in %q"), method);
+        }
+        if ((size_t)n > bufinfo->len) {
+            mp_raise_ValueError(MP_ERROR_TEXT("nbytes is greater than the length of the buffer"));
+        }
+        if (n > 0) {
+            bufinfo->len = n;
+        }
+    }
+}
+
+// method socket.recv_into(buf[, nbytes])
+static mp_obj_t socket_recv_into(size_t n_args, const mp_obj_t *args) {
+    mod_network_socket_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+    if (self->nic == MP_OBJ_NULL) {
+        // not connected
+        mp_raise_OSError(MP_ENOTCONN);
+    }
+    mp_buffer_info_t bufinfo;
+    socket_get_into_buffer(MP_QSTR_recv_into, n_args, args, &bufinfo);
+    int _errno;
+    mp_uint_t ret = self->nic_protocol->recv(self, bufinfo.buf, bufinfo.len, &_errno);
+    if (ret == MP_STREAM_ERROR) {
+        mp_raise_OSError(_errno);
+    }
+    return mp_obj_new_int_from_uint(ret);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_recv_into_obj, 2, 3, socket_recv_into);
+
 // method socket.sendto(bytes, address)
 static mp_obj_t socket_sendto(mp_obj_t self_in, mp_obj_t data_in, mp_obj_t addr_in) {
     mod_network_socket_obj_t *self = MP_OBJ_TO_PTR(self_in);
@@ -353,6 +455,30 @@ static mp_obj_t socket_recvfrom(mp_obj_t self_in, mp_obj_t len_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(socket_recvfrom_obj, socket_recvfrom);
 
+// method socket.recvfrom_into(buf[, nbytes])
+static mp_obj_t socket_recvfrom_into(size_t n_args, const mp_obj_t *args) {
+    mod_network_socket_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+    if (self->nic == MP_OBJ_NULL) {
+        // not connected
+        mp_raise_OSError(MP_ENOTCONN);
+    }
+    mp_buffer_info_t bufinfo;
+    socket_get_into_buffer(MP_QSTR_recvfrom_into, n_args, args, &bufinfo);
+    byte ip[4];
+    mp_uint_t port;
+    int _errno;
+    mp_int_t ret = self->nic_protocol->recvfrom(self, bufinfo.buf, bufinfo.len, ip, &port, &_errno);
+    if (ret == -1) {
+        mp_raise_OSError(_errno);
+    }
+    mp_obj_t tuple[2] = {
+        mp_obj_new_int(ret),
+        netutils_format_inet_addr(ip, port, NETUTILS_BIG),
+    };
+    return mp_obj_new_tuple(2, tuple);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_recvfrom_into_obj, 2, 3, socket_recvfrom_into);
+
 // method socket.setsockopt(level, optname, value)
 static mp_obj_t socket_setsockopt(size_t n_args, const mp_obj_t *args) {
     mod_network_socket_obj_t *self = MP_OBJ_TO_PTR(args[0]);
@@ -454,9 +580,12 @@ static const mp_rom_map_elem_t socket_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_connect), MP_ROM_PTR(&socket_connect_obj) },
     { MP_ROM_QSTR(MP_QSTR_send), MP_ROM_PTR(&socket_send_obj) },
     { MP_ROM_QSTR(MP_QSTR_sendall), MP_ROM_PTR(&socket_sendall_obj) },
+    { MP_ROM_QSTR(MP_QSTR_sendmsg), MP_ROM_PTR(&socket_sendmsg_obj) },
     { MP_ROM_QSTR(MP_QSTR_recv), MP_ROM_PTR(&socket_recv_obj) },
+    { MP_ROM_QSTR(MP_QSTR_recv_into), MP_ROM_PTR(&socket_recv_into_obj) },
     { MP_ROM_QSTR(MP_QSTR_sendto), MP_ROM_PTR(&socket_sendto_obj) },
     { MP_ROM_QSTR(MP_QSTR_recvfrom), MP_ROM_PTR(&socket_recvfrom_obj) },
+    { MP_ROM_QSTR(MP_QSTR_recvfrom_into), MP_ROM_PTR(&socket_recvfrom_into_obj) },
     { MP_ROM_QSTR(MP_QSTR_setsockopt), MP_ROM_PTR(&socket_setsockopt_obj) },
     { MP_ROM_QSTR(MP_QSTR_makefile), MP_ROM_PTR(&socket_makefile_obj) },
     { MP_ROM_QSTR(MP_QSTR_settimeout), MP_ROM_PTR(&socket_settimeout_obj) },
@@ -86,6 +86,12 @@
 #define MICROPY_HW_WIZNET_SPI_BAUDRATE  (2000000)
 #endif
 
+// Count the traffic of each socket, the SPI transactions and bytes of each
+// kind of operation, and the time spent polling and yielding
+#ifndef MICROPY_PY_NETWORK_WIZNET5K_STATS
+#define MICROPY_PY_NETWORK_WIZNET5K_STATS (1)
+#endif
+
 #ifndef WIZCHIP_SREG_ADDR
 #if (_WIZCHIP_ == 5500)
 #define WIZCHIP_SREG_ADDR(sn, addr)    (_W5500_IO_BASE_ + (addr << 8) + (WIZCHIP_SREG_BLOCK(sn) << 3))
@@ -94,6 +100,44 @@
 #endif
 #endif
 
+// The operations that SPI traffic is counted against
+enum {
+    WIZNET5K_SPI_OP_OTHER,
+    WIZNET5K_SPI_OP_POLL,
+    WIZNET5K_SPI_OP_RECV,
+    WIZNET5K_SPI_OP_SEND,
+    WIZNET5K_SPI_OP_NUM,
+};
+
+typedef struct _wiznet5k_spi_stats_t {
+    uint32_t transactions;
+    uint32_t bytes;
+} wiznet5k_spi_stats_t;
+
+// The counters kept for each socket, all uint32_t so they can be walked as
+// an array, in the order of wiznet5k_sock_stats_names
+typedef struct _wiznet5k_sock_stats_t {
+    uint32_t rx_packets;
+    uint32_t rx_bytes;
+    uint32_t tx_packets;
+    uint32_t tx_bytes;
+    uint32_t timeouts;
+    uint32_t rx_full;
+    uint32_t errors;
+} wiznet5k_sock_stats_t;
+
+// The activities that time is measured for
+enum {
+    WIZNET5K_TIME_POLL,
+    WIZNET5K_TIME_YIELD,
+    WIZNET5K_TIME_NUM,
+};
+
+typedef struct _wiznet5k_time_stats_t {
+    uint32_t calls;
+    uint64_t us;
+} wiznet5k_time_stats_t;
+
 typedef struct _wiznet5k_obj_t {
     mp_obj_base_t base;
     mp_uint_t cris_state;
@@ -101,6 +145,13 @@ typedef struct _wiznet5k_obj_t {
     void (*spi_transfer)(mp_obj_base_t *obj, size_t len, const uint8_t *src, uint8_t *dest);
     mp_hal_pin_obj_t cs;
     mp_hal_pin_obj_t rst;
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    uint8_t spi_op;
+    wiznet5k_spi_stats_t spi_stats[WIZNET5K_SPI_OP_NUM];
+    wiznet5k_sock_stats_t sock_stats[_WIZCHIP_SOCK_NUM_];
+    uint8_t rx_full; // bit per socket, set while its RX buffer was last seen full
+    wiznet5k_time_stats_t time_stats[WIZNET5K_TIME_NUM];
+    #endif
     #if WIZNET5K_WITH_LWIP_STACK
     mp_hal_pin_obj_t pin_intn;
     bool use_interrupt;
@@ -132,7 +183,93 @@ static void wiz_cris_exit(void) {
     MICROPY_END_ATOMIC_SECTION(wiznet5k_obj.cris_state);
 }
 
+#if MICROPY_PY_NETWORK_WIZNET5K_STATS
+#define WIZNET5K_SPI_STATS_ADD(field, n) (wiznet5k_obj.spi_stats[wiznet5k_obj.spi_op].field += (n))
+#define WIZNET5K_SOCK_STATS_INC(sn, field) (wiznet5k_obj.sock_stats[(sn)].field += 1)
+#else
+#define WIZNET5K_SPI_STATS_ADD(field, n)
+#define WIZNET5K_SOCK_STATS_INC(sn, field)
+#endif
+
+// Count the result of a send or receive on a socket, as returned by ioLibrary:
+// the number of bytes, 0 when nothing could be done yet, or a SOCKERR_* code.
+// A TCP socket whose retransmissions ran out is closed by the chip, so ioLibrary
+// mostly sees that as the wrong socket status; Sn_IR tells the two apart.
+static void wiznet5k_count_xfer(uint8_t sn, bool tx, mp_int_t ret) {
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    wiznet5k_sock_stats_t *st = &wiznet5k_obj.sock_stats[sn];
+    if (ret > 0) {
+        if (tx) {
+            st->tx_packets += 1;
+            st->tx_bytes += ret;
+        } else {
+            st->rx_packets += 1;
+            st->rx_bytes += ret;
+        }
+    } else if (ret == SOCKERR_TIMEOUT
+               || (ret == SOCKERR_SOCKSTATUS && getSn_IR(sn) & Sn_IR_TIMEOUT)) {
+        st->timeouts += 1;
+    } else if (ret < 0) {
+        st->errors += 1;
+    }
+    #else
+    (void)sn;
+    (void)tx;
+    (void)ret;
+    #endif
+}
+
+// Count a socket's RX buffer being found full, once each time it fills up
+// rather than on every look at it while it stays full
+static void wiznet5k_count_rx_full(uint8_t sn, bool full) {
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    if (!full) {
+        wiznet5k_obj.rx_full &= ~(1 << sn);
+    } else if (!(wiznet5k_obj.rx_full & (1 << sn))) {
+        wiznet5k_obj.rx_full |= 1 << sn;
+        wiznet5k_obj.sock_stats[sn].rx_full += 1;
+    }
+    #else
+    (void)sn;
+    (void)full;
+    #endif
+}
+
+// Start and end the timing of an activity
+static inline uint32_t wiznet5k_time_start(void) {
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    return mp_hal_ticks_us();
+    #else
+    return 0;
+    #endif
+}
+
+static inline void wiznet5k_time_end(uint8_t which, uint32_t t_start) {
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    wiznet5k_time_stats_t *st = &wiznet5k_obj.time_stats[which];
+    st->calls += 1;
+    st->us += (uint32_t)(mp_hal_ticks_us() - t_start);
+    #else
+    (void)which;
+    (void)t_start;
+    #endif
+}
+
+// Set the operation that SPI traffic is counted against, returning the
+// previous one to restore when the operation is done
+static inline uint8_t wiznet5k_spi_op(uint8_t op) {
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    uint8_t prev = wiznet5k_obj.spi_op;
+    wiznet5k_obj.spi_op = op;
+    return prev;
+    #else
+    (void)op;
+    return 0;
+    #endif
+}
+
 static void wiz_cs_select(void) {
+    WIZNET5K_SPI_STATS_ADD(transactions, 1);
     mp_hal_pin_low(wiznet5k_obj.cs);
 }
 
@@ -142,31 +279,134 @@ static void wiz_cs_deselect(void) {
 
 void mpy_wiznet_yield(void) {
     // Used in socket.c via -DWIZCHIP_YIELD=mpy_wiznet_yield in make/cmake
+    uint32_t t_start = wiznet5k_time_start();
     #if MICROPY_PY_THREAD
     MICROPY_THREAD_YIELD();
     #else
     mp_handle_pending(true);
     #endif
+    wiznet5k_time_end(WIZNET5K_TIME_YIELD, t_start);
 }
 
 static void wiz_spi_read(uint8_t *buf, uint16_t len) {
+    WIZNET5K_SPI_STATS_ADD(bytes, len);
     wiznet5k_obj.spi_transfer(wiznet5k_obj.spi, len, buf, buf);
 }
 
 static void wiz_spi_write(const uint8_t *buf, uint16_t len) {
+    WIZNET5K_SPI_STATS_ADD(bytes, len);
     wiznet5k_obj.spi_transfer(wiznet5k_obj.spi, len, buf, NULL);
 }
 
 static uint8_t wiz_spi_readbyte() {
     uint8_t buf = 0;
+    WIZNET5K_SPI_STATS_ADD(bytes, 1);
     wiznet5k_obj.spi_transfer(wiznet5k_obj.spi, 1, &buf, &buf);
     return buf;
 }
 
 static void wiz_spi_writebyte(const uint8_t buf) {
+    WIZNET5K_SPI_STATS_ADD(bytes, 1);
     wiznet5k_obj.spi_transfer(wiznet5k_obj.spi, 1, &buf, NULL);
 }
 
+// Get the number of bytes received by a socket, in a single transaction when
+// it's zero.
+static uint16_t wiznet5k_get_rx_rsr(uint8_t sn) {
+    #if _WIZCHIP_ == 5500
+    uint8_t buf[2];
+    uint16_t prev;
+    uint16_t rx_rsr = 0;
+    do {
+        prev = rx_rsr;
+        WIZCHIP_READ_BUF(Sn_RX_RSR(sn), buf, sizeof(buf));
+        rx_rsr = buf[0] << 8 | buf[1];
+    } while (rx_rsr != 0 && rx_rsr != prev);
+    return rx_rsr;
+    #else
+    return getSn_RX_RSR(sn);
+    #endif
+}
+
+#if WIZNET5K_WITH_LWIP_STACK
+
+// The size in KB of the TX and RX buffers of the MACRAW socket, which gets
+// all the buffer memory of the chip
+#if _WIZCHIP_ < W5200
+#define WIZNET5K_MACRAW_BUF_KB (8)
+#else
+#define WIZNET5K_MACRAW_BUF_KB (16)
+#endif
+
+// The MACRAW RX buffer is counted as full when a maximum size frame, with
+// the 2-byte length the chip puts before it, may not fit in what's left
+#define WIZNET5K_MACRAW_RX_FULL (WIZNET5K_MACRAW_BUF_KB * 1024 - (1514 + 2))
+
+#else // WIZNET5K_PROVIDED_STACK
+
+// The status registers of a socket
+typedef struct _wiznet5k_sock_status_t {
+    uint8_t ir;
+    uint8_t sr;
+    uint16_t tx_fsr;
+    uint16_t rx_rsr;
+    uint16_t rx_max;
+} wiznet5k_sock_status_t;
+
+#if _WIZCHIP_ == 5500
+
+// Offsets in the W5500 socket register block
+#define WIZ_SN_IR_OFS (0x02)
+#define WIZ_SN_RXBUF_SIZE_OFS (0x1e)
+#define WIZ_SN_TX_FSR_OFS (0x20)
+#define WIZ_SN_RX_RSR_OFS (0x26)
+
+// Read the 16-bit size registers from Sn_TX_FSR to Sn_RX_RSR in bursts of
+// one transaction until both sizes read the same twice.  Their two bytes can
+// be read either side of an update by the chip, so getSn_TX_FSR() and
+// getSn_RX_RSR() do the same, but with a transaction per byte.  As there,
+// zero is taken on the first read, here when both sizes are zero.
+static void wiznet5k_read_sizes(uint8_t sn, const uint8_t *buf, wiznet5k_sock_status_t *st) {
+    const uint8_t *rsr = buf + WIZ_SN_RX_RSR_OFS - WIZ_SN_TX_FSR_OFS;
+    st->tx_fsr = buf[0] << 8 | buf[1];
+    st->rx_rsr = rsr[0] << 8 | rsr[1];
+    while (st->tx_fsr != 0 || st->rx_rsr != 0) {
+        uint8_t win[WIZ_SN_RX_RSR_OFS + 2 - WIZ_SN_TX_FSR_OFS];
+        WIZCHIP_READ_BUF(Sn_TX_FSR(sn), win, sizeof(win));
+        uint16_t tx_fsr = win[0] << 8 | win[1];
+        uint16_t rx_rsr = win[sizeof(win) - 2] << 8 | win[sizeof(win) - 1];
+        if (tx_fsr == st->tx_fsr && rx_rsr == st->rx_rsr) {
+            break;
+        }
+        st->tx_fsr = tx_fsr;
+        st->rx_rsr = rx_rsr;
+    }
+}
+
+#endif
+
+// Get the status registers of a socket.  On the W5500 they're read in one
+// burst from Sn_IR to Sn_RX_RSR, and usually one more of the sizes, instead
+// of the ten or so single byte transactions of the getSn_* functions.
+static void wiznet5k_get_sock_status(uint8_t sn, wiznet5k_sock_status_t *st) {
+    #if _WIZCHIP_ == 5500
+    uint8_t buf[WIZ_SN_RX_RSR_OFS + 2 - WIZ_SN_IR_OFS];
+    WIZCHIP_READ_BUF(Sn_IR(sn), buf, sizeof(buf));
+    st->ir = buf[0] & 0x1f;
+    st->sr = buf[1];
+    st->rx_max = buf[WIZ_SN_RXBUF_SIZE_OFS - WIZ_SN_IR_OFS] << 10;
+    wiznet5k_read_sizes(sn, buf + WIZ_SN_TX_FSR_OFS - WIZ_SN_IR_OFS, st);
+    #else
+    st->ir = getSn_IR(sn);
+    st->sr = getSn_SR(sn);
+    st->tx_fsr = getSn_TX_FSR(sn);
+    st->rx_rsr = getSn_RX_RSR(sn);
+    st->rx_max = getSn_RxMAX(sn);
+    #endif
+}
+
+#endif
+
 static void wiznet5k_get_mac_address(wiznet5k_obj_t *self, uint8_t mac[6]) {
     (void)self;
     getSHAR(mac);
@@ -217,9 +457,11 @@ static void wiznet5k_init(void) {
 
     // Configure 16k buffers for fast MACRAW
     #if _WIZCHIP_ < W5200
-    uint8_t sn_size[8] = {8, 0, 0, 0, 8, 0, 0, 0};
+    uint8_t sn_size[8] = {WIZNET5K_MACRAW_BUF_KB, 0, 0, 0, WIZNET5K_MACRAW_BUF_KB, 0, 0, 0};
     #else
-    uint8_t sn_size[16] = {16, 0, 0, 0, 0, 0, 0, 0, 16, 0, 0, 0, 0, 0, 0, 0};
+    uint8_t sn_size[16] = {
+        WIZNET5K_MACRAW_BUF_KB, 0, 0, 0, 0, 0, 0, 0, WIZNET5K_MACRAW_BUF_KB, 0, 0, 0, 0, 0, 0, 0,
+    };
     #endif
     ctlwizchip(CW_INIT_WIZCHIP, sn_size);
 
@@ -252,7 +494,10 @@ static void wiznet5k_init(void) {
 
 static void wiznet5k_send_ethernet(wiznet5k_obj_t *self, size_t len, const uint8_t *buf) {
     uint8_t ip[4] = {1, 1, 1, 1}; // dummy
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_SEND);
     int ret = WIZCHIP_EXPORT(sendto)(0, (byte *)buf, len, ip, 11); // dummy port
+    wiznet5k_spi_op(op);
+    wiznet5k_count_xfer(0, true, ret);
     if (ret != len) {
         printf("wiznet5k_send_ethernet: fatal error %d\n", ret);
         netif_set_link_down(&self->netif);
@@ -262,15 +507,22 @@ static void wiznet5k_send_ethernet(wiznet5k_obj_t *self, size_t len, const uint8
 
 // Stores the frame in self->eth_frame and returns number of bytes in the frame, 0 for no frame
 static uint16_t wiznet5k_recv_ethernet(wiznet5k_obj_t *self) {
-    uint16_t len = getSn_RX_RSR(0);
+    uint16_t len = wiznet5k_get_rx_rsr(0);
     if (len == 0) {
         return 0;
     }
+    wiznet5k_count_rx_full(0, len > WIZNET5K_MACRAW_RX_FULL);
 
     byte ip[4];
     uint16_t port;
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_RECV);
     int ret = WIZCHIP_EXPORT(recvfrom)(0, self->eth_frame, 1514, ip, &port);
+    wiznet5k_spi_op(op);
+    wiznet5k_count_xfer(0, false, ret);
     if (ret <= 0) {
+        if (ret == 0) {
+            WIZNET5K_SOCK_STATS_INC(0, errors);
+        }
         printf("wiznet5k_recv_ethernet: fatal error len=%u ret=%d\n", len, ret);
         netif_set_link_down(&self->netif);
         netif_set_down(&self->netif);
@@ -348,6 +600,8 @@ static void wiznet5k_lwip_init(wiznet5k_obj_t *self) {
 
 void wiznet5k_poll(void) {
     wiznet5k_obj_t *self = &wiznet5k_obj;
+    uint32_t t_start = wiznet5k_time_start();
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_POLL);
     if ((self->netif.flags & (NETIF_FLAG_UP | NETIF_FLAG_LINK_UP)) == (NETIF_FLAG_UP | NETIF_FLAG_LINK_UP)) {
         uint16_t len;
         while ((len = wiznet5k_recv_ethernet(self)) > 0) {
@@ -360,6 +614,9 @@ void wiznet5k_poll(void) {
                 if (self->netif.input(p, &self->netif) != ERR_OK) {
                     pbuf_free(p);
                 }
+            } else {
+                // Out of pbufs, the frame is dropped
+                WIZNET5K_SOCK_STATS_INC(0, errors);
             }
         }
     }
@@ -367,6 +624,8 @@ void wiznet5k_poll(void) {
     #if _WIZCHIP_ == W5100S
     setSn_IR(0, Sn_IR_RECV); // W5100S driver bug: must write to the Sn_IR register to reset the IRQ signal
     #endif
+    wiznet5k_spi_op(op);
+    wiznet5k_time_end(WIZNET5K_TIME_POLL, t_start);
 }
 
 #endif // MICROPY_PY_LWIP
@@ -483,6 +742,7 @@ static void wiznet5k_socket_close(mod_network_socket_obj_t *socket) {
     uint8_t sn = (uint8_t)socket->fileno;
     if (sn < _WIZCHIP_SOCK_NUM_) {
         wiznet5k_obj.socket_used &= ~(1 << sn);
+        wiznet5k_count_rx_full(sn, false);
         WIZCHIP_EXPORT(close)(sn);
     }
 }
@@ -560,6 +820,7 @@ static int wiznet5k_socket_connect(mod_network_socket_obj_t *socket, byte *ip, m
     MP_THREAD_GIL_ENTER();
 
     if (ret < 0) {
+        wiznet5k_count_xfer(socket->fileno, true, ret);
         wiznet5k_socket_close(socket);
         *_errno = -ret;
         return -1;
@@ -571,7 +832,58 @@ static int wiznet5k_socket_connect(mod_network_socket_obj_t *socket, byte *ip, m
 
 static mp_uint_t wiznet5k_socket_send(mod_network_socket_obj_t *socket, const byte *buf, mp_uint_t len, int *_errno) {
     MP_THREAD_GIL_EXIT();
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_SEND);
     mp_int_t ret = WIZCHIP_EXPORT(send)(socket->fileno, (byte *)buf, len);
+    wiznet5k_spi_op(op);
+    wiznet5k_count_xfer(socket->fileno, true, ret);
+    MP_THREAD_GIL_ENTER();
+
+    // TODO convert Wiz errno's to POSIX ones
+    if (ret < 0) {
+        wiznet5k_socket_close(socket);
+        *_errno = -ret;
+        return -1;
+    }
+    return ret;
+}
+
+// Write all the buffers into the socket's TX buffer and send them with one
+// SEND command.  wiz_send_data() copies data in and advances Sn_TX_WR without
+// sending, so all but the last buffer are written that way, then send() writes
+// the last one and sends everything from Sn_TX_RD to the new Sn_TX_WR.  If the
+// buffers don't all fit in the free space only the first one is sent, which is
+// a short write as for send().
+static mp_uint_t wiznet5k_socket_sendv(mod_network_socket_obj_t *socket, const mp_buffer_info_t *bufs, size_t nbufs, int *_errno) {
+    uint8_t sn = (uint8_t)socket->fileno;
+    mp_uint_t total = 0;
+    for (size_t i = 0; i < nbufs; ++i) {
+        total += bufs[i].len;
+    }
+
+    MP_THREAD_GIL_EXIT();
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_SEND);
+    wiznet5k_sock_status_t st;
+    wiznet5k_get_sock_status(sn, &st);
+    mp_int_t ret;
+    if (total > st.tx_fsr) {
+        ret = WIZCHIP_EXPORT(send)(sn, bufs[0].buf, bufs[0].len);
+    } else {
+        uint16_t tx_wr = getSn_TX_WR(sn);
+        for (size_t i = 0; i < nbufs - 1; ++i) {
+            wiz_send_data(sn, bufs[i].buf, bufs[i].len);
+        }
+        ret = WIZCHIP_EXPORT(send)(sn, bufs[nbufs - 1].buf, bufs[nbufs - 1].len);
+        if (ret > 0) {
+            ret = total;
+        } else {
+            // Nothing was sent (the previous send is still in progress, or
+            // an error), so take back the data written ahead of the last
+            // buffer rather than have it go out with a later send
+            setSn_TX_WR(sn, tx_wr);
+        }
+    }
+    wiznet5k_spi_op(op);
+    wiznet5k_count_xfer(sn, true, ret);
     MP_THREAD_GIL_ENTER();
 
     // TODO convert Wiz errno's to POSIX ones
@@ -585,7 +897,14 @@ static mp_uint_t wiznet5k_socket_send(mod_network_socket_obj_t *socket, const by
 
 static mp_uint_t wiznet5k_socket_recv(mod_network_socket_obj_t *socket, byte *buf, mp_uint_t len, int *_errno) {
     MP_THREAD_GIL_EXIT();
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_RECV);
     mp_int_t ret = WIZCHIP_EXPORT(recv)(socket->fileno, buf, len);
+    wiznet5k_spi_op(op);
+    wiznet5k_count_xfer(socket->fileno, false, ret);
+    if (ret > 0) {
+        // Whatever was taken leaves room in the RX buffer
+        wiznet5k_count_rx_full(socket->fileno, false);
+    }
     MP_THREAD_GIL_ENTER();
 
     // TODO convert Wiz errno's to POSIX ones
@@ -606,7 +925,10 @@ static mp_uint_t wiznet5k_socket_sendto(mod_network_socket_obj_t *socket, const
     }
 
     MP_THREAD_GIL_EXIT();
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_SEND);
     mp_int_t ret = WIZCHIP_EXPORT(sendto)(socket->fileno, (byte *)buf, len, ip, port);
+    wiznet5k_spi_op(op);
+    wiznet5k_count_xfer(socket->fileno, true, ret);
     MP_THREAD_GIL_ENTER();
 
     if (ret < 0) {
@@ -620,7 +942,14 @@ static mp_uint_t wiznet5k_socket_sendto(mod_network_socket_obj_t *socket, const
 static mp_uint_t wiznet5k_socket_recvfrom(mod_network_socket_obj_t *socket, byte *buf, mp_uint_t len, byte *ip, mp_uint_t *port, int *_errno) {
     uint16_t port2;
     MP_THREAD_GIL_EXIT();
+    uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_RECV);
     mp_int_t ret = WIZCHIP_EXPORT(recvfrom)(socket->fileno, buf, len, ip, &port2);
+    wiznet5k_spi_op(op);
+    wiznet5k_count_xfer(socket->fileno, false, ret);
+    if (ret > 0) {
+        // Whatever was taken leaves room in the RX buffer
+        wiznet5k_count_rx_full(socket->fileno, false);
+    }
     MP_THREAD_GIL_ENTER();
     *port = port2;
     if (ret < 0) {
@@ -653,17 +982,32 @@ static int wiznet5k_socket_settimeout(mod_network_socket_obj_t *socket, mp_uint_
 
 static int wiznet5k_socket_ioctl(mod_network_socket_obj_t *socket, mp_uint_t request, mp_uint_t arg, int *_errno) {
     if (request == MP_STREAM_POLL) {
+        uint32_t t_start = wiznet5k_time_start();
+        uint8_t op = wiznet5k_spi_op(WIZNET5K_SPI_OP_POLL);
+        wiznet5k_sock_status_t st;
+        if ((arg & (MP_STREAM_POLL_RD | MP_STREAM_POLL_WR)) == MP_STREAM_POLL_RD) {
+            // Waiting to read, as a reader mostly is, so only the received
+            // size is needed, which is one transaction when it's zero
+            st.rx_rsr = wiznet5k_get_rx_rsr(socket->fileno);
+            st.rx_max = st.rx_rsr != 0 ? getSn_RxMAX(socket->fileno) : 0;
+            st.tx_fsr = 0;
+        } else {
+            wiznet5k_get_sock_status(socket->fileno, &st);
+        }
+        wiznet5k_spi_op(op);
+        wiznet5k_time_end(WIZNET5K_TIME_POLL, t_start);
+        wiznet5k_count_rx_full(socket->fileno, st.rx_rsr != 0 && st.rx_rsr >= st.rx_max);
         int ret = 0;
-        if (arg & MP_STREAM_POLL_RD && getSn_RX_RSR(socket->fileno) != 0) {
+        if (arg & MP_STREAM_POLL_RD && st.rx_rsr != 0) {
             ret |= MP_STREAM_POLL_RD;
         }
-        if (arg & MP_STREAM_POLL_WR && getSn_TX_FSR(socket->fileno) != 0) {
+        if (arg & MP_STREAM_POLL_WR && st.tx_fsr != 0) {
             ret |= MP_STREAM_POLL_WR;
         }
         return ret;
     } else {
         *_errno = MP_EINVAL;
-        return MP_STREAM_ERROR;
+        return -1;
     }
 }
 
@@ -771,6 +1115,13 @@ static mp_obj_t wiznet5k_make_new(const mp_obj_type_t *type, size_t n_args, size
     wiznet5k_obj.spi_transfer = ((mp_machine_spi_p_t *)MP_OBJ_TYPE_GET_SLOT(spi->type, protocol))->transfer;
     wiznet5k_obj.cs = cs;
     wiznet5k_obj.rst = rst;
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    wiznet5k_obj.spi_op = WIZNET5K_SPI_OP_OTHER;
+    memset(wiznet5k_obj.spi_stats, 0, sizeof(wiznet5k_obj.spi_stats));
+    memset(wiznet5k_obj.sock_stats, 0, sizeof(wiznet5k_obj.sock_stats));
+    wiznet5k_obj.rx_full = 0;
+    memset(wiznet5k_obj.time_stats, 0, sizeof(wiznet5k_obj.time_stats));
+    #endif
     #if WIZNET5K_WITH_LWIP_STACK
     wiznet5k_obj.pin_intn = pin_intn;
     wiznet5k_obj.use_interrupt = use_interrupt;
@@ -819,6 +1170,93 @@ static mp_obj_t wiznet5k_regs(mp_obj_t self_in) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_1(wiznet5k_regs_obj, wiznet5k_regs);
 
+#if MICROPY_PY_NETWORK_WIZNET5K_STATS
+static mp_obj_t wiznet5k_spi_stats_dict(wiznet5k_obj_t *self) {
+    static const qstr names[WIZNET5K_SPI_OP_NUM] = {
+        MP_QSTR_other, MP_QSTR_poll, MP_QSTR_recv, MP_QSTR_send,
+    };
+    mp_obj_t dict = mp_obj_new_dict(WIZNET5K_SPI_OP_NUM);
+    for (size_t i = 0; i < WIZNET5K_SPI_OP_NUM; ++i) {
+        mp_obj_t tuple[2] = {
+            mp_obj_new_int_from_uint(self->spi_stats[i].transactions),
+            mp_obj_new_int_from_uint(self->spi_stats[i].bytes),
+        };
+        mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(names[i]), mp_obj_new_tuple(2, tuple));
+    }
+    return dict;
+}
+
+// spi_stats([reset])
+// Get the number of SPI transactions and bytes of each kind of operation, as
+// a dict of (transactions, bytes) tuples, optionally zeroing the counts.
+static mp_obj_t wiznet5k_spi_stats(size_t n_args, const mp_obj_t *args) {
+    wiznet5k_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+    mp_obj_t dict = wiznet5k_spi_stats_dict(self);
+    if (n_args > 1 && mp_obj_is_true(args[1])) {
+        memset(self->spi_stats, 0, sizeof(self->spi_stats));
+    }
+    return dict;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(wiznet5k_spi_stats_obj, 1, 2, wiznet5k_spi_stats);
+
+static const qstr wiznet5k_sock_stats_names[] = {
+    MP_QSTR_rx_packets, MP_QSTR_rx_bytes, MP_QSTR_tx_packets, MP_QSTR_tx_bytes,
+    MP_QSTR_timeouts, MP_QSTR_rx_full, MP_QSTR_errors,
+};
+
+static mp_obj_t wiznet5k_sock_stats_dict(const wiznet5k_sock_stats_t *st) {
+    const uint32_t *counts = (const uint32_t *)st;
+    mp_obj_t dict = mp_obj_new_dict(MP_ARRAY_SIZE(wiznet5k_sock_stats_names));
+    for (size_t i = 0; i < MP_ARRAY_SIZE(wiznet5k_sock_stats_names); ++i) {
+        mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(wiznet5k_sock_stats_names[i]), mp_obj_new_int_from_uint(counts[i]));
+    }
+    return dict;
+}
+
+static mp_obj_t wiznet5k_time_stats_tuple(const wiznet5k_time_stats_t *st) {
+    mp_obj_t tuple[2] = {
+        mp_obj_new_int_from_uint(st->calls),
+        mp_obj_new_int_from_ull(st->us),
+    };
+    return mp_obj_new_tuple(2, tuple);
+}
+
+// stats([reset])
+// Get the traffic counters of the interface, the totals over all sockets,
+// with the per-socket counters, SPI traffic and time spent polling and
+// yielding, as a dict, optionally zeroing everything.
+static mp_obj_t wiznet5k_stats(size_t n_args, const mp_obj_t *args) {
+    wiznet5k_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+    MP_STATIC_ASSERT(sizeof(wiznet5k_sock_stats_t) == MP_ARRAY_SIZE(wiznet5k_sock_stats_names) * sizeof(uint32_t));
+
+    wiznet5k_sock_stats_t total;
+    memset(&total, 0, sizeof(total));
+    mp_obj_t sockets[_WIZCHIP_SOCK_NUM_];
+    for (size_t sn = 0; sn < _WIZCHIP_SOCK_NUM_; ++sn) {
+        const uint32_t *counts = (const uint32_t *)&self->sock_stats[sn];
+        uint32_t *sum = (uint32_t *)&total;
+        for (size_t i = 0; i < MP_ARRAY_SIZE(wiznet5k_sock_stats_names); ++i) {
+            sum[i] += counts[i];
+        }
+        sockets[sn] = wiznet5k_sock_stats_dict(&self->sock_stats[sn]);
+    }
+
+    mp_obj_t dict = wiznet5k_sock_stats_dict(&total);
+    mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(MP_QSTR_poll), wiznet5k_time_stats_tuple(&self->time_stats[WIZNET5K_TIME_POLL]));
+    mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(MP_QSTR_yield), wiznet5k_time_stats_tuple(&self->time_stats[WIZNET5K_TIME_YIELD]));
+    mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(MP_QSTR_spi), wiznet5k_spi_stats_dict(self));
+    mp_obj_dict_store(dict, MP_OBJ_NEW_QSTR(MP_QSTR_sockets), mp_obj_new_tuple(_WIZCHIP_SOCK_NUM_, sockets));
+
+    if (n_args > 1 && mp_obj_is_true(args[1])) {
+        memset(self->spi_stats, 0, sizeof(self->spi_stats));
+        memset(self->sock_stats, 0, sizeof(self->sock_stats));
+        memset(self->time_stats, 0, sizeof(self->time_stats));
+    }
+    return dict;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(wiznet5k_stats_obj, 1, 2, wiznet5k_stats);
+#endif
+
 static mp_obj_t wiznet5k_isconnected(mp_obj_t self_in) {
     wiznet5k_obj_t *self = MP_OBJ_TO_PTR(self_in);
     return mp_obj_new_bool(
@@ -1038,6 +1476,10 @@ static MP_DEFINE_CONST_FUN_OBJ_KW(wiznet5k_config_obj, 1, wiznet5k_config);
 
 static const mp_rom_map_elem_t wiznet5k_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_regs), MP_ROM_PTR(&wiznet5k_regs_obj) },
+    #if MICROPY_PY_NETWORK_WIZNET5K_STATS
+    { MP_ROM_QSTR(MP_QSTR_spi_stats), MP_ROM_PTR(&wiznet5k_spi_stats_obj) },
+    { MP_ROM_QSTR(MP_QSTR_stats), MP_ROM_PTR(&wiznet5k_stats_obj) },
+    #endif
     { MP_ROM_QSTR(MP_QSTR_isconnected), MP_ROM_PTR(&wiznet5k_isconnected_obj) },
     { MP_ROM_QSTR(MP_QSTR_active), MP_ROM_PTR(&wiznet5k_active_obj) },
     { MP_ROM_QSTR(MP_QSTR_ifconfig), MP_ROM_PTR(&wiznet5k_ifconfig_obj) },
@@ -1070,6 +1512,7 @@ const mod_network_nic_protocol_t mod_network_nic_protocol_wiznet = {
     .setsockopt = wiznet5k_socket_setsockopt,
     .settimeout = wiznet5k_socket_settimeout,
     .ioctl = wiznet5k_socket_ioctl,
+    .sendv = wiznet5k_socket_sendv,
 };
 #define NIC_TYPE_WIZNET_PROTOCOL protocol, &mod_network_nic_protocol_wiznet,
 #endif
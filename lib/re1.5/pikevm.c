@@ -0,0 +1,201 @@
+// Copyright 2007-2009 Russ Cox.  All Rights Reserved.
+// Use of this source code is governed by a BSD-style
+// license that can be found in the LICENSE file.
+
+// Pike VM for the re1.5 bytecode: all threads advance in lock step over the
+// subject, so matching takes time linear in its length, where the
+// backtracking matchers can take exponential time on patterns such as
+// "(a*)*b".  Threads are kept in priority order and lower priority threads
+// are dropped once a thread matches, which gives the same (leftmost-first)
+// result and submatches as backtracking.
+
+#include "re1.5.h"
+
+typedef struct {
+	ByteProg *prog;
+	Subject *input;
+	int *marks;
+	int gen;
+	int nsubp;
+	const char **caps;
+} PikeVM;
+
+// A list of threads, each stored as its pc followed by its nsubp captures
+typedef struct {
+	int n;
+	const char **t;
+} ThreadList;
+
+static int
+instsize(const char *pc)
+{
+	switch(*pc) {
+	case Class:
+	case ClassNot:
+		return 2 + *(unsigned char*)(pc + 1) * 2;
+	case Any:
+	case Bol:
+	case Eol:
+	case Match:
+		return 1;
+	default:
+		return 2;
+	}
+}
+
+// The most threads a list can hold: one per consuming or Match instruction
+static int
+maxthreads(ByteProg *prog)
+{
+	int n = 0;
+	const char *pc;
+
+	for(pc = prog->insts; pc < prog->insts + prog->bytelen; pc += instsize(pc)) {
+		if(inst_is_consumer(*pc) || *pc == Match)
+			n++;
+	}
+	return n;
+}
+
+// Follow the non-consuming instructions from pc, adding a thread to l for
+// each consuming or Match instruction reached, in priority order.
+static void
+addthread(PikeVM *vm, ThreadList *l, const char *pc, const char *sp)
+{
+	const char *old;
+	const char **t;
+	int off;
+
+	re1_5_stack_chk();
+
+	for(;;) {
+		if(vm->marks[pc - vm->prog->insts] == vm->gen)
+			return;
+		vm->marks[pc - vm->prog->insts] = vm->gen;
+		switch(*pc) {
+		case Jmp:
+			off = (signed char)pc[1];
+			pc += 2 + off;
+			continue;
+		case Split:
+			off = (signed char)pc[1];
+			addthread(vm, l, pc + 2, sp);
+			pc += 2 + off;
+			continue;
+		case RSplit:
+			off = (signed char)pc[1];
+			addthread(vm, l, pc + 2 + off, sp);
+			pc += 2;
+			continue;
+		case Save:
+			off = (unsigned char)pc[1];
+			if(off >= vm->nsubp) {
+				pc += 2;
+				continue;
+			}
+			old = vm->caps[off];
+			vm->caps[off] = sp;
+			addthread(vm, l, pc + 2, sp);
+			vm->caps[off] = old;
+			return;
+		case Bol:
+			if(sp != vm->input->begin_line)
+				return;
+			pc++;
+			continue;
+		case Eol:
+			if(sp != vm->input->end)
+				return;
+			pc++;
+			continue;
+		}
+		t = l->t + l->n++ * (1 + vm->nsubp);
+		t[0] = pc;
+		memcpy(t + 1, vm->caps, vm->nsubp * sizeof(*t));
+		return;
+	}
+}
+
+int
+re1_5_pikevm_memsize(ByteProg *prog, int nsubp)
+{
+	return (2 * maxthreads(prog) * (1 + nsubp) + nsubp) * sizeof(const char*)
+		+ prog->bytelen * sizeof(int);
+}
+
+// mem must be at least re1_5_pikevm_memsize(prog, nsubp) bytes, aligned for
+// a pointer.
+int
+re1_5_pikevm(ByteProg *prog, Subject *input, const char **subp, int nsubp, int is_anchored, void *mem)
+{
+	PikeVM vm;
+	ThreadList clist, nlist, tmp;
+	const char **t;
+	const char *pc, *sp;
+	int i, stride, matched;
+
+	stride = 1 + nsubp;
+	vm.prog = prog;
+	vm.input = input;
+	vm.nsubp = nsubp;
+	clist.t = mem;
+	nlist.t = clist.t + maxthreads(prog) * stride;
+	vm.caps = nlist.t + (nlist.t - clist.t);
+	vm.marks = (int*)(vm.caps + nsubp);
+	memset(vm.marks, 0, prog->bytelen * sizeof(int));
+	memset((char*)vm.caps, 0, nsubp * sizeof(*vm.caps));
+	vm.gen = 1;
+
+	matched = 0;
+	sp = input->begin;
+	clist.n = 0;
+	addthread(&vm, &clist, HANDLE_ANCHORED(prog->insts, is_anchored), sp);
+	while(clist.n > 0) {
+		vm.gen++;
+		nlist.n = 0;
+		for(i = 0; i < clist.n; i++) {
+			t = clist.t + i * stride;
+			pc = t[0];
+			if(*pc == Match) {
+				// Threads after this one have lower priority, drop them
+				memcpy((char*)subp, t + 1, nsubp * sizeof(*t));
+				matched = 1;
+				break;
+			}
+			if(sp >= input->end)
+				continue;
+			switch(*pc) {
+			case Char:
+				if(*sp != pc[1])
+					continue;
+				pc += 2;
+				break;
+			case Any:
+				pc++;
+				break;
+			case Class:
+			case ClassNot:
+				if(!_re1_5_classmatch(pc + 1, sp))
+					continue;
+				pc += instsize(pc);
+				break;
+			case NamedClass:
+				if(!_re1_5_namedclassmatch(pc + 1, sp))
+					continue;
+				pc += 2;
+				break;
+			default:
+				re1_5_fatal("pikevm");
+			}
+			memcpy((char*)vm.caps, t + 1, nsubp * sizeof(*t));
+			addthread(&vm, &nlist, pc, sp + 1);
+		}
+		if(sp >= input->end)
+			break;
+		sp++;
+		tmp = clist;
+		clist = nlist;
+		nlist = tmp;
+	}
+	return matched;
+}
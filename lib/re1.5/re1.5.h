@@ -141,7 +141,8 @@ struct Subject {
 #define RE15_CLASS_NAMED_CLASS_INDICATOR 0
 
 int re1_5_backtrack(ByteProg*, Subject*, const char**, int, int);
-int re1_5_pikevm(ByteProg*, Subject*, const char**, int, int);
+int re1_5_pikevm(ByteProg*, Subject*, const char**, int, int, void*);
+int re1_5_pikevm_memsize(ByteProg*, int);
 int re1_5_recursiveloopprog(ByteProg*, Subject*, const char**, int, int);
 int re1_5_recursiveprog(ByteProg*, Subject*, const char**, int, int);
 int re1_5_thompsonvm(ByteProg*, Subject*, const char**, int, int);
@@ -38,6 +38,8 @@
 
 #include "uzlib.h"
 
+#if UZLIB_CONF_CRC32_TABLE == 0
+
 static const unsigned int tinf_crc32tab[16] = {
    0x00000000, 0x1db71064, 0x3b6e20c8, 0x26d930ac, 0x76dc4190,
    0x6b6b51f4, 0x4db26158, 0x5005713c, 0xedb88320, 0xf00f9344,
@@ -45,17 +47,45 @@ static const unsigned int tinf_crc32tab[16] = {
    0xbdbdf21c
 };
 
+#elif UZLIB_CONF_CRC32_TABLE == 1 || UZLIB_CONF_CRC32_TABLE == 8
+
+#include "crc32tab.h"
+
+#else
+#error "UZLIB_CONF_CRC32_TABLE must be 0, 1 or 8"
+#endif
+
 /* crc is previous value for incremental computation, 0xffffffff initially */
 uint32_t uzlib_crc32(const void *data, unsigned int length, uint32_t crc)
 {
    const unsigned char *buf = (const unsigned char *)data;
-   unsigned int i;
 
-   for (i = 0; i < length; ++i)
+#if UZLIB_CONF_CRC32_TABLE == 8
+   /* Slicing-by-8: fold 8 bytes into the register with one lookup each in
+      8 tables, the first 4 bytes through the register and the other 4 as
+      if followed by 3, 2, 1 and 0 zero bytes.  Bytes are assembled one at
+      a time so this works regardless of alignment and endianness. */
+   while (length >= 8)
+   {
+      crc ^= buf[0] | (buf[1] << 8) | (buf[2] << 16) | ((uint32_t)buf[3] << 24);
+      crc = tinf_crc32tab256[7][crc & 0xff] ^ tinf_crc32tab256[6][(crc >> 8) & 0xff]
+          ^ tinf_crc32tab256[5][(crc >> 16) & 0xff] ^ tinf_crc32tab256[4][crc >> 24]
+          ^ tinf_crc32tab256[3][buf[4]] ^ tinf_crc32tab256[2][buf[5]]
+          ^ tinf_crc32tab256[1][buf[6]] ^ tinf_crc32tab256[0][buf[7]];
+      buf += 8;
+      length -= 8;
+   }
+#endif
+
+   for (; length; --length)
    {
-      crc ^= buf[i];
+#if UZLIB_CONF_CRC32_TABLE == 0
+      crc ^= *buf++;
       crc = tinf_crc32tab[crc & 0x0f] ^ (crc >> 4);
       crc = tinf_crc32tab[crc & 0x0f] ^ (crc >> 4);
+#else
+      crc = tinf_crc32tab256[0][(crc ^ *buf++) & 0xff] ^ (crc >> 8);
+#endif
    }
 
    // return value suitable for passing in next time, for final value invert it
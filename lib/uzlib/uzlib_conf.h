@@ -19,4 +19,12 @@
 #define UZLIB_CONF_PARANOID_CHECKS 0
 #endif
 
+#ifndef UZLIB_CONF_CRC32_TABLE
+/* Lookup tables used by uzlib_crc32():
+   0 - one 16-entry table (64 bytes), two lookups per byte
+   1 - one 256-entry table (1K), one lookup per byte
+   8 - eight 256-entry tables (8K), "slicing-by-8", 8 bytes at a time */
+#define UZLIB_CONF_CRC32_TABLE 0
+#endif
+
 #endif /* UZLIB_CONF_H_INCLUDED */
@@ -48,6 +48,7 @@
 #include "py/mphal.h"
 #include "py/mpthread.h"
 #include "extmod/misc.h"
+#include "extmod/modnetwork.h"
 #include "extmod/modplatform.h"
 #include "extmod/vfs.h"
 #include "extmod/vfs_posix.h"
@@ -57,6 +58,9 @@
 // Command line options, with their defaults
 static bool compile_only = false;
 static uint emit_opt = MP_EMIT_OPT_NONE;
+#if MICROPY_READER_POSIX_MMAP
+static bool mpy_mmap = false;
+#endif
 
 #if MICROPY_ENABLE_GC
 // Heap size of GC heap (if enabled)
@@ -344,6 +348,10 @@ static void print_help(char **argv) {
         , heap_size);
     impl_opts_cnt++;
     #endif
+    #if MICROPY_READER_POSIX_MMAP
+    printf("  mpy-mmap -- map imported .mpy files into memory and run their bytecode in place\n");
+    impl_opts_cnt++;
+    #endif
     #if defined(__APPLE__)
     printf("  realtime -- set thread priority to realtime\n");
     impl_opts_cnt++;
@@ -423,6 +431,10 @@ static void pre_process_options(int argc, char **argv) {
                         goto invalid_arg;
                     }
                 #endif
+                #if MICROPY_READER_POSIX_MMAP
+                } else if (strcmp(argv[a + 1], "mpy-mmap") == 0) {
+                    mpy_mmap = true;
+                #endif
                 #if defined(__APPLE__)
                 } else if (strcmp(argv[a + 1], "realtime") == 0) {
                     #if MICROPY_PY_THREAD
@@ -533,6 +545,10 @@ MP_NOINLINE int main_(int argc, char **argv) {
 
     mp_init();
 
+    #if MICROPY_PY_NETWORK
+    mod_network_init();
+    #endif
+
     #if MICROPY_EMIT_NATIVE
     // Set default emitter options
     MP_STATE_VM(default_emit_opt) = emit_opt;
@@ -540,6 +556,10 @@ MP_NOINLINE int main_(int argc, char **argv) {
     (void)emit_opt;
     #endif
 
+    #if MICROPY_READER_POSIX_MMAP
+    MP_STATE_VM(persistent_code_mmap) = mpy_mmap;
+    #endif
+
     #if MICROPY_VFS_POSIX
     {
         // Mount the host FS at the root of our internal VFS
@@ -27,7 +27,8 @@
 
 #include "py/mpconfig.h"
 
-#if MICROPY_PY_SOCKET
+// With the network module, the socket module is extmod/modsocket.c instead.
+#if MICROPY_PY_SOCKET && !MICROPY_PY_NETWORK
 
 #include <stdio.h>
 #include <assert.h>
@@ -40,6 +41,7 @@
 #include <netinet/in.h>
 #include <arpa/inet.h>
 #include <netdb.h>
+#include <sys/uio.h>
 #include <errno.h>
 #include <math.h>
 
@@ -296,6 +298,39 @@ static mp_obj_t socket_recv(size_t n_args, const mp_obj_t *args) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_recv_obj, 2, 3, socket_recv);
 
+// Get the buffer size to use for an _into method, limited to nbytes if given and non-zero
+static size_t socket_get_nbytes(qstr method, const mp_obj_t nbytes_in, size_t len) {
+    mp_int_t n = mp_obj_get_int(nbytes_in);
+    if (n < 0) {
+        mp_raise_msg_varg(&mp_type_ValueError, MP_ERROR_TEXT("negative buffersize in %q"), method);
+    }
+    if ((size_t)n > len) {
+        mp_raise_ValueError(MP_ERROR_TEXT("nbytes is greater than the length of the buffer"));
+    }
+    return n > 0 ? (size_t)n : len;
+}
+
+// method socket.recv_into(buf[, nbytes[, flags]])
+static mp_obj_t socket_recv_into(size_t n_args, const mp_obj_t *args) {
+    mp_obj_socket_t *self = MP_OBJ_TO_PTR(args[0]);
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(args[1], &bufinfo, MP_BUFFER_WRITE);
+    size_t sz = bufinfo.len;
+    int flags = 0;
+
+    if (n_args > 2) {
+        sz = socket_get_nbytes(MP_QSTR_recv_into, args[2], sz);
+        if (n_args > 3) {
+            flags = MP_OBJ_SMALL_INT_VALUE(args[3]);
+        }
+    }
+
+    ssize_t out_sz;
+    MP_HAL_RETRY_SYSCALL(out_sz, recv(self->fd, bufinfo.buf, sz, flags), mp_raise_OSError(err));
+    return MP_OBJ_NEW_SMALL_INT(out_sz);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_recv_into_obj, 2, 4, socket_recv_into);
+
 static mp_obj_t socket_recvfrom(size_t n_args, const mp_obj_t *args) {
     mp_obj_socket_t *self = MP_OBJ_TO_PTR(args[0]);
     int sz = MP_OBJ_SMALL_INT_VALUE(args[1]);
@@ -323,6 +358,36 @@ static mp_obj_t socket_recvfrom(size_t n_args, const mp_obj_t *args) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_recvfrom_obj, 2, 3, socket_recvfrom);
 
+// method socket.recvfrom_into(buf[, nbytes[, flags]])
+static mp_obj_t socket_recvfrom_into(size_t n_args, const mp_obj_t *args) {
+    mp_obj_socket_t *self = MP_OBJ_TO_PTR(args[0]);
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(args[1], &bufinfo, MP_BUFFER_WRITE);
+    size_t sz = bufinfo.len;
+    int flags = 0;
+
+    if (n_args > 2) {
+        sz = socket_get_nbytes(MP_QSTR_recvfrom_into, args[2], sz);
+        if (n_args > 3) {
+            flags = MP_OBJ_SMALL_INT_VALUE(args[3]);
+        }
+    }
+
+    struct sockaddr_storage addr;
+    socklen_t addr_len = sizeof(addr);
+
+    ssize_t out_sz;
+    MP_HAL_RETRY_SYSCALL(out_sz, recvfrom(self->fd, bufinfo.buf, sz, flags, (struct sockaddr *)&addr, &addr_len),
+        mp_raise_OSError(err));
+
+    mp_obj_tuple_t *t = MP_OBJ_TO_PTR(mp_obj_new_tuple(2, NULL));
+    t->items[0] = MP_OBJ_NEW_SMALL_INT(out_sz);
+    t->items[1] = mp_obj_from_sockaddr((struct sockaddr *)&addr, addr_len);
+
+    return MP_OBJ_FROM_PTR(t);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_recvfrom_into_obj, 2, 4, socket_recvfrom_into);
+
 // Note: besides flag param, this differs from write() in that
 // this does not swallow blocking errors (EAGAIN, EWOULDBLOCK) -
 // these would be thrown as exceptions.
@@ -343,6 +408,51 @@ static mp_obj_t socket_send(size_t n_args, const mp_obj_t *args) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_send_obj, 2, 3, socket_send);
 
+// method socket.sendmsg(buffers[, ancdata[, flags[, address]]])
+// Sends the buffers as one write (or datagram) with a single sendmsg() call,
+// without joining them first.  Ancillary data isn't supported.
+static mp_obj_t socket_sendmsg(size_t n_args, const mp_obj_t *args) {
+    mp_obj_socket_t *self = MP_OBJ_TO_PTR(args[0]);
+    struct msghdr msg = { 0 };
+    int flags = 0;
+
+    if (n_args > 2 && mp_obj_get_int(mp_obj_len(args[2])) != 0) {
+        mp_raise_NotImplementedError(MP_ERROR_TEXT("ancdata"));
+    }
+    if (n_args > 3) {
+        flags = MP_OBJ_SMALL_INT_VALUE(args[3]);
+    }
+    mp_buffer_info_t addr_bi;
+    if (n_args > 4) {
+        mp_get_buffer_raise(args[4], &addr_bi, MP_BUFFER_READ);
+        msg.msg_name = addr_bi.buf;
+        msg.msg_namelen = addr_bi.len;
+    }
+
+    // Get the list of data buffer(s) to send
+    size_t nitems;
+    mp_obj_t *items;
+    mp_obj_get_array(args[1], &nitems, &items);
+    struct iovec *iov = mp_local_alloc((nitems == 0 ? 1 : nitems) * sizeof(struct iovec));
+    for (size_t i = 0; i < nitems; ++i) {
+        mp_buffer_info_t bufinfo;
+        mp_get_buffer_raise(items[i], &bufinfo, MP_BUFFER_READ);
+        iov[i].iov_base = bufinfo.buf;
+        iov[i].iov_len = bufinfo.len;
+    }
+    msg.msg_iov = iov;
+    msg.msg_iovlen = nitems;
+
+    ssize_t out_sz;
+    MP_HAL_RETRY_SYSCALL(out_sz, sendmsg(self->fd, &msg, flags), {
+        mp_local_free(iov);
+        mp_raise_OSError(err);
+    });
+    mp_local_free(iov);
+    return MP_OBJ_NEW_SMALL_INT(out_sz);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(socket_sendmsg_obj, 2, 5, socket_sendmsg);
+
 static mp_obj_t socket_sendto(size_t n_args, const mp_obj_t *args) {
     mp_obj_socket_t *self = MP_OBJ_TO_PTR(args[0]);
     int flags = 0;
@@ -509,8 +619,11 @@ static const mp_rom_map_elem_t socket_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR_listen), MP_ROM_PTR(&socket_listen_obj) },
     { MP_ROM_QSTR(MP_QSTR_accept), MP_ROM_PTR(&socket_accept_obj) },
     { MP_ROM_QSTR(MP_QSTR_recv), MP_ROM_PTR(&socket_recv_obj) },
+    { MP_ROM_QSTR(MP_QSTR_recv_into), MP_ROM_PTR(&socket_recv_into_obj) },
     { MP_ROM_QSTR(MP_QSTR_recvfrom), MP_ROM_PTR(&socket_recvfrom_obj) },
+    { MP_ROM_QSTR(MP_QSTR_recvfrom_into), MP_ROM_PTR(&socket_recvfrom_into_obj) },
     { MP_ROM_QSTR(MP_QSTR_send), MP_ROM_PTR(&socket_send_obj) },
+    { MP_ROM_QSTR(MP_QSTR_sendmsg), MP_ROM_PTR(&socket_sendmsg_obj) },
     { MP_ROM_QSTR(MP_QSTR_sendto), MP_ROM_PTR(&socket_sendto_obj) },
     { MP_ROM_QSTR(MP_QSTR_setsockopt), MP_ROM_PTR(&socket_setsockopt_obj) },
     { MP_ROM_QSTR(MP_QSTR_setblocking), MP_ROM_PTR(&socket_setblocking_obj) },
@@ -720,4 +833,4 @@ const mp_obj_module_t mp_module_socket = {
 
 MP_REGISTER_EXTENSIBLE_MODULE(MP_QSTR_socket, mp_module_socket);
 
-#endif // MICROPY_PY_SOCKET
+#endif // MICROPY_PY_SOCKET && !MICROPY_PY_NETWORK
@@ -117,6 +117,9 @@ typedef long mp_off_t;
 #define MICROPY_HELPER_LEXER_UNIX   (1)
 #define MICROPY_VFS_POSIX           (1)
 #define MICROPY_READER_POSIX        (1)
+#ifndef MICROPY_READER_POSIX_MMAP
+#define MICROPY_READER_POSIX_MMAP   (1)
+#endif
 #if MICROPY_PY_FFI || MICROPY_BLUETOOTH_BTSTACK
 #define MICROPY_TRACKED_ALLOC       (1)
 #endif
@@ -157,7 +160,10 @@ typedef long mp_off_t;
 // Enable sys.executable.
 #define MICROPY_PY_SYS_EXECUTABLE (1)
 
+// The socket module of the network module has its own default.
+#if !MICROPY_PY_NETWORK
 #define MICROPY_PY_SOCKET_LISTEN_BACKLOG_DEFAULT (SOMAXCONN < 128 ? SOMAXCONN : 128)
+#endif
 
 // Bare-metal ports don't have stderr. Printing debug to stderr may give tests
 // which check stdout a chance to pass, etc.
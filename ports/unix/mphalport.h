@@ -105,10 +105,28 @@ static inline void mp_hal_delay_us(mp_uint_t us) {
 
 void mp_hal_get_random(size_t n, void *buf);
 
-#if MICROPY_PY_BLUETOOTH
+#if MICROPY_PY_BLUETOOTH || MICROPY_PY_NETWORK_WIZNET5K
 enum {
     MP_HAL_MAC_BDADDR,
+    MP_HAL_MAC_ETH0,
 };
 
 void mp_hal_get_mac(int idx, uint8_t buf[6]);
 #endif
+
+#if MICROPY_PY_NETWORK_WIZNET5K
+// The SPI bus and pins that the WIZNET5K driver is given are those of the
+// W5500 register model in variants/wiznet5k, pins being driven through the
+// pin protocol of extmod/virtpin.
+#include "extmod/virtpin.h"
+
+#define mp_hal_pin_obj_t mp_obj_t
+#define mp_hal_pin_output(p) ((void)(p))
+#define mp_hal_pin_read(p) mp_virtual_pin_read(p)
+#define mp_hal_pin_write(p, v) mp_virtual_pin_write((p), (v))
+#define mp_hal_pin_low(p) mp_virtual_pin_write((p), 0)
+#define mp_hal_pin_high(p) mp_virtual_pin_write((p), 1)
+
+mp_hal_pin_obj_t mp_hal_get_pin_obj(mp_obj_t pin_in);
+mp_obj_base_t *mp_hal_get_spi_obj(mp_obj_t spi_in);
+#endif
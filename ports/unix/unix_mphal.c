@@ -259,3 +259,12 @@ void mp_hal_get_random(size_t n, void *buf) {
     close(fd);
     #endif
 }
+
+#if MICROPY_PY_NETWORK_WIZNET5K
+void mp_hal_get_mac(int idx, uint8_t buf[6]) {
+    // A locally administered address, the same on every run
+    buf[0] = 0x02;
+    memset(buf + 1, 0, 4);
+    buf[5] = idx;
+}
+#endif
@@ -79,9 +79,20 @@
 // Enable a small performance boost for the VM.
 #define MICROPY_OPT_COMPUTED_GOTO      (1)
 
+// Cache map lookups per call site in the VM.
+#define MICROPY_OPT_VM_INLINE_CACHE    (1)
+
+// Cache attribute lookups through the class hierarchy.
+#define MICROPY_OPT_CLASS_LOOKUP_CACHE (1)
+
 // Return number of collected objects from gc.collect().
 #define MICROPY_PY_GC_COLLECT_RETVAL   (1)
 
+// Allow the sweep phase of automatic collections to be done in slices, and
+// record GC pause times.
+#define MICROPY_GC_INCREMENTAL_SWEEP   (1)
+#define MICROPY_GC_PAUSE_STATS         (1)
+
 // Enable detailed error messages and warnings.
 #define MICROPY_ERROR_REPORTING     (MICROPY_ERROR_REPORTING_DETAILED)
 #define MICROPY_WARNINGS               (1)
@@ -114,6 +125,14 @@
 #define MICROPY_PY_SELECT_POSIX_OPTIMISATIONS (1)
 #define MICROPY_PY_SELECT_SELECT       (0)
 
+// Use slicing-by-8 tables for CRC32.
+#ifndef MICROPY_PY_DEFLATE_CRC32_TABLE
+#define MICROPY_PY_DEFLATE_CRC32_TABLE (8)
+#endif
+
+// Enable heapq.nsmallest, heapq.nlargest and heapq.merge.
+#define MICROPY_PY_HEAPQ_NSMALLEST_MERGE (1)
+
 // Enable the "websocket" module.
 #define MICROPY_PY_WEBSOCKET           (1)
 
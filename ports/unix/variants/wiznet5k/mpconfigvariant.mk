@@ -0,0 +1,10 @@
+# The WIZNET5K driver and ioLibrary, with the W5500 register model for them
+# to talk to.
+
+MICROPY_PY_NETWORK_WIZNET5K = 5500
+SHARED_SRC_C += shared/netutils/netutils.c
+
+# Let the blocking loops in ioLibrary's socket.c run pending callbacks.
+CFLAGS += -DWIZCHIP_YIELD=mpy_wiznet_yield
+
+FROZEN_MANIFEST ?= $(VARIANT_DIR)/manifest.py
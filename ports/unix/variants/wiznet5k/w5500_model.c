@@ -0,0 +1,548 @@
+/*
+ * This file is part of the MicroPython project, http://micropython.org/
+ *
+ * The MIT License (MIT)
+ *
+ * Copyright (c) 2026 The MicroPython project contributors
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in
+ * all copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ * THE SOFTWARE.
+ */
+
+// A register model of the W5500, which the WIZNET5K driver is created with
+// in place of the SPI bus and the CS and RST pins:
+//
+//     import network, w5500model
+//     chip = w5500model.W5500()
+//     nic = network.WIZNET5K(chip, chip.cs, chip.rst)
+//
+// It decodes each SPI frame, between CS going low and high, as a 16-bit
+// address and a control byte, with the block in its top five bits and the
+// read/write bit, followed by data with the address incremented after each
+// byte, as in variable length data mode.  Socket commands complete at once:
+// a TCP connect is established, sent data is acknowledged and logged, and
+// data to be received is put in the RX buffer by the test.  There's only
+// one chip, as there's only one WIZNET5K object.
+
+#include <string.h>
+
+#include "py/runtime.h"
+#include "py/mperrno.h"
+#include "py/mphal.h"
+#include "extmod/modmachine.h"
+#include "extmod/virtpin.h"
+
+#if MICROPY_PY_NETWORK_WIZNET5K == 5500
+
+#define W5500_SOCK_NUM (8)
+
+// The most buffer memory that one socket can be given
+#define W5500_SOCK_BUF_MAX (16 * 1024)
+
+// Control byte of a frame
+#define W5500_CTRL_BSB_SHIFT (3)
+#define W5500_CTRL_RWB (0x04)
+
+// Common registers
+#define W5500_MR (0x00)
+#define W5500_PHYCFGR (0x2e)
+#define W5500_VERSIONR (0x39)
+#define W5500_COMMON_SIZE (0x40)
+
+#define W5500_MR_RST (0x80)
+
+// Socket registers
+#define W5500_SN_MR (0x00)
+#define W5500_SN_CR (0x01)
+#define W5500_SN_IR (0x02)
+#define W5500_SN_SR (0x03)
+#define W5500_SN_RXBUF_SIZE (0x1e)
+#define W5500_SN_TXBUF_SIZE (0x1f)
+#define W5500_SN_TX_FSR (0x20)
+#define W5500_SN_TX_RD (0x22)
+#define W5500_SN_TX_WR (0x24)
+#define W5500_SN_RX_RSR (0x26)
+#define W5500_SN_RX_RD (0x28)
+#define W5500_SN_RX_WR (0x2a)
+#define W5500_SN_SIZE (0x30)
+
+#define W5500_SN_MR_TCP (0x01)
+#define W5500_SN_MR_UDP (0x02)
+#define W5500_SN_MR_MACRAW (0x04)
+
+#define W5500_SN_CR_OPEN (0x01)
+#define W5500_SN_CR_LISTEN (0x02)
+#define W5500_SN_CR_CONNECT (0x04)
+#define W5500_SN_CR_DISCON (0x08)
+#define W5500_SN_CR_CLOSE (0x10)
+#define W5500_SN_CR_SEND (0x20)
+
+#define W5500_SN_IR_CON (0x01)
+#define W5500_SN_IR_DISCON (0x02)
+#define W5500_SN_IR_RECV (0x04)
+#define W5500_SN_IR_TIMEOUT (0x08)
+#define W5500_SN_IR_SENDOK (0x10)
+
+#define W5500_SOCK_CLOSED (0x00)
+#define W5500_SOCK_INIT (0x13)
+#define W5500_SOCK_LISTEN (0x14)
+#define W5500_SOCK_ESTABLISHED (0x17)
+#define W5500_SOCK_CLOSE_WAIT (0x1c)
+#define W5500_SOCK_UDP (0x22)
+#define W5500_SOCK_MACRAW (0x42)
+
+typedef struct _w5500_pin_obj_t {
+    mp_obj_base_t base;
+    uint8_t value;
+} w5500_pin_obj_t;
+
+typedef struct _w5500_sock_t {
+    uint8_t regs[W5500_SN_SIZE];
+    // Sent data has been acknowledged up to tx_rd, and received data ends
+    // at rx_wr; the pointers that the host writes are kept in regs
+    uint16_t tx_rd;
+    uint16_t rx_wr;
+    uint8_t tx_buf[W5500_SOCK_BUF_MAX];
+    uint8_t rx_buf[W5500_SOCK_BUF_MAX];
+    // The data of the SEND commands, until it's taken by tx()
+    uint16_t sent_len;
+    uint8_t sent[W5500_SOCK_BUF_MAX];
+    // Data that arrives in the middle of the next read of Sn_RX_RSR
+    uint16_t torn_len;
+    uint8_t torn[W5500_SOCK_BUF_MAX];
+} w5500_sock_t;
+
+typedef struct _w5500_obj_t {
+    mp_obj_base_t base;
+    w5500_pin_obj_t cs;
+    w5500_pin_obj_t rst;
+    // The frame being decoded, its header and then the address of the data
+    uint8_t header_len;
+    uint8_t header[3];
+    uint16_t addr;
+    uint32_t frames;
+    uint32_t bytes;
+    uint8_t common[W5500_COMMON_SIZE];
+    w5500_sock_t sock[W5500_SOCK_NUM];
+} w5500_obj_t;
+
+static const mp_obj_type_t w5500_type;
+static const mp_obj_type_t w5500_pin_type;
+
+static w5500_obj_t w5500_obj;
+
+static uint16_t w5500_get16(const uint8_t *p) {
+    return p[0] << 8 | p[1];
+}
+
+static uint16_t w5500_tx_size(const w5500_sock_t *s) {
+    return s->regs[W5500_SN_TXBUF_SIZE] << 10;
+}
+
+static uint16_t w5500_rx_size(const w5500_sock_t *s) {
+    return s->regs[W5500_SN_RXBUF_SIZE] << 10;
+}
+
+static uint16_t w5500_tx_fsr(const w5500_sock_t *s) {
+    return w5500_tx_size(s) - (uint16_t)(w5500_get16(&s->regs[W5500_SN_TX_WR]) - s->tx_rd);
+}
+
+static uint16_t w5500_rx_rsr(const w5500_sock_t *s) {
+    return s->rx_wr - w5500_get16(&s->regs[W5500_SN_RX_RD]);
+}
+
+static void w5500_reset(w5500_obj_t *self) {
+    memset(self->common, 0, sizeof(self->common));
+    // Link up at 100M full duplex
+    self->common[W5500_PHYCFGR] = 0xbf;
+    self->common[W5500_VERSIONR] = 0x04;
+    for (size_t sn = 0; sn < W5500_SOCK_NUM; ++sn) {
+        w5500_sock_t *s = &self->sock[sn];
+        memset(s->regs, 0, sizeof(s->regs));
+        s->regs[W5500_SN_RXBUF_SIZE] = 2;
+        s->regs[W5500_SN_TXBUF_SIZE] = 2;
+        s->tx_rd = 0;
+        s->rx_wr = 0;
+        s->torn_len = 0;
+    }
+}
+
+// Put data in a socket's RX buffer, as much as fits
+static void w5500_rx(w5500_sock_t *s, const uint8_t *data, size_t len) {
+    uint16_t size = w5500_rx_size(s);
+    if (size == 0) {
+        return;
+    }
+    len = MIN(len, (size_t)(size - w5500_rx_rsr(s)));
+    for (size_t i = 0; i < len; ++i) {
+        s->rx_buf[(uint16_t)(s->rx_wr + i) & (size - 1)] = data[i];
+    }
+    s->rx_wr += len;
+    if (len != 0) {
+        s->regs[W5500_SN_IR] |= W5500_SN_IR_RECV;
+    }
+}
+
+static void w5500_command(w5500_sock_t *s, uint8_t cmd) {
+    uint8_t *sr = &s->regs[W5500_SN_SR];
+    switch (cmd) {
+        case W5500_SN_CR_OPEN:
+            switch (s->regs[W5500_SN_MR] & 0x0f) {
+                case W5500_SN_MR_TCP:
+                    *sr = W5500_SOCK_INIT;
+                    break;
+                case W5500_SN_MR_UDP:
+                    *sr = W5500_SOCK_UDP;
+                    break;
+                case W5500_SN_MR_MACRAW:
+                    *sr = W5500_SOCK_MACRAW;
+                    break;
+                default:
+                    return;
+            }
+            memset(&s->regs[W5500_SN_TX_FSR], 0, W5500_SN_RX_WR + 2 - W5500_SN_TX_FSR);
+            s->tx_rd = 0;
+            s->rx_wr = 0;
+            break;
+        case W5500_SN_CR_LISTEN:
+            if (*sr == W5500_SOCK_INIT) {
+                *sr = W5500_SOCK_LISTEN;
+            }
+            break;
+        case W5500_SN_CR_CONNECT:
+            if (*sr == W5500_SOCK_INIT) {
+                *sr = W5500_SOCK_ESTABLISHED;
+                s->regs[W5500_SN_IR] |= W5500_SN_IR_CON;
+            }
+            break;
+        case W5500_SN_CR_DISCON:
+            if (*sr == W5500_SOCK_ESTABLISHED || *sr == W5500_SOCK_CLOSE_WAIT) {
+                *sr = W5500_SOCK_CLOSED;
+                s->regs[W5500_SN_IR] |= W5500_SN_IR_DISCON;
+            }
+            break;
+        case W5500_SN_CR_CLOSE:
+            *sr = W5500_SOCK_CLOSED;
+            break;
+        case W5500_SN_CR_SEND: {
+            if (*sr != W5500_SOCK_ESTABLISHED && *sr != W5500_SOCK_CLOSE_WAIT
+                && *sr != W5500_SOCK_UDP && *sr != W5500_SOCK_MACRAW) {
+                break;
+            }
+            uint16_t size = w5500_tx_size(s);
+            uint16_t tx_wr = w5500_get16(&s->regs[W5500_SN_TX_WR]);
+            for (; s->tx_rd != tx_wr; ++s->tx_rd) {
+                if (s->sent_len < W5500_SOCK_BUF_MAX) {
+                    s->sent[s->sent_len++] = s->tx_buf[s->tx_rd & (size - 1)];
+                }
+            }
+            s->regs[W5500_SN_IR] |= W5500_SN_IR_SENDOK;
+            break;
+        }
+    }
+}
+
+static uint8_t w5500_read(w5500_obj_t *self, uint8_t block, uint16_t addr) {
+    if (block == 0) {
+        return addr < W5500_COMMON_SIZE ? self->common[addr] : 0;
+    }
+    w5500_sock_t *s = &self->sock[block >> 2];
+    switch (block & 3) {
+        case 1: {
+            uint16_t val;
+            switch (addr & ~1) {
+                case W5500_SN_TX_FSR:
+                    val = w5500_tx_fsr(s);
+                    break;
+                case W5500_SN_TX_RD:
+                    val = s->tx_rd;
+                    break;
+                case W5500_SN_RX_RSR:
+                    val = w5500_rx_rsr(s);
+                    if (addr == W5500_SN_RX_RSR && s->torn_len != 0) {
+                        // The data arrives between the two bytes of the read
+                        w5500_rx(s, s->torn, s->torn_len);
+                        s->torn_len = 0;
+                    }
+                    break;
+                case W5500_SN_RX_WR:
+                    val = s->rx_wr;
+                    break;
+                default:
+                    return addr < W5500_SN_SIZE ? s->regs[addr] : 0;
+            }
+            return addr & 1 ? val & 0xff : val >> 8;
+        }
+        case 2:
+            return s->tx_buf[addr & (w5500_tx_size(s) - 1)];
+        case 3:
+            return s->rx_buf[addr & (w5500_rx_size(s) - 1)];
+        default:
+            return 0;
+    }
+}
+
+static void w5500_write(w5500_obj_t *self, uint8_t block, uint16_t addr, uint8_t val) {
+    if (block == 0) {
+        if (addr == W5500_MR && val & W5500_MR_RST) {
+            w5500_reset(self);
+        } else if (addr < W5500_COMMON_SIZE && addr != W5500_PHYCFGR && addr != W5500_VERSIONR) {
+            self->common[addr] = val;
+        }
+        return;
+    }
+    w5500_sock_t *s = &self->sock[block >> 2];
+    switch (block & 3) {
+        case 1:
+            switch (addr) {
+                case W5500_SN_CR:
+                    w5500_command(s, val);
+                    break;
+                case W5500_SN_IR:
+                    s->regs[W5500_SN_IR] &= ~val;
+                    break;
+                case W5500_SN_SR:
+                case W5500_SN_TX_FSR:
+                case W5500_SN_TX_FSR + 1:
+                case W5500_SN_TX_RD:
+                case W5500_SN_TX_RD + 1:
+                case W5500_SN_RX_RSR:
+                case W5500_SN_RX_RSR + 1:
+                case W5500_SN_RX_WR:
+                case W5500_SN_RX_WR + 1:
+                    // Read-only
+                    break;
+                default:
+                    if (addr < W5500_SN_SIZE) {
+                        s->regs[addr] = val;
+                    }
+                    break;
+            }
+            break;
+        case 2:
+            s->tx_buf[addr & (w5500_tx_size(s) - 1)] = val;
+            break;
+    }
+}
+
+// The SPI bus, which is only clocked while CS is low
+static void w5500_spi_transfer(mp_obj_base_t *obj, size_t len, const uint8_t *src, uint8_t *dest) {
+    w5500_obj_t *self = (w5500_obj_t *)obj;
+    self->bytes += len;
+    for (size_t i = 0; i < len; ++i) {
+        uint8_t in = src != NULL ? src[i] : 0;
+        uint8_t out = 0;
+        if (self->cs.value) {
+            // Not selected
+        } else if (self->header_len < sizeof(self->header)) {
+            self->header[self->header_len++] = in;
+            self->addr = w5500_get16(self->header);
+        } else {
+            uint8_t ctrl = self->header[2];
+            uint8_t block = ctrl >> W5500_CTRL_BSB_SHIFT;
+            if (ctrl & W5500_CTRL_RWB) {
+                w5500_write(self, block, self->addr, in);
+            } else {
+                out = w5500_read(self, block, self->addr);
+            }
+            ++self->addr;
+        }
+        if (dest != NULL) {
+            dest[i] = out;
+        }
+    }
+}
+
+static const mp_machine_spi_p_t w5500_spi_p = {
+    .transfer = w5500_spi_transfer,
+};
+
+static mp_uint_t w5500_pin_ioctl(mp_obj_t self_in, mp_uint_t request, uintptr_t arg, int *errcode) {
+    w5500_pin_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    switch (request) {
+        case MP_PIN_READ:
+            return self->value;
+        case MP_PIN_WRITE: {
+            uint8_t value = arg != 0;
+            if (self == &w5500_obj.cs && self->value && !value) {
+                // Start of a frame
+                w5500_obj.frames += 1;
+                w5500_obj.header_len = 0;
+            } else if (self == &w5500_obj.rst && self->value && !value) {
+                w5500_reset(&w5500_obj);
+            }
+            self->value = value;
+            return 0;
+        }
+    }
+    *errcode = MP_EINVAL;
+    return -1;
+}
+
+static const mp_pin_p_t w5500_pin_p = {
+    .ioctl = w5500_pin_ioctl,
+};
+
+static MP_DEFINE_CONST_OBJ_TYPE(
+    w5500_pin_type,
+    MP_QSTR_W5500Pin,
+    MP_TYPE_FLAG_NONE,
+    protocol, &w5500_pin_p
+    );
+
+mp_hal_pin_obj_t mp_hal_get_pin_obj(mp_obj_t pin_in) {
+    if (!mp_obj_is_type(pin_in, &w5500_pin_type)) {
+        mp_raise_TypeError(MP_ERROR_TEXT("expecting a pin"));
+    }
+    return pin_in;
+}
+
+mp_obj_base_t *mp_hal_get_spi_obj(mp_obj_t spi_in) {
+    if (!mp_obj_is_type(spi_in, &w5500_type)) {
+        mp_raise_TypeError(MP_ERROR_TEXT("expecting an SPI object"));
+    }
+    return MP_OBJ_TO_PTR(spi_in);
+}
+
+static w5500_sock_t *w5500_get_sock(mp_obj_t sn_in) {
+    mp_uint_t sn = mp_obj_get_int(sn_in);
+    if (sn >= W5500_SOCK_NUM) {
+        mp_raise_ValueError(NULL);
+    }
+    return &w5500_obj.sock[sn];
+}
+
+// W5500()
+// Reset the chip, with CS and RST high, and return it.
+static mp_obj_t w5500_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *args) {
+    mp_arg_check_num(n_args, n_kw, 0, 0, false);
+    w5500_obj_t *self = &w5500_obj;
+    self->base.type = &w5500_type;
+    self->cs.base.type = &w5500_pin_type;
+    self->cs.value = 1;
+    self->rst.base.type = &w5500_pin_type;
+    self->rst.value = 1;
+    self->header_len = 0;
+    self->frames = 0;
+    self->bytes = 0;
+    for (size_t sn = 0; sn < W5500_SOCK_NUM; ++sn) {
+        self->sock[sn].sent_len = 0;
+    }
+    w5500_reset(self);
+    return MP_OBJ_FROM_PTR(self);
+}
+
+// rx(sn, data[, torn])
+// Receive data on a socket, as much as fits in its RX buffer.  If torn is
+// true the data arrives in the middle of the next read of Sn_RX_RSR, between
+// its high and low bytes.
+static mp_obj_t w5500_rx_data(size_t n_args, const mp_obj_t *args) {
+    w5500_sock_t *s = w5500_get_sock(args[1]);
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(args[2], &bufinfo, MP_BUFFER_READ);
+    if (n_args > 3 && mp_obj_is_true(args[3])) {
+        s->torn_len = MIN(bufinfo.len, sizeof(s->torn));
+        memcpy(s->torn, bufinfo.buf, s->torn_len);
+    } else {
+        w5500_rx(s, bufinfo.buf, bufinfo.len);
+    }
+    return mp_const_none;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(w5500_rx_data_obj, 3, 4, w5500_rx_data);
+
+// tx(sn)
+// Get the data sent on a socket since the last call.
+static mp_obj_t w5500_tx_data(mp_obj_t self_in, mp_obj_t sn_in) {
+    (void)self_in;
+    w5500_sock_t *s = w5500_get_sock(sn_in);
+    mp_obj_t data = mp_obj_new_bytes(s->sent, s->sent_len);
+    s->sent_len = 0;
+    return data;
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(w5500_tx_data_obj, w5500_tx_data);
+
+// timeout(sn)
+// Give up on a TCP connection as when its retransmissions run out.
+static mp_obj_t w5500_timeout(mp_obj_t self_in, mp_obj_t sn_in) {
+    (void)self_in;
+    w5500_sock_t *s = w5500_get_sock(sn_in);
+    s->regs[W5500_SN_SR] = W5500_SOCK_CLOSED;
+    s->regs[W5500_SN_IR] |= W5500_SN_IR_TIMEOUT;
+    return mp_const_none;
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(w5500_timeout_obj, w5500_timeout);
+
+// counts()
+// Get the number of SPI frames and bytes, as a tuple.
+static mp_obj_t w5500_counts(mp_obj_t self_in) {
+    w5500_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_obj_t tuple[2] = {
+        mp_obj_new_int_from_uint(self->frames),
+        mp_obj_new_int_from_uint(self->bytes),
+    };
+    return mp_obj_new_tuple(2, tuple);
+}
+static MP_DEFINE_CONST_FUN_OBJ_1(w5500_counts_obj, w5500_counts);
+
+static void w5500_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest) {
+    w5500_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    if (dest[0] != MP_OBJ_NULL) {
+        return;
+    }
+    if (attr == MP_QSTR_cs) {
+        dest[0] = MP_OBJ_FROM_PTR(&self->cs);
+    } else if (attr == MP_QSTR_rst) {
+        dest[0] = MP_OBJ_FROM_PTR(&self->rst);
+    } else {
+        // Continue lookup in locals_dict
+        dest[1] = MP_OBJ_SENTINEL;
+    }
+}
+
+static const mp_rom_map_elem_t w5500_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_rx), MP_ROM_PTR(&w5500_rx_data_obj) },
+    { MP_ROM_QSTR(MP_QSTR_tx), MP_ROM_PTR(&w5500_tx_data_obj) },
+    { MP_ROM_QSTR(MP_QSTR_timeout), MP_ROM_PTR(&w5500_timeout_obj) },
+    { MP_ROM_QSTR(MP_QSTR_counts), MP_ROM_PTR(&w5500_counts_obj) },
+};
+static MP_DEFINE_CONST_DICT(w5500_locals_dict, w5500_locals_dict_table);
+
+static MP_DEFINE_CONST_OBJ_TYPE(
+    w5500_type,
+    MP_QSTR_W5500,
+    MP_TYPE_FLAG_NONE,
+    make_new, w5500_make_new,
+    attr, w5500_attr,
+    protocol, &w5500_spi_p,
+    locals_dict, &w5500_locals_dict
+    );
+
+static const mp_rom_map_elem_t w5500model_module_globals_table[] = {
+    { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_w5500model) },
+    { MP_ROM_QSTR(MP_QSTR_W5500), MP_ROM_PTR(&w5500_type) },
+};
+static MP_DEFINE_CONST_DICT(w5500model_module_globals, w5500model_module_globals_table);
+
+const mp_obj_module_t w5500model_module = {
+    .base = { &mp_type_module },
+    .globals = (mp_obj_dict_t *)&w5500model_module_globals,
+};
+
+MP_REGISTER_MODULE(MP_QSTR_w5500model, w5500model_module);
+
+#endif // MICROPY_PY_NETWORK_WIZNET5K == 5500
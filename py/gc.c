@@ -32,6 +32,10 @@
 #include "py/gc.h"
 #include "py/runtime.h"
 
+#if MICROPY_GC_PAUSE_STATS
+#include "py/mphal.h"
+#endif
+
 #if MICROPY_DEBUG_VALGRIND
 #include <valgrind/memcheck.h>
 #endif
@@ -92,6 +96,13 @@
 #define ATB_HEAD_TO_MARK(area, block) do { area->gc_alloc_table_start[(block) / BLOCKS_PER_ATB] |= (AT_MARK << BLOCK_SHIFT(block)); } while (0)
 #define ATB_MARK_TO_HEAD(area, block) do { area->gc_alloc_table_start[(block) / BLOCKS_PER_ATB] &= (~(AT_TAIL << BLOCK_SHIFT(block))); } while (0)
 
+#if MICROPY_GC_INCREMENTAL_SWEEP
+// Live heads may still be marked while a deferred sweep is pending.
+#define ATB_IS_HEAD(area, block) (ATB_GET_KIND(area, block) == AT_HEAD || ATB_GET_KIND(area, block) == AT_MARK)
+#else
+#define ATB_IS_HEAD(area, block) (ATB_GET_KIND(area, block) == AT_HEAD)
+#endif
+
 #define BLOCK_FROM_PTR(area, ptr) (((byte *)(ptr) - area->gc_pool_start) / BYTES_PER_BLOCK)
 #define PTR_FROM_BLOCK(area, block) (((block) * BYTES_PER_BLOCK + (uintptr_t)area->gc_pool_start))
 
@@ -165,6 +176,9 @@ static void gc_setup_area(mp_state_mem_area_t *area, void *start, void *end) {
 
     area->gc_last_free_atb_index = 0;
     area->gc_last_used_block = 0;
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    area->gc_sweep_block = (size_t)-1;
+    #endif
 
     #if MICROPY_GC_SPLIT_HEAP
     area->next = NULL;
@@ -210,6 +224,17 @@ void gc_init(void *start, void *end) {
     MP_STATE_MEM(gc_alloc_amount) = 0;
     #endif
 
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    // by default, sweep in one go
+    MP_STATE_MEM(gc_sweep_slice_blocks) = 0;
+    MP_STATE_MEM(gc_sweep_area) = NULL;
+    MP_STATE_MEM(gc_sweep_defer) = 0;
+    #endif
+
+    #if MICROPY_GC_PAUSE_STATS
+    gc_pause_stats_reset();
+    #endif
+
     #if MICROPY_PY_THREAD && !MICROPY_PY_THREAD_GIL
     mp_thread_mutex_init(&MP_STATE_MEM(gc_mutex));
     #endif
@@ -477,6 +502,52 @@ static void gc_deal_with_stack_overflow(void) {
     }
 }
 
+#if MICROPY_GC_PAUSE_STATS
+void gc_pause_stats_reset(void) {
+    MP_STATE_MEM(gc_pause_count) = 0;
+    MP_STATE_MEM(gc_pause_total_us) = 0;
+    MP_STATE_MEM(gc_pause_max_us) = 0;
+    memset(MP_STATE_MEM(gc_pause_hist), 0, sizeof(MP_STATE_MEM(gc_pause_hist)));
+}
+
+static void gc_pause_record(mp_uint_t start) {
+    mp_uint_t dt = mp_hal_ticks_us() - start;
+    MP_STATE_MEM(gc_pause_count) += 1;
+    MP_STATE_MEM(gc_pause_total_us) += dt;
+    if (dt > MP_STATE_MEM(gc_pause_max_us)) {
+        MP_STATE_MEM(gc_pause_max_us) = dt;
+    }
+    // bucket n counts pauses in the range [2**(n-1), 2**n) microseconds,
+    // with the last bucket also counting all longer pauses
+    size_t bucket = 0;
+    while (dt != 0 && bucket < MICROPY_GC_PAUSE_STATS_NUM_BUCKETS - 1) {
+        dt >>= 1;
+        bucket += 1;
+    }
+    MP_STATE_MEM(gc_pause_hist)[bucket] += 1;
+}
+#endif
+
+#if MICROPY_ENABLE_FINALISER
+static void gc_run_finaliser(mp_obj_base_t *obj) {
+    if (obj->type != NULL) {
+        // if the object has a type then see if it has a __del__ method
+        mp_obj_t dest[2];
+        mp_load_method_maybe(MP_OBJ_FROM_PTR(obj), MP_QSTR___del__, dest);
+        if (dest[0] != MP_OBJ_NULL) {
+            // load_method returned a method, execute it in a protected environment
+            #if MICROPY_ENABLE_SCHEDULER
+            mp_sched_lock();
+            #endif
+            mp_call_function_1_protected(dest[0], dest[1]);
+            #if MICROPY_ENABLE_SCHEDULER
+            mp_sched_unlock();
+            #endif
+        }
+    }
+}
+#endif
+
 static void gc_sweep(void) {
     #if MICROPY_PY_GC_COLLECT_RETVAL
     MP_STATE_MEM(gc_collected) = 0;
@@ -500,22 +571,7 @@ static void gc_sweep(void) {
                 case AT_HEAD:
                     #if MICROPY_ENABLE_FINALISER
                     if (FTB_GET(area, block)) {
-                        mp_obj_base_t *obj = (mp_obj_base_t *)PTR_FROM_BLOCK(area, block);
-                        if (obj->type != NULL) {
-                            // if the object has a type then see if it has a __del__ method
-                            mp_obj_t dest[2];
-                            mp_load_method_maybe(MP_OBJ_FROM_PTR(obj), MP_QSTR___del__, dest);
-                            if (dest[0] != MP_OBJ_NULL) {
-                                // load_method returned a method, execute it in a protected environment
-                                #if MICROPY_ENABLE_SCHEDULER
-                                mp_sched_lock();
-                                #endif
-                                mp_call_function_1_protected(dest[0], dest[1]);
-                                #if MICROPY_ENABLE_SCHEDULER
-                                mp_sched_unlock();
-                                #endif
-                            }
-                        }
+                        gc_run_finaliser((mp_obj_base_t *)PTR_FROM_BLOCK(area, block));
                         // clear finaliser flag
                         FTB_CLEAR(area, block);
                     }
@@ -562,9 +618,147 @@ static void gc_sweep(void) {
     }
 }
 
+#if MICROPY_GC_INCREMENTAL_SWEEP
+#if MICROPY_ENABLE_FINALISER
+// Run the finalisers of all unmarked objects.  A finaliser may use other
+// unreachable objects, which must not be freed, and so possibly reallocated,
+// by a sweep slice before it runs.  Running them all before the sweep is
+// deferred leaves them no worse off than in a full sweep.
+static void gc_run_pending_finalisers(void) {
+    for (mp_state_mem_area_t *area = &MP_STATE_MEM(area); area != NULL; area = NEXT_AREA(area)) {
+        size_t end_block = area->gc_alloc_table_byte_len * BLOCKS_PER_ATB;
+        if (area->gc_last_used_block < end_block) {
+            end_block = area->gc_last_used_block + 1;
+        }
+        for (size_t block = 0; block < end_block; block += BLOCKS_PER_FTB) {
+            if (area->gc_finaliser_table_start[block / BLOCKS_PER_FTB] == 0) {
+                continue;
+            }
+            for (size_t b = block; b < block + BLOCKS_PER_FTB && b < end_block; b++) {
+                if (FTB_GET(area, b) && ATB_GET_KIND(area, b) == AT_HEAD) {
+                    gc_run_finaliser((mp_obj_base_t *)PTR_FROM_BLOCK(area, b));
+                    FTB_CLEAR(area, b);
+                }
+            }
+        }
+    }
+}
+#endif
+
+// Start a deferred sweep of the whole heap.  Until it is complete, blocks at
+// or after an area's gc_sweep_block are in the state left by the mark phase.
+static void gc_sweep_begin(void) {
+    #if MICROPY_PY_GC_COLLECT_RETVAL
+    MP_STATE_MEM(gc_collected) = 0;
+    #endif
+    #if MICROPY_ENABLE_FINALISER
+    gc_run_pending_finalisers();
+    #endif
+    for (mp_state_mem_area_t *area = &MP_STATE_MEM(area); area != NULL; area = NEXT_AREA(area)) {
+        area->gc_sweep_block = 0;
+    }
+    MP_STATE_MEM(gc_sweep_area) = &MP_STATE_MEM(area);
+}
+
+// Continue a deferred sweep, processing at least max_blocks blocks.  A slice
+// only ends on an object boundary, so that the tail of an unmarked chain is
+// never left behind for the allocator to see.  The finalisers of the
+// unmarked objects have already been run by gc_sweep_begin().  The heap
+// area's gc_last_used_block is not reduced here, it is only an upper bound.
+// Must be called with the GC locked.
+static void gc_sweep_slice(size_t max_blocks) {
+    mp_state_mem_area_t *area = MP_STATE_MEM(gc_sweep_area);
+    while (area != NULL) {
+        size_t end_block = area->gc_alloc_table_byte_len * BLOCKS_PER_ATB;
+        if (area->gc_last_used_block < end_block) {
+            end_block = area->gc_last_used_block + 1;
+        }
+
+        int free_tail = 0;
+        size_t block = area->gc_sweep_block;
+        for (; block < end_block; block++) {
+            MICROPY_GC_HOOK_LOOP(block);
+            size_t kind = ATB_GET_KIND(area, block);
+            if (max_blocks == 0 && kind != AT_TAIL) {
+                break;
+            }
+            switch (kind) {
+                case AT_HEAD:
+                    free_tail = 1;
+                    #if MICROPY_PY_GC_COLLECT_RETVAL
+                    MP_STATE_MEM(gc_collected)++;
+                    #endif
+                    MP_FALLTHROUGH
+
+                case AT_TAIL:
+                    if (free_tail) {
+                        ATB_ANY_TO_FREE(area, block);
+                        // the allocator may already have scanned past this block
+                        if (block / BLOCKS_PER_ATB < area->gc_last_free_atb_index) {
+                            area->gc_last_free_atb_index = block / BLOCKS_PER_ATB;
+                        }
+                        #if MICROPY_GC_SPLIT_HEAP
+                        MP_STATE_MEM(gc_last_free_area) = &MP_STATE_MEM(area);
+                        #endif
+                    }
+                    break;
+
+                case AT_MARK:
+                    ATB_MARK_TO_HEAD(area, block);
+                    free_tail = 0;
+                    break;
+            }
+            if (max_blocks != 0) {
+                max_blocks -= 1;
+            }
+        }
+
+        if (block < end_block) {
+            // slice used up, resume from here next time
+            area->gc_sweep_block = block;
+            MP_STATE_MEM(gc_sweep_area) = area;
+            return;
+        }
+
+        area->gc_sweep_block = (size_t)-1;
+        area = NEXT_AREA(area);
+    }
+    MP_STATE_MEM(gc_sweep_area) = NULL;
+}
+
+// Sweep the next slice of a deferred sweep, if there is one pending.
+// Must be called with GC_ENTER held.
+static void gc_sweep_incremental(void) {
+    if (MP_STATE_MEM(gc_sweep_area) == NULL) {
+        return;
+    }
+    #if MICROPY_GC_PAUSE_STATS
+    mp_uint_t start = mp_hal_ticks_us();
+    #endif
+    size_t max_blocks = MP_STATE_MEM(gc_sweep_slice_blocks);
+    if (max_blocks == 0) {
+        // deferring was disabled since this sweep started, so finish it now
+        max_blocks = (size_t)-1;
+    }
+    MP_STATE_THREAD(gc_lock_depth)++;
+    gc_sweep_slice(max_blocks);
+    MP_STATE_THREAD(gc_lock_depth)--;
+    #if MICROPY_GC_PAUSE_STATS
+    gc_pause_record(start);
+    #endif
+}
+#endif
+
 void gc_collect_start(void) {
     GC_ENTER();
     MP_STATE_THREAD(gc_lock_depth)++;
+    #if MICROPY_GC_PAUSE_STATS
+    MP_STATE_MEM(gc_pause_start) = mp_hal_ticks_us();
+    #endif
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    // the mark phase needs the whole heap to be swept
+    gc_sweep_slice((size_t)-1);
+    #endif
     #if MICROPY_GC_ALLOC_THRESHOLD
     MP_STATE_MEM(gc_alloc_amount) = 0;
     #endif
@@ -632,13 +826,25 @@ void gc_collect_root(void **ptrs, size_t len) {
 
 void gc_collect_end(void) {
     gc_deal_with_stack_overflow();
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    if (MP_STATE_MEM(gc_sweep_defer) && MP_STATE_MEM(gc_sweep_slice_blocks) != 0) {
+        gc_sweep_begin();
+    } else {
+        gc_sweep();
+    }
+    MP_STATE_MEM(gc_sweep_defer) = 0;
+    #else
     gc_sweep();
+    #endif
     #if MICROPY_GC_SPLIT_HEAP
     MP_STATE_MEM(gc_last_free_area) = &MP_STATE_MEM(area);
     #endif
     for (mp_state_mem_area_t *area = &MP_STATE_MEM(area); area != NULL; area = NEXT_AREA(area)) {
         area->gc_last_free_atb_index = 0;
     }
+    #if MICROPY_GC_PAUSE_STATS
+    gc_pause_record(MP_STATE_MEM(gc_pause_start));
+    #endif
     MP_STATE_THREAD(gc_lock_depth)--;
     GC_EXIT();
 }
@@ -646,6 +852,13 @@ void gc_collect_end(void) {
 void gc_sweep_all(void) {
     GC_ENTER();
     MP_STATE_THREAD(gc_lock_depth)++;
+    #if MICROPY_GC_PAUSE_STATS
+    MP_STATE_MEM(gc_pause_start) = mp_hal_ticks_us();
+    #endif
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    // finish any deferred sweep so that no blocks are left marked
+    gc_sweep_slice((size_t)-1);
+    #endif
     MP_STATE_MEM(gc_stack_overflow) = 0;
     gc_collect_end();
 }
@@ -673,6 +886,7 @@ void gc_info(gc_info_t *info) {
                     break;
 
                 case AT_HEAD:
+                case AT_MARK: // a live head not yet reached by a deferred sweep
                     info->used += 1;
                     len = 1;
                     break;
@@ -681,10 +895,6 @@ void gc_info(gc_info_t *info) {
                     info->used += 1;
                     len += 1;
                     break;
-
-                case AT_MARK:
-                    // shouldn't happen
-                    break;
             }
 
             block++;
@@ -694,7 +904,7 @@ void gc_info(gc_info_t *info) {
                 kind = ATB_GET_KIND(area, block);
             }
 
-            if (finish || kind == AT_FREE || kind == AT_HEAD) {
+            if (finish || kind == AT_FREE || kind == AT_HEAD || kind == AT_MARK) {
                 if (len == 1) {
                     info->num_1block += 1;
                 } else if (len == 2) {
@@ -703,7 +913,7 @@ void gc_info(gc_info_t *info) {
                 if (len > info->max_block) {
                     info->max_block = len;
                 }
-                if (finish || kind == AT_HEAD) {
+                if (finish || kind == AT_HEAD || kind == AT_MARK) {
                     if (len_free > info->max_free) {
                         info->max_free = len_free;
                     }
@@ -750,9 +960,16 @@ void *gc_alloc(size_t n_bytes, unsigned int alloc_flags) {
     bool added = false;
     #endif
 
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    gc_sweep_incremental();
+    #endif
+
     #if MICROPY_GC_ALLOC_THRESHOLD
     if (!collected && MP_STATE_MEM(gc_alloc_amount) >= MP_STATE_MEM(gc_alloc_threshold)) {
         GC_EXIT();
+        #if MICROPY_GC_INCREMENTAL_SWEEP
+        MP_STATE_MEM(gc_sweep_defer) = 1;
+        #endif
         gc_collect();
         collected = 1;
         GC_ENTER();
@@ -791,6 +1008,14 @@ void *gc_alloc(size_t n_bytes, unsigned int alloc_flags) {
             #endif
         }
 
+        #if MICROPY_GC_INCREMENTAL_SWEEP
+        if (MP_STATE_MEM(gc_sweep_area) != NULL) {
+            // reclaim some more memory from the deferred sweep and try again
+            gc_sweep_incremental();
+            continue;
+        }
+        #endif
+
         GC_EXIT();
         // nothing found!
         if (collected) {
@@ -803,6 +1028,9 @@ void *gc_alloc(size_t n_bytes, unsigned int alloc_flags) {
             return NULL;
         }
         DEBUG_printf("gc_alloc(" UINT_FMT "): no free mem, triggering GC\n", n_bytes);
+        #if MICROPY_GC_INCREMENTAL_SWEEP
+        MP_STATE_MEM(gc_sweep_defer) = 1;
+        #endif
         gc_collect();
         collected = 1;
         GC_ENTER();
@@ -831,6 +1059,14 @@ found:
     // mark first block as used head
     ATB_FREE_TO_HEAD(area, start_block);
 
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    if (start_block >= area->gc_sweep_block) {
+        // the deferred sweep has not reached this block yet, so mark it as
+        // live to stop the sweep from freeing it
+        ATB_HEAD_TO_MARK(area, start_block);
+    }
+    #endif
+
     // mark rest of blocks as used tail
     // TODO for a run of many blocks can make this more efficient
     for (size_t bl = start_block + 1; bl <= end_block; bl++) {
@@ -911,7 +1147,7 @@ void gc_free(void *ptr) {
     #endif
 
     size_t block = BLOCK_FROM_PTR(area, ptr);
-    assert(ATB_GET_KIND(area, block) == AT_HEAD);
+    assert(ATB_IS_HEAD(area, block));
 
     #if MICROPY_ENABLE_FINALISER
     FTB_CLEAR(area, block);
@@ -966,7 +1202,7 @@ size_t gc_nbytes(const void *ptr) {
 
     if (area) {
         size_t block = BLOCK_FROM_PTR(area, ptr);
-        if (ATB_GET_KIND(area, block) == AT_HEAD) {
+        if (ATB_IS_HEAD(area, block)) {
             // work out number of consecutive blocks in the chain starting with this on
             size_t n_blocks = 0;
             do {
@@ -1012,7 +1248,7 @@ void *gc_realloc(void *ptr_in, size_t n_bytes, bool allow_move) {
     area = &MP_STATE_MEM(area);
     #endif
     size_t block = BLOCK_FROM_PTR(area, ptr);
-    assert(ATB_GET_KIND(area, block) == AT_HEAD);
+    assert(ATB_IS_HEAD(area, block));
 
     // compute number of new blocks that are requested
     size_t new_blocks = (n_bytes + BYTES_PER_BLOCK - 1) / BYTES_PER_BLOCK;
@@ -81,6 +81,9 @@ typedef struct _gc_info_t {
 } gc_info_t;
 
 void gc_info(gc_info_t *info);
+#if MICROPY_GC_PAUSE_STATS
+void gc_pause_stats_reset(void);
+#endif
 void gc_dump_info(const mp_print_t *print);
 void gc_dump_alloc_table(const mp_print_t *print);
 
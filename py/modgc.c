@@ -24,9 +24,12 @@
  * THE SOFTWARE.
  */
 
+#include <string.h>
+
 #include "py/mpstate.h"
 #include "py/obj.h"
 #include "py/gc.h"
+#include "py/runtime.h"
 
 #if MICROPY_PY_GC && MICROPY_ENABLE_GC
 
@@ -100,6 +103,53 @@ static mp_obj_t gc_threshold(size_t n_args, const mp_obj_t *args) {
 MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(gc_threshold_obj, 0, 1, gc_threshold);
 #endif
 
+#if MICROPY_GC_INCREMENTAL_SWEEP
+// sweep_slice([amount]): get or set the number of bytes of heap swept per
+// allocation after an automatic collection, 0 to sweep in one go
+static mp_obj_t gc_sweep_slice(size_t n_args, const mp_obj_t *args) {
+    if (n_args == 0) {
+        return mp_obj_new_int(MP_STATE_MEM(gc_sweep_slice_blocks) * MICROPY_BYTES_PER_GC_BLOCK);
+    }
+    mp_int_t val = mp_obj_get_int(args[0]);
+    if (val < 0) {
+        mp_raise_ValueError(NULL);
+    }
+    // round up so that any non-zero amount enables deferred sweeping
+    MP_STATE_MEM(gc_sweep_slice_blocks) = (val + MICROPY_BYTES_PER_GC_BLOCK - 1) / MICROPY_BYTES_PER_GC_BLOCK;
+    return mp_const_none;
+}
+MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(gc_sweep_slice_obj, 0, 1, gc_sweep_slice);
+#endif
+
+#if MICROPY_GC_PAUSE_STATS
+// pause_stats([reset]): return (count, total_us, max_us, histogram) for the
+// pauses made by the GC, optionally resetting the statistics afterwards
+static mp_obj_t gc_pause_stats(size_t n_args, const mp_obj_t *args) {
+    // take a copy first because creating the result may run the GC
+    mp_uint_t count = MP_STATE_MEM(gc_pause_count);
+    mp_uint_t total_us = MP_STATE_MEM(gc_pause_total_us);
+    mp_uint_t max_us = MP_STATE_MEM(gc_pause_max_us);
+    mp_uint_t hist[MICROPY_GC_PAUSE_STATS_NUM_BUCKETS];
+    memcpy(hist, MP_STATE_MEM(gc_pause_hist), sizeof(hist));
+    if (n_args > 0 && mp_obj_is_true(args[0])) {
+        gc_pause_stats_reset();
+    }
+
+    mp_obj_tuple_t *hist_tuple = MP_OBJ_TO_PTR(mp_obj_new_tuple(MICROPY_GC_PAUSE_STATS_NUM_BUCKETS, NULL));
+    for (size_t i = 0; i < MICROPY_GC_PAUSE_STATS_NUM_BUCKETS; ++i) {
+        hist_tuple->items[i] = mp_obj_new_int_from_uint(hist[i]);
+    }
+    mp_obj_t items[4] = {
+        mp_obj_new_int_from_uint(count),
+        mp_obj_new_int_from_uint(total_us),
+        mp_obj_new_int_from_uint(max_us),
+        MP_OBJ_FROM_PTR(hist_tuple),
+    };
+    return mp_obj_new_tuple(4, items);
+}
+MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(gc_pause_stats_obj, 0, 1, gc_pause_stats);
+#endif
+
 static const mp_rom_map_elem_t mp_module_gc_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_gc) },
     { MP_ROM_QSTR(MP_QSTR_collect), MP_ROM_PTR(&gc_collect_obj) },
@@ -111,6 +161,12 @@ static const mp_rom_map_elem_t mp_module_gc_globals_table[] = {
     #if MICROPY_GC_ALLOC_THRESHOLD
     { MP_ROM_QSTR(MP_QSTR_threshold), MP_ROM_PTR(&gc_threshold_obj) },
     #endif
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    { MP_ROM_QSTR(MP_QSTR_sweep_slice), MP_ROM_PTR(&gc_sweep_slice_obj) },
+    #endif
+    #if MICROPY_GC_PAUSE_STATS
+    { MP_ROM_QSTR(MP_QSTR_pause_stats), MP_ROM_PTR(&gc_pause_stats_obj) },
+    #endif
 };
 
 static MP_DEFINE_CONST_DICT(mp_module_gc_globals, mp_module_gc_globals_table);
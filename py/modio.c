@@ -202,6 +202,229 @@ static MP_DEFINE_CONST_OBJ_TYPE(
     );
 #endif // MICROPY_PY_IO_BUFFEREDWRITER
 
+#if MICROPY_PY_IO_BUFFEREDREADER
+typedef struct _mp_obj_bufreader_t {
+    mp_obj_base_t base;
+    mp_obj_t stream;
+    size_t alloc;
+    size_t pos;
+    size_t len;
+    byte buf[0];
+} mp_obj_bufreader_t;
+
+static mp_obj_t bufreader_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *args) {
+    mp_arg_check_num(n_args, n_kw, 1, 2, false);
+    mp_get_stream_raise(args[0], MP_STREAM_OP_READ);
+    mp_int_t alloc = 256;
+    if (n_args > 1) {
+        alloc = mp_obj_get_int(args[1]);
+        if (alloc <= 0) {
+            mp_raise_ValueError(NULL);
+        }
+    }
+    mp_obj_bufreader_t *o = mp_obj_malloc_var(mp_obj_bufreader_t, buf, byte, alloc, type);
+    o->stream = args[0];
+    o->alloc = alloc;
+    o->pos = 0;
+    o->len = 0;
+    return MP_OBJ_FROM_PTR(o);
+}
+
+// Refill the (empty) buffer with a single read of the underlying stream.
+// Returns the number of bytes read, 0 at EOF, or MP_STREAM_ERROR.
+static mp_uint_t bufreader_fill(mp_obj_bufreader_t *self, int *errcode) {
+    const mp_stream_p_t *stream_p = mp_get_stream(self->stream);
+    mp_uint_t out_sz = stream_p->read(self->stream, self->buf, self->alloc, errcode);
+    self->pos = 0;
+    self->len = out_sz == MP_STREAM_ERROR ? 0 : out_sz;
+    return out_sz;
+}
+
+static mp_uint_t bufreader_read(mp_obj_t self_in, void *buf, mp_uint_t size, int *errcode) {
+    mp_obj_bufreader_t *self = MP_OBJ_TO_PTR(self_in);
+
+    if (self->pos == self->len) {
+        if (size >= self->alloc) {
+            // Buffering wouldn't save any calls, so read directly into the
+            // caller's buffer.
+            const mp_stream_p_t *stream_p = mp_get_stream(self->stream);
+            return stream_p->read(self->stream, buf, size, errcode);
+        }
+        mp_uint_t out_sz = bufreader_fill(self, errcode);
+        if (out_sz == MP_STREAM_ERROR || out_sz == 0) {
+            return out_sz;
+        }
+    }
+
+    // Return only what is buffered, so that each call to this function makes
+    // at most one call to the underlying stream.
+    mp_uint_t avail = self->len - self->pos;
+    if (size > avail) {
+        size = avail;
+    }
+    memcpy(buf, self->buf + self->pos, size);
+    self->pos += size;
+    return size;
+}
+
+static mp_uint_t bufreader_ioctl(mp_obj_t self_in, mp_uint_t request, uintptr_t arg, int *errcode) {
+    mp_obj_bufreader_t *self = MP_OBJ_TO_PTR(self_in);
+    const mp_stream_p_t *stream_p = mp_get_stream(self->stream);
+    mp_uint_t avail = self->len - self->pos;
+
+    if (request == MP_STREAM_GET_FILENO) {
+        // Don't let select poll the file descriptor directly, it can't see
+        // data that is already buffered.
+        *errcode = MP_EINVAL;
+        return MP_STREAM_ERROR;
+    }
+    if (stream_p->ioctl == NULL) {
+        if (request == MP_STREAM_POLL && avail) {
+            return arg & MP_STREAM_POLL_RD;
+        }
+        *errcode = MP_EINVAL;
+        return MP_STREAM_ERROR;
+    }
+
+    if (request == MP_STREAM_SEEK) {
+        struct mp_stream_seek_t *seek_s = (struct mp_stream_seek_t *)arg;
+        if (seek_s->whence == MP_SEEK_CUR && seek_s->offset == 0) {
+            // tell() doesn't move, so keep the buffered data.
+            mp_uint_t ret = stream_p->ioctl(self->stream, request, arg, errcode);
+            if (ret != MP_STREAM_ERROR) {
+                seek_s->offset -= avail;
+            }
+            return ret;
+        }
+        // The underlying stream is ahead of this one by the buffered data.
+        if (seek_s->whence == MP_SEEK_CUR) {
+            seek_s->offset -= avail;
+        }
+        self->pos = self->len = 0;
+    } else if (request == MP_STREAM_CLOSE) {
+        self->pos = self->len = 0;
+    }
+
+    mp_uint_t ret = stream_p->ioctl(self->stream, request, arg, errcode);
+    if (request == MP_STREAM_POLL && avail) {
+        // Buffered data can be read without waiting for the stream.
+        if (ret == MP_STREAM_ERROR) {
+            ret = 0;
+        }
+        ret |= arg & MP_STREAM_POLL_RD;
+    }
+    return ret;
+}
+
+static mp_obj_t bufreader_peek(size_t n_args, const mp_obj_t *args) {
+    mp_obj_bufreader_t *self = MP_OBJ_TO_PTR(args[0]);
+    // Like CPython, the size argument is ignored and whatever is buffered is
+    // returned, reading from the stream (once) only if nothing is.
+    if (self->pos == self->len) {
+        int errcode;
+        if (bufreader_fill(self, &errcode) == MP_STREAM_ERROR) {
+            if (mp_is_nonblocking_error(errcode)) {
+                return mp_const_empty_bytes;
+            }
+            mp_raise_OSError(errcode);
+        }
+    }
+    return mp_obj_new_bytes(self->buf + self->pos, self->len - self->pos);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(bufreader_peek_obj, 1, 2, bufreader_peek);
+
+static mp_obj_t bufreader_readline(size_t n_args, const mp_obj_t *args) {
+    mp_obj_bufreader_t *self = MP_OBJ_TO_PTR(args[0]);
+
+    mp_int_t max_size = -1;
+    if (n_args > 1) {
+        max_size = mp_obj_get_int(args[1]);
+    }
+
+    vstr_t vstr;
+    vstr_init(&vstr, 16);
+
+    // Copy whole runs of buffered data up to and including the next newline,
+    // so the underlying stream is only read once per buffer-full rather than
+    // once per byte as mp_stream_unbuffered_readline does.
+    while (max_size < 0 || vstr.len < (size_t)max_size) {
+        if (self->pos == self->len) {
+            int errcode;
+            mp_uint_t out_sz = bufreader_fill(self, &errcode);
+            if (out_sz == MP_STREAM_ERROR) {
+                if (mp_is_nonblocking_error(errcode)) {
+                    if (vstr.len == 0) {
+                        // Nothing read before EAGAIN, follow the behaviour of
+                        // read() and mp_stream_unbuffered_readline.
+                        vstr_clear(&vstr);
+                        return mp_const_none;
+                    }
+                    break;
+                }
+                mp_raise_OSError(errcode);
+            }
+            if (out_sz == 0) {
+                break;
+            }
+        }
+        const byte *start = self->buf + self->pos;
+        size_t n = self->len - self->pos;
+        if (max_size >= 0 && n > (size_t)max_size - vstr.len) {
+            n = max_size - vstr.len;
+        }
+        const byte *nl = memchr(start, '\n', n);
+        if (nl != NULL) {
+            n = nl - start + 1;
+        }
+        vstr_add_strn(&vstr, (const char *)start, n);
+        self->pos += n;
+        if (nl != NULL) {
+            break;
+        }
+    }
+
+    return mp_obj_new_bytes_from_vstr(&vstr);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(bufreader_readline_obj, 1, 2, bufreader_readline);
+
+static mp_obj_t bufreader_iternext(mp_obj_t self_in) {
+    mp_obj_t line = bufreader_readline(1, &self_in);
+    if (mp_obj_is_true(line)) {
+        return line;
+    }
+    return MP_OBJ_STOP_ITERATION;
+}
+
+static const mp_rom_map_elem_t bufreader_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_read), MP_ROM_PTR(&mp_stream_read_obj) },
+    { MP_ROM_QSTR(MP_QSTR_read1), MP_ROM_PTR(&mp_stream_read1_obj) },
+    { MP_ROM_QSTR(MP_QSTR_readinto), MP_ROM_PTR(&mp_stream_readinto_obj) },
+    { MP_ROM_QSTR(MP_QSTR_readline), MP_ROM_PTR(&bufreader_readline_obj) },
+    { MP_ROM_QSTR(MP_QSTR_peek), MP_ROM_PTR(&bufreader_peek_obj) },
+    { MP_ROM_QSTR(MP_QSTR_seek), MP_ROM_PTR(&mp_stream_seek_obj) },
+    { MP_ROM_QSTR(MP_QSTR_tell), MP_ROM_PTR(&mp_stream_tell_obj) },
+    { MP_ROM_QSTR(MP_QSTR_close), MP_ROM_PTR(&mp_stream_close_obj) },
+    { MP_ROM_QSTR(MP_QSTR___enter__), MP_ROM_PTR(&mp_identity_obj) },
+    { MP_ROM_QSTR(MP_QSTR___exit__), MP_ROM_PTR(&mp_stream___exit___obj) },
+};
+static MP_DEFINE_CONST_DICT(bufreader_locals_dict, bufreader_locals_dict_table);
+
+static const mp_stream_p_t bufreader_stream_p = {
+    .read = bufreader_read,
+    .ioctl = bufreader_ioctl,
+};
+
+static MP_DEFINE_CONST_OBJ_TYPE(
+    mp_type_bufreader,
+    MP_QSTR_BufferedReader,
+    MP_TYPE_FLAG_ITER_IS_ITERNEXT,
+    make_new, bufreader_make_new,
+    iter, bufreader_iternext,
+    protocol, &bufreader_stream_p,
+    locals_dict, &bufreader_locals_dict
+    );
+#endif // MICROPY_PY_IO_BUFFEREDREADER
+
 static const mp_rom_map_elem_t mp_module_io_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_io) },
     // Note: mp_builtin_open_obj should be defined by port, it's not
@@ -217,6 +440,9 @@ static const mp_rom_map_elem_t mp_module_io_globals_table[] = {
     #if MICROPY_PY_IO_BUFFEREDWRITER
     { MP_ROM_QSTR(MP_QSTR_BufferedWriter), MP_ROM_PTR(&mp_type_bufwriter) },
     #endif
+    #if MICROPY_PY_IO_BUFFEREDREADER
+    { MP_ROM_QSTR(MP_QSTR_BufferedReader), MP_ROM_PTR(&mp_type_bufreader) },
+    #endif
 };
 
 static MP_DEFINE_CONST_DICT(mp_module_io_globals, mp_module_io_globals_table);
@@ -257,6 +257,224 @@ static mp_obj_t struct_pack_into(size_t n_args, const mp_obj_t *args) {
 }
 MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(struct_pack_into_obj, 3, MP_OBJ_FUN_ARGS_MAX, struct_pack_into);
 
+#if MICROPY_PY_STRUCT_STRUCT
+
+// A field of a compiled format: a typecode with its repeat count.
+typedef struct _mp_struct_field_t {
+    mp_uint_t cnt;
+    char type;
+} mp_struct_field_t;
+
+// struct.Struct parses the format once, storing the field layout and size so
+// that packing and unpacking don't need to parse the format string again.
+typedef struct _mp_obj_struct_t {
+    mp_obj_base_t base;
+    mp_obj_t format;
+    size_t size;
+    size_t num_items;
+    size_t num_fields;
+    char fmt_type;
+    mp_struct_field_t fields[];
+} mp_obj_struct_t;
+
+typedef struct _mp_obj_struct_iter_t {
+    mp_obj_base_t base;
+    mp_fun_1_t iternext;
+    mp_obj_struct_t *st;
+    mp_obj_t buf;
+    size_t offset;
+} mp_obj_struct_iter_t;
+
+static const mp_obj_type_t mp_type_struct;
+
+static mp_obj_t struct_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *args) {
+    mp_arg_check_num(n_args, n_kw, 1, 1, false);
+    const char *fmt = mp_obj_str_get_str(args[0]);
+    size_t size;
+    size_t num_items = calc_size_items(fmt, &size);
+    char fmt_type = get_fmt_type(&fmt);
+
+    size_t num_fields = 0;
+    for (const char *f = fmt; *f; f++) {
+        if (!unichar_isdigit(*f)) {
+            num_fields++;
+        }
+    }
+
+    mp_obj_struct_t *self = mp_obj_malloc_var(mp_obj_struct_t, fields, mp_struct_field_t, num_fields, type);
+    self->format = args[0];
+    self->size = size;
+    self->num_items = num_items;
+    self->num_fields = num_fields;
+    self->fmt_type = fmt_type;
+    for (mp_struct_field_t *field = self->fields; *fmt; fmt++, field++) {
+        field->cnt = 1;
+        if (unichar_isdigit(*fmt)) {
+            field->cnt = get_fmt_num(&fmt);
+        }
+        field->type = *fmt;
+    }
+    return MP_OBJ_FROM_PTR(self);
+}
+
+// Return a pointer to offset bytes into the buffer, checking that there is
+// room for a whole struct there.
+static byte *struct_get_buf(mp_obj_struct_t *self, mp_obj_t buf_in, mp_int_t offset, mp_uint_t flags) {
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(buf_in, &bufinfo, flags);
+    if (offset < 0) {
+        // negative offsets are relative to the end of the buffer
+        offset = (mp_int_t)bufinfo.len + offset;
+    }
+    if (offset < 0 || (size_t)offset + self->size > bufinfo.len) {
+        mp_raise_ValueError(MP_ERROR_TEXT("buffer too small"));
+    }
+    return (byte *)bufinfo.buf + offset;
+}
+
+static mp_obj_t struct_obj_unpack_internal(mp_obj_struct_t *self, byte *p) {
+    mp_obj_tuple_t *res = MP_OBJ_TO_PTR(mp_obj_new_tuple(self->num_items, NULL));
+    byte *p_base = p;
+    size_t i = 0;
+    for (const mp_struct_field_t *field = self->fields; field < self->fields + self->num_fields; field++) {
+        mp_uint_t cnt = field->cnt;
+        if (field->type == 'x') {
+            p += cnt;
+        } else if (field->type == 's') {
+            res->items[i++] = mp_obj_new_bytes(p, cnt);
+            p += cnt;
+        } else {
+            while (cnt--) {
+                res->items[i++] = mp_binary_get_val(self->fmt_type, field->type, p_base, &p);
+            }
+        }
+    }
+    return MP_OBJ_FROM_PTR(res);
+}
+
+// As for the module-level functions, p must have room for the whole struct
+// and missing arguments leave their fields untouched.
+static void struct_obj_pack_internal(mp_obj_struct_t *self, byte *p, size_t n_args, const mp_obj_t *args) {
+    byte *p_base = p;
+    size_t i = 0;
+    for (const mp_struct_field_t *field = self->fields; field < self->fields + self->num_fields && i < n_args; field++) {
+        mp_uint_t cnt = field->cnt;
+        if (field->type == 'x') {
+            memset(p, 0, cnt);
+            p += cnt;
+        } else if (field->type == 's') {
+            mp_buffer_info_t bufinfo;
+            mp_get_buffer_raise(args[i++], &bufinfo, MP_BUFFER_READ);
+            mp_uint_t to_copy = cnt;
+            if (bufinfo.len < to_copy) {
+                to_copy = bufinfo.len;
+            }
+            memcpy(p, bufinfo.buf, to_copy);
+            memset(p + to_copy, 0, cnt - to_copy);
+            p += cnt;
+        } else {
+            while (cnt-- && i < n_args) {
+                mp_binary_set_val(self->fmt_type, field->type, args[i++], p_base, &p);
+            }
+        }
+    }
+}
+
+static mp_obj_t struct_obj_pack(size_t n_args, const mp_obj_t *args) {
+    mp_obj_struct_t *self = MP_OBJ_TO_PTR(args[0]);
+    vstr_t vstr;
+    vstr_init_len(&vstr, self->size);
+    memset(vstr.buf, 0, self->size);
+    struct_obj_pack_internal(self, (byte *)vstr.buf, n_args - 1, &args[1]);
+    return mp_obj_new_bytes_from_vstr(&vstr);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(struct_obj_pack_obj, 1, MP_OBJ_FUN_ARGS_MAX, struct_obj_pack);
+
+static mp_obj_t struct_obj_pack_into(size_t n_args, const mp_obj_t *args) {
+    mp_obj_struct_t *self = MP_OBJ_TO_PTR(args[0]);
+    byte *p = struct_get_buf(self, args[1], mp_obj_get_int(args[2]), MP_BUFFER_WRITE);
+    struct_obj_pack_internal(self, p, n_args - 3, &args[3]);
+    return mp_const_none;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(struct_obj_pack_into_obj, 3, MP_OBJ_FUN_ARGS_MAX, struct_obj_pack_into);
+
+static mp_obj_t struct_obj_unpack_from(size_t n_args, const mp_obj_t *args) {
+    // As for the module-level unpack, the buffer only needs to be big enough.
+    mp_obj_struct_t *self = MP_OBJ_TO_PTR(args[0]);
+    mp_int_t offset = n_args > 2 ? mp_obj_get_int(args[2]) : 0;
+    byte *p = struct_get_buf(self, args[1], offset, MP_BUFFER_READ);
+    return struct_obj_unpack_internal(self, p);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(struct_obj_unpack_from_obj, 2, 3, struct_obj_unpack_from);
+
+static mp_obj_t struct_iter_iternext(mp_obj_t self_in) {
+    mp_obj_struct_iter_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(self->buf, &bufinfo, MP_BUFFER_READ);
+    if (self->offset + self->st->size > bufinfo.len) {
+        return MP_OBJ_STOP_ITERATION;
+    }
+    mp_obj_t res = struct_obj_unpack_internal(self->st, (byte *)bufinfo.buf + self->offset);
+    self->offset += self->st->size;
+    return res;
+}
+
+static mp_obj_t struct_obj_iter_unpack(mp_obj_t self_in, mp_obj_t buf_in) {
+    mp_obj_struct_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(buf_in, &bufinfo, MP_BUFFER_READ);
+    if (self->size == 0 || bufinfo.len % self->size != 0) {
+        mp_raise_ValueError(MP_ERROR_TEXT("buffer size must be a multiple of struct size"));
+    }
+    mp_obj_struct_iter_t *o = mp_obj_malloc(mp_obj_struct_iter_t, &mp_type_polymorph_iter);
+    o->iternext = struct_iter_iternext;
+    o->st = self;
+    o->buf = buf_in;
+    o->offset = 0;
+    return MP_OBJ_FROM_PTR(o);
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(struct_obj_iter_unpack_obj, struct_obj_iter_unpack);
+
+static mp_obj_t struct_iter_unpack(mp_obj_t fmt_in, mp_obj_t buf_in) {
+    return struct_obj_iter_unpack(struct_make_new(&mp_type_struct, 1, 0, &fmt_in), buf_in);
+}
+static MP_DEFINE_CONST_FUN_OBJ_2(struct_iter_unpack_obj, struct_iter_unpack);
+
+static void struct_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest) {
+    if (dest[0] != MP_OBJ_NULL) {
+        return;
+    }
+    mp_obj_struct_t *self = MP_OBJ_TO_PTR(self_in);
+    if (attr == MP_QSTR_size) {
+        dest[0] = MP_OBJ_NEW_SMALL_INT(self->size);
+    } else if (attr == MP_QSTR_format) {
+        dest[0] = self->format;
+    } else {
+        // Need to forward to locals dict.
+        dest[1] = MP_OBJ_SENTINEL;
+    }
+}
+
+static const mp_rom_map_elem_t struct_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_pack), MP_ROM_PTR(&struct_obj_pack_obj) },
+    { MP_ROM_QSTR(MP_QSTR_pack_into), MP_ROM_PTR(&struct_obj_pack_into_obj) },
+    { MP_ROM_QSTR(MP_QSTR_unpack), MP_ROM_PTR(&struct_obj_unpack_from_obj) },
+    { MP_ROM_QSTR(MP_QSTR_unpack_from), MP_ROM_PTR(&struct_obj_unpack_from_obj) },
+    { MP_ROM_QSTR(MP_QSTR_iter_unpack), MP_ROM_PTR(&struct_obj_iter_unpack_obj) },
+};
+static MP_DEFINE_CONST_DICT(struct_locals_dict, struct_locals_dict_table);
+
+static MP_DEFINE_CONST_OBJ_TYPE(
+    mp_type_struct,
+    MP_QSTR_Struct,
+    MP_TYPE_FLAG_NONE,
+    make_new, struct_make_new,
+    attr, struct_attr,
+    locals_dict, &struct_locals_dict
+    );
+
+#endif // MICROPY_PY_STRUCT_STRUCT
+
 static const mp_rom_map_elem_t mp_module_struct_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_struct) },
     { MP_ROM_QSTR(MP_QSTR_calcsize), MP_ROM_PTR(&struct_calcsize_obj) },
@@ -264,6 +482,10 @@ static const mp_rom_map_elem_t mp_module_struct_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR_pack_into), MP_ROM_PTR(&struct_pack_into_obj) },
     { MP_ROM_QSTR(MP_QSTR_unpack), MP_ROM_PTR(&struct_unpack_from_obj) },
     { MP_ROM_QSTR(MP_QSTR_unpack_from), MP_ROM_PTR(&struct_unpack_from_obj) },
+    #if MICROPY_PY_STRUCT_STRUCT
+    { MP_ROM_QSTR(MP_QSTR_iter_unpack), MP_ROM_PTR(&struct_iter_unpack_obj) },
+    { MP_ROM_QSTR(MP_QSTR_Struct), MP_ROM_PTR(&mp_type_struct) },
+    #endif
 };
 
 static MP_DEFINE_CONST_DICT(mp_module_struct_globals, mp_module_struct_globals_table);
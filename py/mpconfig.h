@@ -200,6 +200,24 @@
 #define MICROPY_GC_ALLOC_THRESHOLD (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_CORE_FEATURES)
 #endif
 
+// Support deferring the sweep phase of an automatic collection, so that it is
+// done in bounded slices by subsequent allocations, configurable by
+// gc.sweep_slice().  The mark phase is still done in one go.
+#ifndef MICROPY_GC_INCREMENTAL_SWEEP
+#define MICROPY_GC_INCREMENTAL_SWEEP (0)
+#endif
+
+// Whether to record the duration of each GC pause (requires mp_hal_ticks_us),
+// available via gc.pause_stats().
+#ifndef MICROPY_GC_PAUSE_STATS
+#define MICROPY_GC_PAUSE_STATS (0)
+#endif
+
+// Number of power-of-two buckets in the GC pause-time histogram.
+#ifndef MICROPY_GC_PAUSE_STATS_NUM_BUCKETS
+#define MICROPY_GC_PAUSE_STATS_NUM_BUCKETS (16)
+#endif
+
 // Number of bytes to allocate initially when creating new chunks to store
 // interned string data.  Smaller numbers lead to more chunks being needed
 // and more wastage at the end of the chunk.  Larger numbers lead to wasted
@@ -565,6 +583,34 @@
 #define MICROPY_OPT_MAP_LOOKUP_CACHE_SIZE (128)
 #endif
 
+// Give each bytecode function a table of map slot hints, indexed by the
+// location of the LOAD_GLOBAL/LOAD_ATTR/LOAD_METHOD opcode that uses it. Unlike
+// MICROPY_OPT_MAP_LOOKUP_CACHE the hints are not shared between call sites, so
+// hot loops don't evict each other. Costs two words per function object, plus
+// the table (2 bytes per byte of bytecode, up to the maximum size below) for
+// functions that do such lookups.
+#ifndef MICROPY_OPT_VM_INLINE_CACHE
+#define MICROPY_OPT_VM_INLINE_CACHE (0)
+#endif
+
+// Maximum number of hints in each function's table. Must be a power of 2.
+#ifndef MICROPY_OPT_VM_INLINE_CACHE_SIZE
+#define MICROPY_OPT_VM_INLINE_CACHE_SIZE (256)
+#endif
+
+// Cache the result of looking up attributes and methods through the class
+// hierarchy (the MRO), so that accessing inherited methods doesn't need a map
+// lookup in each base class. Uses MICROPY_OPT_CLASS_LOOKUP_CACHE_SIZE entries
+// of 3 words plus 8 bytes of RAM for each thread (on the thread's C stack).
+#ifndef MICROPY_OPT_CLASS_LOOKUP_CACHE
+#define MICROPY_OPT_CLASS_LOOKUP_CACHE (0)
+#endif
+
+// Number of entries in the class lookup cache. Must be a power of 2.
+#ifndef MICROPY_OPT_CLASS_LOOKUP_CACHE_SIZE
+#define MICROPY_OPT_CLASS_LOOKUP_CACHE_SIZE (64)
+#endif
+
 // Whether to use fast versions of bitwise operations (and, or, xor) when the
 // arguments are both positive.  Increases Thumb2 code size by about 250 bytes.
 #ifndef MICROPY_OPT_MPZ_BITWISE
@@ -598,6 +644,13 @@
 #define MICROPY_READER_POSIX (0)
 #endif
 
+// Whether the POSIX reader can memory-map .mpy files, so their bytecode and
+// constant data are used in place instead of being copied to the heap
+// (enabled at runtime by MP_STATE_VM(persistent_code_mmap))
+#ifndef MICROPY_READER_POSIX_MMAP
+#define MICROPY_READER_POSIX_MMAP (0)
+#endif
+
 // Whether to use the VFS reader for importing files
 #ifndef MICROPY_READER_VFS
 #define MICROPY_READER_VFS (0)
@@ -1438,11 +1491,21 @@ typedef double mp_float_t;
 #define MICROPY_PY_IO_BUFFEREDWRITER (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EVERYTHING)
 #endif
 
+// Whether to provide "io.BufferedReader" class
+#ifndef MICROPY_PY_IO_BUFFEREDREADER
+#define MICROPY_PY_IO_BUFFEREDREADER (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
+#endif
+
 // Whether to provide "struct" module
 #ifndef MICROPY_PY_STRUCT
 #define MICROPY_PY_STRUCT (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_CORE_FEATURES)
 #endif
 
+// Whether to provide "struct.Struct" type and "struct.iter_unpack" function
+#ifndef MICROPY_PY_STRUCT_STRUCT
+#define MICROPY_PY_STRUCT_STRUCT (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
+#endif
+
 // Whether to provide "sys" module
 #ifndef MICROPY_PY_SYS
 #define MICROPY_PY_SYS (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_CORE_FEATURES)
@@ -1644,6 +1707,13 @@ typedef double mp_float_t;
 #define MICROPY_PY_DEFLATE_COMPRESS (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_FULL_FEATURES)
 #endif
 
+// Lookup tables for the CRC32 used by "deflate" and binascii.crc32: 0 for a
+// 16-entry table (64 bytes), 1 for a 256-entry table (1k) or 8 for
+// slicing-by-8 with eight 256-entry tables (8k), smallest to fastest
+#ifndef MICROPY_PY_DEFLATE_CRC32_TABLE
+#define MICROPY_PY_DEFLATE_CRC32_TABLE (0)
+#endif
+
 #ifndef MICROPY_PY_JSON
 #define MICROPY_PY_JSON (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
 #endif
@@ -1681,10 +1751,26 @@ typedef double mp_float_t;
 #define MICROPY_PY_RE_SUB (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
 #endif
 
+// Number of compiled patterns to cache in the re module, 0 to disable
+#ifndef MICROPY_PY_RE_CACHE_SIZE
+#define MICROPY_PY_RE_CACHE_SIZE (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES ? 8 : 0)
+#endif
+
+// Whether to provide the re.LINEAR flag, which matches with a Pike VM in
+// time linear in the length of the subject instead of by backtracking
+#ifndef MICROPY_PY_RE_PIKEVM
+#define MICROPY_PY_RE_PIKEVM (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
+#endif
+
 #ifndef MICROPY_PY_HEAPQ
 #define MICROPY_PY_HEAPQ (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
 #endif
 
+// Whether to provide nsmallest, nlargest and merge in the heapq module
+#ifndef MICROPY_PY_HEAPQ_NSMALLEST_MERGE
+#define MICROPY_PY_HEAPQ_NSMALLEST_MERGE (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EVERYTHING)
+#endif
+
 #ifndef MICROPY_PY_HASHLIB
 #define MICROPY_PY_HASHLIB (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
 #endif
@@ -1723,6 +1809,11 @@ typedef double mp_float_t;
 #define MICROPY_PY_BINASCII_CRC32 (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
 #endif
 
+// Whether to provide binascii.crc, for CRCs other than CRC32
+#ifndef MICROPY_PY_BINASCII_CRC
+#define MICROPY_PY_BINASCII_CRC (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
+#endif
+
 #ifndef MICROPY_PY_RANDOM
 #define MICROPY_PY_RANDOM (MICROPY_CONFIG_ROM_LEVEL_AT_LEAST_EXTRA_FEATURES)
 #endif
@@ -94,6 +94,9 @@ typedef struct _mp_state_mem_area_t {
 
     size_t gc_last_free_atb_index;
     size_t gc_last_used_block; // The block ID of the highest block allocated in the area
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    size_t gc_sweep_block; // The next block to sweep in the area, or (size_t)-1 if not sweeping
+    #endif
 } mp_state_mem_area_t;
 
 // This structure hold information about the memory allocation system.
@@ -131,6 +134,23 @@ typedef struct _mp_state_mem_t {
     size_t gc_collected;
     #endif
 
+    #if MICROPY_GC_INCREMENTAL_SWEEP
+    // Number of blocks to sweep per allocation when a sweep is deferred; 0 disables deferring.
+    size_t gc_sweep_slice_blocks;
+    // The area currently being swept, or NULL if there is no deferred sweep pending.
+    mp_state_mem_area_t *gc_sweep_area;
+    // Set by gc_alloc to request that the next gc_collect_end defers its sweep.
+    uint8_t gc_sweep_defer;
+    #endif
+
+    #if MICROPY_GC_PAUSE_STATS
+    mp_uint_t gc_pause_start;
+    mp_uint_t gc_pause_count;
+    mp_uint_t gc_pause_total_us;
+    mp_uint_t gc_pause_max_us;
+    mp_uint_t gc_pause_hist[MICROPY_GC_PAUSE_STATS_NUM_BUCKETS];
+    #endif
+
     #if MICROPY_PY_THREAD && !MICROPY_PY_THREAD_GIL
     // This is a global mutex used to make the GC thread-safe.
     mp_thread_mutex_t gc_mutex;
@@ -205,6 +225,11 @@ typedef struct _mp_state_vm_t {
     mp_thread_mutex_t qstr_mutex;
     #endif
 
+    #if MICROPY_READER_POSIX_MMAP
+    // whether .mpy files are memory-mapped and executed in place
+    bool persistent_code_mmap;
+    #endif
+
     #if MICROPY_ENABLE_COMPILER
     mp_uint_t mp_optimise_value;
     #if MICROPY_EMIT_NATIVE
@@ -247,8 +272,25 @@ typedef struct _mp_state_vm_t {
     // See mp_map_lookup.
     uint8_t map_lookup_cache[MICROPY_OPT_MAP_LOOKUP_CACHE_SIZE];
     #endif
+
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    // See mp_obj_class_lookup_cache_flush.
+    uint32_t class_lookup_epoch;
+    #endif
 } mp_state_vm_t;
 
+#if MICROPY_OPT_CLASS_LOOKUP_CACHE
+// An entry in the cache of attribute lookups through the class hierarchy.
+typedef struct _mp_class_lookup_cache_entry_t {
+    const mp_obj_type_t *type; // type the lookup started at
+    const mp_obj_type_t *found_type; // type the attribute was found in, or NULL if not found
+    qstr attr;
+    uint16_t found_pos; // position in the locals dict of found_type
+    uint16_t slot_offset;
+    uint32_t epoch;
+} mp_class_lookup_cache_entry_t;
+#endif
+
 // This structure holds state that is specific to a given thread. Everything
 // in this structure is scanned for root pointers.  Anything added to this
 // structure must have corresponding initialisation added to thread_entry (in
@@ -270,6 +312,13 @@ typedef struct _mp_state_thread_t {
     // Locking of the GC is done per thread.
     uint16_t gc_lock_depth;
 
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    // See mp_obj_class_lookup.  Each thread has its own cache so that entries
+    // are never seen half written.  Entries are only valid if their epoch
+    // matches class_lookup_epoch, and are not roots for the GC.
+    mp_class_lookup_cache_entry_t class_lookup_cache[MICROPY_OPT_CLASS_LOOKUP_CACHE_SIZE];
+    #endif
+
     ////////////////////////////////////////////////////////////
     // START ROOT POINTER SECTION
     // Everything that needs GC scanning must start here, and
@@ -37,6 +37,10 @@ typedef struct _mp_obj_fun_bc_t {
     #if MICROPY_PY_SYS_SETTRACE
     const struct _mp_raw_code_t *rc;
     #endif
+    #if MICROPY_OPT_VM_INLINE_CACHE
+    uint16_t *inline_cache;                     // map slot hints for the VM, allocated on demand
+    uint16_t inline_cache_warmup;               // lookups done before inline_cache was allocated
+    #endif
     // the following extra_args array is allocated space to take (in order):
     //  - values of positional default args (if any)
     //  - a single slot for default kw args dict (if it has them)
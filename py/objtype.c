@@ -131,11 +131,68 @@ struct class_lookup_data {
     size_t slot_offset;
     mp_obj_t *dest;
     bool is_type;
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    // Set by the lookup to record where the attribute was found.
+    const mp_obj_type_t *found_type;
+    size_t found_pos;
+    bool uncacheable;
+    #endif
 };
 
-static void mp_obj_class_lookup(struct class_lookup_data *lookup, const mp_obj_type_t *type) {
-    assert(lookup->dest[0] == MP_OBJ_NULL);
-    assert(lookup->dest[1] == MP_OBJ_NULL);
+#if MICROPY_OPT_CLASS_LOOKUP_CACHE
+#define CLASS_LOOKUP_FOUND_SLOT (0xffff)
+#define CLASS_LOOKUP_CACHE_ENTRY(type, attr, slot_offset) \
+    (&MP_STATE_THREAD(class_lookup_cache)[(((uintptr_t)(type) >> 4) + (attr) * 7 + (slot_offset)) & (MICROPY_OPT_CLASS_LOOKUP_CACHE_SIZE - 1)])
+
+// Invalidate all cached class lookups, in all threads.  Must be called whenever
+// the locals dict of a class changes, or a new class is created (which may
+// reuse the memory of a class that has been freed).
+void mp_obj_class_lookup_cache_flush(void) {
+    if (++MP_STATE_VM(class_lookup_epoch) == 0) {
+        // The epoch wrapped, so stale entries could match it again.  Only the
+        // cache of this thread can be cleared, but other threads would need
+        // to keep an entry through 2^32 flushes for it to be a problem.
+        memset(MP_STATE_THREAD(class_lookup_cache), 0, sizeof(MP_STATE_THREAD(class_lookup_cache)));
+        MP_STATE_VM(class_lookup_epoch) = 1;
+    }
+}
+#endif
+
+static void mp_obj_class_lookup_found(struct class_lookup_data *lookup, const mp_obj_type_t *type, mp_map_elem_t *elem) {
+    if (lookup->is_type) {
+        // If we look up a class method, we need to return original type for which we
+        // do a lookup, not a (base) type in which we found the class method.
+        const mp_obj_type_t *org_type = (const mp_obj_type_t *)lookup->obj;
+        mp_convert_member_lookup(MP_OBJ_NULL, org_type, elem->value, lookup->dest);
+    } else {
+        mp_obj_instance_t *obj = lookup->obj;
+        mp_obj_t obj_obj;
+        if (obj != NULL && mp_obj_is_native_type(type) && type != &mp_type_object /* object is not a real type */) {
+            // If we're dealing with native base class, then it applies to native sub-object
+            obj_obj = obj->subobj[0];
+            #if MICROPY_BUILTIN_METHOD_CHECK_SELF_ARG
+            if (obj_obj == MP_OBJ_FROM_PTR(&native_base_init_wrapper_obj)) {
+                // But we shouldn't attempt lookups on object that is not yet instantiated.
+                mp_raise_msg(&mp_type_AttributeError, MP_ERROR_TEXT("call super().__init__() first"));
+            }
+            #endif // MICROPY_BUILTIN_METHOD_CHECK_SELF_ARG
+        } else {
+            obj_obj = MP_OBJ_FROM_PTR(obj);
+        }
+        mp_convert_member_lookup(obj_obj, type, elem->value, lookup->dest);
+    }
+    #if DEBUG_PRINT
+    DEBUG_printf("mp_obj_class_lookup: Returning: ");
+    mp_obj_print_helper(MICROPY_DEBUG_PRINTER, lookup->dest[0], PRINT_REPR);
+    if (lookup->dest[1] != MP_OBJ_NULL) {
+        // Don't try to repr() lookup->dest[1], as we can be called recursively
+        DEBUG_printf(" <%s @%p>", mp_obj_get_type_str(lookup->dest[1]), MP_OBJ_TO_PTR(lookup->dest[1]));
+    }
+    DEBUG_printf("\n");
+    #endif
+}
+
+static void mp_obj_class_lookup_uncached(struct class_lookup_data *lookup, const mp_obj_type_t *type) {
     for (;;) {
         DEBUG_printf("mp_obj_class_lookup: Looking up %s in %s\n", qstr_str(lookup->attr), qstr_str(type->name));
         // Optimize special method lookup for native types
@@ -150,6 +207,10 @@ static void mp_obj_class_lookup(struct class_lookup_data *lookup, const mp_obj_t
                 DEBUG_printf("mp_obj_class_lookup: Matched special meth slot (off=%d) for %s\n",
                     lookup->slot_offset, qstr_str(lookup->attr));
                 lookup->dest[0] = MP_OBJ_SENTINEL;
+                #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+                lookup->found_type = type;
+                lookup->found_pos = CLASS_LOOKUP_FOUND_SLOT;
+                #endif
                 return;
             }
         }
@@ -160,36 +221,10 @@ static void mp_obj_class_lookup(struct class_lookup_data *lookup, const mp_obj_t
             mp_map_t *locals_map = &MP_OBJ_TYPE_GET_SLOT(type, locals_dict)->map;
             mp_map_elem_t *elem = mp_map_lookup(locals_map, MP_OBJ_NEW_QSTR(lookup->attr), MP_MAP_LOOKUP);
             if (elem != NULL) {
-                if (lookup->is_type) {
-                    // If we look up a class method, we need to return original type for which we
-                    // do a lookup, not a (base) type in which we found the class method.
-                    const mp_obj_type_t *org_type = (const mp_obj_type_t *)lookup->obj;
-                    mp_convert_member_lookup(MP_OBJ_NULL, org_type, elem->value, lookup->dest);
-                } else {
-                    mp_obj_instance_t *obj = lookup->obj;
-                    mp_obj_t obj_obj;
-                    if (obj != NULL && mp_obj_is_native_type(type) && type != &mp_type_object /* object is not a real type */) {
-                        // If we're dealing with native base class, then it applies to native sub-object
-                        obj_obj = obj->subobj[0];
-                        #if MICROPY_BUILTIN_METHOD_CHECK_SELF_ARG
-                        if (obj_obj == MP_OBJ_FROM_PTR(&native_base_init_wrapper_obj)) {
-                            // But we shouldn't attempt lookups on object that is not yet instantiated.
-                            mp_raise_msg(&mp_type_AttributeError, MP_ERROR_TEXT("call super().__init__() first"));
-                        }
-                        #endif // MICROPY_BUILTIN_METHOD_CHECK_SELF_ARG
-                    } else {
-                        obj_obj = MP_OBJ_FROM_PTR(obj);
-                    }
-                    mp_convert_member_lookup(obj_obj, type, elem->value, lookup->dest);
-                }
-                #if DEBUG_PRINT
-                DEBUG_printf("mp_obj_class_lookup: Returning: ");
-                mp_obj_print_helper(MICROPY_DEBUG_PRINTER, lookup->dest[0], PRINT_REPR);
-                if (lookup->dest[1] != MP_OBJ_NULL) {
-                    // Don't try to repr() lookup->dest[1], as we can be called recursively
-                    DEBUG_printf(" <%s @%p>", mp_obj_get_type_str(lookup->dest[1]), MP_OBJ_TO_PTR(lookup->dest[1]));
-                }
-                DEBUG_printf("\n");
+                mp_obj_class_lookup_found(lookup, type, elem);
+                #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+                lookup->found_type = type;
+                lookup->found_pos = elem - locals_map->table;
                 #endif
                 return;
             }
@@ -198,6 +233,12 @@ static void mp_obj_class_lookup(struct class_lookup_data *lookup, const mp_obj_t
         // Previous code block takes care about attributes defined in .locals_dict,
         // but some attributes of native types may be handled using .load_attr method,
         // so make sure we try to lookup those too.
+        #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+        if (mp_obj_is_native_type(type) && type != &mp_type_object) {
+            // The result past this point may depend on the native sub-object.
+            lookup->uncacheable = true;
+        }
+        #endif
         if (lookup->obj != NULL && !lookup->is_type && mp_obj_is_native_type(type) && type != &mp_type_object /* object is not a real type */) {
             mp_load_method_maybe(lookup->obj->subobj[0], lookup->attr, lookup->dest);
             if (lookup->dest[0] != MP_OBJ_NULL) {
@@ -222,7 +263,7 @@ static void mp_obj_class_lookup(struct class_lookup_data *lookup, const mp_obj_t
                     // Not a "real" type
                     continue;
                 }
-                mp_obj_class_lookup(lookup, bt);
+                mp_obj_class_lookup_uncached(lookup, bt);
                 if (lookup->dest[0] != MP_OBJ_NULL) {
                     return;
                 }
@@ -242,6 +283,53 @@ static void mp_obj_class_lookup(struct class_lookup_data *lookup, const mp_obj_t
     }
 }
 
+static void mp_obj_class_lookup(struct class_lookup_data *lookup, const mp_obj_type_t *type) {
+    assert(lookup->dest[0] == MP_OBJ_NULL);
+    assert(lookup->dest[1] == MP_OBJ_NULL);
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    // Lookups that don't involve a native base class (other than object) depend
+    // only on the type, attribute and slot, so their result can be cached.
+    // The position of the attribute in the locals dict is cached rather than
+    // a pointer to it, and checked before use, so a stale entry can never
+    // refer to freed memory.
+    mp_class_lookup_cache_entry_t *entry = CLASS_LOOKUP_CACHE_ENTRY(type, lookup->attr, lookup->slot_offset);
+    if (entry->epoch == MP_STATE_VM(class_lookup_epoch) && entry->type == type
+        && entry->attr == lookup->attr && entry->slot_offset == lookup->slot_offset) {
+        const mp_obj_type_t *found_type = entry->found_type;
+        if (found_type == NULL) {
+            // Not found.
+            return;
+        }
+        if (entry->found_pos == CLASS_LOOKUP_FOUND_SLOT) {
+            lookup->dest[0] = MP_OBJ_SENTINEL;
+            return;
+        }
+        mp_map_t *locals_map = &MP_OBJ_TYPE_GET_SLOT(found_type, locals_dict)->map;
+        if (entry->found_pos < locals_map->alloc) {
+            mp_map_elem_t *elem = &locals_map->table[entry->found_pos];
+            if (elem->key == MP_OBJ_NEW_QSTR(lookup->attr)) {
+                mp_obj_class_lookup_found(lookup, found_type, elem);
+                return;
+            }
+        }
+    }
+    lookup->found_type = NULL;
+    lookup->found_pos = 0;
+    lookup->uncacheable = false;
+    mp_obj_class_lookup_uncached(lookup, type);
+    if (!lookup->uncacheable && lookup->found_pos <= CLASS_LOOKUP_FOUND_SLOT) {
+        entry->type = type;
+        entry->found_type = lookup->found_type;
+        entry->attr = lookup->attr;
+        entry->found_pos = lookup->found_pos;
+        entry->slot_offset = lookup->slot_offset;
+        entry->epoch = MP_STATE_VM(class_lookup_epoch);
+    }
+    #else
+    mp_obj_class_lookup_uncached(lookup, type);
+    #endif
+}
+
 static void instance_print(const mp_print_t *print, mp_obj_t self_in, mp_print_kind_t kind) {
     mp_obj_instance_t *self = MP_OBJ_TO_PTR(self_in);
     qstr meth = (kind == PRINT_STR) ? MP_QSTR___str__ : MP_QSTR___repr__;
@@ -1083,6 +1171,9 @@ static void type_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest) {
                 // can't apply delete/store to a fixed map
                 return;
             }
+            #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+            mp_obj_class_lookup_cache_flush();
+            #endif
             if (dest[1] == MP_OBJ_NULL) {
                 // delete attribute
                 mp_map_elem_t *elem = mp_map_lookup(locals_map, MP_OBJ_NEW_QSTR(attr), MP_MAP_LOOKUP_REMOVE_IF_FOUND);
@@ -1131,7 +1222,13 @@ mp_obj_t mp_obj_new_type(qstr name, mp_obj_t bases_tuple, mp_obj_t locals_dict)
         mp_raise_TypeError(NULL);
     }
 
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    // The class needs its own copy of locals_dict, as in CPython, because changes
+    // made to it through the original dict wouldn't flush the lookup cache.
+    locals_dict = mp_obj_dict_copy(locals_dict);
+    #else
     // TODO might need to make a copy of locals_dict; at least that's how CPython does it
+    #endif
 
     // Basic validation of base classes
     uint16_t base_flags = MP_TYPE_FLAG_EQ_NOT_REFLEXIVE
@@ -1177,6 +1274,9 @@ mp_obj_t mp_obj_new_type(qstr name, mp_obj_t bases_tuple, mp_obj_t locals_dict)
     o->base.type = &mp_type_type;
     o->flags = base_flags;
     o->name = name;
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    mp_obj_class_lookup_cache_flush();
+    #endif
     MP_OBJ_TYPE_SET_SLOT(o, make_new, mp_obj_instance_make_new, 0);
     MP_OBJ_TYPE_SET_SLOT(o, print, instance_print, 1);
     MP_OBJ_TYPE_SET_SLOT(o, call, mp_obj_instance_call, 2);
@@ -52,4 +52,8 @@ mp_obj_t mp_obj_instance_call(mp_obj_t self_in, size_t n_args, size_t n_kw, cons
 // this needs to be exposed for mp_getiter
 mp_obj_t mp_obj_instance_getiter(mp_obj_t self_in, mp_obj_iter_buf_t *iter_buf);
 
+#if MICROPY_OPT_CLASS_LOOKUP_CACHE
+void mp_obj_class_lookup_cache_flush(void);
+#endif
+
 #endif // MICROPY_INCLUDED_PY_OBJTYPE_H
@@ -181,6 +181,11 @@ static qstr load_qstr(mp_reader_t *reader) {
         return len >> 1;
     }
     len >>= 1;
+    const char *str_rom = (const char *)mp_reader_try_read_rom_data(reader, len + 1);
+    if (str_rom != NULL) {
+        // reference the null-terminated string data in place
+        return qstr_from_strn_static(str_rom, len);
+    }
     char *str = m_new(char, len);
     read_bytes(reader, (byte *)str, len);
     read_byte(reader); // read and discard null terminator
@@ -215,6 +220,13 @@ static mp_obj_t load_obj(mp_reader_t *reader) {
                 tuple->items[i] = load_obj(reader);
             }
             return MP_OBJ_FROM_PTR(tuple);
+        } else if (obj_type == MP_PERSISTENT_OBJ_STR || obj_type == MP_PERSISTENT_OBJ_BYTES) {
+            const byte *data = mp_reader_try_read_rom_data(reader, len + 1);
+            if (data != NULL) {
+                // reference the null-terminated str/bytes data in place
+                const mp_obj_type_t *type = obj_type == MP_PERSISTENT_OBJ_STR ? &mp_type_str : &mp_type_bytes;
+                return mp_obj_new_str_static(type, data, len);
+            }
         }
         vstr_t vstr;
         vstr_init_len(&vstr, len);
@@ -257,10 +269,15 @@ static mp_raw_code_t *load_raw_code(mp_reader_t *reader, mp_module_context_t *co
     #endif
 
     if (kind == MP_CODE_BYTECODE) {
-        // Allocate memory for the bytecode
-        fun_data = m_new(uint8_t, fun_data_len);
-        // Load bytecode
-        read_bytes(reader, fun_data, fun_data_len);
+        // The bytecode refers to qstrs and constants via the module context's
+        // tables, so it can be executed in place if the reader allows it.
+        fun_data = (uint8_t *)mp_reader_try_read_rom_data(reader, fun_data_len);
+        if (fun_data == NULL) {
+            // Allocate memory for the bytecode
+            fun_data = m_new(uint8_t, fun_data_len);
+            // Load bytecode
+            read_bytes(reader, fun_data, fun_data_len);
+        }
 
     #if MICROPY_EMIT_MACHINE_CODE
     } else {
@@ -462,7 +479,12 @@ void mp_raw_code_load_mem(const byte *buf, size_t len, mp_compiled_module_t *con
 
 void mp_raw_code_load_file(qstr filename, mp_compiled_module_t *context) {
     mp_reader_t reader;
-    mp_reader_new_file(&reader, filename);
+    #if MICROPY_READER_POSIX_MMAP
+    if (!MP_STATE_VM(persistent_code_mmap) || !mp_reader_new_file_mmap(&reader, filename))
+    #endif
+    {
+        mp_reader_new_file(&reader, filename);
+    }
     mp_raw_code_load(&reader, context);
 }
 
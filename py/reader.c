@@ -33,7 +33,7 @@
 #include "py/reader.h"
 
 typedef struct _mp_reader_mem_t {
-    size_t free_len; // if >0 mem is freed on close by: m_free(beg, free_len)
+    size_t free_len; // if >0 mem is freed on close by: m_free(beg, free_len), unless MP_READER_IS_ROM
     const byte *beg;
     const byte *cur;
     const byte *end;
@@ -50,7 +50,7 @@ static mp_uint_t mp_reader_mem_readbyte(void *data) {
 
 static void mp_reader_mem_close(void *data) {
     mp_reader_mem_t *reader = (mp_reader_mem_t *)data;
-    if (reader->free_len > 0) {
+    if (reader->free_len > 0 && reader->free_len != MP_READER_IS_ROM) {
         m_del(char, (char *)reader->beg, reader->free_len);
     }
     m_del_obj(mp_reader_mem_t, reader);
@@ -67,11 +67,27 @@ void mp_reader_new_mem(mp_reader_t *reader, const byte *buf, size_t len, size_t
     reader->close = mp_reader_mem_close;
 }
 
+const byte *mp_reader_try_read_rom_data(mp_reader_t *reader, size_t len) {
+    if (reader->readbyte != mp_reader_mem_readbyte) {
+        return NULL;
+    }
+    mp_reader_mem_t *rm = (mp_reader_mem_t *)reader->data;
+    if (rm->free_len != MP_READER_IS_ROM || len > (size_t)(rm->end - rm->cur)) {
+        return NULL;
+    }
+    const byte *data = rm->cur;
+    rm->cur += len;
+    return data;
+}
+
 #if MICROPY_READER_POSIX
 
 #include <sys/stat.h>
 #include <fcntl.h>
 #include <unistd.h>
+#if MICROPY_READER_POSIX_MMAP
+#include <sys/mman.h>
+#endif
 
 typedef struct _mp_reader_posix_t {
     bool close_fd;
@@ -132,6 +148,28 @@ void mp_reader_new_file_from_fd(mp_reader_t *reader, int fd, bool close_fd) {
     reader->close = mp_reader_posix_close;
 }
 
+#if MICROPY_READER_POSIX_MMAP
+bool mp_reader_new_file_mmap(mp_reader_t *reader, qstr filename) {
+    MP_THREAD_GIL_EXIT();
+    int fd = open(qstr_str(filename), O_RDONLY, 0644);
+    void *data = MAP_FAILED;
+    struct stat st;
+    if (fd >= 0) {
+        if (fstat(fd, &st) == 0 && st.st_size > 0) {
+            data = mmap(NULL, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+        }
+        // the mapping stays valid after the file is closed
+        close(fd);
+    }
+    MP_THREAD_GIL_ENTER();
+    if (data == MAP_FAILED) {
+        return false;
+    }
+    mp_reader_new_mem(reader, data, st.st_size, MP_READER_IS_ROM);
+    return true;
+}
+#endif
+
 #if !MICROPY_VFS_POSIX
 // If MICROPY_VFS_POSIX is defined then this function is provided by the VFS layer
 void mp_reader_new_file(mp_reader_t *reader, qstr filename) {
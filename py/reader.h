@@ -33,6 +33,10 @@
 // it can be called again after returning MP_READER_EOF, and in that case must return MP_READER_EOF
 #define MP_READER_EOF ((mp_uint_t)(-1))
 
+// value of free_len for mp_reader_new_mem to indicate that the memory is never
+// freed or modified, so the data can be referenced in place (eg in flash)
+#define MP_READER_IS_ROM ((size_t)-1)
+
 typedef struct _mp_reader_t {
     void *data;
     mp_uint_t (*readbyte)(void *data);
@@ -43,4 +47,14 @@ void mp_reader_new_mem(mp_reader_t *reader, const byte *buf, size_t len, size_t
 void mp_reader_new_file(mp_reader_t *reader, qstr filename);
 void mp_reader_new_file_from_fd(mp_reader_t *reader, int fd, bool close_fd);
 
+// If the reader is backed by memory created with MP_READER_IS_ROM then return a
+// pointer to the next len bytes and advance past them, otherwise return NULL.
+const byte *mp_reader_try_read_rom_data(mp_reader_t *reader, size_t len);
+
+#if MICROPY_READER_POSIX_MMAP
+// Map the given file into memory and create a MP_READER_IS_ROM reader for it.
+// Returns false if the file could not be mapped.  The mapping is never removed.
+bool mp_reader_new_file_mmap(mp_reader_t *reader, qstr filename);
+#endif
+
 #endif // MICROPY_INCLUDED_PY_READER_H
@@ -95,6 +95,15 @@ void mp_init(void) {
     MP_STATE_VM(mp_kbd_exception).args = (mp_obj_tuple_t *)&mp_const_empty_tuple_obj;
     #endif
 
+    #if MICROPY_READER_POSIX_MMAP
+    MP_STATE_VM(persistent_code_mmap) = false;
+    #endif
+
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    // forget any classes from before a soft reset
+    mp_obj_class_lookup_cache_flush();
+    #endif
+
     #if MICROPY_ENABLE_COMPILER
     // optimization disabled by default
     MP_STATE_VM(mp_optimise_value) = 0;
@@ -171,6 +180,13 @@ void mp_init(void) {
     MP_STATE_VM(bluetooth) = MP_OBJ_NULL;
     #endif
 
+    #if MICROPY_PY_RE && MICROPY_PY_RE_CACHE_SIZE
+    // forget compiled patterns from before a soft reset
+    for (size_t i = 0; i < MICROPY_PY_RE_CACHE_SIZE; ++i) {
+        MP_STATE_VM(re_cache[i]) = MP_OBJ_NULL;
+    }
+    #endif
+
     #if MICROPY_HW_ENABLE_USB_RUNTIME_DEVICE
     MP_STATE_VM(usbd) = MP_OBJ_NULL;
     #endif
@@ -225,23 +241,29 @@ mp_obj_t MICROPY_WRAP_MP_LOAD_GLOBAL(mp_load_global)(qstr qst) {
     DEBUG_OP_printf("load global %s\n", qstr_str(qst));
     mp_map_elem_t *elem = mp_map_lookup(&mp_globals_get()->map, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP);
     if (elem == NULL) {
-        #if MICROPY_CAN_OVERRIDE_BUILTINS
-        if (MP_STATE_VM(mp_module_builtins_override_dict) != NULL) {
-            // lookup in additional dynamic table of builtins first
-            elem = mp_map_lookup(&MP_STATE_VM(mp_module_builtins_override_dict)->map, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP);
-            if (elem != NULL) {
-                return elem->value;
-            }
+        return mp_load_builtin(qst);
+    }
+    return elem->value;
+}
+
+mp_obj_t mp_load_builtin(qstr qst) {
+    // logic: search builtins, for a name that is known not to be in globals
+    #if MICROPY_CAN_OVERRIDE_BUILTINS
+    if (MP_STATE_VM(mp_module_builtins_override_dict) != NULL) {
+        // lookup in additional dynamic table of builtins first
+        mp_map_elem_t *elem = mp_map_lookup(&MP_STATE_VM(mp_module_builtins_override_dict)->map, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP);
+        if (elem != NULL) {
+            return elem->value;
         }
+    }
+    #endif
+    mp_map_elem_t *elem = mp_map_lookup((mp_map_t *)&mp_module_builtins_globals.map, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP);
+    if (elem == NULL) {
+        #if MICROPY_ERROR_REPORTING <= MICROPY_ERROR_REPORTING_TERSE
+        mp_raise_msg(&mp_type_NameError, MP_ERROR_TEXT("name not defined"));
+        #else
+        mp_raise_msg_varg(&mp_type_NameError, MP_ERROR_TEXT("name '%q' isn't defined"), qst);
         #endif
-        elem = mp_map_lookup((mp_map_t *)&mp_module_builtins_globals.map, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP);
-        if (elem == NULL) {
-            #if MICROPY_ERROR_REPORTING <= MICROPY_ERROR_REPORTING_TERSE
-            mp_raise_msg(&mp_type_NameError, MP_ERROR_TEXT("name not defined"));
-            #else
-            mp_raise_msg_varg(&mp_type_NameError, MP_ERROR_TEXT("name '%q' isn't defined"), qst);
-            #endif
-        }
     }
     return elem->value;
 }
@@ -164,6 +164,11 @@ static inline void mp_thread_init_state(mp_state_thread_t *ts, size_t stack_size
     // GC starts off unlocked
     ts->gc_lock_depth = 0;
 
+    #if MICROPY_OPT_CLASS_LOOKUP_CACHE
+    // Start with an empty class lookup cache (no entries have epoch 0)
+    memset(ts->class_lookup_cache, 0, sizeof(ts->class_lookup_cache));
+    #endif
+
     // There are no pending jump callbacks or exceptions yet
     ts->nlr_jump_callback_top = NULL;
     ts->mp_pending_exception = MP_OBJ_NULL;
@@ -182,6 +187,7 @@ static inline void mp_thread_init_state(mp_state_thread_t *ts, size_t stack_size
 
 mp_obj_t mp_load_name(qstr qst);
 mp_obj_t mp_load_global(qstr qst);
+mp_obj_t mp_load_builtin(qstr qst);
 mp_obj_t mp_load_build_class(void);
 void mp_store_name(qstr qst, mp_obj_t obj);
 void mp_store_global(qstr qst, mp_obj_t obj);
@@ -195,6 +195,126 @@
 #define TRACE_TICK(current_ip, current_sp, is_exception)
 #endif // MICROPY_PY_SYS_SETTRACE
 
+#if MICROPY_OPT_VM_INLINE_CACHE
+// Each bytecode function has a table of hints to the slot where a map lookup
+// last succeeded, indexed by the offset in the bytecode of the opcode doing
+// the lookup (taken at ip just after its qstr argument).  A hint is only
+// trusted if the slot it points to still holds the wanted key, so hints never
+// need invalidating: a map that was resized or had the key removed simply
+// misses and the hint is relearnt.  The table grows to cover the call sites
+// that are used, up to MICROPY_OPT_VM_INLINE_CACHE_SIZE entries; beyond that,
+// sites in large functions share entries, which is also safe.
+//
+// The first element of the table holds the number of hints that follow it,
+// so a thread always sees a table and length that match.  When the table
+// grows, the old one is left for the GC to free, because another thread may
+// still be using it.
+#define VM_INLINE_CACHE_WARMUP (16)
+#define VM_INLINE_CACHE_MIN_LEN (16)
+#define VM_INLINE_CACHE_MISS (0xffff) // the last lookup at this site failed
+#define VM_INLINE_CACHE_ENTRY(cache, fun, ip) ((cache)[1 + ((size_t)((ip) - (fun)->bytecode) & ((cache)[0] - 1))])
+
+static MP_NOINLINE void vm_inline_cache_learn(mp_obj_fun_bc_t *fun, const byte *ip, mp_map_t *map, mp_map_elem_t *elem) {
+    uint16_t *cache = fun->inline_cache;
+    size_t len = cache == NULL ? 0 : cache[0];
+    size_t offset = ip - fun->bytecode;
+    if (offset >= len && len < MICROPY_OPT_VM_INLINE_CACHE_SIZE) {
+        if (elem == NULL) {
+            // Not worth growing the table just to record a miss.
+            return;
+        }
+        if (cache == NULL && fun->inline_cache_warmup < VM_INLINE_CACHE_WARMUP) {
+            // Only create the table once the function has done a few lookups,
+            // so that short-lived functions (eg comprehensions) don't pay for it.
+            ++fun->inline_cache_warmup;
+            return;
+        }
+        // Grow the table to cover this call site.  Existing hints keep their
+        // index because they are all for offsets below the old length.  If
+        // the allocation fails, carry on with the existing table (or uncached
+        // if there isn't one yet).
+        size_t new_len = VM_INLINE_CACHE_MIN_LEN;
+        while (new_len <= offset && new_len < MICROPY_OPT_VM_INLINE_CACHE_SIZE) {
+            new_len *= 2;
+        }
+        uint16_t *new_cache = m_new_maybe(uint16_t, 1 + new_len);
+        if (new_cache == NULL) {
+            if (cache == NULL) {
+                return;
+            }
+        } else {
+            new_cache[0] = new_len;
+            if (cache != NULL) {
+                memcpy(new_cache + 1, cache + 1, len * sizeof(uint16_t));
+            }
+            memset(new_cache + 1 + len, 0xff, (new_len - len) * sizeof(uint16_t));
+            fun->inline_cache = cache = new_cache;
+        }
+    }
+    VM_INLINE_CACHE_ENTRY(cache, fun, ip) = elem == NULL ? VM_INLINE_CACHE_MISS : elem - map->table;
+}
+
+static inline mp_map_elem_t *vm_map_lookup_cached(mp_obj_fun_bc_t *fun, const byte *ip, mp_map_t *map, qstr qst) {
+    size_t pos = VM_INLINE_CACHE_MISS;
+    uint16_t *cache = fun->inline_cache;
+    if (cache != NULL) {
+        pos = VM_INLINE_CACHE_ENTRY(cache, fun, ip);
+        if (pos < map->alloc && map->table[pos].key == MP_OBJ_NEW_QSTR(qst)) {
+            return &map->table[pos];
+        }
+    }
+    mp_map_elem_t *elem = mp_map_lookup(map, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP);
+    if (elem != NULL || pos != VM_INLINE_CACHE_MISS) {
+        // The hint was wrong, so update it (a site that keeps missing, eg a
+        // builtin looked up in globals first, isn't updated again).
+        vm_inline_cache_learn(fun, ip, map, elem);
+    }
+    return elem;
+}
+
+// Fast path for the common LOAD_METHOD cases: a function defined directly in
+// the class of an instance, and an attribute of a module.  Returns false if
+// the full mp_load_method() is needed.
+static bool vm_load_method_cached(mp_obj_fun_bc_t *fun, const byte *ip, qstr qst, mp_obj_t *dest) {
+    if (qst == MP_QSTR___class__ || qst == MP_QSTR___next__) {
+        // These are special-cased by mp_load_method_maybe.
+        return false;
+    }
+    mp_obj_t obj = dest[0];
+    const mp_obj_type_t *type = mp_obj_get_type(obj);
+    if (type == &mp_type_module) {
+        mp_obj_module_t *mod = MP_OBJ_TO_PTR(obj);
+        mp_map_elem_t *elem = vm_map_lookup_cached(fun, ip, &mod->globals->map, qst);
+        if (elem != NULL) {
+            dest[0] = elem->value;
+            dest[1] = MP_OBJ_NULL;
+            return true;
+        }
+    } else if (mp_obj_is_instance_type(type) && MP_OBJ_TYPE_HAS_SLOT(type, locals_dict)) {
+        // An instance member shadows any method of the class.
+        mp_obj_instance_t *self = MP_OBJ_TO_PTR(obj);
+        if (mp_map_lookup(&self->members, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP) != NULL) {
+            return false;
+        }
+        mp_map_elem_t *elem = vm_map_lookup_cached(fun, ip, &MP_OBJ_TYPE_GET_SLOT(type, locals_dict)->map, qst);
+        if (elem != NULL && mp_obj_is_obj(elem->value)) {
+            // Only plain functions, which bind self, can be handled here, see mp_convert_member_lookup.
+            const mp_obj_type_t *m_type = ((mp_obj_base_t *)MP_OBJ_TO_PTR(elem->value))->type;
+            if ((m_type->flags & (MP_TYPE_FLAG_BINDS_SELF | MP_TYPE_FLAG_BUILTIN_FUN)) == MP_TYPE_FLAG_BINDS_SELF) {
+                dest[0] = elem->value;
+                dest[1] = obj;
+                return true;
+            }
+        }
+    }
+    return false;
+}
+
+#define VM_MAP_LOOKUP(map, qst) vm_map_lookup_cached(code_state->fun_bc, ip, (map), (qst))
+#else
+#define VM_MAP_LOOKUP(map, qst) mp_map_lookup((map), MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP)
+#endif
+
 // fastn has items in reverse order (fastn[0] is local[0], fastn[-1] is local[1], etc)
 // sp points to bottom of stack which grows up
 // returns:
@@ -388,7 +508,12 @@ dispatch_loop:
                 ENTRY(MP_BC_LOAD_GLOBAL): {
                     MARK_EXC_IP_SELECTIVE();
                     DECODE_QSTR;
+                    #if MICROPY_OPT_VM_INLINE_CACHE
+                    mp_map_elem_t *elem = VM_MAP_LOOKUP(&mp_globals_get()->map, qst);
+                    PUSH(elem != NULL ? elem->value : mp_load_builtin(qst));
+                    #else
                     PUSH(mp_load_global(qst));
+                    #endif
                     DISPATCH();
                 }
 
@@ -406,8 +531,14 @@ dispatch_loop:
                     mp_map_elem_t *elem = NULL;
                     if (mp_obj_is_instance_type(mp_obj_get_type(top))) {
                         mp_obj_instance_t *self = MP_OBJ_TO_PTR(top);
-                        elem = mp_map_lookup(&self->members, MP_OBJ_NEW_QSTR(qst), MP_MAP_LOOKUP);
+                        elem = VM_MAP_LOOKUP(&self->members, qst);
+                    }
+                    #if MICROPY_OPT_VM_INLINE_CACHE
+                    else if (mp_obj_is_type(top, &mp_type_module)) {
+                        mp_obj_module_t *mod = MP_OBJ_TO_PTR(top);
+                        elem = VM_MAP_LOOKUP(&mod->globals->map, qst);
                     }
+                    #endif
                     if (elem) {
                         obj = elem->value;
                     } else
@@ -422,7 +553,12 @@ dispatch_loop:
                 ENTRY(MP_BC_LOAD_METHOD): {
                     MARK_EXC_IP_SELECTIVE();
                     DECODE_QSTR;
-                    mp_load_method(*sp, qst, sp);
+                    #if MICROPY_OPT_VM_INLINE_CACHE
+                    if (!vm_load_method_cached(code_state->fun_bc, ip, qst, sp))
+                    #endif
+                    {
+                        mp_load_method(*sp, qst, sp);
+                    }
                     sp += 1;
                     DISPATCH();
                 }
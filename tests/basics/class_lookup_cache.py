@@ -0,0 +1,130 @@
+# test that cached lookups through the class hierarchy see changes to the
+# classes, by doing each lookup many times
+
+
+class A:
+    def meth(self):
+        return "A"
+
+    def __add__(self, other):
+        return "A+"
+
+
+class B(A):
+    pass
+
+
+class C(B):
+    pass
+
+
+def call(o, n=20):
+    return [o.meth() for _ in range(n)][-1]
+
+
+c = C()
+print(call(c), c + 1)
+
+# add a shadowing method to a class in the middle of the hierarchy
+B.meth = lambda self: "B"
+B.__add__ = lambda self, other: "B+"
+print(call(c), c + 1)
+
+# delete it again, then replace the method in the base class
+del B.meth
+del B.__add__
+print(call(c), c + 1)
+A.meth = lambda self: "A2"
+print(call(c))
+
+# attribute that is not found, then added
+for _ in range(20):
+    print(hasattr(c, "extra"), end=" ")
+print()
+B.extra = 1
+print(hasattr(c, "extra"), c.extra)
+del B.extra
+print(hasattr(c, "extra"))
+
+
+# add lots of attributes to force a resize of the class dict
+def resize(cls, n):
+    for i in range(n):
+        setattr(cls, "x%d" % i, i)
+
+
+print(call(c))
+resize(A, 50)
+print(call(c), c.x10, C.x49)
+
+
+# multiple inheritance
+class D:
+    def meth(self):
+        return "D"
+
+    def other(self):
+        return "D.other"
+
+
+class E(C, D):
+    pass
+
+
+e = E()
+print(call(e), e.other())
+B.other = lambda self: "B.other"
+print(call(e), e.other())
+
+
+# class attributes and class methods looked up through the type
+class F(C):
+    @classmethod
+    def name(cls):
+        return cls.__name__
+
+
+class G(F):
+    pass
+
+
+print([G.name() for _ in range(20)][-1], [F.name() for _ in range(20)][-1])
+
+
+# classes with a native base
+class L(list):
+    def meth(self):
+        return len(self)
+
+
+class M(L):
+    pass
+
+
+m = M([1, 2, 3])
+print(call(m), [m.count(1) for _ in range(20)][-1])
+m.append(4)
+print(call(m))
+
+
+class Exc(Exception):
+    pass
+
+
+class Exc2(Exc):
+    pass
+
+
+print([Exc2(1).args for _ in range(20)][-1])
+
+
+# new classes that may reuse the memory of freed classes
+def make(n):
+    out = []
+    for i in range(n):
+        X = type("X", (A,), {"meth": lambda self, i=i: i})
+        out.append(call(X()))
+    return out
+
+
+print(make(20)[::5])
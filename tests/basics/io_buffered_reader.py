@@ -0,0 +1,69 @@
+import io
+
+try:
+    io.BytesIO
+    io.BufferedReader
+except AttributeError:
+    print("SKIP")
+    raise SystemExit
+
+data = b"first line\nsecond\n\nlast line without newline"
+
+# read, read1 and readinto, across buffer boundaries
+buf = io.BufferedReader(io.BytesIO(data), 8)
+print(buf.read(3))
+print(buf.read1(100))
+print(buf.read(20))
+b = bytearray(5)
+print(buf.readinto(b), b)
+print(buf.read())
+print(buf.read())
+
+# readline, with and without a size limit
+buf = io.BufferedReader(io.BytesIO(data), 4)
+print(buf.readline())
+print(buf.readline(3))
+print(buf.readline())
+print(buf.readline())
+print(buf.readline())
+print(buf.readline())
+
+# iteration
+for line in io.BufferedReader(io.BytesIO(data), 5):
+    print(line)
+
+# peek doesn't consume data
+buf = io.BufferedReader(io.BytesIO(data), 8)
+print(buf.peek())
+print(buf.read(4))
+print(buf.peek(1))
+print(buf.read(4))
+print(buf.peek())
+print(buf.read())
+print(buf.peek())
+
+# seek and tell account for buffered data
+buf = io.BufferedReader(io.BytesIO(data))
+print(buf.read(2))
+print(buf.tell())
+print(buf.seek(-1, 1))
+print(buf.read(4))
+print(buf.seek(0))
+print(buf.readline())
+
+# the default buffer size
+print(io.BufferedReader(io.BytesIO(data)).read())
+
+# context manager closes the underlying stream
+bts = io.BytesIO(data)
+with io.BufferedReader(bts) as buf:
+    print(buf.read(5))
+try:
+    bts.read()
+except ValueError:
+    print("ValueError")
+
+try:
+    io.BufferedReader(io.BytesIO(), 0)
+except ValueError:
+    print("ValueError")
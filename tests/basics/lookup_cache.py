@@ -0,0 +1,119 @@
+# test that cached global/attribute/method lookups see changes to the
+# underlying dicts, by running each lookup site many times
+
+# global variables, changing value, being deleted and shadowing builtins
+g = 0
+
+
+def load_global(n):
+    global g
+    out = []
+    for i in range(n):
+        out.append(g)
+        if i == 20:
+            g = 1
+        elif i == 40:
+            # add lots of globals to force a resize of the globals dict
+            for j in range(50):
+                globals()["g%d" % j] = j
+        elif i == 60:
+            del globals()["g"]
+            globals()["g"] = 2
+    return out
+
+
+print(load_global(80)[::10])
+
+
+def load_builtin(n):
+    global len
+    out = []
+    for i in range(n):
+        out.append(len("abc"))
+        if i == 30:
+            len = lambda x: -1
+        elif i == 60:
+            del len
+    return out
+
+
+print(load_builtin(80)[::10])
+
+
+# instance attributes, and a method shadowed by an instance attribute
+class A:
+    def __init__(self, x):
+        self.x = x
+
+    def meth(self):
+        return "meth"
+
+
+def load_attr(objs):
+    return [o.x for o in objs]
+
+
+objs = [A(i) for i in range(40)]
+objs[20].y = 1
+del objs[30].x
+objs[30].x = "new"
+print(load_attr(objs))
+
+
+def call_meth(objs):
+    return [o.meth() for o in objs]
+
+
+objs = [A(i) for i in range(40)]
+objs[25].meth = lambda: "shadow"
+print(call_meth(objs)[20:30])
+
+
+# methods replaced on the class, and a class that has a different layout
+def call_meth2(o, n):
+    out = []
+    for i in range(n):
+        out.append(o.meth())
+        if i == 20:
+            A.meth = lambda self: "replaced"
+        elif i == 40:
+            A.z = 1
+            A.meth2 = lambda self: "meth2"
+    return out
+
+
+print(call_meth2(A(0), 60)[::10])
+
+
+class B:
+    def other(self):
+        pass
+
+    def meth(self):
+        return "B"
+
+
+print([o.meth() for o in [A(0), B(), A(0), B()] * 10][:4])
+
+
+# property and staticmethod/classmethod are not bound like functions
+class C:
+    @property
+    def meth(self):
+        return lambda: "prop"
+
+
+class D:
+    @staticmethod
+    def meth():
+        return "static"
+
+
+class E:
+    @classmethod
+    def meth(cls):
+        return cls.__name__
+
+
+print([o.meth() for o in [A(0), C(), D(), E()] * 10][:4])
+
@@ -0,0 +1,61 @@
+# test struct.Struct and iter_unpack
+
+try:
+    import struct
+
+    struct.Struct
+except (ImportError, AttributeError):
+    print("SKIP")
+    raise SystemExit
+
+s = struct.Struct("<hI2sxB")
+print(s.format, s.size)
+data = s.pack(-2, 0x12345678, b"ab", 7)
+print(data)
+print(s.unpack(data))
+print(s.unpack_from(b"\xff" + data, 1))
+print(s.unpack_from(b"\xff" + data, -s.size))
+
+# pack_into, with positive and negative offsets
+buf = bytearray(2 * s.size)
+s.pack_into(buf, 0, 1, 2, b"x", 3)
+s.pack_into(buf, -s.size, 4, 5, b"yzw", 6)
+print(buf)
+
+# repeat counts and native alignment
+s = struct.Struct("!3H")
+print(s.size, s.pack(1, 2, 3), s.unpack(b"\x00\x01\x00\x02\x00\x03"))
+s = struct.Struct("bi")
+print(s.size == struct.calcsize("bi"), s.unpack(s.pack(-1, 100)))
+
+# iter_unpack, on a Struct and at module level
+s = struct.Struct(">HB")
+packed = bytes(range(9))
+for t in s.iter_unpack(packed):
+    print(t)
+print(list(struct.iter_unpack("<H", memoryview(packed)[1:7])))
+print(list(s.iter_unpack(b"")))
+
+# check that we get an error if the buffer is too small
+try:
+    s.unpack_from(b"\x00\x01")
+except:
+    print("struct.error")
+try:
+    s.unpack_from(packed, 7)
+except:
+    print("struct.error")
+try:
+    s.pack_into(bytearray(4), 2, 1, 2)
+except:
+    print("struct.error")
+try:
+    s.pack_into(bytearray(4), -5, 1, 2)
+except:
+    print("struct.error")
+
+# iter_unpack needs a whole number of structs
+try:
+    s.iter_unpack(b"\x00\x01")
+except:
+    print("struct.error")
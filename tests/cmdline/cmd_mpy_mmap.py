@@ -0,0 +1,34 @@
+# cmdline: -X mpy-mmap
+# test importing a .mpy file that is memory-mapped, so its data is used in place
+
+import gc, os, sys
+
+# compiled form of:
+#   S = "s" * 1500  (as a literal)
+#   B = b"b" * 1500  (as a literal)
+#   def f(x):
+#       return [x, S[:3], B[-3:], "qstr_in_place"]
+mpy = (
+    b"M\x06\x00\x1f\x06\x03\x08m.py\x00\x0f\x02f\x00\x02S\x00\x02B\x00\x02x\x00\x05\x8b\\"
+    + b"s" * 1500
+    + b"\x00\x06\x8b\\"
+    + b"b" * 1500
+    + b"\x00\x05\rqstr_in_place\x00\x81\x1c\x00\x06\x01$$#\x00\x16\x03#\x01\x16\x042\x00\x16\x02Qc\x01\x81H)\x06\x02\x05`\xb0\x12\x03Q\x83.\x02U\x12\x04}Q.\x02U#\x02+\x04c"
+)
+
+name = "cmd_mpy_mmap_mod"
+with open(name + ".mpy", "wb") as f:
+    f.write(mpy)
+sys.path.insert(0, "")
+
+try:
+    gc.collect()
+    m0 = gc.mem_alloc()
+    mod = __import__(name)
+    gc.collect()
+    # the str and bytes constants are not copied to the heap
+    print(gc.mem_alloc() - m0 < 1500)
+    print(len(mod.S), len(mod.B), mod.f(1))
+    print(mod.S == "s" * 1500, mod.B == b"b" * 1500, hash(mod.S) == hash("s" * 1500))
+finally:
+    os.remove(name + ".mpy")
@@ -0,0 +1,64 @@
+# Test asyncio datagram endpoints over UDP on the loopback interface
+
+try:
+    import asyncio, socket
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+PORT = 8011
+
+
+async def server(ep, n):
+    buf = bytearray(16)
+    mv = memoryview(buf)
+    for _ in range(n):
+        nbytes, addr = await ep.recvfrom_into(buf)
+        print("server got", bytes(mv[:nbytes]))
+        await ep.sendto(mv[:nbytes], addr)
+
+
+async def main():
+    try:
+        srv = await asyncio.open_datagram_endpoint(local_addr=("127.0.0.1", PORT))
+    except OSError:
+        print("SKIP")
+        return
+    task = asyncio.create_task(server(srv, 5))
+
+    cli = await asyncio.open_datagram_endpoint(remote_addr=("127.0.0.1", PORT))
+
+    # Send to the connected address, and receive a new bytes object
+    await cli.sendto(b"hello")
+    data, addr = await cli.recvfrom(16)
+    print("client got", data, addr == socket.getaddrinfo("127.0.0.1", PORT)[0][-1])
+
+    # Send a batch of datagrams, and receive them into a buffer
+    await cli.sendmany([b"a", b"bc", b"def"])
+    buf = bytearray(4)
+    for _ in range(3):
+        n, _ = await cli.recvfrom_into(buf)
+        print("client got", n, buf[:n])
+
+    # Receive at most n bytes of a datagram
+    await cli.sendto(b"0123456789")
+    n, _ = await cli.recvfrom_into(buf, 2)
+    print("client got", n, buf[:n])
+
+    await task
+    cli.close()
+    srv.close()
+
+    # Cancel a task waiting to receive
+    ep = await asyncio.open_datagram_endpoint(local_addr=("127.0.0.1", PORT))
+    task = asyncio.create_task(ep.recvfrom(16))
+    await asyncio.sleep_ms(10)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        print("cancelled")
+    ep.close()
+
+
+asyncio.run(main())
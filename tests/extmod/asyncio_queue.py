@@ -0,0 +1,123 @@
+# Test Queue, LifoQueue and PriorityQueue classes
+
+try:
+    import asyncio
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+
+async def producer(q, id, n):
+    for i in range(n):
+        await q.put((id, i))
+        print("put", id, i)
+    print("producer done", id)
+
+
+async def consumer(q, id, n):
+    for _ in range(n):
+        item = await q.get()
+        print("get", id, item)
+        q.task_done()
+    print("consumer done", id)
+
+
+async def getter(q):
+    try:
+        print("getter got", await q.get())
+    except asyncio.CancelledError:
+        print("getter cancelled")
+
+
+async def main():
+    # Non-blocking methods on an unbounded queue, including growing the buffer
+    q = asyncio.Queue()
+    print(q.maxsize, q.qsize(), q.empty(), q.full())
+    for i in range(10):
+        q.put_nowait(i)
+    print(q.qsize(), q.empty(), q.full())
+    print([q.get_nowait() for _ in range(10)])
+    try:
+        q.get_nowait()
+    except asyncio.QueueEmpty:
+        print("QueueEmpty")
+
+    # Wrap around the buffer of a bounded queue
+    q = asyncio.Queue(3)
+    for i in range(7):
+        q.put_nowait(i)
+        print(q.get_nowait(), end=" ")
+    print()
+    q.put_nowait("a")
+    q.put_nowait("b")
+    q.put_nowait("c")
+    print(q.qsize(), q.full())
+    try:
+        q.put_nowait("d")
+    except asyncio.QueueFull:
+        print("QueueFull")
+    print(q.get_nowait(), q.get_nowait(), q.get_nowait())
+
+    # LifoQueue
+    q = asyncio.LifoQueue()
+    for i in range(6):
+        q.put_nowait(i)
+    print([q.get_nowait() for _ in range(6)])
+
+    # PriorityQueue
+    q = asyncio.PriorityQueue()
+    for item in ((3, "c"), (1, "a"), (4, "d"), (2, "b")):
+        q.put_nowait(item)
+    print([q.get_nowait() for _ in range(4)])
+
+    # Producer blocks on a full queue until the consumer takes items
+    print("----")
+    q = asyncio.Queue(2)
+    t = asyncio.create_task(producer(q, 0, 5))
+    await asyncio.sleep(0)
+    print("qsize", q.qsize())
+    await consumer(q, 0, 5)
+    await t
+
+    # Consumers block on an empty queue until producers put items
+    print("----")
+    q = asyncio.Queue(1)
+    c1 = asyncio.create_task(consumer(q, 1, 2))
+    c2 = asyncio.create_task(consumer(q, 2, 2))
+    await asyncio.sleep(0)
+    await producer(q, 0, 4)
+    await c1
+    await c2
+
+    # join() waits until all items are marked done
+    print("----")
+    q = asyncio.Queue()
+    await q.join()
+    for i in range(3):
+        q.put_nowait(i)
+    t = asyncio.create_task(consumer(q, 0, 3))
+    await q.join()
+    print("joined", q.qsize())
+    await t
+    try:
+        q.task_done()
+    except ValueError:
+        print("ValueError")
+
+    # Cancel a task waiting to get an item, then put an item
+    print("----")
+    q = asyncio.Queue()
+    t1 = asyncio.create_task(getter(q))
+    t2 = asyncio.create_task(getter(q))
+    await asyncio.sleep(0)
+    t1.cancel()
+    q.put_nowait("x")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    print(q.qsize())
+    q.put_nowait("y")
+    await t2
+    print(q.get_nowait())
+
+
+asyncio.run(main())
@@ -0,0 +1,79 @@
+# Test scheduler statistics collected in debug mode
+
+try:
+    import asyncio, time
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+try:
+    asyncio.stats
+except AttributeError:
+    print("SKIP")
+    raise SystemExit
+
+
+async def task(n):
+    for _ in range(n):
+        await asyncio.sleep(0)
+    return n
+
+
+async def sleeper():
+    await asyncio.sleep_ms(1)
+
+
+async def blocker():
+    time.sleep_ms(20)
+
+
+async def fail():
+    raise ValueError
+
+
+async def main():
+    loop = asyncio.get_event_loop()
+
+    # Statistics are only collected in debug mode
+    print(loop.get_debug(), asyncio.stats())
+    await task(2)
+    print(asyncio.stats())
+
+    loop.set_debug(True)
+    loop.slow_callback_ms = 1000
+    print(loop.get_debug())
+
+    # Run count of tasks, including ones that finish with an exception
+    t1 = asyncio.create_task(task(0))
+    t2 = asyncio.create_task(task(3))
+    t3 = asyncio.create_task(fail())
+    try:
+        await t3
+    except ValueError:
+        print("ValueError")
+    print(await t1, await t2)
+    s = asyncio.stats()
+    print(s[None][0], s[asyncio.current_task()][0] > 0)
+    print(all(v[1] >= v[2] >= 0 and v[3] >= v[4] >= 0 for v in s.values()))
+
+    # Finished tasks aren't kept, only the totals of all of them
+    print(t1 in s, t2 in s, t3 in s)
+
+    # A task that blocks the loop makes other tasks late
+    asyncio.stats(True)
+    t1 = asyncio.create_task(sleeper())
+    await asyncio.sleep(0)
+    t2 = asyncio.create_task(blocker())
+    await t1
+    await t2
+    s = asyncio.stats(True)
+    print(s[None][0], s[None][2] >= 15000, s[None][4] >= 10)
+
+    # Statistics were reset
+    print(t1 in asyncio.stats(), len(asyncio.stats()))
+
+    loop.set_debug(False)
+    print(loop.get_debug(), asyncio.stats())
+
+
+asyncio.run(main())
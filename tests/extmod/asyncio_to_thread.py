@@ -0,0 +1,80 @@
+# Test running blocking calls on worker threads with to_thread and run_in_executor
+
+try:
+    import asyncio, time, _thread
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+
+def work(n):
+    # CPU-bound work
+    x = 0
+    for i in range(n):
+        x += i * i
+    return x
+
+
+def fail(msg):
+    raise ValueError(msg)
+
+
+def wait_for(cond):
+    # Block until cond() is true, which needs something else to run at the same
+    # time; the limit only stops a broken implementation from hanging the test
+    for _ in range(1000):
+        if cond():
+            return True
+        time.sleep_ms(10)
+    return False
+
+
+async def ticker(state):
+    while not state[0]:
+        state[1] += 1
+        await asyncio.sleep_ms(5)
+
+
+async def main():
+    # Return values and exceptions are passed back to the caller
+    print(await asyncio.to_thread(work, 10))
+    print(await asyncio.to_thread(sorted, [3, 1, 2], reverse=True))
+    try:
+        await asyncio.to_thread(fail, "error")
+    except ValueError as er:
+        print("ValueError", er)
+
+    loop = asyncio.get_event_loop()
+    print(await loop.run_in_executor(None, work, 10))
+
+    # The loop keeps running other tasks while the blocking call runs: the
+    # call waits for the ticker to tick, which it can only do meanwhile
+    state = [False, 0]
+    t = asyncio.create_task(ticker(state))
+    print(await asyncio.to_thread(wait_for, lambda: state[1] >= 3))
+    state[0] = True
+    await t
+
+    # Calls on a pool of workers run concurrently: each waits until all three
+    # workers have started a call
+    executor = asyncio.ThreadPoolExecutor(3)
+    lock = _thread.allocate_lock()
+    started = [0]
+
+    def call(i):
+        with lock:
+            started[0] += 1
+        return wait_for(lambda: started[0] >= 3) and work(i)
+
+    res = await asyncio.gather(*(loop.run_in_executor(executor, call, i) for i in range(4)))
+    print(res)
+
+    # A shut down executor doesn't take more calls
+    executor.shutdown()
+    try:
+        executor.run(work, 1)
+    except RuntimeError:
+        print("RuntimeError")
+
+
+asyncio.run(main())
@@ -0,0 +1,79 @@
+# Test binascii.crc and binascii.crc_hqx
+
+try:
+    import binascii
+
+    binascii.crc
+except (ImportError, AttributeError):
+    print("SKIP")
+    raise SystemExit
+
+# Check values of the presets, for b"123456789"
+check = b"123456789"
+print(hex(binascii.crc(check, binascii.CRC16_CCITT)))
+print(hex(binascii.crc(check, binascii.CRC16_MODBUS)))
+print(hex(binascii.crc(check, binascii.CRC32C)))
+print(hex(binascii.crc(b"", binascii.CRC32C)))
+
+# Custom parameters: (width, poly, init, refin, refout, xorout)
+CRC32 = (32, 0x04C11DB7, 0xFFFFFFFF, True, True, 0xFFFFFFFF)
+CRC16_XMODEM = (16, 0x1021, 0, False, False, 0)
+CRC16_KERMIT = (16, 0x1021, 0, True, True, 0)
+CRC16_ARC = [16, 0x8005, 0, True, True, 0]
+CRC8 = (8, 0x07, 0, False, False, 0)
+CRC8_MAXIM = (8, 0x31, 0, True, True, 0)
+CRC5_USB = (5, 0x05, 0x1F, True, True, 0x1F)
+CRC3_GSM = (3, 0x3, 0, False, False, 0x7)
+CRC32_BZIP2 = (32, 0x04C11DB7, 0xFFFFFFFF, False, False, 0xFFFFFFFF)
+CRC16_GENIBUS = (16, 0x1021, 0xFFFF, False, False, 0xFFFF)
+for params in (
+    CRC32,
+    CRC16_XMODEM,
+    CRC16_KERMIT,
+    CRC16_ARC,
+    CRC8,
+    CRC8_MAXIM,
+    CRC5_USB,
+    CRC3_GSM,
+    CRC32_BZIP2,
+    CRC16_GENIBUS,
+):
+    print(params[0], hex(binascii.crc(check, params)))
+
+# Same result as crc32, where available
+if hasattr(binascii, "crc32"):
+    for data in (b"", b"a", check, bytes(range(256)) * 3):
+        print(binascii.crc(data, CRC32) == binascii.crc32(data))
+
+# Incremental computation, passing the previous result as value
+data = bytes(range(200))
+for params in (
+    binascii.CRC16_CCITT,
+    binascii.CRC16_MODBUS,
+    binascii.CRC32C,
+    CRC5_USB,
+    CRC16_GENIBUS,
+):
+    crc = binascii.crc(data[:77], params)
+    crc = binascii.crc(data[77:], params, crc)
+    print(crc == binascii.crc(data, params))
+
+# Any buffer can be used
+print(hex(binascii.crc(bytearray(check), binascii.CRC16_MODBUS)))
+print(hex(binascii.crc(memoryview(check)[1:], binascii.CRC16_MODBUS)))
+
+# crc_hqx is CRC-16/XMODEM starting from value, as in CPython
+print(hex(binascii.crc_hqx(check, 0)))
+print(hex(binascii.crc_hqx(check, 0xFFFF)))
+print(hex(binascii.crc_hqx(check[5:], binascii.crc_hqx(check[:5], 0))))
+
+# Errors
+for params in (3, -1, (0, 1, 0, False, False, 0), (33, 1, 0, False, False, 0), (16, 0x1021)):
+    try:
+        binascii.crc(check, params)
+    except ValueError:
+        print("ValueError")
+try:
+    binascii.crc(1, binascii.CRC32C)
+except TypeError:
+    print("TypeError")
@@ -0,0 +1,64 @@
+# Test deflate.DeflateIO with different sizes of buffer for the compressed data.
+
+try:
+    # Check if deflate is available.
+    import deflate
+    import io
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+# zlib.compress(b"micropython" * 40)
+data_zlib = b"x\x9c\xcb\xcdL.\xca/\xa8,\xc9\xc8\xcf\xcb\x1de\x0e\x1d&\x00\x1fe\xbda"
+expected = b"micropython" * 40
+
+# Each buffer size gives the same result, with read and readinto.
+for bufsize in (0, 1, 5, 16, 256, 4096):
+    with deflate.DeflateIO(io.BytesIO(data_zlib), deflate.ZLIB, 0, False, bufsize) as g:
+        print(bufsize, g.read() == expected)
+    with deflate.DeflateIO(io.BytesIO(data_zlib), deflate.ZLIB, 0, False, bufsize) as g:
+        buf = bytearray(100)
+        out = b""
+        while n := g.readinto(buf):
+            out += buf[:n]
+        print(bufsize, out == expected)
+
+# Data read ahead of the end of the compressed stream is given back to a
+# seekable stream.
+for bufsize in (0, 7, 256):
+    buf = io.BytesIO(data_zlib + b"trailer")
+    with deflate.DeflateIO(buf, deflate.ZLIB, 0, False, bufsize) as g:
+        print(g.read() == expected, buf.read())
+
+# Invalid buffer size.
+try:
+    deflate.DeflateIO(io.BytesIO(data_zlib), deflate.ZLIB, 0, False, -1)
+except ValueError:
+    print("ValueError")
+
+# By default a stream that can't seek is unbuffered, so nothing following the
+# compressed stream is read from it.
+
+
+class Stream(io.IOBase):
+    def __init__(self, data):
+        self.buf = io.BytesIO(data)
+
+    def readinto(self, buf):
+        return self.buf.readinto(buf)
+
+
+s = Stream(data_zlib + b"trailer")
+with deflate.DeflateIO(s, deflate.ZLIB) as g:
+    print(g.read() == expected, s.buf.read())
+
+# Unless a bufsize is given.
+s = Stream(data_zlib + b"trailer")
+with deflate.DeflateIO(s, deflate.ZLIB, 0, False, 256) as g:
+    print(g.read() == expected, s.buf.read())
+
+# A seekable stream is buffered by default, and given back what's read ahead.
+buf = io.BytesIO(data_zlib + b"trailer")
+with deflate.DeflateIO(buf, deflate.ZLIB, 0, False, None) as g:
+    print(g.read(1), buf.tell() == len(data_zlib) + 7)
+    print(g.read() == expected[1:], buf.read())
@@ -36,9 +36,9 @@ b = io.BytesIO(result_raw)
 with deflate.DeflateIO(b, deflate.RAW) as g:
     print(g.read())
 
-# Writing to a closed underlying stream.
+# Writing to a closed underlying stream, unbuffered so the write reaches it.
 b = io.BytesIO()
-g = deflate.DeflateIO(b, deflate.RAW)
+g = deflate.DeflateIO(b, deflate.RAW, 0, False, 0)
 g.write(b"micropython")
 b.close()
 try:
@@ -152,3 +152,15 @@ for wbits in range(5, 10):
 # at the start of the bytes.
 compressed = compress(b"1234567890abcdefghijklmnopqrstuvwxyz123123", deflate.RAW)
 print(len(compressed), compressed)
+
+# Output is the same for each size of buffer for the compressed data, and
+# buffered output is written to the stream by flush() and close().
+expected = compress(buf, deflate.ZLIB, 8)
+for bufsize in (0, 1, 5, 256, 4096):
+    b = io.BytesIO()
+    g = deflate.DeflateIO(b, deflate.ZLIB, 8, False, bufsize)
+    g.write(buf)
+    g.flush()
+    flushed = len(b.getvalue())
+    g.close()
+    print(bufsize, flushed > len(expected) // 2, b.getvalue() == expected)
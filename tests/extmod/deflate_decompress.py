@@ -75,9 +75,9 @@ decompress_error(b"\x07", deflate.RAW)
 # Truncated stream.
 decompress_error(data_raw[:10], deflate.RAW)
 
-# Partial reads.
+# Partial reads, unbuffered (bufsize=0) so the source is read byte by byte.
 buf = io.BytesIO(data_zlib)
-with deflate.DeflateIO(buf) as g:
+with deflate.DeflateIO(buf, deflate.AUTO, 0, False, 0) as g:
     print(buf.seek(0, 1))  # verify stream is not read until first read of the DeflateIO stream.
     print(g.read(1))
     print(buf.seek(0, 1))  # verify that only the minimal amount is read from the source
@@ -100,7 +100,7 @@ decompress_error(data_gzip[:-8] + b"\x00\x00\x00\x00\x00\x00\x00\x00", deflate.G
 
 # Reading from a closed underlying stream.
 b = io.BytesIO(data_raw)
-g = deflate.DeflateIO(b, deflate.RAW)
+g = deflate.DeflateIO(b, deflate.RAW, 0, False, 0)
 g.read(4)
 b.close()
 try:
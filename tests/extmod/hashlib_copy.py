@@ -0,0 +1,25 @@
+# Test the copy() method of hash objects
+
+try:
+    import hashlib
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+for algo_name in ("md5", "sha1", "sha256"):
+    algo = getattr(hashlib, algo_name, None)
+    if not algo:
+        print(algo_name, True, True, True)
+        continue
+
+    # A copy has the state of the original, and the two are independent.
+    h = algo(b"prefix")
+    h2 = h.copy()
+    h.update(b" and more")
+    h3 = h.copy()
+    print(
+        algo_name,
+        h2.digest() == algo(b"prefix").digest(),
+        h.digest() == algo(b"prefix and more").digest(),
+        h3.digest() == algo(b"prefix and more").digest(),
+    )
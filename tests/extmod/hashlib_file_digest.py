@@ -0,0 +1,54 @@
+# Test hashlib.file_digest
+
+try:
+    import hashlib, io
+
+    hashlib.file_digest
+except (ImportError, AttributeError):
+    print("SKIP")
+    raise SystemExit
+
+data = bytes(range(256)) * 20 + b"tail"
+
+# By constructor and by name, giving a hash object that can still be updated
+for digest in (hashlib.sha256, "sha256"):
+    h = hashlib.file_digest(io.BytesIO(data), digest)
+    print(h.digest() == hashlib.sha256(data).digest())
+h = hashlib.file_digest(io.BytesIO(data), "sha256")
+h.update(b"more")
+print(h.digest() == hashlib.sha256(data + b"more").digest())
+
+# Block sizes smaller and larger than the data, and an empty stream
+for bufsize in (1, 7, 1024, 100000):
+    h = hashlib.file_digest(io.BytesIO(data), hashlib.sha256, bufsize)
+    print(bufsize, h.digest() == hashlib.sha256(data).digest())
+print(hashlib.file_digest(io.BytesIO(b""), "sha256").digest() == hashlib.sha256().digest())
+
+
+# Any object with an update method can be used as the hash
+class Collect:
+    def __init__(self):
+        self.chunks = []
+
+    def update(self, b):
+        self.chunks.append(bytes(b))
+
+
+h = hashlib.file_digest(io.BytesIO(data), Collect, 2000)
+print([len(c) for c in h.chunks], b"".join(h.chunks) == data)
+
+# Errors
+for stream in (data, 1):
+    try:
+        hashlib.file_digest(stream, "sha256")
+    except OSError:
+        print("OSError")
+try:
+    hashlib.file_digest(io.BytesIO(data), "sha256", 0)
+except ValueError:
+    print("ValueError")
+for name in ("sha999", "file_digest", "__name__"):
+    try:
+        hashlib.file_digest(io.BytesIO(data), name)
+    except ValueError:
+        print("ValueError", name)
@@ -32,4 +32,15 @@ for algo_name in ("md5", "sha1", "sha256"):
         # same even if the algorithm is not implemented on the port.
         pass
 
+    # A final hash can't be copied.
+    h = algo(b"123")
+    h.digest()
+    try:
+        h.copy()
+        print("fail")
+    except ValueError:
+        # Expected path, don't print anything so test output is the
+        # same even if the algorithm is not implemented on the port.
+        pass
+
 print("done")
@@ -0,0 +1,43 @@
+try:
+    import heapq
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+if not hasattr(heapq, "merge"):
+    print("SKIP")
+    raise SystemExit
+
+data = [5, 1, 8, 3, -2, 7, 1, 0, 9, 3]
+
+for n in (-1, 0, 1, 3, 10, 20):
+    print(n, heapq.nsmallest(n, data), heapq.nlargest(n, data))
+
+# key function, passed positionally or by keyword
+print(heapq.nsmallest(3, data, lambda x: -x), heapq.nlargest(3, data, key=lambda x: -x))
+print(heapq.nsmallest(4, iter(data), key=None))
+
+# items with equal keys come out in the order they were given
+words = ["pear", "fig", "apple", "kiwi", "plum", "date", "banana", "lime"]
+print(heapq.nsmallest(5, words, key=len))
+print(heapq.nlargest(5, words, key=len))
+print(heapq.nsmallest(3, [(1, "b"), (0, "z"), (1, "a"), (0, "y")], key=lambda t: t[0]))
+
+# merge is lazy, and works with any iterables
+m = heapq.merge([1, 4, 7], (2, 5, 8), iter([0, 3, 6, 9]))
+print(next(m), next(m), list(m))
+print(list(heapq.merge()), list(heapq.merge([], [1], [])))
+print(list(heapq.merge(range(0, 10, 3), range(1, 10, 3), range(2, 10, 3))))
+
+# merge with key and reverse, and stable for equal keys
+a = [("a", 1), ("c", 1), ("e", 2)]
+b = [("b", 1), ("d", 2), ("f", 3)]
+print(list(heapq.merge(a, b, key=lambda t: t[1])))
+print(list(heapq.merge(a[::-1], b[::-1], key=lambda t: t[1], reverse=True)))
+print(list(heapq.merge([9, 5, 1], [8, 6], reverse=True)))
+
+# merge only takes key and reverse as keyword arguments
+try:
+    heapq.merge([1], [2], keys=len)
+except TypeError:
+    print("TypeError")
@@ -0,0 +1,72 @@
+try:
+    import heapq
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+if not hasattr(heapq, "heapreplace"):
+    print("SKIP")
+    raise SystemExit
+
+try:
+    heapq.heapreplace([], 1)
+except IndexError:
+    print("IndexError")
+
+try:
+    heapq.heappushpop((), 1)
+except TypeError:
+    print("TypeError")
+
+
+def pop_all(h):
+    return [heapq.heappop(h) for _ in range(len(h))]
+
+
+# heapreplace returns the smallest item even if the new one is smaller
+h = [4, 3, 8, 9, 10, 2, 7, 11, 5]
+heapq.heapify(h)
+print(heapq.heapreplace(h, 6), heapq.heapreplace(h, 1), h)
+print(pop_all(h))
+
+# heappushpop returns the new item if it's the smallest
+h = [4, 3, 8, 9, 10, 2, 7, 11, 5]
+heapq.heapify(h)
+print(heapq.heappushpop(h, 1), heapq.heappushpop(h, 6), h)
+print(pop_all(h))
+print(heapq.heappushpop([], 1))
+
+# tuples, including ones with items that aren't small ints and with equal
+# leading items
+h = []
+for item in [
+    (2, "b"),
+    (1, "z"),
+    (2, "a"),
+    (1 << 70, "big"),
+    (-(1 << 70), "neg"),
+    (1.5, "f"),
+    (2,),
+    (1, "z", 0),
+    (1, "y"),
+]:
+    heapq.heappush(h, item)
+print(pop_all(h))
+
+
+# items with their own comparison
+class Item:
+    def __init__(self, x):
+        self.x = x
+
+    def __lt__(self, other):
+        return self.x < other.x
+
+    def __repr__(self):
+        return "Item(%d)" % self.x
+
+
+h = [Item(x) for x in (5, 1, 4, 2, 3)]
+heapq.heapify(h)
+print(heapq.heapreplace(h, Item(0)), heapq.heappushpop(h, Item(6)))
+print(pop_all(h))
@@ -0,0 +1,65 @@
+# test the WIZNET5K driver's socket polls against the W5500 model of the
+# unix wiznet5k variant: how many SPI transactions a poll takes, the offsets
+# of the burst reads of the status registers, and the re-reads of a size
+# whose two bytes were read either side of an update by the chip
+
+try:
+    import network, select, socket, w5500model
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+chip = w5500model.W5500()
+nic = network.WIZNET5K(chip, chip.cs, chip.rst)
+nic.active(True)
+nic.ifconfig(("192.168.0.18", "255.255.255.0", "192.168.0.1", "8.8.8.8"))
+
+s = socket.socket()
+s.connect(("192.168.0.2", 8000))
+poller = select.poll()
+
+
+def poll(events):
+    nic.spi_stats(True)
+    poller.register(s, events)
+    res = [ev for _, ev in poller.poll(0)]
+    print("poll", res, nic.spi_stats()["poll"], nic.stats()["sockets"][0]["rx_full"])
+
+
+# Nothing received: reading RD alone is one transaction of Sn_RX_RSR, and
+# RD|WR a burst from Sn_IR to Sn_RX_RSR then the sizes again as TX is free
+poll(select.POLLIN)
+poll(select.POLLIN | select.POLLOUT)
+
+# Data received: Sn_RX_RSR is read twice and then Sn_RXBUF_SIZE
+chip.rx(0, b"x" * 100)
+poll(select.POLLIN)
+poll(select.POLLIN | select.POLLOUT)
+print(len(s.recv(100)))
+
+# The RX buffer becomes full between the bytes of Sn_RX_RSR: 0x07ff to
+# 0x0800 is read as 0x0700, and only read again is the buffer seen full
+chip.rx(0, b"a" * 0x7FF)
+chip.rx(0, b"b", True)
+poll(select.POLLIN)
+print(len(s.recv(2048)))
+
+# The same in the burst read of the sizes
+chip.rx(0, b"a" * 0x7FF)
+chip.rx(0, b"b", True)
+poll(select.POLLIN | select.POLLOUT)
+print(len(s.recv(2048)))
+
+# Every SPI transaction and byte is counted by the driver
+counts = chip.counts()
+nic.spi_stats(True)
+poll(select.POLLIN)
+s.send(b"hello")
+chip.rx(0, b"world")
+print(s.recv(5), chip.tx(0))
+trans = sum(t for t, _ in nic.spi_stats().values())
+nbytes = sum(b for _, b in nic.spi_stats().values())
+print(trans == chip.counts()[0] - counts[0], nbytes == chip.counts()[1] - counts[1])
+
+s.close()
+nic.active(False)
@@ -0,0 +1,99 @@
+# test the WIZNET5K driver's traffic counters against the W5500 model of the
+# unix wiznet5k variant; the exact SPI traffic and times depend on the
+# ioLibrary, so what's checked is that the counters agree with the traffic,
+# only ever go up, and count an RX buffer once each time it fills up
+
+try:
+    import network, select, socket, w5500model
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+chip = w5500model.W5500()
+nic = network.WIZNET5K(chip, chip.cs, chip.rst)
+nic.active(True)
+nic.ifconfig(("192.168.0.18", "255.255.255.0", "192.168.0.1", "8.8.8.8"))
+
+
+# All the counters as one flat dict
+def counters():
+    st = nic.stats()
+    flat = {}
+    for sn, sock in enumerate(st["sockets"]):
+        for k, v in sock.items():
+            flat["%d.%s" % (sn, k)] = v
+    for k in ("poll", "yield"):
+        flat[k + ".calls"], flat[k + ".us"] = st[k]
+    for op, (trans, nbytes) in st["spi"].items():
+        flat[op + ".transactions"] = trans
+        flat[op + ".bytes"] = nbytes
+    return flat
+
+
+# Do something, check that no counter went down, and return the changes
+prev = counters()
+
+
+def step(func):
+    global prev
+    func()
+    cur = counters()
+    if any(cur[k] < prev[k] for k in cur):
+        print("counter went down:", [k for k in cur if cur[k] < prev[k]])
+    delta = {k: cur[k] - prev[k] for k in cur}
+    prev = cur
+    return delta
+
+
+s = socket.socket()
+s.connect(("192.168.0.2", 8000))
+poller = select.poll()
+poller.register(s, select.POLLIN)
+step(lambda: None)
+
+# Sends, with a gathered send counted as one, and receives
+d = step(lambda: (s.send(b"hello"), s.sendmsg((b"a", b"bc", b"def"))))
+sent = chip.tx(0)
+print(sent, d["0.tx_packets"], d["0.tx_bytes"] == len(sent))
+chip.rx(0, b"world")
+d = step(lambda: print(s.recv(3), s.recv(3)))
+print(d["0.rx_packets"], d["0.rx_bytes"])
+
+# The RX buffer stays full over several polls, and is counted once
+chip.rx(0, b"x" * 2048)
+d = step(lambda: [poller.poll(0) for _ in range(3)])
+print("full", d["0.rx_full"], d["poll.calls"])
+
+# Drained and filled again, it's counted again
+d = step(lambda: print(len(s.recv(1024))))
+d = step(lambda: poller.poll(0))
+print("drained", d["0.rx_full"])
+chip.rx(0, b"y" * 1024)
+d = step(lambda: (poller.poll(0), poller.poll(0)))
+print("refilled", d["0.rx_full"])
+
+# The interface totals are those of the sockets
+st = nic.stats()
+print(all(st[k] == sum(sock[k] for sock in st["sockets"]) for k in st["sockets"][0]))
+
+# Reset the counters
+nic.stats(True)
+prev = counters()
+print(all(v == 0 for v in prev.values()))
+
+# The chip gives up retransmitting, and the send fails with a timeout
+chip.timeout(0)
+
+
+def send_lost():
+    try:
+        s.send(b"lost")
+    except OSError:
+        print("OSError")
+
+
+d = step(send_lost)
+print("timeouts", d["0.timeouts"], d["0.tx_packets"])
+s.close()
+
+nic.active(False)
@@ -0,0 +1,39 @@
+# test that compiled patterns are cached by pattern and flags
+
+try:
+    import re
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+r = re.compile("a+b")
+if re.compile("a+b") is not r:
+    # caching disabled in this build
+    print("SKIP")
+    raise SystemExit
+
+# equal patterns which aren't the same object also hit the cache
+p = "".join(("a", "+", "b"))
+print(re.compile(p) is r)
+
+# a str pattern and a bytes pattern are different
+print(re.compile(b"a+b") is r)
+
+# flags are part of the key
+if hasattr(re, "LINEAR"):
+    print(re.compile("a+b", re.LINEAR) is r)
+else:
+    print(False)
+
+# the module-level functions use the cache, and get the right results
+print(re.match("a+b", "aab").group(0))
+print(re.search("a+b", "xaab").group(0))
+print(re.compile("a+b") is r)
+
+# the least recently used pattern is dropped once enough others are compiled
+for i in range(32):
+    re.compile("x{}".format(i))
+print(re.compile("a+b") is r)
+
+# a cached pattern still works
+print(r.match("ab").group(0))
@@ -0,0 +1,74 @@
+# test the re.LINEAR (Pike VM) matcher against the backtracking one
+
+try:
+    import re
+
+    re.LINEAR
+except (ImportError, AttributeError):
+    print("SKIP")
+    raise SystemExit
+
+
+def groups(m):
+    if m is None:
+        return None
+    g = []
+    while True:
+        try:
+            g.append(m.group(len(g)))
+        except IndexError:
+            return tuple(g)
+
+
+tests = (
+    ("abc", "xxabcxx"),
+    ("a.c", "abc"),
+    ("^ab", "cab"),
+    ("ab$", "abab"),
+    ("a*", "aaab"),
+    ("a*?b", "aaab"),
+    ("a+?", "aaa"),
+    ("a??a", "aa"),
+    ("(a|ab)(c|bcd)", "abcd"),
+    ("(a*)(b*)", "aabbb"),
+    ("(a*)*b", "aaab"),
+    ("(a|b)*c", "ababc"),
+    ("(a+)(a+)", "aaaa"),
+    ("([a-c]+)([^a-c]*)", "abcxyzabc"),
+    ("\\d+\\.\\d*", "t=21.50C"),
+    ("(\\w+)@(\\w+)\\.com", "mail bob@example.com now"),
+    ("\\s*(\\S+)\\s*=\\s*(\\S+)", "  key = value "),
+    ("(x)?y", "y"),
+    ("(x)|(y)", "y"),
+    ("", "abc"),
+    ("a|", "b"),
+    ("[0-9]+|[a-z]+", "abc123"),
+)
+
+for pattern, subject in tests:
+    bt = re.compile(pattern)
+    lin = re.compile(pattern, re.LINEAR)
+    for f in ("match", "search"):
+        try:
+            a = groups(getattr(bt, f)(subject))
+        except RuntimeError:
+            # The backtracking matcher recurses without limit on some patterns
+            a = "RuntimeError"
+        b = groups(getattr(lin, f)(subject))
+        print(pattern, f, b, "ok" if a == b else "backtracking: %s" % (a,))
+
+# split and sub use the same matcher
+r = re.compile("[,;] *", re.LINEAR)
+print(r.split("a, b;c,  d"))
+if hasattr(r, "sub"):
+    print(r.sub("|", "a, b;c,  d"))
+    print(re.sub("(\\d+)", "<\\1>", "1 22 333", 0, re.LINEAR))
+
+# module-level functions take the flag too
+print(groups(re.match("a+", "aaa", re.LINEAR)))
+print(groups(re.search("b+", "aaabb", re.LINEAR)))
+
+# patterns that take exponential time to backtrack
+print(re.match("(a*)*b", "a" * 40, re.LINEAR))
+print(re.match("(a|aa)*c", "a" * 60, re.LINEAR))
+print(groups(re.search("(a|aa)*c", "a" * 60 + "c", re.LINEAR)))
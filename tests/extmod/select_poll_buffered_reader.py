@@ -0,0 +1,62 @@
+# Test io.BufferedReader with select.poll, and the number of underlying reads.
+
+try:
+    import io, select
+
+    io.BufferedReader
+    io.IOBase
+    select.poll
+except (ImportError, AttributeError):
+    print("SKIP")
+    raise SystemExit
+
+
+# A non-blocking stream which receives data in chunks, like a socket
+class Stream(io.IOBase):
+    def __init__(self):
+        self.chunks = []
+        self.reads = 0
+
+    def readinto(self, buf):
+        self.reads += 1
+        if not self.chunks:
+            return None
+        chunk = self.chunks.pop(0)
+        buf[: len(chunk)] = chunk
+        return len(chunk)
+
+    def ioctl(self, req, arg):
+        if req == 3:  # MP_STREAM_POLL
+            return arg & select.POLLIN if self.chunks else 0
+        return 0
+
+
+s = Stream()
+r = io.BufferedReader(s, 32)
+poller = select.poll()
+poller.register(r, select.POLLIN)
+
+# Nothing to read yet
+print(poller.poll(0))
+print(r.readline(), s.reads)
+
+# Several lines arrive at once and are read with a single call to the stream
+s.chunks.append(b"line 1\nline 2\npartial")
+print(poller.poll(0)[0][1] == select.POLLIN)
+print(r.readline(), s.reads)
+
+# The rest of the data is buffered, so the reader is ready even though the
+# stream isn't
+print(poller.poll(0)[0][1] == select.POLLIN)
+print(r.readline(), s.reads)
+
+# A partial line is returned when the stream would block
+print(r.readline(), s.reads)
+print(poller.poll(0))
+
+# peek fills the buffer without consuming it
+s.chunks.append(b" line\nend")
+print(r.peek(), s.reads)
+print(r.readline(), s.reads)
+print(r.read(), s.reads)
+print(r.read(), s.reads)
@@ -0,0 +1,63 @@
+# test socket.sendmsg() and socket.recv_into() on TCP and UDP sockets
+
+try:
+    import socket
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+try:
+    socket.socket.sendmsg
+    socket.socket.recv_into
+except AttributeError:
+    print("SKIP")
+    raise SystemExit
+
+addr = socket.getaddrinfo("127.0.0.1", 8011)[0][-1]
+
+# TCP: a header and payload gathered into one send
+s_listen = socket.socket()
+s_listen.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+s_listen.bind(addr)
+s_listen.listen(1)
+s_client = socket.socket()
+s_client.connect(addr)
+s_server, _ = s_listen.accept()
+
+print(s_client.sendmsg([b"\x00\x05", bytearray(b"hello"), memoryview(b"--world--")[2:7]]))
+print(s_client.sendmsg([]))
+print(s_client.sendmsg((b"", b"!")))
+
+buf = bytearray(16)
+mv = memoryview(buf)
+n = 0
+while n < 13:
+    n += s_server.recv_into(mv[n:])
+print(n, buf)
+
+# limit the number of bytes received
+s_client.send(b"abcdef")
+buf = bytearray(8)
+print(s_server.recv_into(buf, 3), buf)
+print(s_server.recv_into(buf, 0), buf)
+
+# nbytes larger than the buffer
+try:
+    s_server.recv_into(buf, 9)
+except ValueError:
+    print("ValueError")
+
+s_client.close()
+s_server.close()
+s_listen.close()
+
+# UDP: the buffers are sent as one datagram
+s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+s.bind(addr)
+s2 = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+s2.connect(addr)
+print(s2.sendmsg([b"12", b"345"]))
+buf = bytearray(8)
+print(s.recv_into(buf), buf)
+s2.close()
+s.close()
@@ -0,0 +1,50 @@
+# test socket.recvfrom_into() on UDP sockets
+
+try:
+    import socket
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+try:
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind(socket.getaddrinfo("127.0.0.1", 8010)[0][-1])
+    s.recvfrom_into
+except (OSError, AttributeError):
+    print("SKIP")
+    raise SystemExit
+
+s2 = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+addr = socket.getaddrinfo("127.0.0.1", 8010)[0][-1]
+buf = bytearray(8)
+
+# receive into the whole buffer
+s2.sendto(b"abc", addr)
+n, _ = s.recvfrom_into(buf)
+print(n, buf)
+
+# receive into a memoryview, truncating the datagram
+s2.sendto(b"0123456789", addr)
+n, _ = s.recvfrom_into(memoryview(buf)[2:])
+print(n, buf)
+
+# limit the number of bytes received
+s2.sendto(b"xyz", addr)
+n, _ = s.recvfrom_into(buf, 2)
+print(n, buf)
+
+# nbytes larger than the buffer
+try:
+    s.recvfrom_into(buf, 9)
+except ValueError:
+    print("ValueError")
+
+# negative nbytes
+for meth in (s.recv_into, s.recvfrom_into):
+    try:
+        meth(buf, -1)
+    except ValueError as er:
+        print("ValueError", er)
+
+s2.close()
+s.close()
@@ -1,11 +1,23 @@
+import sys
 import time
 
 
 ITERS = 20000000
 
+# The test runner may override the number of iterations on the command line.
+if len(sys.argv) > 1:
+    ITERS = int(sys.argv[1])
 
-def run(f):
-    t = time.time()
-    f(ITERS)
-    t = time.time() - t
-    print(t)
+
+def run(f, iters=None):
+    if iters is None:
+        iters = ITERS
+    if hasattr(time, "ticks_us"):
+        t = time.ticks_us()
+        f(iters)
+        t = time.ticks_diff(time.ticks_us(), t) / 1000000
+    else:
+        t = time.time()
+        f(iters)
+        t = time.time() - t
+    print(t, iters)
@@ -7,4 +7,5 @@ def test(num):
         i += 1
 
 
-bench.run(test)
+# The loop bound is a literal, so this test always runs the default count.
+bench.run(test, 20000000)
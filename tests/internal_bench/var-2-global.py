@@ -1,6 +1,6 @@
 import bench
 
-ITERS = 20000000
+ITERS = bench.ITERS
 
 
 def test(num):
@@ -2,7 +2,7 @@ import bench
 
 
 def test(num):
-    ITERS = 20000000
+    ITERS = num
     i = 0
     while i < ITERS:
         i += 1
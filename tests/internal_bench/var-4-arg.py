@@ -7,4 +7,4 @@ def test(num):
         i += 1
 
 
-bench.run(lambda n: test(20000000))
+bench.run(lambda n: test(n))
@@ -2,7 +2,7 @@ import bench
 
 
 class Foo:
-    num = 20000000
+    num = bench.ITERS
 
 
 def test(num):
@@ -3,7 +3,7 @@ import bench
 
 class Foo:
     def __init__(self):
-        self.num = 20000000
+        self.num = bench.ITERS
 
 
 def test(num):
@@ -7,7 +7,7 @@ class Foo:
         self.num2 = 0
         self.num3 = 0
         self.num4 = 0
-        self.num = 20000000
+        self.num = bench.ITERS
 
 
 def test(num):
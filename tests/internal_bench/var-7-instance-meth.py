@@ -3,7 +3,7 @@ import bench
 
 class Foo:
     def __init__(self):
-        self._num = 20000000
+        self._num = bench.ITERS
 
     def num(self):
         return self._num
@@ -5,7 +5,7 @@ T = namedtuple("Tup", ["num", "bar"])
 
 
 def test(num):
-    t = T(20000000, 0)
+    t = T(bench.ITERS, 0)
     i = 0
     while i < t.num:
         i += 1
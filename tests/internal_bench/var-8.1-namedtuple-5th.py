@@ -5,7 +5,7 @@ T = namedtuple("Tup", ["foo1", "foo2", "foo3", "foo4", "num"])
 
 
 def test(num):
-    t = T(0, 0, 0, 0, 20000000)
+    t = T(0, 0, 0, 0, bench.ITERS)
     i = 0
     while i < t.num:
         i += 1
@@ -0,0 +1,19 @@
+# test gc.pause_stats()
+
+import gc
+
+try:
+    gc.pause_stats
+except AttributeError:
+    print("SKIP")
+    raise SystemExit
+
+gc.collect()
+count, total, max_us, hist = gc.pause_stats()
+print(count > 0, total >= max_us, sum(hist) == count)
+
+# reset returns the statistics from before the reset
+count2 = gc.pause_stats(True)[0]
+print(count2 >= count)
+gc.collect()
+print(gc.pause_stats()[0])
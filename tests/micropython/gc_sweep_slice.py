@@ -0,0 +1,42 @@
+# test deferred sweeping of the heap via gc.sweep_slice()
+
+import gc
+
+try:
+    gc.sweep_slice
+except AttributeError:
+    print("SKIP")
+    raise SystemExit
+
+print(gc.sweep_slice())
+gc.sweep_slice(1)
+print(gc.sweep_slice() > 0)
+gc.sweep_slice(0)
+print(gc.sweep_slice())
+
+try:
+    gc.sweep_slice(-1)
+except ValueError:
+    print("ValueError")
+
+# Allocate lots of garbage with a low threshold so that collections are
+# triggered by the allocator, and check that live objects survive the
+# deferred sweeps.
+gc.sweep_slice(256)
+gc.threshold(4096)
+keep = [[i, str(i)] for i in range(100)]
+for i in range(5000):
+    garbage = [i, i + 1, i + 2]
+    if i % 50 == 0:
+        keep[i % 100] = [i, str(i)]
+        gc.mem_free()
+ok = True
+for i, item in enumerate(keep):
+    if item[0] % 100 != i or item[1] != str(item[0]):
+        ok = False
+print(ok)
+
+# an explicit collection completes any deferred sweep
+print(gc.collect() >= 0)
+gc.threshold(-1)
+gc.sweep_slice(0)
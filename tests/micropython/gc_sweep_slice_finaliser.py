@@ -0,0 +1,63 @@
+# test that finalisers run by a deferred sweep see the objects they refer to
+# intact, even when those objects are garbage too
+
+import gc
+
+try:
+    gc.sweep_slice
+    import vfs
+
+    vfs.VfsFat
+except (ImportError, AttributeError):
+    print("SKIP")
+    raise SystemExit
+
+writes = [0]
+
+
+class RAMBlockDevice:
+    ERASE_BLOCK_SIZE = 512
+
+    def __init__(self, blocks):
+        self.blocks = [bytearray(self.ERASE_BLOCK_SIZE) for _ in range(blocks)]
+
+    # These are called by the finaliser with the heap locked, so mustn't allocate
+
+    def readblocks(self, block, buf):
+        for i in range(len(buf)):
+            buf[i] = self.blocks[block + i // 512][i % 512]
+
+    def writeblocks(self, block, buf):
+        writes[0] += 1
+        for i in range(len(buf)):
+            self.blocks[block + i // 512][i % 512] = buf[i]
+
+    def ioctl(self, op, arg):
+        if op == 4:  # block count
+            return len(self.blocks)
+        if op == 5:  # block size
+            return self.ERASE_BLOCK_SIZE
+
+
+def open_file():
+    # A file with unwritten data, whose finaliser closes it and so writes to
+    # the block device, left for the GC along with the device and filesystem
+    bdev = RAMBlockDevice(50)
+    vfs.VfsFat.mkfs(bdev)
+    f = vfs.VfsFat(bdev).open("f", "w")
+    f.write("x" * 100)
+
+
+gc.collect()
+gc.sweep_slice(16)
+gc.threshold(2048)
+for _ in range(4):
+    open_file()
+    # Allocate garbage so that collections are triggered by the allocator and
+    # the blocks freed by their sweep slices are reused straight away
+    for i in range(2000):
+        garbage = [i, str(i), bytearray(i % 64)]
+gc.threshold(-1)
+gc.sweep_slice(0)
+gc.collect()
+print(writes[0] > 0)
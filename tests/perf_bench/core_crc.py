@@ -0,0 +1,53 @@
+# Test performance of computing CRCs over a block of data in pieces, as done
+# when checking a firmware image or a log file: CRC32 with binascii.crc32,
+# and CRC-32C and CRC-16/MODBUS with binascii.crc.  The score is in bytes/sec.
+
+try:
+    from binascii import crc32, crc, CRC32C, CRC16_MODBUS
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+
+def test(data, chunk, niter):
+    mv = memoryview(data)
+    out = []
+    for _ in range(niter):
+        c32 = 0
+        c32c = crc(b"", CRC32C)
+        c16 = crc(b"", CRC16_MODBUS)
+        for i in range(0, len(data), chunk):
+            piece = mv[i : i + chunk]
+            c32 = crc32(piece, c32)
+            c32c = crc(piece, CRC32C, c32c)
+            c16 = crc(piece, CRC16_MODBUS, c16)
+        out.append((c32, c32c, c16))
+    return out
+
+
+###########################################################################
+# Benchmark interface
+
+bm_params = {
+    (50, 25): (4096, 512, 2),
+    (100, 100): (16384, 1024, 4),
+    (1000, 1000): (65536, 4096, 8),
+    (5000, 1000): (262144, 4096, 8),
+}
+
+
+def bm_setup(params):
+    size, chunk, niter = params
+    data = bytes((i * 7 + (i >> 8)) & 0xFF for i in range(size))
+    state = None
+
+    def run():
+        nonlocal state
+        state = test(data, chunk, niter)
+
+    def result():
+        # Each pass must give the same CRCs as computing them in one go
+        ref = (crc32(data), crc(data, CRC32C), crc(data, CRC16_MODBUS))
+        return 3 * size * niter, all(r == ref for r in state)
+
+    return run, result
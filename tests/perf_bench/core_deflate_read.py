@@ -0,0 +1,81 @@
+# Test performance of decompressing a large deflate stream with DeflateIO, from
+# an io.BytesIO and from a file.
+
+try:
+    import io, os, deflate
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+FILENAME = "perf_bench_deflate.bin"
+
+
+def make_stream(size):
+    # Build a raw deflate stream made of stored (uncompressed) blocks.  This
+    # doesn't need compression support in the target, and it makes the
+    # decompressor take every byte of its output from the input stream.
+    chunk = bytes(range(256)) * 64
+    out = bytearray()
+    while size > 0:
+        n = min(size, len(chunk))
+        size -= n
+        out.append(size == 0)  # BFINAL, BTYPE=00 (stored)
+        out.extend(n.to_bytes(2, "little"))
+        out.extend((n ^ 0xFFFF).to_bytes(2, "little"))
+        out.extend(chunk[:n])
+    return bytes(out)
+
+
+def decompress(stream, buf):
+    total = 0
+    check = 0
+    with deflate.DeflateIO(stream, deflate.RAW) as d:
+        while n := d.readinto(buf):
+            total += n
+            check ^= buf[n - 1]
+    return total, check
+
+
+def test(data, use_file, niter):
+    buf = bytearray(512)
+    out = []
+    for _ in range(niter):
+        out.append(decompress(io.BytesIO(data), buf))
+        if use_file:
+            with open(FILENAME, "rb") as f:
+                out.append(decompress(f, buf))
+    return out
+
+
+###########################################################################
+# Benchmark interface
+
+bm_params = {
+    (50, 25): (4096, 2),
+    (100, 100): (32768, 2),
+    (1000, 1000): (262144, 2),
+    (5000, 1000): (524288, 4),
+}
+
+
+def bm_setup(params):
+    size, niter = params
+    data = make_stream(size)
+    try:
+        with open(FILENAME, "wb") as f:
+            f.write(data)
+        use_file = True
+    except OSError:
+        use_file = False
+    state = None
+
+    def run():
+        nonlocal state
+        state = test(data, use_file, niter)
+
+    def result():
+        if use_file:
+            os.remove(FILENAME)
+        return size * niter, all(r == (size, 0) for r in state)
+
+    return run, result
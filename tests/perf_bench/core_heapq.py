@@ -0,0 +1,62 @@
+# Test performance of heapq used as a priority queue of (time, task) tuples,
+# as in a scheduler, and of small-int keys.
+
+try:
+    import heapq
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+
+class Task:
+    def __init__(self, period):
+        self.period = period
+        self.runs = 0
+
+
+def test(ntasks, nsteps):
+    # Timer queue: repeatedly take the next task due and reschedule it.
+    tasks = [Task(1 + (i * 7919) % 97) for i in range(ntasks)]
+    queue = [(t.period, i, t) for i, t in enumerate(tasks)]
+    heapq.heapify(queue)
+    for _ in range(nsteps):
+        when, i, task = queue[0]
+        task.runs += 1
+        heapq.heapreplace(queue, (when + task.period, i, task))
+
+    # Plain ints: push/pop with a pseudorandom sequence.
+    heap = []
+    x = 1
+    total = 0
+    for _ in range(nsteps):
+        x = (x * 1103515245 + 12345) & 0x3FFFFFFF
+        heapq.heappush(heap, x >> 10)
+        if len(heap) > ntasks:
+            total += heapq.heappop(heap)
+    total += heapq.heappushpop(heap, 0)
+
+    return queue[0][0], sum(t.runs * i for i, t in enumerate(tasks)), total
+
+
+###########################################################################
+# Benchmark interface
+
+bm_params = {
+    (50, 10): (16, 1000),
+    (100, 10): (32, 2000),
+    (1000, 10): (64, 10000),
+    (5000, 10): (128, 40000),
+}
+
+
+def bm_setup(params):
+    state = None
+
+    def run():
+        nonlocal state
+        state = test(*params)
+
+    def result():
+        return params[0] * params[1], state
+
+    return run, result
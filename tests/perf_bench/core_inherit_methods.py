@@ -0,0 +1,68 @@
+# This tests the performance of calling methods and loading class attributes
+# that are inherited through several levels of classes.
+
+
+class Base:
+    scale = 3
+
+    def get(self):
+        return self.value
+
+    def add(self, x):
+        self.value += x * self.scale
+
+
+class Level1(Base):
+    def level1(self):
+        return 1
+
+
+class Level2(Level1):
+    def level2(self):
+        return 2
+
+
+class Level3(Level2):
+    def level3(self):
+        return 3
+
+
+class Leaf(Level3):
+    def __init__(self):
+        self.value = 0
+
+
+def test(niter):
+    obj = Leaf()
+    for i in range(niter):
+        obj.add(i & 7)
+        obj.add(obj.level1())
+        obj.add(obj.level2() - obj.level3())
+    return obj.get()
+
+
+###########################################################################
+# Benchmark interface
+
+bm_params = {
+    (32, 10): (100,),
+    (50, 10): (300,),
+    (100, 10): (1000,),
+    (500, 10): (5000,),
+    (1000, 10): (10000,),
+    (5000, 10): (40000,),
+}
+
+
+def bm_setup(params):
+    (niter,) = params
+    state = None
+
+    def run():
+        nonlocal state
+        state = test(niter)
+
+    def result():
+        return niter, state
+
+    return run, result
@@ -0,0 +1,60 @@
+# Test performance of the re module parsing log lines, both through the
+# module-level functions (which compile the pattern on every call unless it
+# is cached) and with a precompiled pattern using the linear-time matcher.
+
+try:
+    import re
+except ImportError:
+    print("SKIP")
+    raise SystemExit
+
+LINEAR = getattr(re, "LINEAR", 0)
+
+LINES = (
+    "12:00:01 INFO  sensor=temp value=21.50 unit=C",
+    "12:00:02 WARN  sensor=hum value=81.2 unit=%",
+    "12:00:03 INFO  link up 100Mbps full-duplex",
+    "12:00:04 ERROR sensor=temp timeout after 250 ms",
+)
+
+
+def test(niter):
+    count = 0
+    total = 0
+    for i in range(niter):
+        line = LINES[i % len(LINES)]
+        # Module-level functions, as commonly used in application code
+        m = re.match("(\\d+):(\\d+):(\\d+) (\\w+)", line)
+        if re.search("ERROR|WARN", line):
+            count += 1
+        total += int(m.group(3))
+    r = re.compile("(\\w+)=(\\d+)\\.?(\\d*)", LINEAR)
+    for i in range(niter):
+        m = r.search(LINES[i % len(LINES)])
+        if m:
+            total += int(m.group(2))
+    return count, total
+
+
+###########################################################################
+# Benchmark interface
+
+bm_params = {
+    (50, 10): (40,),
+    (100, 10): (200,),
+    (1000, 10): (2000,),
+    (5000, 10): (10000,),
+}
+
+
+def bm_setup(params):
+    state = None
+
+    def run():
+        nonlocal state
+        state = test(*params)
+
+    def result():
+        return params[0], state
+
+    return run, result
@@ -4,6 +4,7 @@ import os
 import subprocess
 import sys
 import argparse
+import json
 import re
 from glob import glob
 from collections import defaultdict
@@ -15,58 +16,192 @@ if os.name == "nt":
 else:
     MICROPYTHON = os.getenv("MICROPY_MICROPYTHON", "../ports/unix/build-standard/micropython")
 
+EMITTERS = ("bytecode", "native", "viper")
+
+# Two-sided 95% quantiles of Student's t-distribution, indexed by degrees of freedom.
+T_95 = (
+    None,
+    12.706,
+    4.303,
+    3.182,
+    2.776,
+    2.571,
+    2.447,
+    2.365,
+    2.306,
+    2.262,
+    2.228,
+    2.201,
+    2.179,
+    2.160,
+    2.145,
+    2.131,
+    2.120,
+    2.110,
+    2.101,
+    2.093,
+    2.086,
+)
+
+
+def compute_stats(lst):
+    # Returns the mean and the half-width of its 95% confidence interval.
+    n = len(lst)
+    avg = sum(lst) / n
+    if n < 2:
+        return avg, 0
+    var = sum((x - avg) ** 2 for x in lst) / (n - 1)
+    t = T_95[n - 1] if n - 1 < len(T_95) else 1.960
+    return avg, t * (var / n) ** 0.5
+
+
+def run_test(pyb, test_file, emit, iters):
+    if pyb is None:
+        # run on PC
+        cmd = [MICROPYTHON, "-X", "emit=" + emit, test_file]
+        if iters is not None:
+            cmd.append(str(iters))
+        try:
+            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+        except subprocess.CalledProcessError as er:
+            return "CRASH: " + str(er.output.strip().split(b"\n")[-1], "utf8", "replace")
+    else:
+        # run on pyboard, which needs bench.py in its filesystem
+        pyb.enter_raw_repl()
+        try:
+            if iters is not None:
+                pyb.exec_("import sys\nsys.argv[1:] = [%r]" % str(iters))
+            output = pyb.execfile(test_file).replace(b"\r\n", b"\n")
+        except pyboard.PyboardError as er:
+            return "CRASH: %r" % er
+
+    # The output is the elapsed time in seconds followed by the number of iterations.
+    try:
+        elapsed, num = output.split()
+        elapsed, num = float(elapsed), int(num)
+    except ValueError:
+        return "CRASH: %r" % output
+    if elapsed <= 0:
+        return "SKIP: run too short for the timer, increase --iters"
+    return elapsed, num
+
+
+def run_tests(pyb, test_dict, args):
+    # Every (test, emitter) pair is a variant.  They are run round-robin, with
+    # the starting point rotated each round, so slow drift of the host (thermal
+    # throttling, background load) is spread evenly across all variants rather
+    # than penalising whichever happened to run last.
+    variants = [
+        (t, emit) for _, tests in sorted(test_dict.items()) for t in tests for emit in args.emit
+    ]
+    samples = {v: [] for v in variants}
+    failed = {}
+    for r in range(args.repeat):
+        if args.verbose:
+            print("round {}/{}".format(r + 1, args.repeat), file=sys.stderr)
+        for i in range(len(variants)):
+            v = variants[(i + r) % len(variants)]
+            if v in failed:
+                continue
+            result = run_test(pyb, v[0], v[1], args.iters)
+            if isinstance(result, str):
+                failed[v] = result
+            else:
+                samples[v].append(result[1] / result[0])
 
-def run_tests(pyb, test_dict):
-    test_count = 0
-    testcase_count = 0
-
+    results = {}
     for base_test, tests in sorted(test_dict.items()):
         print(base_test + ":")
-        for test_file in tests:
-            # run MicroPython
-            if pyb is None:
-                # run on PC
-                try:
-                    output_mupy = subprocess.check_output(
-                        [MICROPYTHON, "-X", "emit=bytecode", test_file[0]]
+        for emit in args.emit:
+            baseline = None
+            for t in tests:
+                if (t, emit) in failed:
+                    print("    {:8} {} {}".format(emit, t, failed[(t, emit)]))
+                    continue
+                ops, ci = compute_stats(samples[(t, emit)])
+                if baseline is None:
+                    baseline = ops
+                print(
+                    "    {:8} {:9.3f} Mop/s +/-{:6.2f}% ({:+7.2f}%) {}".format(
+                        emit, ops / 1e6, ci * 100 / ops, ops * 100 / baseline - 100, t
                     )
-                except subprocess.CalledProcessError:
-                    output_mupy = b"CRASH"
-            else:
-                # run on pyboard
-                pyb.enter_raw_repl()
-                try:
-                    output_mupy = pyb.execfile(test_file).replace(b"\r\n", b"\n")
-                except pyboard.PyboardError:
-                    output_mupy = b"CRASH"
-
-            output_mupy = float(output_mupy.strip())
-            test_file[1] = output_mupy
-            testcase_count += 1
-
-        test_count += 1
-        baseline = None
-        for t in tests:
-            if baseline is None:
-                baseline = t[1]
-            print("    %.3fs (%+06.2f%%) %s" % (t[1], (t[1] * 100 / baseline) - 100, t[0]))
-
-    print("{} tests performed ({} individual testcases)".format(test_count, testcase_count))
+                )
+                results.setdefault(t, {})[emit] = {
+                    "ops_per_sec": ops,
+                    "ci95": ci,
+                    "samples": samples[(t, emit)],
+                }
+
+    print(
+        "{} tests performed ({} individual testcases, {} emitters, {} rounds)".format(
+            len(test_dict), sum(len(t) for t in test_dict.values()), len(args.emit), args.repeat
+        )
+    )
 
-    # all tests succeeded
-    return True
+    return results
+
+
+def compare_baseline(results, baseline):
+    # A change is only flagged as significant if the confidence intervals of
+    # the two measurements do not overlap.
+    print("compared to baseline:")
+    for t, emits in sorted(results.items()):
+        for emit, new in sorted(emits.items()):
+            old = baseline.get(t, {}).get(emit)
+            if old is None:
+                continue
+            delta = new["ops_per_sec"] - old["ops_per_sec"]
+            sig = "*" if abs(delta) > new["ci95"] + old["ci95"] else " "
+            print(
+                "    {:8} {:9.3f} -> {:9.3f} Mop/s ({:+7.2f}%){} {}".format(
+                    emit,
+                    old["ops_per_sec"] / 1e6,
+                    new["ops_per_sec"] / 1e6,
+                    delta * 100 / old["ops_per_sec"],
+                    sig,
+                    t,
+                )
+            )
 
 
 def main():
-    cmd_parser = argparse.ArgumentParser(description="Run tests for MicroPython.")
+    cmd_parser = argparse.ArgumentParser(description="Run internal benchmarks for MicroPython.")
     cmd_parser.add_argument("--pyboard", action="store_true", help="run the tests on the pyboard")
+    cmd_parser.add_argument(
+        "-n", "--repeat", type=int, default=5, help="number of times to run each variant"
+    )
+    cmd_parser.add_argument(
+        "-i", "--iters", type=int, help="number of iterations per run (default set by bench.py)"
+    )
+    cmd_parser.add_argument(
+        "-e",
+        "--emit",
+        default="bytecode",
+        help="comma-separated list of emitters to run: {}".format(",".join(EMITTERS)),
+    )
+    cmd_parser.add_argument("--json", metavar="FILE", help="write results to a JSON file")
+    cmd_parser.add_argument(
+        "--baseline", metavar="FILE", help="compare results against a JSON file from --json"
+    )
+    cmd_parser.add_argument("-v", "--verbose", action="store_true", help="report progress")
     cmd_parser.add_argument("files", nargs="*", help="input test files")
     args = cmd_parser.parse_args()
 
+    args.emit = args.emit.split(",")
+    for emit in args.emit:
+        if emit not in EMITTERS:
+            cmd_parser.error("unknown emitter: {}".format(emit))
+    if args.repeat < 1:
+        cmd_parser.error("--repeat must be at least 1")
+
     # Note pyboard support is copied over from run-tests.py, not tests, and likely needs revamping
     if args.pyboard:
+        global pyboard
+        sys.path.append("../tools")
         import pyboard
 
+        if args.emit != ["bytecode"]:
+            cmd_parser.error("only the bytecode emitter can be selected on the pyboard")
         pyb = pyboard.Pyboard("/dev/ttyACM0")
         pyb.enter_raw_repl()
     else:
@@ -93,10 +228,26 @@ def main():
         m = re.match(r"(.+?)-(.+)\.py", t)
         if not m:
             continue
-        test_dict[m.group(1)].append([t, None])
-
-    if not run_tests(pyb, test_dict):
-        sys.exit(1)
+        test_dict[m.group(1)].append(t)
+
+    results = run_tests(pyb, test_dict, args)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare_baseline(results, json.load(f)["results"])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "micropython": MICROPYTHON if pyb is None else "pyboard",
+                    "repeat": args.repeat,
+                    "iters": args.iters,
+                    "results": results,
+                },
+                f,
+                indent=1,
+            )
 
 
 if __name__ == "__main__":
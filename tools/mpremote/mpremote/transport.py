@@ -192,8 +192,8 @@ class Transport:
             return getattr(hashlib, algo)(data).digest()
         try:
             self.exec(
-                "buf = memoryview(bytearray({chunk_size}))\nwith open('{path}', 'rb') as f:\n while True:\n  n = f.readinto(buf)\n  if n == 0:\n   break\n  h.update(buf if n == {chunk_size} else buf[:n])\n".format(
-                    chunk_size=chunk_size, path=path
+                "with open('{path}', 'rb') as f:\n if hasattr(hashlib, 'file_digest'):\n  h = hashlib.file_digest(f, hashlib.{algo}, {chunk_size})\n else:\n  buf = memoryview(bytearray({chunk_size}))\n  while True:\n   n = f.readinto(buf)\n   if n == 0:\n    break\n   h.update(buf if n == {chunk_size} else buf[:n])\n".format(
+                    chunk_size=chunk_size, path=path, algo=algo
                 )
             )
             return self.eval("h.digest()")